@@ -0,0 +1,215 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional
+
+from analyzers.response import shape_response
+
+
+# Framework padrão por linguagem quando o cliente envia "auto"
+DEFAULT_FRAMEWORKS = {
+    "python": "pytest",
+    "java": "junit5",
+    "javascript": "jest",
+    "typescript": "jest"
+}
+
+# Linguagens atendidas pelo analisador JavaScript/TypeScript
+JS_LANGUAGES = frozenset({"javascript", "typescript"})
+
+# Abaixo deste tamanho o lote é processado no próprio processo
+MIN_PARALLEL_ITEMS = 4
+
+
+def resolve_framework(language: str, test_framework: str) -> str:
+    """Normaliza o framework de teste para a linguagem informada"""
+    if test_framework == "auto":
+        test_framework = DEFAULT_FRAMEWORKS.get(language, "pytest")
+
+    # Mapear junit para junit5 se necessário
+    if language == "java" and test_framework == "junit":
+        test_framework = "junit5"
+
+    return test_framework
+
+
+class _Backends:
+    """Analisadores instanciados uma vez por processo de trabalho
+
+    Os módulos dos analisadores só são importados aqui, então importar este
+    módulo (como o servidor faz na partida) não carrega nenhum backend.
+    """
+
+    def __init__(self):
+        from analyzers.python_Analyzer import PythonAnalysisEngine, PromptGenerator
+        from analyzers.java_Analyzer import (
+            JavaStaticAnalyzer, JavaFlowSummarizer, JavaPromptGenerator, JavaAnalysisEngine
+        )
+        from analyzers.js_Analyzer import JSAnalysisEngine
+
+        self.python_engine = PythonAnalysisEngine()
+        self.prompt_generator = PromptGenerator()
+        self.java_static_analyzer = JavaStaticAnalyzer()
+        self.java_flow_summarizer = JavaFlowSummarizer()
+        self.java_prompt_generator = JavaPromptGenerator()
+        self.java_engine = JavaAnalysisEngine()
+        self.js_engine = JSAnalysisEngine()
+
+
+_backends: Optional[_Backends] = None
+
+
+def get_backends() -> _Backends:
+    """Retorna os analisadores do processo atual, criando-os na primeira chamada"""
+    global _backends
+    if _backends is None:
+        _backends = _Backends()
+    return _backends
+
+
+# Análises que podem ser pedidas por nome a um processo de trabalho: (tipo, linguagem)
+_ANALYSES = {
+    ("fused", "python"): lambda backends, code: backends.python_engine.analyze(code),
+    ("module", "python"): lambda backends, code: backends.python_engine.analyze_module(code),
+    ("static", "java"): lambda backends, code: backends.java_static_analyzer.analyze_method(code),
+    ("flow", "java"): lambda backends, code: backends.java_flow_summarizer.summarize_flow(code),
+    ("class", "java"): lambda backends, code: backends.java_engine.analyze_class(code),
+    ("fused", "javascript"): lambda backends, code: backends.js_engine.analyze(code),
+    ("module", "javascript"): lambda backends, code: backends.js_engine.analyze_module(code),
+}
+
+
+def run_analysis(kind: str, language: str, code: str) -> Dict[str, Any]:
+    """Executa uma análise com os analisadores do processo atual"""
+    return _ANALYSES[(kind, language)](get_backends(), code)
+
+
+def analyze_item(index: int, item: Dict[str, Any], detail: str = "full",
+                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Analisa um item do lote; nunca lança exceção, devolve entrada de erro
+
+    O resultado já sai no nível de detalhe pedido, então o modo "compact"
+    também reduz o que trafega entre os processos.
+    """
+    return shape_response(_analyze_item(index, item), detail, fields)
+
+
+def _analyze_item(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Relatório completo de um item do lote"""
+    try:
+        if not isinstance(item, dict) or not isinstance(item.get("code"), str):
+            raise ValueError("Item deve conter o campo 'code' com o código fonte")
+
+        code = item["code"]
+        language = str(item.get("language", "python")).lower()
+        test_framework = resolve_framework(language, item.get("test_framework", "auto"))
+        max_prompt_tokens = item.get("max_prompt_tokens")
+        backends = get_backends()
+
+        result = {"index": index, "language": language, "framework": test_framework}
+
+        if language == "java":
+            static_analysis = backends.java_static_analyzer.analyze_method(code)
+            flow_analysis = backends.java_flow_summarizer.summarize_flow(code)
+        elif language in JS_LANGUAGES:
+            analysis = backends.js_engine.analyze(code)
+            static_analysis = analysis["static"]
+            flow_analysis = analysis["flow"]
+        else:
+            analysis = backends.python_engine.analyze(code)
+            static_analysis = analysis["static"]
+            flow_analysis = analysis["flow"]
+
+        result["static_analysis"] = static_analysis
+        result["flow_analysis"] = flow_analysis
+
+        if "error" in static_analysis or "error" in flow_analysis:
+            result["error"] = "Erro em uma ou mais análises"
+            return result
+
+        if language == "java":
+            result["prompt_generation"] = backends.java_prompt_generator.generate_test_prompt(
+                static_analysis, flow_analysis, test_framework, max_prompt_tokens
+            )
+        else:
+            result["prompt_generation"] = backends.prompt_generator.generate_test_prompt(
+                static_analysis, flow_analysis, language, test_framework, max_prompt_tokens
+            )
+        return result
+    except Exception as e:
+        return {"index": index, "error": f"Erro no item {index}: {str(e)}"}
+
+
+def _analyze_chunk(start: int, items: List[Dict[str, Any]], detail: str = "full",
+                   fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Processa uma fatia contígua do lote em um processo de trabalho"""
+    return [analyze_item(start + offset, item, detail, fields) for offset, item in enumerate(items)]
+
+
+class BatchAnalyzer:
+    """Distribui análises de um lote entre processos, preservando a ordem"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """Cria o pool sob demanda e o reutiliza entre chamadas"""
+        with self._lock:
+            if self._executor is None:
+                # "spawn": fork de um processo com threads (transporte stdio) pode travar
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def reset_executor(self) -> None:
+        """Descarta um pool quebrado; o próximo uso cria um novo"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self) -> None:
+        """Encerra os processos de trabalho"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def analyze(self, items: List[Dict[str, Any]], detail: str = "full",
+                fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Analisa todos os itens e devolve os resultados na ordem de entrada"""
+        if self.max_workers <= 1 or len(items) < MIN_PARALLEL_ITEMS:
+            return _analyze_chunk(0, items, detail, fields)
+
+        # Fatias contíguas: poucas mensagens entre processos e ordem preservada
+        chunk_size = max(1, -(-len(items) // (self.max_workers * 4)))
+        starts = list(range(0, len(items), chunk_size))
+
+        try:
+            executor = self.get_executor()
+            futures = [executor.submit(_analyze_chunk, start, items[start:start + chunk_size],
+                                       detail, fields)
+                       for start in starts]
+        except (BrokenProcessPool, RuntimeError):
+            self.reset_executor()
+            return _analyze_chunk(0, items, detail, fields)
+
+        results: List[Dict[str, Any]] = []
+        broken = False
+        for start, future in zip(starts, futures):
+            try:
+                results.extend(future.result())
+            except BrokenProcessPool as e:
+                broken = True
+                results.extend({"index": start + offset, "error": f"Erro no item {start + offset}: {str(e)}"}
+                               for offset in range(len(items[start:start + chunk_size])))
+
+        if broken:
+            self.reset_executor()
+        return results
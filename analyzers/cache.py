@@ -0,0 +1,198 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional, Tuple
+
+from analyzers.flow import FlowNode
+
+
+# Estimativa de memória ocupada por uma árvore AST por caractere de código fonte
+TREE_BYTES_PER_CHAR = 16
+
+# Tamanho estimado de números, booleanos e null no JSON
+NUMBER_SIZE = 6
+
+# Itens medidos por lista na estimativa de tamanho; o resto é extrapolado
+SIZE_SAMPLE = 32
+
+_MISSING = object()
+
+
+def content_hash(code: str) -> str:
+    """Calcula o hash de conteúdo usado como chave do cache"""
+    return hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """Estima o tamanho em bytes de um resultado pela sua estrutura
+
+    Aproxima o comprimento do JSON sem serializá-lo: textos contam pelo
+    tamanho, números e literais por um valor fixo, e dicts, listas e nós de
+    fluxo somam os filhos mais a pontuação. Listas longas são estimadas por
+    uma amostra de SIZE_SAMPLE itens, então o custo não cresce com o resultado.
+    """
+    size = 0.0
+    stack = [(value, 1.0)]
+    while stack:
+        item, weight = stack.pop()
+        cls = item.__class__
+        if cls is str:
+            size += (len(item) + 2) * weight
+        elif cls is dict:
+            size += 2 * weight
+            for key, child in item.items():
+                size += (len(key) + 4 if key.__class__ is str else 8) * weight
+                stack.append((child, weight))
+        elif cls is list or cls is tuple:
+            count = len(item)
+            size += (2 + count) * weight
+            if count > SIZE_SAMPLE:
+                step = count / SIZE_SAMPLE
+                weight *= step
+                item = [item[int(i * step)] for i in range(SIZE_SAMPLE)]
+            stack.extend((child, weight) for child in item)
+        elif isinstance(item, FlowNode):
+            size += (len(item.type) + 12) * weight
+            for name in item.__slots__:
+                size += (len(name) + 4) * weight
+                stack.append((getattr(item, name), weight))
+        elif item is None or cls is bool or cls is int or cls is float:
+            size += NUMBER_SIZE * weight
+        else:
+            size += len(repr(item)) * weight
+    return int(size)
+
+
+class LRUCache:
+    """Cache LRU limitado pelo total de bytes armazenados"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor associado à chave e o marca como usado recentemente"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """Armazena um valor, removendo os menos usados até caber no limite"""
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove todas as entradas (os contadores são preservados)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores de uso do cache"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+class AnalysisCache:
+    """Cache em camadas para árvores sintáticas, análises e prompts
+
+    As chaves são derivadas do hash do código, então o mesmo trecho reenviado
+    pelo cliente reaproveita o trabalho já feito. Os valores retornados são
+    compartilhados entre chamadas e devem ser tratados como somente leitura.
+    """
+
+    def __init__(self, parse_max_bytes: int = 64 * 1024 * 1024,
+                 analysis_max_bytes: int = 32 * 1024 * 1024,
+                 prompt_max_bytes: int = 16 * 1024 * 1024):
+        self.parse = LRUCache(parse_max_bytes)
+        self.analysis = LRUCache(analysis_max_bytes)
+        self.prompt = LRUCache(prompt_max_bytes)
+        self._last_hash: Tuple[Optional[str], str] = (None, "")
+
+    def key(self, code: str) -> str:
+        """Retorna o hash do código, reaproveitando o último calculado"""
+        last_code, last_hash = self._last_hash
+        if code is last_code:
+            return last_hash
+
+        digest = content_hash(code)
+        self._last_hash = (code, digest)
+        return digest
+
+    def get_tree(self, code: str, language: str, parser: Callable[[str], Any]) -> Any:
+        """Camada de parse: retorna a árvore sintática do código"""
+        key = (self.key(code), language)
+        tree = self.parse.get(key, _MISSING)
+        if tree is _MISSING:
+            tree = parser(code)
+            self.parse.put(key, tree, len(code) * TREE_BYTES_PER_CHAR)
+        return tree
+
+    def get_analysis(self, kind: str, code: str, language: str,
+                     compute: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Camada de análise: resultados estáticos e de fluxo"""
+        key = (kind, self.key(code), language)
+        result = self.analysis.get(key, _MISSING)
+        if result is _MISSING:
+            result = compute(code)
+            self.analysis.put(key, result, estimate_size(result))
+        return result
+
+    def get_prompt(self, generator: str, code: str, language: str, framework: str,
+                   compute: Callable[[], Dict[str, Any]],
+                   max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Camada de prompt: chaveada por (hash da análise, linguagem, framework, orçamento)"""
+        key = (generator, self.key(code), language, framework, max_tokens)
+        result = self.prompt.get(key, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            self.prompt.put(key, result, estimate_size(result))
+        return result
+
+    def clear(self) -> None:
+        """Esvazia todas as camadas"""
+        self.parse.clear()
+        self.analysis.clear()
+        self.prompt.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna estatísticas por camada"""
+        return {
+            "parse": self.parse.stats(),
+            "analysis": self.analysis.stats(),
+            "prompt": self.prompt.stats()
+        }
@@ -0,0 +1,379 @@
+import os
+import threading
+from concurrent.futures import Executor
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from analyzers.cache import AnalysisCache, content_hash
+from analyzers.metrics import phase
+from analyzers.project import discover_files
+from analyzers.python_Analyzer import ModuleVisitor, parse_python
+from analyzers.python_render import ExpressionRenderer
+from analyzers.python_symbols import DEFINITION_SEPARATOR
+
+
+# Separador entre o arquivo e o nome qualificado nos nós do grafo de projeto
+NODE_SEPARATOR = "::"
+
+# Abaixo desta quantidade de arquivos alterados a extração roda no próprio processo
+MIN_PARALLEL_FILES = 8
+
+
+def module_calls(code: str, cache: Optional[AnalysisCache] = None) -> Dict[str, Any]:
+    """Imports do módulo e chamadas de cada função, em uma única travessia
+
+    Devolve {"imports": [...], "functions": {nome qualificado: [chamadas]}};
+    as chamadas são as mesmas de internal_calls em analyze_module. Como no
+    SymbolIndex, um nome redefinido aponta para a última definição (a que
+    as chamadas alcançam); as anteriores viram "nome#1", "nome#2"...
+    """
+    tree = parse_python(code, cache)
+    visitor = ModuleVisitor(ExpressionRenderer(code).render)
+    with phase("walk"):
+        visitor.visit(tree)
+
+    counts: Dict[str, int] = {}
+    for frame in visitor.frames:
+        counts[frame.qualified_name] = counts.get(frame.qualified_name, 0) + 1
+    seen: Dict[str, int] = {}
+    functions: Dict[str, List[str]] = {}
+    for frame in visitor.frames:
+        name = frame.qualified_name
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] < counts[name]:
+            name = f"{name}{DEFINITION_SEPARATOR}{seen[name]}"
+        functions[name] = list(dict.fromkeys(frame.calls))
+    return {"imports": visitor.module_imports(), "functions": functions}
+
+
+def _enclosing_scopes(caller: str) -> List[str]:
+    """Prefixos em que um nome chamado por `caller` é procurado, do mais interno ao módulo
+
+    Como no Python, os escopos de classe não entram na busca: em
+    "A.m.<locals>.g" a ordem é "A.m.<locals>.g.<locals>.", "A.m.<locals>." e "".
+    """
+    caller = caller.split(DEFINITION_SEPARATOR, 1)[0]
+    scopes = [caller + ".<locals>."]
+    parts = caller.split(".<locals>.")
+    for end in range(len(parts) - 1, 0, -1):
+        scopes.append(".<locals>.".join(parts[:end]) + ".<locals>.")
+    scopes.append("")
+    return scopes
+
+
+def _enclosing_class(caller: str) -> Optional[str]:
+    """Classe do método que contém `caller` (alvo de self.x/cls.x), ou None"""
+    method = caller.split(DEFINITION_SEPARATOR, 1)[0].split(".<locals>.", 1)[0]
+    if "." not in method:
+        return None
+    return method.rsplit(".", 1)[0]
+
+
+def _callable_name(name: str, functions: Dict[str, Any]) -> Optional[str]:
+    """`name` se for uma função do módulo; para uma classe, o seu __init__"""
+    if name in functions:
+        return name
+    constructor = name + ".__init__"
+    return constructor if constructor in functions else None
+
+
+def resolve_local_call(call: str, caller: str, functions: Dict[str, Any]) -> Optional[str]:
+    """Função do próprio módulo chamada por `caller`, ou None (externa/desconhecida)"""
+    head, _, rest = call.partition(".")
+    if head in ("self", "cls") and rest:
+        owner = _enclosing_class(caller)
+        return _callable_name(f"{owner}.{rest}", functions) if owner else None
+    if not rest:
+        for scope in _enclosing_scopes(caller):
+            target = _callable_name(scope + call, functions)
+            if target is not None:
+                return target
+        return None
+    # "Classe.metodo" ou "Classe.Interna.metodo" referenciados pelo nome
+    return _callable_name(call, functions)
+
+
+class CallGraph:
+    """Grafo de chamadas entre funções, com ordenação das folhas para os chamadores
+
+    Os nós são nomes qualificados (ou "arquivo::nome" em um projeto) na ordem
+    em que foram adicionados; as arestas vão do chamador para as funções
+    chamadas que também são nós do grafo. Chamadas externas ficam de fora.
+    """
+
+    __slots__ = ("edges",)
+
+    def __init__(self):
+        self.edges: Dict[str, List[str]] = {}
+
+    def add(self, node: str, callees: Iterable[str]) -> None:
+        self.edges.setdefault(node, []).extend(callees)
+
+    def strongly_connected(self) -> List[List[str]]:
+        """Componentes fortemente conexos (Tarjan iterativo), folhas primeiro
+
+        Cada componente só é emitido depois de todos os que ele alcança, ou
+        seja, as funções chamadas vêm antes de quem as chama.
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+
+        for start in self.edges:
+            if start in index:
+                continue
+            work = [(start, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index[node] = lowlink[node] = len(index)
+                    stack.append(node)
+                    on_stack.add(node)
+                callees = self.edges.get(node, ())
+                if position < len(callees):
+                    work.append((node, position + 1))
+                    callee = callees[position]
+                    if callee not in index:
+                        work.append((callee, 0))
+                    elif callee in on_stack:
+                        lowlink[node] = min(lowlink[node], index[callee])
+                    continue
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+        return components
+
+    def leaf_first(self) -> Dict[str, Any]:
+        """Ordem de geração: cada função aparece depois de todas as que ela chama
+
+        O nível de uma função é 0 se ela não chama nenhuma outra do grafo e
+        1 + o maior nível das chamadas caso contrário; funções do mesmo nível
+        são independentes entre si. Recursões (diretas ou mútuas) ficam no
+        mesmo nível e são listadas em "cycles".
+        """
+        position = {node: i for i, node in enumerate(self.edges)}
+        level: Dict[str, int] = {}
+        cycles: List[List[str]] = []
+
+        for component in self.strongly_connected():
+            members = set(component)
+            outside = [level[callee] for node in component
+                       for callee in self.edges.get(node, ()) if callee not in members]
+            component_level = max(outside) + 1 if outside else 0
+            for node in component:
+                level[node] = component_level
+            if len(component) > 1 or component[0] in self.edges.get(component[0], ()):
+                cycles.append(sorted(component, key=position.__getitem__))
+
+        order = sorted(self.edges, key=lambda node: (level[node], position[node]))
+        return {
+            "function_count": len(order),
+            "edge_count": sum(len(callees) for callees in self.edges.values()),
+            "level_count": max(level.values()) + 1 if level else 0,
+            "cycles": cycles,
+            "order": [{"name": node, "level": level[node], "calls": self.edges[node]}
+                      for node in order]
+        }
+
+
+def module_graph(calls: Dict[str, Any]) -> CallGraph:
+    """Grafo das funções de um módulo a partir de module_calls"""
+    functions = calls["functions"]
+    graph = CallGraph()
+    for caller, names in functions.items():
+        targets = (resolve_local_call(name, caller, functions) for name in names)
+        graph.add(caller, dict.fromkeys(target for target in targets if target is not None))
+    return graph
+
+
+def extract_file(root: str, relative_path: str,
+                 known_hash: Optional[str] = None) -> Dict[str, Any]:
+    """Chamadas de um arquivo Python do projeto (executada nos processos de trabalho)
+
+    Se o hash do conteúdo for igual a `known_hash`, devolve apenas
+    {"path", "content_hash", "unchanged": True}, como analyze_file.
+    """
+    result: Dict[str, Any] = {"path": relative_path}
+    try:
+        with open(os.path.join(root, relative_path), encoding="utf-8", errors="replace") as source:
+            code = source.read()
+
+        result["content_hash"] = content_hash(code)
+        if result["content_hash"] == known_hash:
+            result["unchanged"] = True
+            return result
+        result.update(module_calls(code))
+    except Exception as e:
+        result["error"] = f"Erro ao analisar arquivo: {str(e)}"
+    return result
+
+
+def module_name(relative_path: str) -> str:
+    """Nome pontuado do módulo de um arquivo: "pkg/mod.py" -> "pkg.mod", "pkg/__init__.py" -> "pkg\""""
+    name = relative_path[:-len(".py")].replace("/", ".")
+    if name == "__init__" or name.endswith(".__init__"):
+        name = name[:-len("__init__")].rstrip(".")
+    return name
+
+
+class _FileCalls:
+    """Chamadas extraídas de um arquivo e a identificação do conteúdo analisado"""
+
+    __slots__ = ("mtime_ns", "size", "content_hash", "imports", "functions", "error")
+
+    def __init__(self, stat: Optional[os.stat_result], extracted: Dict[str, Any]):
+        self.mtime_ns = stat.st_mtime_ns if stat is not None else None
+        self.size = stat.st_size if stat is not None else None
+        self.content_hash = extracted.get("content_hash")
+        self.imports: List[str] = extracted.get("imports", [])
+        self.functions: Dict[str, List[str]] = extracted.get("functions", {})
+        self.error: Optional[str] = extracted.get("error")
+
+    def matches(self, stat: Optional[os.stat_result]) -> bool:
+        return (stat is not None and self.mtime_ns == stat.st_mtime_ns
+                and self.size == stat.st_size)
+
+
+class ProjectCallGraph:
+    """Grafo de chamadas de um projeto Python, atualizado incrementalmente
+
+    Cada arquivo é percorrido uma vez e suas chamadas ficam guardadas com
+    mtime, tamanho e hash do conteúdo; em `update`, só os arquivos novos ou
+    alterados são lidos de novo (arquivos apenas "tocados" são reconhecidos
+    pelo hash). A resolução das chamadas entre módulos usa os imports de cada
+    arquivo e é refeita a cada atualização, sem novo parse.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self._files: Dict[str, _FileCalls] = {}
+        self._lock = threading.Lock()
+
+    def update(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+               executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """Sincroniza com o disco; devolve quantos arquivos foram lidos de novo"""
+        with self._lock:
+            paths = [path for path in discover_files(self.root, include, exclude)
+                     if path.endswith(".py")]
+            files: Dict[str, _FileCalls] = {}
+            stale: List[Tuple[str, Optional[os.stat_result]]] = []
+            for relative_path in paths:
+                stat = self._stat(relative_path)
+                entry = self._files.get(relative_path)
+                if entry is not None and entry.matches(stat):
+                    files[relative_path] = entry
+                else:
+                    stale.append((relative_path, stat))
+
+            parsed_count = 0
+            for (relative_path, stat), extracted in zip(stale, self._extract(stale, executor)):
+                entry = self._files.get(relative_path)
+                if extracted.get("unchanged"):
+                    # Conteúdo idêntico: só atualiza mtime/tamanho
+                    if stat is not None:
+                        entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+                else:
+                    parsed_count += 1
+                    entry = _FileCalls(stat, extracted)
+                files[relative_path] = entry
+
+            self._files = files
+            return {"file_count": len(files), "parsed_count": parsed_count}
+
+    def _stat(self, relative_path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(os.path.join(self.root, relative_path))
+        except OSError:
+            return None
+
+    def _extract(self, stale: List[Tuple[str, Optional[os.stat_result]]],
+                 executor: Optional[Executor]) -> List[Dict[str, Any]]:
+        known = [self._files[path].content_hash if path in self._files else None
+                 for path, _ in stale]
+        paths = [path for path, _ in stale]
+        if executor is None or len(stale) < MIN_PARALLEL_FILES:
+            return [extract_file(self.root, path, digest) for path, digest in zip(paths, known)]
+        return list(executor.map(extract_file, [self.root] * len(paths), paths, known))
+
+    def revision(self) -> str:
+        """Identifica o conteúdo atual do grafo (usado nos cursores de paginação)"""
+        return "\n".join([self.root] + [f"{path}:{entry.content_hash}"
+                                        for path, entry in self._files.items()])
+
+    def errors(self) -> List[Dict[str, str]]:
+        return [{"path": path, "error": entry.error}
+                for path, entry in self._files.items() if entry.error is not None]
+
+    def graph(self) -> CallGraph:
+        """Grafo do projeto: nós "arquivo::nome", com chamadas resolvidas entre módulos"""
+        with self._lock:
+            files = dict(self._files)
+
+        modules: Dict[str, str] = {}
+        for relative_path in files:
+            modules.setdefault(module_name(relative_path), relative_path)
+
+        graph = CallGraph()
+        for relative_path, entry in files.items():
+            package = module_name(relative_path).rpartition(".")[0]
+            if relative_path.endswith("__init__.py"):
+                package = module_name(relative_path)
+            for caller, names in entry.functions.items():
+                targets = []
+                for name in names:
+                    local = resolve_local_call(name, caller, entry.functions)
+                    if local is not None:
+                        targets.append(relative_path + NODE_SEPARATOR + local)
+                        continue
+                    target = self._resolve_import(name, entry.imports, package, modules, files)
+                    if target is not None:
+                        targets.append(target)
+                graph.add(relative_path + NODE_SEPARATOR + caller, dict.fromkeys(targets))
+        return graph
+
+    @staticmethod
+    def _resolve_import(call: str, imports: List[str], package: str,
+                        modules: Dict[str, str], files: Dict[str, _FileCalls]) -> Optional[str]:
+        """Nó de outro arquivo do projeto alcançado pela chamada através dos imports"""
+        for imported in imports:
+            bound = imported.rsplit(".", 1)[-1]
+            if call == imported or call.startswith(imported + "."):
+                dotted = call
+            elif call == bound or call.startswith(bound + "."):
+                # "from pkg.mod import f" chama "f"; "from pkg import mod" chama "mod.f"
+                dotted = imported + call[len(bound):]
+            else:
+                continue
+
+            parts = dotted.split(".")
+            for split in range(len(parts) - 1, 0, -1):
+                module = ".".join(parts[:split])
+                # Imports relativos perdem o ponto: tenta primeiro o pacote do chamador
+                for candidate in ((f"{package}.{module}",) if package else ()) + (module,):
+                    relative_path = modules.get(candidate)
+                    if relative_path is None:
+                        continue
+                    target = _callable_name(".".join(parts[split:]), files[relative_path].functions)
+                    if target is not None:
+                        return relative_path + NODE_SEPARATOR + target
+        return None
+
+
+def analyze_call_graph(code: str, cache: Optional[AnalysisCache] = None) -> Dict[str, Any]:
+    """Grafo de chamadas de um módulo Python na ordem das folhas para os chamadores"""
+    try:
+        calls = module_calls(code, cache)
+    except Exception as e:
+        return {"error": f"Erro na análise do módulo: {str(e)}"}
+    return module_graph(calls).leaf_first()
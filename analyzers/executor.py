@@ -0,0 +1,221 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Callable, Optional
+
+from analyzers.batch import BatchAnalyzer, run_analysis
+from analyzers.flow import to_response
+from analyzers.metrics import ServerMetrics, timed
+
+
+# Modos aceitos em MCP_QA_EXECUTOR: análises em threads do servidor ou em processos
+EXECUTOR_MODES = ("thread", "process")
+
+# Entradas menores que isto (em caracteres) não esperam na fila das análises pesadas
+LIGHT_INPUT_CHARS = 16 * 1024
+
+# Threads reservadas para as chamadas leves, além das limitadas pela concorrência
+LIGHT_WORKERS = 2
+
+# Intervalo (s) entre verificações de cancelamento enquanto um processo trabalha
+CANCEL_POLL_SECONDS = 0.05
+
+
+# Conversão dos nós de fluxo em dicts na saída das ferramentas, medida como "serialize"
+_to_response = timed("serialize", to_response)
+
+
+class ToolCancelled(Exception):
+    """A chamada foi cancelada pelo cliente antes de terminar"""
+
+
+# Sinal de cancelamento da chamada em execução na thread atual
+_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "_cancel_event", default=None
+)
+
+
+def check_cancelled() -> None:
+    """Interrompe a chamada atual (ToolCancelled) se o cliente a cancelou"""
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise ToolCancelled("Chamada cancelada pelo cliente")
+
+
+class ToolExecutor:
+    """Executa as ferramentas fora do event loop do servidor MCP
+
+    Cada chamada roda em uma thread; no máximo `max_concurrency` chamadas
+    pesadas rodam ao mesmo tempo e as demais aguardam sem bloquear o loop.
+    Entradas pequenas não entram nessa fila e têm threads reservadas, então
+    continuam rápidas enquanto uma análise grande está em andamento.
+
+    No modo "process" as análises em si são enviadas ao pool de processos do
+    BatchAnalyzer (sem disputar o GIL com o servidor). Quando o cliente
+    cancela a chamada, ela é descartada se ainda estiver na fila, e uma
+    chamada já iniciada para na próxima análise (`check_cancelled`).
+    """
+
+    def __init__(self, batch_analyzer: BatchAnalyzer, mode: str = "thread",
+                 max_concurrency: Optional[int] = None,
+                 metrics: Optional[ServerMetrics] = None):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Modo de execução inválido: {mode} (use {' ou '.join(EXECUTOR_MODES)})")
+        self.batch_analyzer = batch_analyzer
+        self.metrics = metrics
+        self.mode = mode
+        self.max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        self.running = 0
+        self.waiting = 0
+        self.cancelled = 0
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def get_threads(self) -> ThreadPoolExecutor:
+        """Cria o pool de threads sob demanda"""
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency + LIGHT_WORKERS,
+                    thread_name_prefix="mcp-qa-tool"
+                )
+            return self._threads
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semáforo de concorrência do event loop atual (recriado se o loop mudar)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, fn: Callable[..., Any], *args: Any, size: int = 0,
+                  tool: Optional[str] = None) -> Any:
+        """Executa fn(*args) em uma thread e aguarda o resultado sem bloquear o loop
+
+        `size` é o tamanho da entrada; abaixo de LIGHT_INPUT_CHARS a chamada
+        não espera pelas análises pesadas em andamento. Com `tool`, a chamada
+        é registrada nas métricas com esse nome. Os nós de fluxo do resultado
+        são convertidos em dicts ainda na thread de trabalho.
+        """
+        fn, args = _respond, (fn,) + args
+        if self.metrics is not None and tool is not None:
+            fn, args = self.metrics.call, (tool, size, fn) + args
+
+        if size < LIGHT_INPUT_CHARS:
+            return await self._submit(fn, args)
+
+        self.waiting += 1
+        try:
+            semaphore = self._get_semaphore()
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        return await self._submit(fn, args, semaphore.release)
+
+    async def _submit(self, fn: Callable[..., Any], args: tuple,
+                      on_done: Optional[Callable[[], None]] = None) -> Any:
+        """Envia a chamada às threads; `on_done` roda no loop quando a thread termina
+
+        O permit das chamadas pesadas volta em `on_done`, e não quando quem
+        aguarda desiste: uma chamada cancelada em andamento continua ocupando
+        a thread até parar, e não pode abrir espaço para outra pesada tomar
+        as threads reservadas às chamadas leves.
+        """
+        event = threading.Event()
+        context = contextvars.copy_context()
+        context.run(_cancel_event.set, event)
+
+        loop = asyncio.get_running_loop()
+        try:
+            work = self.get_threads().submit(context.run, fn, *args)
+        except BaseException:
+            if on_done is not None:
+                on_done()
+            raise
+        if on_done is not None:
+            work.add_done_callback(lambda _: _call_in_loop(loop, on_done))
+        future = asyncio.wrap_future(work, loop=loop)
+        self.running += 1
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Na fila a thread nunca executa; em andamento para na próxima análise
+            event.set()
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+
+    def analyze(self, kind: str, language: str, code: str,
+                local: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Executa uma análise na thread atual ou, no modo "process", em um processo
+
+        `kind` e `language` identificam a análise em `run_analysis`; `local` é
+        a mesma análise com os analisadores do servidor.
+        """
+        check_cancelled()
+        # Entradas pequenas custam menos que a ida e volta até o processo
+        if self.mode != "process" or len(code) < LIGHT_INPUT_CHARS:
+            return local(code)
+
+        try:
+            future = self.batch_analyzer.get_executor().submit(run_analysis, kind, language, code)
+        except (BrokenProcessPool, RuntimeError):
+            self.batch_analyzer.reset_executor()
+            return local(code)
+
+        event = _cancel_event.get()
+        while True:
+            try:
+                return future.result(timeout=CANCEL_POLL_SECONDS)
+            except FutureTimeoutError:
+                if event is not None and event.is_set():
+                    future.cancel()
+                    raise ToolCancelled("Chamada cancelada pelo cliente")
+            except BrokenProcessPool:
+                self.batch_analyzer.reset_executor()
+                return local(code)
+
+    def shutdown(self) -> None:
+        """Encerra as threads de trabalho"""
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=True)
+            self._threads = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Configuração e chamadas em andamento, na fila e canceladas"""
+        return {
+            "mode": self.mode,
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "cancelled": self.cancelled
+        }
+
+
+def _call_in_loop(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    """Agenda `callback` no event loop a partir de qualquer thread (ignora loop já fechado)"""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+def _respond(fn: Callable[..., Any], *args: Any) -> Any:
+    """Executa fn(*args) e entrega o resultado no formato das respostas"""
+    return _to_response(fn(*args))
+
+
+def executor_from_env(batch_analyzer: BatchAnalyzer,
+                      metrics: Optional[ServerMetrics] = None) -> ToolExecutor:
+    """Cria o executor a partir de MCP_QA_EXECUTOR e MCP_QA_MAX_CONCURRENCY"""
+    mode = os.environ.get("MCP_QA_EXECUTOR", "thread").strip().lower() or "thread"
+    concurrency = os.environ.get("MCP_QA_MAX_CONCURRENCY", "").strip()
+    return ToolExecutor(batch_analyzer, mode, int(concurrency) if concurrency else None, metrics)
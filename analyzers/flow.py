@@ -0,0 +1,195 @@
+import sys
+from collections.abc import Mapping
+from typing import Dict, List, Any, Iterator
+
+
+class FlowNode(Mapping):
+    """Elemento de um mapa de fluxo, guardado em slots em vez de um dict
+
+    O tipo é um atributo da classe (uma única string compartilhada por todos
+    os nós) e os campos ficam em `__slots__`, na ordem das chaves do dict
+    equivalente. A leitura como mapeamento (node["type"], node.get(...),
+    igualdade com dicts) continua funcionando; `to_dict` produz o formato das
+    respostas e só deve ser chamado na saída das ferramentas (`to_response`).
+    """
+
+    __slots__ = ()
+    type = ""
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.type
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key == "type" or key in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        yield "type"
+        yield from self.__slots__
+
+    def __len__(self) -> int:
+        return len(self.__slots__) + 1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "type":
+            return self.type
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict da resposta, com os fluxos aninhados também convertidos"""
+        result: Dict[str, Any] = {"type": self.type}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name == "nested_flow":
+                value = [node.to_dict() for node in value]
+            elif value.__class__ is list:
+                value = list(value)
+            result[name] = value
+        return result
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+def intern_name(name: str) -> str:
+    """Nome de exceção compartilhado entre os nós (as mesmas classes se repetem muito)"""
+    return sys.intern(name)
+
+
+class Conditional(FlowNode):
+    __slots__ = ("condition", "has_else", "nested_flow")
+    type = "conditional"
+
+    def __init__(self, condition: str, has_else: bool, nested_flow: List[FlowNode]):
+        self.condition = condition
+        self.has_else = has_else
+        self.nested_flow = nested_flow
+
+
+class Else(FlowNode):
+    __slots__ = ("nested_flow",)
+    type = "else"
+
+    def __init__(self, nested_flow: List[FlowNode]):
+        self.nested_flow = nested_flow
+
+
+class LoopFor(FlowNode):
+    """for do Python: alvo e iterável separados"""
+
+    __slots__ = ("target", "iter", "nested_flow")
+    type = "loop_for"
+
+    def __init__(self, target: str, iterable: str, nested_flow: List[FlowNode]):
+        self.target = target
+        self.iter = iterable
+        self.nested_flow = nested_flow
+
+
+class LoopForHeader(FlowNode):
+    """for do Java/JavaScript: o cabeçalho inteiro como definição"""
+
+    __slots__ = ("definition", "nested_flow")
+    type = "loop_for"
+
+    def __init__(self, definition: str, nested_flow: List[FlowNode]):
+        self.definition = definition
+        self.nested_flow = nested_flow
+
+
+class LoopWhile(FlowNode):
+    __slots__ = ("condition", "nested_flow")
+    type = "loop_while"
+
+    def __init__(self, condition: str, nested_flow: List[FlowNode]):
+        self.condition = condition
+        self.nested_flow = nested_flow
+
+
+class TryExcept(FlowNode):
+    __slots__ = ("exceptions", "has_finally", "nested_flow")
+    type = "try_except"
+
+    def __init__(self, exceptions: List[str], has_finally: bool, nested_flow: List[FlowNode]):
+        self.exceptions = [intern_name(name) for name in exceptions]
+        self.has_finally = has_finally
+        self.nested_flow = nested_flow
+
+
+class TryCatch(FlowNode):
+    """try do Java/JavaScript; os catch e o finally vêm em seguida como nós próprios"""
+
+    __slots__ = ("exceptions", "has_finally", "nested_flow")
+    type = "try_catch"
+
+    def __init__(self, nested_flow: List[FlowNode]):
+        self.exceptions: List[str] = []
+        self.has_finally = False
+        self.nested_flow = nested_flow
+
+
+class Catch(FlowNode):
+    __slots__ = ("exception", "nested_flow")
+    type = "catch"
+
+    def __init__(self, exception: str, nested_flow: List[FlowNode]):
+        self.exception = intern_name(exception)
+        self.nested_flow = nested_flow
+
+
+class Finally(FlowNode):
+    __slots__ = ("nested_flow",)
+    type = "finally"
+
+    def __init__(self, nested_flow: List[FlowNode]):
+        self.nested_flow = nested_flow
+
+
+class ExceptionRaise(FlowNode):
+    __slots__ = ("exception",)
+    type = "exception_raise"
+
+    def __init__(self, exception: str):
+        self.exception = intern_name(exception)
+
+
+class ExceptionThrow(FlowNode):
+    __slots__ = ("exception",)
+    type = "exception_throw"
+
+    def __init__(self, exception: str):
+        self.exception = intern_name(exception)
+
+
+class Return(FlowNode):
+    __slots__ = ("value",)
+    type = "return"
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+def to_response(value: Any) -> Any:
+    """Converte os nós de fluxo de um resultado em dicts (formato das respostas)
+
+    Dicts e listas são copiados; os demais valores voltam como estão.
+    """
+    if value.__class__ is dict:
+        return {key: to_response(item) for key, item in value.items()}
+    if value.__class__ is list:
+        return [to_response(item) for item in value]
+    if isinstance(value, FlowNode):
+        return value.to_dict()
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """`default` de json.dumps: nós de fluxo viram dicts, o restante vira texto"""
+    if isinstance(value, FlowNode):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,358 @@
+"""Análise incremental guiada pelo git diff
+
+Mapeia os trechos alterados entre duas revisões de um repositório local
+para as funções Python e os métodos Java que os contêm, e executa as
+análises e a geração de prompts só nessas funções.
+
+Uso:
+    python -m analyzers.git_diff BASE [HEAD] [--repo .] [--framework auto]
+                                 [--max-prompt-tokens N] [--detail compact]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from analyzers.batch import resolve_framework
+from analyzers.cache import AnalysisCache
+from analyzers.flow import to_response
+from analyzers.lazy import Lazy
+from analyzers.metrics import timed
+from analyzers.python_symbols import SymbolIndex
+from analyzers.response import DETAIL_LEVELS, detail_error, shape_response
+
+
+# Extensões acompanhadas pelo diff e a linguagem correspondente
+DIFF_LANGUAGES = {".py": "python", ".java": "java"}
+
+# Cabeçalho de um trecho no formato unificado: @@ -a[,b] +c[,d] @@
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# Escapes de um caminho entre aspas no diff (estilo C; octais são bytes UTF-8)
+_QUOTED_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+LineRange = Tuple[int, int]
+
+# (chave da função, primeira linha, última linha)
+Span = Tuple[Any, int, int]
+
+
+class GitError(Exception):
+    """Falha de um comando git (repositório ou revisão inválidos)"""
+
+
+def run_git(repo: str, args: Sequence[str], stdin: Optional[bytes] = None) -> bytes:
+    """Executa `git -C repo args` e devolve a saída; GitError se o comando falhar"""
+    try:
+        completed = subprocess.run(
+            ["git", "-c", "core.quotePath=false", "-C", repo, *args],
+            input=stdin, capture_output=True, check=False
+        )
+    except OSError as e:
+        raise GitError(f"git indisponível: {str(e)}")
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", "replace").strip()
+        raise GitError(message or f"git {args[0]} terminou com código {completed.returncode}")
+    return completed.stdout
+
+
+def parse_diff(output: str) -> Dict[str, List[LineRange]]:
+    """Linhas alteradas (no arquivo novo) por arquivo, a partir de `git diff --unified=0`
+
+    Cada trecho vira um intervalo fechado (início, fim); uma remoção pura é
+    atribuída à linha que a antecede. Arquivos removidos ficam de fora.
+    """
+    changes: Dict[str, List[LineRange]] = {}
+    ranges: Optional[List[LineRange]] = None
+    for line in output.splitlines():
+        if line.startswith("+++ "):
+            path = diff_path(line[4:])
+            ranges = None if path is None else changes.setdefault(path, [])
+        elif line.startswith("@@") and ranges is not None:
+            match = _HUNK_HEADER.match(line)
+            if match is None:
+                continue
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count == 0:
+                ranges.append((max(start, 1), max(start, 1)))
+            else:
+                ranges.append((start, start + count - 1))
+    return changes
+
+
+def diff_path(header: str) -> Optional[str]:
+    """Caminho de um cabeçalho `+++` (gerado com o prefixo b/); None para /dev/null
+
+    Nomes com espaço terminam com uma tabulação e nomes com caracteres
+    especiais vêm entre aspas, com escapes no estilo C.
+    """
+    if header.startswith('"') and header.endswith('"'):
+        header = _unquote(header[1:-1])
+    else:
+        header = header.rstrip("\t")
+    if header == "/dev/null":
+        return None
+    return header[2:] if header.startswith("b/") else header
+
+
+def _unquote(text: str) -> str:
+    """Desfaz os escapes de um caminho entre aspas do git"""
+    data = bytearray()
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char != "\\" or index + 1 == len(text):
+            data += char.encode("utf-8")
+            index += 1
+        elif text[index + 1] in _QUOTED_ESCAPES:
+            data.append(_QUOTED_ESCAPES[text[index + 1]])
+            index += 2
+        else:
+            data.append(int(text[index + 1:index + 4], 8))
+            index += 4
+    return data.decode("utf-8", "replace")
+
+
+def toplevel(repo: str) -> str:
+    """Raiz do repositório que contém `repo` (os caminhos do diff são relativos a ela)"""
+    return run_git(repo, ["rev-parse", "--show-toplevel"]).decode("utf-8", "replace").strip()
+
+
+def changed_ranges(repo: str, base: str, head: Optional[str] = None) -> Dict[str, List[LineRange]]:
+    """Intervalos alterados de base para head (ou para a árvore de trabalho, sem head)
+
+    Os filtros de caminho valem a partir de `repo`, então um subdiretório
+    restringe o diff a ele; os caminhos devolvidos são relativos à raiz.
+    """
+    revisions = [base] if head is None else [base, head]
+    pathspecs = [f"*{extension}" for extension in DIFF_LANGUAGES]
+    # Prefixos e caminhos fixados: diff.noprefix, diff.mnemonicPrefix e
+    # diff.relative da configuração do usuário mudariam os cabeçalhos
+    output = run_git(repo, ["diff", "--unified=0", "--no-color", "--no-ext-diff", "-M",
+                            "--src-prefix=a/", "--dst-prefix=b/", "--no-relative",
+                            *revisions, "--", *pathspecs])
+    return parse_diff(output.decode("utf-8", "replace"))
+
+
+def read_files(root: str, revision: Optional[str], paths: List[str]) -> Dict[str, str]:
+    """Conteúdo dos arquivos na revisão (um único `git cat-file --batch`) ou no disco
+
+    `root` é a raiz do repositório (toplevel), à qual os caminhos são relativos.
+    """
+    if revision is None:
+        files = {}
+        for path in paths:
+            with open(os.path.join(root, path), encoding="utf-8", errors="replace") as source:
+                files[path] = source.read()
+        return files
+
+    requests = "".join(f"{revision}:{path}\n" for path in paths).encode("utf-8")
+    output = run_git(root, ["cat-file", "--batch"], stdin=requests)
+    files = {}
+    position = 0
+    for path in paths:
+        header_end = output.index(b"\n", position)
+        header = output[position:header_end].split()
+        position = header_end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        files[path] = output[position:position + size].decode("utf-8", "replace")
+        position += size + 1
+    return files
+
+
+def _line_owners(spans: List[Span], line_count: int) -> List[Any]:
+    """Função mais interna de cada linha (índice = número da linha)
+
+    As funções são pintadas da externa para a interna, então uma função
+    aninhada sobrescreve as linhas dela no intervalo de quem a contém.
+    """
+    owners: List[Any] = [None] * (line_count + 2)
+    for key, start, end in sorted(spans, key=lambda span: (span[1], -span[2])):
+        end = min(end, line_count + 1)
+        owners[start:end + 1] = [key] * (end - start + 1)
+    return owners
+
+
+def touched_functions(spans: List[Span], ranges: List[LineRange], line_count: int) -> List[Any]:
+    """Chaves das funções que contêm diretamente alguma linha alterada, na ordem do código
+
+    `spans` traz (chave, primeira linha, última linha) de cada função; uma
+    linha alterada em uma função aninhada conta só para a aninhada.
+    """
+    owners = _line_owners(spans, line_count)
+    touched = set()
+    for start, end in ranges:
+        touched.update(owners[max(start, 0):min(end, line_count + 1) + 1])
+    touched.discard(None)
+    return [key for key, _, _ in sorted(spans, key=lambda span: span[1]) if key in touched]
+
+
+def python_spans(index: SymbolIndex) -> List[Span]:
+    """(nome, primeira linha com decoradores, última linha) de cada definição de função
+
+    Todas as definições entram, inclusive as repetidas (setter de uma
+    property, função redefinida), com o nome único do índice ("nome#2").
+    """
+    spans = []
+    for qualified_name, node in index.definitions:
+        start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        spans.append((qualified_name, start, node.end_lineno))
+    return spans
+
+
+class DiffAnalyzer:
+    """Analisa apenas as funções tocadas por um diff entre duas revisões
+
+    Os analisadores são criados no primeiro uso de cada linguagem e usam o
+    AnalysisCache (o do servidor, quando informado) para fazer um único parse
+    e um único índice de símbolos por arquivo. Só os arquivos alterados são
+    lidos (em um único processo git) e só as funções que contêm linhas
+    alteradas são analisadas.
+    """
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache if cache is not None else AnalysisCache()
+        self._python = Lazy(self._create_python)
+        self._java = Lazy(self._create_java)
+
+    def _create_python(self):
+        from analyzers.python_Analyzer import PromptGenerator, PythonAnalysisEngine
+
+        return PythonAnalysisEngine(self.cache), timed("prompt", PromptGenerator().generate_test_prompt)
+
+    def _create_java(self):
+        from analyzers.java_Analyzer import JavaAnalysisEngine, JavaPromptGenerator
+
+        return JavaAnalysisEngine(self.cache), timed("prompt", JavaPromptGenerator().generate_test_prompt)
+
+    def analyze(self, repo: str, base: str, head: Optional[str] = None,
+                test_framework: str = "auto", max_prompt_tokens: Optional[int] = None,
+                detail: str = "full", fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Relatórios das funções alteradas de base para head (sem head: árvore de trabalho)"""
+        error = detail_error(detail)
+        if error is not None:
+            return error
+        if any(revision and revision.startswith("-") for revision in (base, head)):
+            return {"error": "Revisão inválida: não pode começar com '-'"}
+        repo = os.path.abspath(os.path.expanduser(repo))
+        try:
+            root = toplevel(repo)
+            changes = changed_ranges(repo, base, head)
+            files = read_files(root, head, list(changes))
+        except (GitError, OSError) as e:
+            return {"error": f"Erro no git: {str(e)}"}
+
+        functions: List[Dict[str, Any]] = []
+        errors: List[Dict[str, str]] = []
+        for path, ranges in changes.items():
+            if path not in files:
+                continue
+            language = DIFF_LANGUAGES[os.path.splitext(path)[1]]
+            framework = resolve_framework(language, test_framework)
+            try:
+                if language == "python":
+                    reports = self._python_reports(files[path], ranges, framework, max_prompt_tokens)
+                else:
+                    reports = self._java_reports(files[path], ranges, framework, max_prompt_tokens)
+            except Exception as e:
+                errors.append({"path": path, "error": f"Erro ao analisar arquivo: {str(e)}"})
+                continue
+            for identity, report in reports:
+                report["language"] = language
+                report["framework"] = framework
+                functions.append({"path": path, **identity, **shape_response(report, detail, fields)})
+
+        return {
+            "repo": repo,
+            "root": root,
+            "base": base,
+            "head": head,
+            "file_count": len(changes),
+            "function_count": len(functions),
+            "error_count": len(errors) + sum(1 for function in functions if "error" in function),
+            "errors": errors,
+            "functions": functions
+        }
+
+    def _python_reports(self, code: str, ranges: List[LineRange], framework: str,
+                        max_prompt_tokens: Optional[int]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        from analyzers.python_Analyzer import symbol_index
+
+        engine, build_prompt = self._python()
+        spans = python_spans(symbol_index(code, self.cache))
+        lines = {name: (start, end) for name, start, end in spans}
+        names = touched_functions(spans, ranges, code.count("\n") + 1)
+        reports = []
+        for qualified_name in names:
+            analysis = engine.analyze(code, qualified_name)
+            report = _report(analysis["static"], analysis["flow"])
+            if "error" not in report:
+                report["prompt_generation"] = build_prompt(
+                    analysis["static"], analysis["flow"], "python", framework, max_prompt_tokens
+                )
+            lineno, end_lineno = lines[qualified_name]
+            identity = {"qualified_name": qualified_name, "lineno": lineno, "end_lineno": end_lineno}
+            reports.append((identity, report))
+        return reports
+
+    def _java_reports(self, code: str, ranges: List[LineRange], framework: str,
+                      max_prompt_tokens: Optional[int]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        engine, build_prompt = self._java()
+        java_class = self.cache.get_analysis("class", code, "java", engine.analyze_class)
+        if "error" in java_class:
+            raise ValueError(java_class["error"])
+
+        # Sobrecargas repetem o nome qualificado: a chave é a posição do método
+        methods = java_class["methods"]
+        positions = touched_functions([(position, method["lineno"], method["end_lineno"])
+                                       for position, method in enumerate(methods)],
+                                      ranges, code.count("\n") + 1)
+        reports = []
+        for position in positions:
+            method = methods[position]
+            qualified_name = method["qualified_name"]
+            report = _report(method["static_analysis"], method["flow_analysis"])
+            if "error" not in report:
+                report["prompt_generation"] = build_prompt(
+                    method["static_analysis"], method["flow_analysis"], framework, max_prompt_tokens
+                )
+            identity = {"qualified_name": qualified_name, "lineno": method["lineno"],
+                        "end_lineno": method["end_lineno"]}
+            reports.append((identity, report))
+        return reports
+
+
+def _report(static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Relatório no formato de analyze_batch, antes do prompt"""
+    report = {"static_analysis": static_analysis, "flow_analysis": flow_analysis}
+    if "error" in static_analysis or "error" in flow_analysis:
+        report["error"] = "Erro em uma ou mais análises"
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", help="Revisão de referência (ex.: origin/main)")
+    parser.add_argument("head", nargs="?", help="Revisão alterada (padrão: árvore de trabalho)")
+    parser.add_argument("--repo", default=".", help="Diretório do repositório git")
+    parser.add_argument("--framework", default="auto", help="Framework de teste (padrão por linguagem)")
+    parser.add_argument("--max-prompt-tokens", type=int)
+    parser.add_argument("--detail", choices=DETAIL_LEVELS, default="full")
+    parser.add_argument("--fields", nargs="+")
+    args = parser.parse_args(argv)
+
+    result = DiffAnalyzer().analyze(args.repo, args.base, args.head, args.framework,
+                                    args.max_prompt_tokens, args.detail, args.fields)
+    json.dump(to_response(result), sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 1 if "error" in result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
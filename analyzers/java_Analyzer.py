@@ -1,195 +1,204 @@
-import re
-import json
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from analyzers.cache import AnalysisCache
+from analyzers.flow import (
+    Catch, Conditional, Else, ExceptionThrow, Finally, FlowNode, LoopForHeader, LoopWhile, Return,
+    TryCatch, intern_name
+)
+from analyzers.java_lexer import JavaTokens, tokenize_java
+from analyzers.metrics import phase
+from analyzers.prompt_budget import PromptCompactor
+from analyzers.templates import TemplateRegistry, get_registry
+from analyzers.java_declarations import (
+    MethodDeclaration, TypeDeclaration, find_declaration, iter_declarations, iter_type_declarations
+)
+
+
+# Profundidade máxima de estruturas aninhadas na árvore de fluxo; abaixo dela
+# as instruções são apenas puladas (limita a recursão em entradas patológicas)
+MAX_FLOW_DEPTH = 100
+
+# Esqueleto usado quando não há modelo para o framework pedido
+DEFAULT_SKELETON = ("java", "junit5")
 
 
 class JavaStaticAnalyzer:
     """Analisador estático de código Java"""
     
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+    
     def analyze_method(self, code: str) -> Dict[str, Any]:
         """Extrai informações estruturais de um método Java"""
         try:
-            # Limpar código e encontrar método
-            cleaned_code = self._clean_code(code)
-            method_match = self._find_method(cleaned_code)
-            
-            if not method_match:
-                raise ValueError("Nenhum método encontrado no código")
-            
-            method_signature = method_match.group(0)
-            method_body = self._extract_method_body(cleaned_code, method_match.end())
-            
-            return {
-                "signature": self._extract_signature(method_signature),
-                "modifiers": self._extract_modifiers(method_signature),
-                "parameters": self._extract_parameters(method_signature),
-                "return_type": self._extract_return_type(method_signature),
-                "exceptions": self._extract_exceptions(method_signature),
-                "dependencies": self._extract_dependencies(code),
-                "annotations": self._extract_annotations(method_signature)
-            }
+            # Tokenizar uma vez e reconhecer a declaração sobre os tokens
+            source = tokenize_java(code, self.cache)
+            with phase("walk"):
+                declaration = self._find_method(source)
+                
+                if declaration is None:
+                    raise ValueError("Nenhum método encontrado no código")
+                
+                return self._analyze_declaration(source, declaration, self._extract_dependencies(source))
         except Exception as e:
             return {"error": f"Erro na análise: {str(e)}"}
     
-    def _clean_code(self, code: str) -> str:
-        """Remove comentários e normaliza espaços"""
-        # Remove comentários de linha
-        code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)
-        # Remove comentários de bloco
-        code = re.sub(r'/\*.*?\*/', '', code, flags=re.DOTALL)
-        # Normaliza espaços
-        code = re.sub(r'\s+', ' ', code).strip()
-        return code
-    
-    def _find_method(self, code: str):
-        """Encontra a declaração do método"""
-        # Padrão para métodos Java
-        method_pattern = r'(?:@\w+\s*)*(?:public|private|protected|static|final|abstract|synchronized|native|strictfp|\s)*\s+(?:<[^>]*>\s+)?(?!class|interface|enum)(\w+(?:<[^>]*>)?|\w+\[\]|\w+\.\.\.)\s+(\w+)\s*\([^)]*\)(?:\s+throws\s+[^{]+)?'
-        return re.search(method_pattern, code)
-    
-    def _extract_method_body(self, code: str, start_pos: int) -> str:
-        """Extrai o corpo do método"""
-        # Encontra a abertura da chave
-        brace_start = code.find('{', start_pos)
-        if brace_start == -1:
-            return ""
-        
-        # Conta chaves para encontrar o final
-        brace_count = 1
-        pos = brace_start + 1
-        
-        while pos < len(code) and brace_count > 0:
-            if code[pos] == '{':
-                brace_count += 1
-            elif code[pos] == '}':
-                brace_count -= 1
-            pos += 1
-        
-        return code[brace_start:pos] if brace_count == 0 else ""
+    def _analyze_declaration(self, source: JavaTokens, declaration: MethodDeclaration,
+                             dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Monta o resultado estático de uma declaração já reconhecida"""
+        return {
+            "signature": self._extract_signature(source, declaration),
+            "modifiers": self._extract_modifiers(declaration),
+            "parameters": self._extract_parameters(source, declaration),
+            "return_type": self._extract_return_type(source, declaration),
+            "exceptions": self._extract_exceptions(source, declaration),
+            "dependencies": dependencies,
+            "annotations": self._extract_annotations(source, declaration)
+        }
+    
+    def _find_method(self, source: JavaTokens) -> Optional[MethodDeclaration]:
+        """Encontra a declaração do método (tempo linear, sem expressões regulares)"""
+        return find_declaration(source)
     
-    def _extract_signature(self, method_signature: str) -> str:
+    def _extract_signature(self, source: JavaTokens, declaration: MethodDeclaration) -> str:
         """Extrai a assinatura limpa do método"""
         # Remove anotações e normaliza
-        signature = re.sub(r'@\w+(\([^)]*\))?\s*', '', method_signature)
-        return signature.strip()
+        return declaration.signature(source)
     
-    def _extract_modifiers(self, method_signature: str) -> List[str]:
+    def _extract_modifiers(self, declaration: MethodDeclaration) -> List[str]:
         """Extrai modificadores de acesso e outros"""
-        modifiers = []
-        modifier_pattern = r'\b(public|private|protected|static|final|abstract|synchronized|native|strictfp)\b'
-        matches = re.findall(modifier_pattern, method_signature)
-        return matches
+        return list(declaration.modifiers)
     
-    def _extract_parameters(self, method_signature: str) -> List[Dict[str, Any]]:
+    def _extract_parameters(self, source: JavaTokens, declaration: MethodDeclaration) -> List[Dict[str, Any]]:
         """Extrai informações dos parâmetros"""
-        # Encontra os parâmetros entre parênteses
-        params_match = re.search(r'\(([^)]*)\)', method_signature)
-        if not params_match or not params_match.group(1).strip():
-            return []
-        
-        params_str = params_match.group(1)
         parameters = []
         
         # Divide por vírgulas, considerando generics
-        param_parts = self._split_parameters(params_str)
-        
-        for param in param_parts:
-            param = param.strip()
-            if not param:
-                continue
-                
+        for start, end in self._split_parameters(source, declaration.params_open + 1,
+                                                 declaration.params_close):
             # Extrai anotações
-            annotations = re.findall(r'@\w+(?:\([^)]*\))?', param)
-            param = re.sub(r'@\w+(?:\([^)]*\))?\s*', '', param)
+            annotations = []
+            while start < end and source.text(start) == "@":
+                annotation_end = self._annotation_end(source, start, end)
+                annotations.append(source.render(start, annotation_end))
+                start = annotation_end
             
-            # Divide em tipo e nome
-            parts = param.split()
-            if len(parts) >= 2:
-                param_type = ' '.join(parts[:-1])
-                param_name = parts[-1]
-                
-                parameters.append({
-                    "name": param_name,
-                    "type": param_type,
-                    "annotations": annotations,
-                    "is_varargs": "..." in param_type
-                })
+            # Divide em tipo e nome (o nome é o último identificador)
+            name_index = end - 1
+            while name_index > start and source.kinds[name_index] != "ident":
+                name_index -= 1
+            if name_index <= start:
+                continue
+            
+            param_type = source.render(start, name_index)
+            parameters.append({
+                "name": source.render(name_index, end).replace(" ", ""),
+                "type": param_type,
+                "annotations": annotations,
+                "is_varargs": "..." in param_type
+            })
         
         return parameters
     
-    def _split_parameters(self, params_str: str) -> List[str]:
-        """Divide parâmetros considerando generics"""
+    def _split_parameters(self, source: JavaTokens, start: int, end: int) -> List[Tuple[int, int]]:
+        """Divide parâmetros considerando generics (intervalos de tokens)"""
         parameters = []
-        current_param = ""
         bracket_count = 0
+        index = start
         
-        for char in params_str:
-            if char == '<':
+        while index < end:
+            text = source.text(index)
+            if text == '<':
                 bracket_count += 1
-            elif char == '>':
+            elif text == '>':
                 bracket_count -= 1
-            elif char == ',' and bracket_count == 0:
-                parameters.append(current_param.strip())
-                current_param = ""
-                continue
-            
-            current_param += char
+            elif text in ('(', '[', '{') and source.pairs[index] != -1:
+                index = source.pairs[index]
+            elif text == ',' and bracket_count == 0:
+                parameters.append((start, index))
+                start = index + 1
+            index += 1
         
-        if current_param.strip():
-            parameters.append(current_param.strip())
+        if start < end:
+            parameters.append((start, end))
         
         return parameters
     
-    def _extract_return_type(self, method_signature: str) -> str:
-        """Extrai o tipo de retorno"""
-        # Remove anotações
-        clean_sig = re.sub(r'@\w+(\([^)]*\))?\s*', '', method_signature)
-        
-        # Padrão para capturar tipo de retorno
-        return_pattern = r'(?:public|private|protected|static|final|abstract|synchronized|native|strictfp|\s)*\s*(?:<[^>]*>\s+)?(\w+(?:<[^>]*>)?|\w+\[\]|\w+\.\.\.)\s+\w+\s*\('
-        match = re.search(return_pattern, clean_sig)
-        
-        if match:
-            return match.group(1)
-        return "void"
-    
-    def _extract_exceptions(self, method_signature: str) -> List[str]:
+    def _annotation_end(self, source: JavaTokens, start: int, end: int) -> int:
+        """Fim (exclusivo) da anotação que começa no "@" em `start`"""
+        index = start + 2
+        while index + 1 < end and source.text(index) == "." and source.kinds[index + 1] == "ident":
+            index += 2
+        if index < end and source.text(index) == "(" and source.pairs[index] != -1:
+            index = source.pairs[index] + 1
+        return min(index, end)
+    
+    def _extract_return_type(self, source: JavaTokens, declaration: MethodDeclaration) -> str:
+        """Extrai o tipo de retorno (para construtores, a própria classe)"""
+        if declaration.is_constructor:
+            return source.text(declaration.name_index)
+        return source.render(declaration.type_start, declaration.name_index)
+    
+    def _extract_exceptions(self, source: JavaTokens, declaration: MethodDeclaration) -> List[str]:
         """Extrai exceções declaradas"""
-        throws_match = re.search(r'throws\s+([^{]+)', method_signature)
-        if not throws_match:
+        if declaration.throws_start == -1:
             return []
         
-        exceptions_str = throws_match.group(1).strip()
-        return [exc.strip() for exc in exceptions_str.split(',')]
+        return [source.render(start, end) for start, end in
+                self._split_parameters(source, declaration.throws_start, declaration.throws_end)]
     
-    def _extract_dependencies(self, code: str) -> Dict[str, List[str]]:
-        """Extrai dependências (imports e chamadas)"""
-        imports = []
-        method_calls = []
-        
-        # Extrair imports
-        import_pattern = r'import\s+(?:static\s+)?([^;]+);'
-        imports = re.findall(import_pattern, code)
-        
-        # Extrair chamadas de método
-        call_pattern = r'(\w+(?:\.\w+)*)\s*\('
-        method_calls = list(set(re.findall(call_pattern, code)))
-        
+    def _extract_dependencies(self, source: JavaTokens) -> Dict[str, List[str]]:
+        """Extrai dependências (imports e chamadas) em uma passada pelos tokens"""
         return {
-            "imports": imports,
-            "method_calls": method_calls
+            "imports": self._extract_imports(source),
+            "method_calls": self._extract_method_calls(source, 0, len(source))
         }
     
-    def _extract_annotations(self, method_signature: str) -> List[Dict[str, Any]]:
+    def _extract_imports(self, source: JavaTokens) -> List[str]:
+        """Extrai os imports do código (inclusive static)"""
+        imports = []
+        texts = source.texts
+        kinds = source.kinds
+        
+        for index, text in enumerate(texts):
+            if text == "import" and kinds[index] == "keyword":
+                start = index + 1
+                if source.text(start) == "static":
+                    start += 1
+                end = source.find(";", start, stop="import")
+                if end != -1:
+                    imports.append(source.render(start, end))
+        
+        return imports
+    
+    def _extract_method_calls(self, source: JavaTokens, start: int, end: int) -> List[str]:
+        """Chamadas de método no intervalo de tokens, sem repetição e em ordem"""
+        method_calls = []
+        texts = source.texts
+        kinds = source.kinds
+        
+        for index in range(max(start, 1), end):
+            if texts[index] == "(" and kinds[index - 1] == "ident":
+                # Volta pela cadeia qualificada: a.b.metodo(
+                first = index - 1
+                while (first >= 2 and texts[first - 1] == "."
+                       and kinds[first - 2] in ("ident", "keyword")
+                       and texts[first - 2] not in ("new", "return")):
+                    first -= 2
+                method_calls.append(source.render(first, index).replace(" ", ""))
+        
+        return list(dict.fromkeys(method_calls))
+    
+    def _extract_annotations(self, source: JavaTokens, declaration: MethodDeclaration) -> List[Dict[str, Any]]:
         """Extrai anotações do método"""
         annotations = []
-        annotation_pattern = r'@(\w+)(?:\(([^)]*)\))?'
-        matches = re.findall(annotation_pattern, method_signature)
         
-        for name, params in matches:
-            annotation = {"name": name}
-            if params:
-                annotation["parameters"] = params
+        for start, end in declaration.annotation_spans:
+            name_end = end
+            if source.text(end - 1) == ")":
+                name_end = source.pairs[end - 1]
+            annotation = {"name": source.render(start + 1, name_end)}
+            if name_end < end and name_end + 1 < end - 1:
+                annotation["parameters"] = source.render(name_end + 1, end - 1)
             annotations.append(annotation)
         
         return annotations
@@ -198,128 +207,247 @@ class JavaStaticAnalyzer:
 class JavaFlowSummarizer:
     """Resumidor de fluxo de execução para Java"""
     
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+    
     def summarize_flow(self, code: str) -> Dict[str, Any]:
         """Cria um mapa do fluxo de execução do método Java"""
         try:
-            cleaned_code = self._clean_code(code)
-            method_body = self._extract_method_body(cleaned_code)
-            
-            if not method_body:
-                raise ValueError("Corpo do método não encontrado")
-            
-            flow_map = self._analyze_flow(method_body)
-            
-            return {
-                "flow_map": flow_map,
-                "complexity_score": self._calculate_complexity(flow_map),
-                "summary": self._generate_flow_summary(flow_map)
-            }
+            source = tokenize_java(code, self.cache)
+            with phase("walk"):
+                body_start, body_end = self._extract_method_body(source)
+                
+                if body_start >= body_end:
+                    raise ValueError("Corpo do método não encontrado")
+                
+                return self._summarize_range(source, body_start, body_end)
         except Exception as e:
             return {"error": f"Erro na análise de fluxo: {str(e)}"}
     
-    def _clean_code(self, code: str) -> str:
-        """Remove comentários"""
-        code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)
-        code = re.sub(r'/\*.*?\*/', '', code, flags=re.DOTALL)
-        return code
-    
-    def _extract_method_body(self, code: str) -> str:
-        """Extrai apenas o corpo do método"""
-        brace_start = code.find('{')
-        if brace_start == -1:
-            return code
-        
-        brace_count = 1
-        pos = brace_start + 1
-        
-        while pos < len(code) and brace_count > 0:
-            if code[pos] == '{':
-                brace_count += 1
-            elif code[pos] == '}':
-                brace_count -= 1
-            pos += 1
-        
-        return code[brace_start + 1:pos - 1] if brace_count == 0 else code[brace_start + 1:]
-    
-    def _analyze_flow(self, body: str) -> List[Dict[str, Any]]:
-        """Analisa estruturas de controle no código Java"""
-        flow_elements = []
-        
-        # Analisar if/else
-        if_pattern = r'if\s*\([^)]+\)'
-        if_matches = re.finditer(if_pattern, body)
-        for match in if_matches:
-            condition = match.group(0)[2:].strip('()')
-            flow_elements.append({
-                "type": "conditional",
-                "condition": condition,
-                "has_else": self._has_corresponding_else(body, match.start())
-            })
-        
-        # Analisar for loops
-        for_pattern = r'for\s*\([^)]+\)'
-        for_matches = re.finditer(for_pattern, body)
-        for match in for_matches:
-            loop_def = match.group(0)[3:].strip('()')
-            flow_elements.append({
-                "type": "loop_for",
-                "definition": loop_def
-            })
-        
-        # Analisar while loops
-        while_pattern = r'while\s*\([^)]+\)'
-        while_matches = re.finditer(while_pattern, body)
-        for match in while_matches:
-            condition = match.group(0)[5:].strip('()')
-            flow_elements.append({
-                "type": "loop_while",
-                "condition": condition
-            })
+    def _summarize_range(self, source: JavaTokens, start: int, end: int) -> Dict[str, Any]:
+        """Mapa de fluxo, complexidade e resumo de um intervalo de tokens"""
+        flow_map = self._analyze_flow(source, start, end)
         
-        # Analisar try-catch
-        try_pattern = r'try\s*\{'
-        try_matches = re.finditer(try_pattern, body)
-        for match in try_matches:
-            exceptions = self._extract_catch_blocks(body, match.start())
-            flow_elements.append({
-                "type": "try_catch",
-                "exceptions": exceptions,
-                "has_finally": "finally" in body[match.start():]
-            })
-        
-        # Analisar throws
-        throw_pattern = r'throw\s+new\s+(\w+)'
-        throw_matches = re.findall(throw_pattern, body)
-        for exception in throw_matches:
-            flow_elements.append({
-                "type": "exception_throw",
-                "exception": exception
-            })
+        return {
+            "flow_map": flow_map,
+            "complexity_score": self._calculate_complexity(flow_map),
+            "summary": self._generate_flow_summary(flow_map)
+        }
+    
+    def _extract_method_body(self, source: JavaTokens) -> Tuple[int, int]:
+        """Intervalo de tokens do corpo do primeiro método declarado
         
-        # Analisar returns
-        return_pattern = r'return(?:\s+[^;]+)?;'
-        return_matches = re.findall(return_pattern, body)
-        for return_stmt in return_matches:
-            value = return_stmt.replace('return', '').replace(';', '').strip()
-            flow_elements.append({
-                "type": "return",
-                "value": value if value else "void"
-            })
+        Sem declaração reconhecível, usa o bloco da primeira chave do código.
+        """
+        declaration = find_declaration(source)
+        if declaration is not None and declaration.body_open != -1:
+            return declaration.body_range(source)
         
-        return flow_elements
-    
-    def _has_corresponding_else(self, body: str, if_pos: int) -> bool:
-        """Verifica se há um else correspondente ao if"""
-        # Implementação simplificada
-        return "else" in body[if_pos:if_pos + 200]
-    
-    def _extract_catch_blocks(self, body: str, try_pos: int) -> List[str]:
-        """Extrai exceções dos blocos catch"""
-        catch_pattern = r'catch\s*\(\s*(\w+)'
-        catches = re.findall(catch_pattern, body[try_pos:])
-        return catches
-    
-    def _calculate_complexity(self, flow_map: List[Dict[str, Any]]) -> int:
+        brace_start = source.find("{")
+        if brace_start == -1:
+            return 0, len(source)
+        
+        brace_end = source.pairs[brace_start]
+        return brace_start + 1, brace_end if brace_end != -1 else len(source)
+    
+    def _analyze_flow(self, source: JavaTokens, start: int, end: int,
+                      depth: int = 0) -> List[FlowNode]:
+        """Monta a árvore de fluxo das instruções em [start, end), em ordem
+        
+        Cada token é visitado uma única vez: corpos de if/for/while/try são
+        delimitados pelo índice de pares e viram `nested_flow`; else, catch e
+        finally ficam ligados à própria instrução, como no FlowSummarizer Python.
+        """
+        elements: List[FlowNode] = []
+        index = start
+        while index < end:
+            index = self._parse_statement(source, index, end, elements, depth)
+        return elements
+    
+    def _statement_flow(self, source: JavaTokens, index: int, end: int,
+                        depth: int) -> Tuple[List[FlowNode], int]:
+        """Fluxo do corpo de uma estrutura (bloco ou instrução única) e o índice seguinte"""
+        if index >= end:
+            return [], index
+        
+        if source.texts[index] == "{":
+            close = source.pairs[index]
+            if close == -1 or close > end:
+                return self._analyze_flow(source, index + 1, end, depth + 1), end
+            return self._analyze_flow(source, index + 1, close, depth + 1), close + 1
+        
+        nested: List[FlowNode] = []
+        return nested, self._parse_statement(source, index, end, nested, depth + 1)
+    
+    def _parse_statement(self, source: JavaTokens, index: int, end: int,
+                         elements: List[FlowNode], depth: int) -> int:
+        """Lê uma instrução a partir de `index`, registra seu fluxo e retorna o índice seguinte"""
+        texts = source.texts
+        text = texts[index]
+        
+        # Blocos simples, switch e synchronized são transparentes
+        if text in ("{", "}", ";"):
+            return index + 1
+        if source.kinds[index] == "ident" and source.text(index + 1) == ":":
+            return index + 2
+        if source.kinds[index] != "keyword" or depth >= MAX_FLOW_DEPTH:
+            return self._skip_statement(source, index, end)
+        
+        header_close = -1
+        if source.text(index + 1) == "(":
+            header_close = source.pairs[index + 1]
+            if header_close >= end:
+                header_close = -1
+        
+        if text in ("if", "for", "while") and header_close != -1:
+            header = source.render(index + 2, header_close)
+            nested, next_index = self._statement_flow(source, header_close + 1, end, depth)
+            
+            if text == "if":
+                element = Conditional(header, False, nested)
+                elements.append(element)
+                # O else pertence ao if mais interno ainda aberto (já consumido acima)
+                if next_index < end and texts[next_index] == "else":
+                    element.has_else = True
+                    else_flow, next_index = self._statement_flow(source, next_index + 1, end, depth)
+                    elements.append(Else(else_flow))
+            elif text == "for":
+                elements.append(LoopForHeader(header, nested))
+            else:
+                elements.append(LoopWhile(header, nested))
+            return next_index
+        
+        if text == "do":
+            nested, next_index = self._statement_flow(source, index + 1, end, depth)
+            condition = ""
+            if source.text(next_index) == "while" and source.text(next_index + 1) == "(":
+                close = source.pairs[next_index + 1]
+                if close != -1 and close < end:
+                    condition = source.render(next_index + 2, close)
+                    next_index = close + 1
+                    if source.text(next_index) == ";":
+                        next_index += 1
+            elements.append(LoopWhile(condition, nested))
+            return next_index
+        
+        if text == "try":
+            return self._parse_try(source, index, end, elements, depth)
+        
+        if text in ("switch", "synchronized") and header_close != -1:
+            return header_close + 1
+        
+        if text in ("case", "default"):
+            return self._skip_label(source, index, end)
+        
+        if text in ("return", "throw"):
+            next_index = self._skip_statement(source, index + 1, end)
+            value_end = next_index - 1 if texts[next_index - 1] == ";" else next_index
+            if text == "return":
+                value = source.render(index + 1, value_end)
+                elements.append(Return(value if value else "void"))
+            else:
+                elements.append(ExceptionThrow(self._thrown_exception(source, index + 1, value_end)))
+            return next_index
+        
+        if text in ("else", "catch", "finally"):
+            # Sem a instrução correspondente (código incompleto)
+            return index + 1
+        
+        return self._skip_statement(source, index, end)
+    
+    def _parse_try(self, source: JavaTokens, index: int, end: int,
+                   elements: List[FlowNode], depth: int) -> int:
+        """try (com ou sem recursos), seus catch e o finally, cada um com o próprio fluxo"""
+        next_index = index + 1
+        if source.text(next_index) == "(" and source.pairs[next_index] != -1:
+            next_index = source.pairs[next_index] + 1
+        
+        nested, next_index = self._statement_flow(source, next_index, end, depth)
+        element = TryCatch(nested)
+        elements.append(element)
+        handlers: List[FlowNode] = []
+        
+        while (next_index < end and source.texts[next_index] == "catch"
+               and source.text(next_index + 1) == "(" and source.pairs[next_index + 1] != -1):
+            close = source.pairs[next_index + 1]
+            exception = self._extract_catch_type(source, next_index + 2, close)
+            element.exceptions.append(intern_name(exception))
+            catch_flow, next_index = self._statement_flow(source, close + 1, end, depth)
+            handlers.append(Catch(exception, catch_flow))
+        
+        if next_index < end and source.texts[next_index] == "finally":
+            element.has_finally = True
+            finally_flow, next_index = self._statement_flow(source, next_index + 1, end, depth)
+            handlers.append(Finally(finally_flow))
+        
+        elements.extend(handlers)
+        return next_index
+    
+    def _skip_statement(self, source: JavaTokens, index: int, end: int) -> int:
+        """Fim de uma instrução simples: após o ";" do mesmo nível
+        
+        Parênteses, colchetes e chaves internos (lambdas, classes anônimas,
+        inicializadores) são pulados pelo índice de pares. Uma chave seguida de
+        algo que não é operador encerra a instrução (ex.: classe local).
+        """
+        texts = source.texts
+        pairs = source.pairs
+        while index < end:
+            text = texts[index]
+            if text == ";":
+                return index + 1
+            if text == "}":
+                return index
+            if text in ("(", "[", "{") and pairs[index] != -1:
+                closes_block = text == "{"
+                index = pairs[index] + 1
+                if closes_block and (source.kind(index) != "op" or source.text(index) in ("{", "}")):
+                    return min(index, end)
+                continue
+            index += 1
+        return end
+    
+    def _skip_label(self, source: JavaTokens, index: int, end: int) -> int:
+        """Pula um rótulo "case ...:" / "default ->" de switch"""
+        texts = source.texts
+        while index < end:
+            text = texts[index]
+            if text in (":", "->"):
+                return index + 1
+            if text in (";", "{", "}"):
+                return index
+            if text in ("(", "[") and source.pairs[index] != -1:
+                index = source.pairs[index]
+            index += 1
+        return end
+    
+    def _thrown_exception(self, source: JavaTokens, start: int, end: int) -> str:
+        """Tipo lançado por "throw new X(...)", ou a expressão lançada"""
+        if source.text(start) != "new":
+            return source.render(start, end)
+        
+        name_end = start + 1
+        while source.text(name_end + 1) == "." and name_end + 2 < end:
+            name_end += 2
+        return source.render(start + 1, name_end + 1)
+    
+    def _extract_catch_type(self, source: JavaTokens, start: int, close: int) -> str:
+        """Tipo capturado por um catch, ignorando modificadores e anotações"""
+        while start < close:
+            if source.text(start) == "final":
+                start += 1
+            elif source.text(start) == "@":
+                start += 2
+                if source.text(start) == "(":
+                    start = source.pairs[start] + 1
+            else:
+                break
+        
+        # O último token antes do ")" é o nome da variável
+        type_end = close - 1 if close - 1 > start else close
+        return source.render(start, type_end)
+    
+    def _calculate_complexity(self, flow_map: List[FlowNode]) -> int:
         """Calcula complexidade ciclomática"""
         complexity = 1
         
@@ -328,10 +456,13 @@ class JavaFlowSummarizer:
                 complexity += 1
             elif element["type"] == "try_catch":
                 complexity += len(element["exceptions"])
+            
+            if "nested_flow" in element:
+                complexity += self._calculate_complexity(element["nested_flow"]) - 1
         
         return complexity
     
-    def _generate_flow_summary(self, flow_map: List[Dict[str, Any]]) -> str:
+    def _generate_flow_summary(self, flow_map: List[FlowNode]) -> str:
         """Gera resumo textual do fluxo"""
         summary_parts = []
         
@@ -353,17 +484,128 @@ class JavaFlowSummarizer:
         return " -> ".join(summary_parts) if summary_parts else "Linear"
 
 
+class JavaAnalysisEngine:
+    """Motor de análise de uma unidade de compilação Java completa
+
+    Tokeniza o arquivo uma única vez, reconhece todos os métodos e
+    construtores numa só varredura e reaproveita a lista de imports.
+    """
+    
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+        self.static_analyzer = JavaStaticAnalyzer(cache)
+        self.flow_summarizer = JavaFlowSummarizer(cache)
+    
+    def analyze_class(self, code: str) -> Dict[str, Any]:
+        """Analisa todos os métodos e construtores das classes do arquivo"""
+        try:
+            source = tokenize_java(code, self.cache)
+            with phase("walk"):
+                imports = self.static_analyzer._extract_imports(source)
+                types = list(iter_type_declarations(source))
+                declarations = list(iter_declarations(source))
+        except Exception as e:
+            return {"error": f"Erro na análise da classe: {str(e)}"}
+        
+        with phase("walk"):
+            methods = [self._analyze_member(source, declaration, qualified_name, imports)
+                       for declaration, qualified_name in self._qualified_names(source, types, declarations)]
+        
+        return {
+            "imports": imports,
+            "types": [type_declaration.name for type_declaration in types],
+            "method_count": len(methods),
+            "methods": methods
+        }
+    
+    def _analyze_member(self, source: JavaTokens, declaration: MethodDeclaration,
+                        qualified_name: str, imports: List[str]) -> Dict[str, Any]:
+        """Análises estática e de fluxo de um método ou construtor da classe"""
+        body_start, body_end = declaration.body_range(source)
+        end_index = body_end if declaration.body_open != -1 else declaration.header_end - 1
+        dependencies = {
+            "imports": imports,
+            "method_calls": self.static_analyzer._extract_method_calls(source, body_start, body_end)
+        }
+        return {
+            "name": source.texts[declaration.name_index],
+            "qualified_name": qualified_name,
+            "kind": "constructor" if declaration.is_constructor else "method",
+            "lineno": source.line(declaration.start),
+            "end_lineno": source.line(min(end_index, len(source) - 1)),
+            "static_analysis": self._build_static(source, declaration, dependencies),
+            "flow_analysis": self._build_flow(source, body_start, body_end)
+        }
+    
+    def _qualified_names(self, source: JavaTokens, types: List[TypeDeclaration],
+                         declarations: List[MethodDeclaration]) -> List[Tuple[MethodDeclaration, str]]:
+        """Nome qualificado de cada declaração (Classe.Interna.metodo)
+        
+        Sobe pelos blocos que contêm a declaração (índice de blocos dos
+        tokens) e usa os que pertencem a tipos ou métodos. Métodos de classes
+        anônimas recebem "<anonymous>" depois do método que as contém.
+        """
+        owners: Dict[int, Tuple[str, bool]] = {}  # chave de abertura -> (nome, é tipo)
+        for type_declaration in types:
+            owners[type_declaration.body_open] = (type_declaration.name, True)
+        for declaration in declarations:
+            if declaration.body_open != -1:
+                owners[declaration.body_open] = (source.texts[declaration.name_index], False)
+        
+        names = []
+        for declaration in declarations:
+            parts = [source.texts[declaration.name_index]]
+            inside_type = False
+            block = source.enclosing(declaration.name_index)
+            while block != -1:
+                owner = owners.get(block)
+                if owner is not None:
+                    name, is_type = owner
+                    # Método dentro de método sem tipo nomeado entre eles: classe anônima
+                    if not is_type and not inside_type:
+                        parts.append("<anonymous>")
+                    parts.append(name)
+                    inside_type = is_type
+                block = source.enclosing(block)
+            names.append((declaration, ".".join(reversed(parts))))
+        
+        return names
+    
+    def _build_static(self, source: JavaTokens, declaration: MethodDeclaration,
+                      dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Monta o resultado estático de um método"""
+        try:
+            return self.static_analyzer._analyze_declaration(source, declaration, dependencies)
+        except Exception as e:
+            return {"error": f"Erro na análise: {str(e)}"}
+    
+    def _build_flow(self, source: JavaTokens, start: int, end: int) -> Dict[str, Any]:
+        """Monta o resultado de fluxo de um método (vazio para métodos abstratos)"""
+        try:
+            return self.flow_summarizer._summarize_range(source, start, end)
+        except Exception as e:
+            return {"error": f"Erro na análise de fluxo: {str(e)}"}
+
+
 class JavaPromptGenerator:
-    """Gerador de prompts para testes unitários Java"""
+    """Gerador de prompts para testes unitários Java
+    
+    Usa o frame "method" do TemplateRegistry e os esqueletos "method/java.<framework>".
+    """
+    
+    def __init__(self, registry: Optional[TemplateRegistry] = None):
+        self.registry = registry or get_registry()
     
     def generate_test_prompt(self, static_analysis: Dict[str, Any], 
                            flow_analysis: Dict[str, Any],
-                           test_framework: str = "junit5") -> Dict[str, Any]:
-        """Gera prompt otimizado para testes unitários Java"""
+                           test_framework: str = "junit5",
+                           max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Gera prompt otimizado para testes unitários Java (compactado até `max_prompt_tokens`)"""
         
-        prompt_sections = self._build_prompt_sections(static_analysis, flow_analysis)
-        output_structure = self._get_output_structure(test_framework)
-        final_prompt = self._assemble_final_prompt(prompt_sections, output_structure)
+        compactor = PromptCompactor(max_prompt_tokens)
+        final_prompt, sections = compactor.fit(
+            lambda: self._render(static_analysis, flow_analysis, test_framework, compactor)
+        )
         
         return {
             "prompt": final_prompt,
@@ -371,13 +613,32 @@ class JavaPromptGenerator:
                 "language": "java",
                 "framework": test_framework,
                 "complexity_score": flow_analysis.get("complexity_score", 1),
-                "estimated_tests": self._estimate_test_count(flow_analysis)
+                "estimated_tests": self._estimate_test_count(flow_analysis),
+                **compactor.report(final_prompt, sections)
             }
         }
     
+    def _render(self, static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any],
+                test_framework: str, compactor: PromptCompactor) -> Tuple[str, Dict[str, str]]:
+        """Monta o prompt com os passos de compactação ativos; devolve (prompt, seções)"""
+        prompt_sections = self._build_prompt_sections(static_analysis, flow_analysis, compactor)
+        short = compactor.active("short_skeleton")
+        prompt = self.registry.render(
+            "method", "java", test_framework, DEFAULT_SKELETON, prompt_sections, short
+        )
+        prompt_sections["output_structure"] = self.registry.skeleton(
+            "method", "java", test_framework, DEFAULT_SKELETON, short
+        )
+        return prompt, prompt_sections
+    
     def _build_prompt_sections(self, static_analysis: Dict[str, Any], 
-                              flow_analysis: Dict[str, Any]) -> Dict[str, str]:
+                              flow_analysis: Dict[str, Any],
+                              compactor: Optional[PromptCompactor] = None) -> Dict[str, str]:
         """Constrói seções do prompt"""
+        compactor = compactor or PromptCompactor()
+        imports = compactor.imports(
+            static_analysis.get('dependencies', {}).get('imports', []), static_analysis, flow_analysis
+        )
         
         method_info = f"""
 MÉTODO: {static_analysis.get('signature', 'N/A')}
@@ -386,13 +647,13 @@ PARÂMETROS: {self._format_parameters(static_analysis.get('parameters', []))}
 RETORNO: {static_analysis.get('return_type', 'void')}
 EXCEÇÕES: {', '.join(static_analysis.get('exceptions', []))}
 ANOTAÇÕES: {self._format_annotations(static_analysis.get('annotations', []))}
-DEPENDÊNCIAS: {', '.join(static_analysis.get('dependencies', {}).get('imports', []))}
+DEPENDÊNCIAS: {', '.join(imports)}
 """
         
         flow_info = f"""
-FLUXO: {flow_analysis.get('summary', 'Linear')}
+FLUXO: {compactor.summary(flow_analysis.get('summary', 'Linear'))}
 COMPLEXIDADE: {flow_analysis.get('complexity_score', 1)}
-CENÁRIOS: {self._extract_test_scenarios(flow_analysis.get('flow_map', []))}
+CENÁRIOS: {self._extract_test_scenarios(flow_analysis.get('flow_map', []), compactor)}
 """
         
         return {
@@ -423,146 +684,35 @@ CENÁRIOS: {self._extract_test_scenarios(flow_analysis.get('flow_map', []))}
         
         return ", ".join([f"@{ann['name']}" for ann in annotations])
     
-    def _extract_test_scenarios(self, flow_map: List[Dict[str, Any]]) -> str:
-        """Extrai cenários de teste do mapa de fluxo"""
-        scenarios = []
-        
+    def iter_test_scenarios(self, flow_map: List[Dict[str, Any]],
+                            compactor: Optional[PromptCompactor] = None) -> Iterator[str]:
+        """Cenários de teste do mapa de fluxo, um por vez (sem montar a lista inteira)"""
+        compactor = compactor or PromptCompactor()
         for element in flow_map:
             if element["type"] == "conditional":
-                scenarios.extend([f"Condição TRUE: {element['condition']}", 
-                                f"Condição FALSE: {element['condition']}"])
+                condition = compactor.condition(element['condition'])
+                yield f"Condição TRUE: {condition}"
+                yield f"Condição FALSE: {condition}"
             elif element["type"] in ["loop_for", "loop_while"]:
-                scenarios.extend(["Loop vazio", "Loop com múltiplas iterações"])
+                yield "Loop vazio"
+                yield "Loop com múltiplas iterações"
             elif element["type"] == "try_catch":
-                scenarios.extend([f"Exceção: {exc}" for exc in element["exceptions"]])
-                scenarios.append("Execução sem exceção")
+                for exc in element["exceptions"]:
+                    yield f"Exceção: {exc}"
+                yield "Execução sem exceção"
             elif element["type"] == "exception_throw":
-                scenarios.append(f"Lança: {element['exception']}")
-        
+                yield f"Lança: {element['exception']}"
+    
+    def _extract_test_scenarios(self, flow_map: List[Dict[str, Any]],
+                                compactor: Optional[PromptCompactor] = None) -> str:
+        """Extrai cenários de teste do mapa de fluxo"""
+        compactor = compactor or PromptCompactor()
+        scenarios = compactor.scenarios(list(self.iter_test_scenarios(flow_map, compactor)))
         return "; ".join(scenarios) if scenarios else "Fluxo linear"
     
     def _get_output_structure(self, framework: str) -> str:
         """Retorna estrutura de saída baseada no framework"""
-        
-        structures = {
-            "junit5": """
-```java
-import org.junit.jupiter.api.Test;
-import org.junit.jupiter.api.BeforeEach;
-import org.junit.jupiter.api.DisplayName;
-import org.junit.jupiter.params.ParameterizedTest;
-import org.junit.jupiter.params.provider.ValueSource;
-import static org.junit.jupiter.api.Assertions.*;
-import static org.mockito.Mockito.*;
-
-class MethodNameTest {
-    
-    private ClassName classUnderTest;
-    
-    @BeforeEach
-    void setUp() {
-        classUnderTest = new ClassName();
-    }
-    
-    @Test
-    @DisplayName("Should handle normal case")
-    void shouldHandleNormalCase() {
-        // Arrange
-        
-        // Act
-        
-        // Assert
-    }
-    
-    @Test
-    @DisplayName("Should handle edge cases")
-    void shouldHandleEdgeCases() {
-        // Test edge cases
-    }
-    
-    @Test
-    @DisplayName("Should throw exception when invalid")
-    void shouldThrowExceptionWhenInvalid() {
-        // Test exception scenarios
-        assertThrows(ExceptionType.class, () -> {
-            // Code that should throw
-        });
-    }
-    
-    @ParameterizedTest
-    @ValueSource(ints = {1, 2, 3})
-    void shouldHandleMultipleValues(int value) {
-        // Parameterized tests
-    }
-}
-```""",
-            
-            "junit4": """
-```java
-import org.junit.Before;
-import org.junit.Test;
-import org.junit.runner.RunWith;
-import org.mockito.Mock;
-import org.mockito.junit.MockitoJUnitRunner;
-import static org.junit.Assert.*;
-import static org.mockito.Mockito.*;
-
-@RunWith(MockitoJUnitRunner.class)
-public class MethodNameTest {
-    
-    private ClassName classUnderTest;
-    
-    @Before
-    public void setUp() {
-        classUnderTest = new ClassName();
-    }
-    
-    @Test
-    public void shouldHandleNormalCase() {
-        // Arrange
-        
-        // Act
-        
-        // Assert
-    }
-    
-    @Test
-    public void shouldHandleEdgeCases() {
-        // Test edge cases
-    }
-    
-    @Test(expected = ExceptionType.class)
-    public void shouldThrowExceptionWhenInvalid() {
-        // Test exception scenarios
-    }
-}
-```"""
-        }
-        
-        return structures.get(framework, structures["junit5"])
-    
-    def _assemble_final_prompt(self, sections: Dict[str, str], output_structure: str) -> str:
-        """Monta o prompt final"""
-        
-        return f"""Gere testes unitários completos para o seguinte método Java:
-
-{sections['method_info']}
-
-{sections['flow_info']}
-
-INSTRUÇÕES:
-1. Cubra todos os cenários identificados no fluxo
-2. Inclua testes para casos extremos e validação de parâmetros
-3. Teste tratamento de exceções quando aplicável
-4. Use Mockito para mockar dependências
-5. Mantenha testes independentes e determinísticos
-6. Use anotações @DisplayName para descrever os testes
-7. Implemente testes parametrizados quando apropriado
-
-ESTRUTURA DE SAÍDA OBRIGATÓRIA:
-{output_structure}
-
-Gere APENAS o código dos testes, sem explicações adicionais."""
+        return self.registry.skeleton("method", "java", framework, DEFAULT_SKELETON)
     
     def _estimate_test_count(self, flow_analysis: Dict[str, Any]) -> int:
         """Estima número de testes necessários"""
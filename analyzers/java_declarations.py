@@ -0,0 +1,280 @@
+from typing import Iterator, List, Optional, Tuple
+
+from analyzers.java_lexer import JavaTokens
+
+
+# Modificadores aceitos no prefixo de uma declaração de método ou construtor
+MODIFIERS = frozenset({
+    "public", "private", "protected", "static", "final", "abstract",
+    "synchronized", "native", "strictfp", "default"
+})
+
+PRIMITIVE_TYPES = frozenset({
+    "boolean", "byte", "char", "short", "int", "long", "float", "double", "void"
+})
+
+# Tokens permitidos entre "<" e ">" de um tipo genérico (além de identificadores)
+_TYPE_ARGUMENT_TOKENS = frozenset({".", ",", "?", "&", "[", "]", "extends", "super"}) | PRIMITIVE_TYPES
+
+# Palavras contextuais que nunca são tipo de retorno (ex.: "record Point(int x)")
+_CONTEXTUAL_KEYWORDS = frozenset({"record", "yield", "var"})
+
+# Tokens que podem preceder o início de uma declaração
+_BOUNDARIES = frozenset({";", "{", "}"})
+
+# Limite de tokens examinados por candidato (prefixo, tipo e cláusula throws).
+# Cada "(" custa no máximo esta quantidade de passos, então o reconhecimento
+# é linear no tamanho do código mesmo para entradas patológicas.
+MAX_DECLARATION_TOKENS = 256
+
+
+# Palavras que iniciam a declaração de um tipo ("record" é contextual)
+TYPE_KEYWORDS = frozenset({"class", "interface", "enum", "record"})
+
+
+class TypeDeclaration:
+    """Classe, interface, enum ou record, com o intervalo de tokens do corpo"""
+
+    __slots__ = ("kind", "name", "name_index", "body_open", "body_close")
+
+    def __init__(self, kind: str, name: str, name_index: int, body_open: int, body_close: int):
+        self.kind = kind
+        self.name = name
+        self.name_index = name_index
+        self.body_open = body_open
+        self.body_close = body_close
+
+
+class MethodDeclaration:
+    """Cabeçalho de um método ou construtor, em índices de tokens"""
+
+    __slots__ = ("start", "modifiers", "annotation_spans", "type_start", "name_index",
+                 "params_open", "params_close", "throws_start", "throws_end",
+                 "header_end", "body_open")
+
+    def __init__(self):
+        self.start = 0
+        self.modifiers: List[str] = []
+        # Intervalos [início, fim) das anotações do prefixo, em ordem
+        self.annotation_spans: List[Tuple[int, int]] = []
+        # -1 para construtores
+        self.type_start = -1
+        self.name_index = 0
+        self.params_open = 0
+        self.params_close = 0
+        self.throws_start = -1
+        self.throws_end = -1
+        # Primeiro token depois do cabeçalho ("{", ";" ou fim)
+        self.header_end = 0
+        # Índice do "{" do corpo, ou -1 para métodos abstratos
+        self.body_open = -1
+
+    @property
+    def is_constructor(self) -> bool:
+        return self.type_start == -1
+
+    def body_range(self, source: JavaTokens) -> Tuple[int, int]:
+        """Intervalo [início, fim) dos tokens do corpo; vazio para métodos abstratos"""
+        if self.body_open == -1:
+            return self.header_end, self.header_end
+        body_close = source.pairs[self.body_open]
+        return self.body_open + 1, body_close if body_close != -1 else len(source)
+
+    def signature(self, source: JavaTokens) -> str:
+        """Assinatura sem anotações, com espaçamento normalizado"""
+        parts = []
+        position = self.start
+        for span_start, span_end in self.annotation_spans:
+            if span_start > position:
+                parts.append(source.render(position, span_start))
+            position = span_end
+        parts.append(source.render(position, self.header_end))
+        return " ".join(part for part in parts if part)
+
+
+def _skip_angle_brackets(source: JavaTokens, index: int, limit: int) -> int:
+    """A partir de um ">", volta até o "<" correspondente; -1 se não for um tipo"""
+    depth = 0
+    while index >= limit:
+        text = source.texts[index]
+        if text == ">":
+            depth += 1
+        elif text == "<":
+            depth -= 1
+            if depth == 0:
+                return index
+        elif source.kinds[index] != "ident" and text not in _TYPE_ARGUMENT_TOKENS:
+            return -1
+        index -= 1
+    return -1
+
+
+def _type_start(source: JavaTokens, index: int, limit: int) -> int:
+    """Início do tipo que termina no token `index`, ou -1"""
+    while index - 1 >= limit and source.text(index) == "]" and source.text(index - 1) == "[":
+        index -= 2
+
+    if source.text(index) == ">":
+        index = _skip_angle_brackets(source, index, limit) - 1
+        if index < limit:
+            return -1
+
+    if index < limit:
+        return -1
+    text = source.texts[index]
+    if source.kinds[index] != "ident" and text not in PRIMITIVE_TYPES:
+        return -1
+    if text in _CONTEXTUAL_KEYWORDS:
+        return -1
+
+    # Tipo qualificado: java.util.List
+    while (index - 2 >= limit and source.text(index - 1) == "."
+           and source.kinds[index - 2] == "ident"):
+        index -= 2
+    return index
+
+
+def _annotation_start(source: JavaTokens, name_end: int, limit: int) -> int:
+    """Índice do "@" de uma anotação cujo nome termina em `name_end`, ou -1"""
+    index = name_end
+    if index < limit or source.kinds[index] != "ident":
+        return -1
+    while (index - 2 >= limit and source.text(index - 1) == "."
+           and source.kinds[index - 2] == "ident"):
+        index -= 2
+    if index - 1 >= limit and source.text(index - 1) == "@":
+        return index - 1
+    return -1
+
+
+def _parse_prefix(source: JavaTokens, declaration: MethodDeclaration,
+                  index: int, limit: int) -> bool:
+    """Lê modificadores, parâmetros de tipo e anotações para trás a partir de `index`"""
+    while index >= limit:
+        text = source.texts[index]
+        kind = source.kinds[index]
+        if kind == "keyword" and text in MODIFIERS:
+            declaration.modifiers.append(text)
+            index -= 1
+        elif text == ">":
+            # Parâmetros de tipo do método: <T extends Comparable<T>>
+            index = _skip_angle_brackets(source, index, limit) - 1
+            if index < limit - 1:
+                return False
+        elif text == ")" and source.pairs[index] != -1:
+            annotation = _annotation_start(source, source.pairs[index] - 1, limit)
+            if annotation == -1:
+                break
+            declaration.annotation_spans.append((annotation, index + 1))
+            index = annotation - 1
+        elif kind == "ident":
+            annotation = _annotation_start(source, index, limit)
+            if annotation == -1:
+                break
+            declaration.annotation_spans.append((annotation, index + 1))
+            index = annotation - 1
+        else:
+            break
+
+    # Antes do prefixo só pode haver início do código ou fim de outra declaração;
+    # um prefixo maior que o limite também termina aqui e é rejeitado
+    if index >= 0 and source.texts[index] not in _BOUNDARIES:
+        return False
+
+    declaration.start = index + 1
+    declaration.modifiers.reverse()
+    declaration.annotation_spans.reverse()
+    return True
+
+
+def _parse_header_end(source: JavaTokens, declaration: MethodDeclaration) -> bool:
+    """Lê a cláusula throws e localiza o corpo depois dos parâmetros"""
+    index = declaration.params_close + 1
+    if source.text(index) == "throws":
+        declaration.throws_start = index + 1
+        limit = min(len(source), index + MAX_DECLARATION_TOKENS)
+        index += 1
+        while index < limit and source.text(index) not in ("{", ";"):
+            if source.kinds[index] != "ident" and source.texts[index] not in (".", ",", "<", ">", "?"):
+                return False
+            index += 1
+        declaration.throws_end = index
+
+    following = source.text(index)
+    declaration.header_end = index
+    if following == "{":
+        declaration.body_open = index
+        return True
+
+    # Construtores sempre têm corpo; métodos podem ser abstratos ou só o cabeçalho
+    if declaration.is_constructor:
+        return False
+    return following in (";", "default", "")
+
+
+def parse_declaration(source: JavaTokens, paren_index: int) -> Optional[MethodDeclaration]:
+    """Reconhece uma declaração cujo parêntese de parâmetros está em `paren_index`
+
+    Trabalha apenas sobre tokens, com no máximo MAX_DECLARATION_TOKENS passos
+    para trás e para frente, portanto sem risco de backtracking.
+    """
+    name_index = paren_index - 1
+    if name_index < 0 or source.kinds[name_index] != "ident":
+        return None
+    if source.pairs[paren_index] == -1:
+        return None
+
+    limit = max(0, name_index - MAX_DECLARATION_TOKENS)
+    declaration = MethodDeclaration()
+    declaration.name_index = name_index
+    declaration.params_open = paren_index
+    declaration.params_close = source.pairs[paren_index]
+
+    type_start = _type_start(source, name_index - 1, limit)
+    declaration.type_start = type_start
+    prefix_end = type_start - 1 if type_start != -1 else name_index - 1
+
+    if not _parse_prefix(source, declaration, prefix_end, limit):
+        return None
+    if not _parse_header_end(source, declaration):
+        return None
+    return declaration
+
+
+def iter_declarations(source: JavaTokens, start: int = 0,
+                      end: Optional[int] = None) -> Iterator[MethodDeclaration]:
+    """Percorre os tokens e devolve cada método ou construtor declarado, em ordem"""
+    end = len(source) if end is None else end
+    texts = source.texts
+    kinds = source.kinds
+    for index in range(start, end):
+        if texts[index] == "(" and kinds[index] == "op":
+            declaration = parse_declaration(source, index)
+            if declaration is not None:
+                yield declaration
+
+
+def find_declaration(source: JavaTokens) -> Optional[MethodDeclaration]:
+    """Primeira declaração de método ou construtor do código"""
+    return next(iter_declarations(source), None)
+
+
+def iter_type_declarations(source: JavaTokens) -> Iterator[TypeDeclaration]:
+    """Percorre os tokens e devolve cada tipo declarado (inclusive aninhados), em ordem"""
+    texts = source.texts
+    kinds = source.kinds
+    for index in range(len(texts) - 1):
+        word = texts[index]
+        if word not in TYPE_KEYWORDS or kinds[index + 1] != "ident":
+            continue
+        # "Foo.class" é um literal de classe, não uma declaração
+        if index > 0 and texts[index - 1] == ".":
+            continue
+
+        body_open = source.find("{", index + 2, min(len(texts), index + 2 + MAX_DECLARATION_TOKENS),
+                                stop=";")
+        if body_open == -1:
+            continue
+        body_close = source.pairs[body_open]
+        yield TypeDeclaration(word, texts[index + 1], index + 1, body_open,
+                              body_close if body_close != -1 else len(texts))
@@ -0,0 +1,233 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from analyzers.cache import AnalysisCache
+from analyzers.metrics import timed
+
+
+# Palavras reservadas de Java (inclui literais e palavras contextuais usadas na análise)
+JAVA_KEYWORDS = frozenset({
+    "abstract", "assert", "boolean", "break", "byte", "case", "catch", "char",
+    "class", "const", "continue", "default", "do", "double", "else", "enum",
+    "extends", "final", "finally", "float", "for", "goto", "if", "implements",
+    "import", "instanceof", "int", "interface", "long", "native", "new",
+    "package", "private", "protected", "public", "return", "short", "static",
+    "strictfp", "super", "switch", "synchronized", "this", "throw", "throws",
+    "transient", "try", "void", "volatile", "while", "true", "false", "null"
+})
+
+# Uma alternativa por tipo de token. Nenhuma alternativa tem repetição aninhada,
+# então cada token é reconhecido em tempo proporcional ao seu tamanho.
+_TOKEN_PATTERN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<text_block>"""(?:[^\\]|\\[\s\S])*?(?:"""|\Z))
+  | (?P<string>"(?:[^"\\\n]|\\.)*"?)
+  | (?P<char>'(?:[^'\\\n]|\\.)*'?)
+  | (?P<ident>(?:[^\W\d]|\$)[\w$]*)
+  | (?P<number>\.?\d(?:[\w.]|(?<=[eEpP])[+-])*)
+  | (?P<op>->|::|\.\.\.|\+\+|--|&&|\|\||[=!<>]=|[+\-*/%&|^]=|<<=?|[\s\S])
+''', re.VERBOSE)
+
+# Pares de delimitadores; ">" é sempre emitido isolado para não confundir generics
+_OPENERS = {"(": ")", "{": "}", "[": "]"}
+_CLOSERS = {")": "(", "}": "{", "]": "["}
+
+
+class JavaTokens:
+    """Fluxo de tokens de um código Java, produzido em uma única passada
+
+    Comentários e espaços são descartados; literais de string, char e text
+    blocks viram tokens únicos (chaves e `//` dentro deles não contam).
+    Os tokens ficam em listas paralelas (um objeto por token custaria o dobro
+    de memória e de tempo em arquivos grandes):
+
+    - `kinds[i]`: "keyword", "ident", "number", "string", "char", "text_block" ou "op"
+    - `texts[i]`: texto do token
+    - `starts[i]`: posição no código original
+    - `spaced[i]`: havia espaço ou comentário antes do token
+    - `pairs[i]`: índice do delimitador que fecha/abre o token `i`, ou -1
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.kinds: List[str] = []
+        self.texts: List[str] = []
+        self.starts: List[int] = []
+        self.spaced: List[bool] = []
+        self.pairs: List[int] = []
+        # Posições das quebras de linha, calculadas somente se line() for usado
+        self._newlines: Optional[List[int]] = None
+        # Índice de blocos (pai e profundidade de cada token), calculado sob demanda
+        self._parents: Optional[List[int]] = None
+        self._depths: Optional[List[int]] = None
+        self._pair_offsets: Optional[Dict[int, int]] = None
+
+        texts = self.texts
+        pairs = self.pairs
+        append_kind = self.kinds.append
+        append_text = texts.append
+        append_start = self.starts.append
+        append_spaced = self.spaced.append
+        append_pair = pairs.append
+        stack: List[int] = []
+        spaced = False
+
+        for match in _TOKEN_PATTERN.finditer(code):
+            kind = match.lastgroup
+            if kind == "space" or kind == "comment":
+                spaced = True
+                continue
+
+            text = match.group()
+            if kind == "ident" and text in JAVA_KEYWORDS:
+                kind = "keyword"
+
+            append_kind(kind)
+            append_text(text)
+            append_start(match.start())
+            append_spaced(spaced)
+            append_pair(-1)
+            spaced = False
+
+            if kind != "op":
+                continue
+            if text in _OPENERS:
+                stack.append(len(texts) - 1)
+            elif text in _CLOSERS:
+                # Fecha o delimitador correspondente mais próximo; sem par fica -1
+                opener = _CLOSERS[text]
+                while stack and texts[stack[-1]] != opener:
+                    stack.pop()
+                if stack:
+                    open_index = stack.pop()
+                    index = len(texts) - 1
+                    pairs[open_index] = index
+                    pairs[index] = open_index
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def text(self, index: int) -> str:
+        """Texto do token, ou "" fora dos limites"""
+        if 0 <= index < len(self.texts):
+            return self.texts[index]
+        return ""
+
+    def kind(self, index: int) -> str:
+        """Tipo do token, ou "" fora dos limites"""
+        if 0 <= index < len(self.kinds):
+            return self.kinds[index]
+        return ""
+
+    def line(self, index: int) -> int:
+        """Linha (a partir de 1) em que o token começa"""
+        if self._newlines is None:
+            self._newlines = [match.start() for match in re.finditer("\n", self.code)]
+        return bisect_right(self._newlines, self.starts[index]) + 1
+
+    def block_span(self, open_index: int) -> Tuple[int, int]:
+        """Posições [início, fim) no código do bloco aberto em `open_index`, delimitadores inclusos"""
+        close_index = self.pairs[open_index]
+        if close_index == -1:
+            return self.starts[open_index], len(self.code)
+        return self.starts[open_index], self.starts[close_index] + 1
+
+    def block_text(self, open_index: int) -> str:
+        """Texto original do bloco aberto em `open_index`, ou "" se não tiver par"""
+        if self.pairs[open_index] == -1:
+            return ""
+        start, end = self.block_span(open_index)
+        return self.code[start:end]
+
+    def match_offset(self, offset: int) -> int:
+        """Posição do delimitador que fecha/abre o que está em `offset`, ou -1"""
+        if self._pair_offsets is None:
+            starts = self.starts
+            self._pair_offsets = {starts[index]: starts[pair]
+                                  for index, pair in enumerate(self.pairs) if pair != -1}
+        return self._pair_offsets.get(offset, -1)
+
+    def enclosing(self, index: int) -> int:
+        """Índice do delimitador de abertura mais interno que contém o token, ou -1"""
+        if self._parents is None:
+            self._build_blocks()
+        return self._parents[index]
+
+    def depth(self, index: int) -> int:
+        """Quantidade de blocos (chaves, parênteses, colchetes) que contêm o token"""
+        if self._depths is None:
+            self._build_blocks()
+        return self._depths[index]
+
+    def in_block(self, index: int, open_index: int) -> bool:
+        """O token está dentro do bloco aberto em `open_index`"""
+        close_index = self.pairs[open_index]
+        return open_index < index and (close_index == -1 or index < close_index)
+
+    def _build_blocks(self) -> None:
+        """Calcula pai e profundidade de todos os tokens em uma passada sobre `pairs`
+
+        Os pares casados sempre se aninham corretamente (delimitadores sem
+        par ficam fora da pilha), então a pilha reflete os blocos abertos.
+        """
+        pairs = self.pairs
+        parents = [-1] * len(pairs)
+        depths = [0] * len(pairs)
+        stack: List[int] = []
+
+        for index, pair in enumerate(pairs):
+            if pair != -1 and pair < index:
+                stack.pop()
+            if stack:
+                parents[index] = stack[-1]
+                depths[index] = len(stack)
+            if pair > index:
+                stack.append(index)
+
+        self._parents = parents
+        self._depths = depths
+
+    def find(self, text: str, start: int = 0, end: Optional[int] = None,
+             stop: str = "") -> int:
+        """Índice do primeiro token com o texto dado, pulando blocos aninhados
+
+        A busca é interrompida (retorna -1) ao encontrar `stop` no mesmo nível,
+        o que mantém linear uma sequência de buscas que se sobrepõem.
+        """
+        texts = self.texts
+        end = len(texts) if end is None else end
+        index = start
+        while index < end:
+            token_text = texts[index]
+            if token_text == text:
+                return index
+            if token_text == stop:
+                return -1
+            if token_text in _OPENERS and self.pairs[index] != -1:
+                index = self.pairs[index]
+            index += 1
+        return -1
+
+    def render(self, start: int, end: int) -> str:
+        """Texto dos tokens [start, end) com espaçamento normalizado"""
+        texts = self.texts
+        spaced = self.spaced
+        parts = []
+        for index in range(max(start, 0), min(end, len(texts))):
+            if spaced[index] and parts:
+                parts.append(" ")
+            parts.append(texts[index])
+        return "".join(parts)
+
+
+# Tokenização (a passada de expressão regular) cronometrada na fase "tokenize"
+_tokenize = timed("tokenize", JavaTokens)
+
+
+def tokenize_java(code: str, cache: Optional[AnalysisCache] = None) -> JavaTokens:
+    """Tokeniza o código, reaproveitando os tokens do cache quando disponível"""
+    if cache is None:
+        return _tokenize(code)
+    return cache.get_tree(code, "java", _tokenize)
@@ -0,0 +1,524 @@
+from typing import Dict, List, Any, Optional, Tuple
+from analyzers.cache import AnalysisCache
+from analyzers.flow import (
+    Catch, Conditional, Else, ExceptionThrow, Finally, FlowNode, LoopForHeader, LoopWhile, Return,
+    TryCatch, intern_name
+)
+from analyzers.java_Analyzer import MAX_FLOW_DEPTH, JavaFlowSummarizer
+from analyzers.js_declarations import (
+    FunctionDeclaration, binding_name, find_classes, find_declaration, find_declarations
+)
+from analyzers.js_lexer import JSTokens, tokenize_js
+from analyzers.metrics import phase
+
+
+class JSStaticAnalyzer:
+    """Analisador estático de código JavaScript/TypeScript
+
+    Mesmo formato do StaticAnalyzer Python: assinatura, parâmetros (com tipo
+    TypeScript ou "any"), tipo de retorno, dependências e decoradores, mais
+    os modificadores (export, async, static...).
+    """
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+
+    def analyze_function(self, code: str) -> Dict[str, Any]:
+        """Extrai informações estruturais da primeira função do código"""
+        try:
+            source = tokenize_js(code, self.cache)
+            with phase("walk"):
+                declarations = find_declarations(source)
+                declaration = find_declaration(source, declarations)
+
+                if declaration is None:
+                    raise ValueError("Nenhuma função encontrada no código")
+
+                return self._analyze_declaration(source, declaration,
+                                                 self._extract_dependencies(source, declaration, declarations))
+        except Exception as e:
+            return {"error": f"Erro na análise: {str(e)}"}
+
+    def _analyze_declaration(self, source: JSTokens, declaration: FunctionDeclaration,
+                             dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Monta o resultado estático de uma declaração já reconhecida"""
+        return {
+            "signature": declaration.signature(source),
+            "modifiers": list(declaration.modifiers),
+            "parameters": self._extract_parameters(source, declaration),
+            "return_type": self._extract_return_type(source, declaration),
+            "dependencies": dependencies,
+            "decorators": [source.render(start + 1, end) for start, end in declaration.decorator_spans]
+        }
+
+    def _extract_parameters(self, source: JSTokens, declaration: FunctionDeclaration) -> List[Dict[str, Any]]:
+        """Extrai nome, tipo e valor padrão de cada parâmetro"""
+        params = []
+
+        for parameter in declaration.parameters(source):
+            param_type = "any[]" if parameter.is_rest else "any"
+            if parameter.type_start != -1:
+                param_type = source.render(parameter.type_start, parameter.type_end)
+
+            default_value = None
+            if parameter.default_start != -1:
+                default_value = source.render(parameter.default_start, parameter.default_end)
+            elif parameter.is_optional:
+                default_value = "undefined"
+
+            params.append({
+                "name": source.render(parameter.name_start, parameter.name_end),
+                "type": param_type,
+                "has_default": default_value is not None,
+                "default_value": default_value,
+                "is_rest": parameter.is_rest
+            })
+
+        return params
+
+    def _extract_return_type(self, source: JSTokens, declaration: FunctionDeclaration) -> str:
+        """Tipo de retorno anotado; sem anotação, "any" (ou "Promise<any>" em funções async)"""
+        if declaration.return_start != -1:
+            return source.render(declaration.return_start, declaration.return_end)
+        return "Promise<any>" if declaration.is_async else "any"
+
+    def _extract_dependencies(self, source: JSTokens, declaration: FunctionDeclaration,
+                              declarations: List[FunctionDeclaration]) -> Dict[str, List[str]]:
+        """Imports do módulo e chamadas feitas no corpo da função"""
+        body_start, body_end = declaration.body_range(source)
+        return {
+            "imports": self._extract_imports(source),
+            "internal_calls": self._extract_calls(source, body_start, body_end,
+                                                  self._declared_parens(declarations))
+        }
+
+    def _declared_parens(self, declarations: List[FunctionDeclaration]) -> set:
+        """Parênteses de parâmetros de declarações (não são chamadas)"""
+        return {declaration.params_start - 1 for declaration in declarations}
+
+    def _extract_imports(self, source: JSTokens) -> List[str]:
+        """Imports ES (import/export ... from), require() e import() com literal
+
+        Imports nomeados viram "módulo.nome" (como `from módulo import nome` no
+        Python); default, namespace e imports só de efeito viram "módulo".
+        """
+        imports = []
+        texts = source.texts
+        kinds = source.kinds
+
+        for index, text in enumerate(texts):
+            kind = kinds[index]
+            if kind == "keyword" and text == "import":
+                if source.text(index + 1) == "(":
+                    module = self._string_argument(source, index + 1)
+                    if module is not None:
+                        imports.append(module)
+                elif source.text(index + 1) != ".":
+                    imports.extend(self._import_clause(source, index + 1))
+            elif kind == "keyword" and text == "export" and source.text(index + 1) in ("*", "{", "type"):
+                imports.extend(self._import_clause(source, index + 1, reexport=True))
+            elif kind == "ident" and text == "require" and source.text(index + 1) == "(":
+                module = self._string_argument(source, index + 1)
+                if module is not None:
+                    imports.extend(self._required_names(source, index, module))
+
+        return list(dict.fromkeys(imports))
+
+    def _string_argument(self, source: JSTokens, paren_index: int) -> Optional[str]:
+        """Módulo de `require('x')` / `import('x')`, ou None se o argumento não for literal"""
+        if source.kind(paren_index + 1) in ("string", "template") and source.text(paren_index + 2) == ")":
+            return source.texts[paren_index + 1][1:-1]
+        return None
+
+    def _import_clause(self, source: JSTokens, index: int, reexport: bool = False) -> List[str]:
+        """Nomes de `import ... from 'm'` ou `export ... from 'm'` a partir de `index`"""
+        texts = source.texts
+        named: List[str] = []
+        whole = False
+        end = min(len(texts), index + 256)
+
+        if source.text(index) == "type" and source.text(index + 1) != "from":
+            index += 1  # import type { T } from 'm' (TypeScript)
+        while index < end:
+            text = texts[index]
+            kind = source.kinds[index]
+            if kind == "string":
+                module = text[1:-1]
+                if not named or whole:
+                    return [module] + [f"{module}.{name}" for name in named]
+                return [f"{module}.{name}" for name in named]
+            if text == "{" and source.pairs[index] != -1:
+                close = source.pairs[index]
+                named.extend(self._named_imports(source, index + 1, close))
+                index = close + 1
+                continue
+            if text == "*" or (kind == "ident" and text not in ("from", "as", "type")):
+                # Default ou namespace: o binding é o módulo inteiro
+                whole = not reexport or text == "*"
+                if text == "*" and source.text(index + 1) == "as":
+                    index += 2
+            elif text not in (",", "from", "as"):
+                break
+            index += 1
+        return []
+
+    def _named_imports(self, source: JSTokens, start: int, end: int) -> List[str]:
+        """Nomes importados de `{ a, b as c, type D }` (o nome original, não o apelido)"""
+        names = []
+        expect_name = True
+        for index in range(start, end):
+            text = source.texts[index]
+            if text == ",":
+                expect_name = True
+            elif expect_name and source.kinds[index] in ("ident", "keyword", "string"):
+                if text == "type" and source.kinds[index + 1] in ("ident", "keyword"):
+                    continue
+                names.append(text[1:-1] if source.kinds[index] == "string" else text)
+                expect_name = False
+        return names
+
+    def _required_names(self, source: JSTokens, require_index: int, module: str) -> List[str]:
+        """`const { a, b } = require('m')` vira "m.a", "m.b"; os demais usos, "m" """
+        if source.text(require_index - 1) == "=" and source.text(require_index - 2) == "}":
+            open_index = source.pairs[require_index - 2]
+            if open_index != -1:
+                names = self._named_imports(source, open_index + 1, require_index - 2)
+                return [f"{module}.{name}" for name in names] or [module]
+        return [module]
+
+    def _extract_calls(self, source: JSTokens, start: int, end: int,
+                       declared_parens: Optional[set] = None) -> List[str]:
+        """Chamadas no intervalo de tokens, sem repetição e em ordem (a.b.c, a?.b)"""
+        calls = []
+        texts = source.texts
+        kinds = source.kinds
+        declared_parens = declared_parens or set()
+
+        for index in range(max(start, 1), end):
+            if texts[index] != "(" or kinds[index - 1] != "ident" or index in declared_parens:
+                continue
+            # Volta pela cadeia de acesso: this.api.get( / obj?.metodo(
+            first = index - 1
+            while (first >= 2 and texts[first - 1] in (".", "?.")
+                   and (kinds[first - 2] == "ident" or texts[first - 2] in ("this", "super"))):
+                first -= 2
+            calls.append(source.render(first, index).replace(" ", ""))
+
+        return list(dict.fromkeys(calls))
+
+
+class JSFlowSummarizer(JavaFlowSummarizer):
+    """Resumidor de fluxo de execução para JavaScript/TypeScript
+
+    Produz a mesma árvore do JavaFlowSummarizer (conditional/else, loop_for,
+    loop_while, try_catch/catch/finally, return, exception_throw); muda só o
+    reconhecimento das instruções, que considera o fim de instrução implícito
+    (sem ";") e ignora funções e classes declaradas dentro do corpo.
+    """
+
+    def summarize_flow(self, code: str) -> Dict[str, Any]:
+        """Cria um mapa do fluxo de execução da primeira função do código"""
+        try:
+            source = tokenize_js(code, self.cache)
+            with phase("walk"):
+                declaration = find_declaration(source)
+
+                if declaration is None:
+                    raise ValueError("Nenhuma função encontrada no código")
+
+                return self._summarize_function(source, declaration)
+        except Exception as e:
+            return {"error": f"Erro na análise de fluxo: {str(e)}"}
+
+    def _summarize_function(self, source: JSTokens, declaration: FunctionDeclaration) -> Dict[str, Any]:
+        """Fluxo do corpo; uma arrow function de expressão é um único return"""
+        start, end = declaration.body_range(source)
+        if declaration.body_open != -1:
+            return self._summarize_range(source, start, end)
+
+        flow_map: List[FlowNode] = [Return(source.render(start, end) or "undefined")]
+        return {
+            "flow_map": flow_map,
+            "complexity_score": self._calculate_complexity(flow_map),
+            "summary": self._generate_flow_summary(flow_map)
+        }
+
+    def _parse_statement(self, source: JSTokens, index: int, end: int,
+                         elements: List[FlowNode], depth: int) -> int:
+        """Lê uma instrução a partir de `index`, registra seu fluxo e retorna o índice seguinte"""
+        texts = source.texts
+        text = texts[index]
+
+        # Blocos simples e switch são transparentes
+        if text in ("{", "}", ";"):
+            return index + 1
+        if source.kinds[index] == "ident" and source.text(index + 1) == ":":
+            return index + 2
+        if source.kinds[index] != "keyword" or depth >= MAX_FLOW_DEPTH:
+            return self._skip_statement(source, index, end)
+
+        header_open = index + 1
+        if text == "for" and source.text(header_open) == "await":
+            header_open += 1
+        header_close = -1
+        if source.text(header_open) == "(":
+            header_close = source.pairs[header_open]
+            if header_close >= end:
+                header_close = -1
+
+        if text in ("if", "for", "while") and header_close != -1:
+            header = source.render(header_open + 1, header_close)
+            nested, next_index = self._statement_flow(source, header_close + 1, end, depth)
+
+            if text == "if":
+                element = Conditional(header, False, nested)
+                elements.append(element)
+                if next_index < end and texts[next_index] == "else":
+                    element.has_else = True
+                    else_flow, next_index = self._statement_flow(source, next_index + 1, end, depth)
+                    elements.append(Else(else_flow))
+            elif text == "for":
+                elements.append(LoopForHeader(header, nested))
+            else:
+                elements.append(LoopWhile(header, nested))
+            return next_index
+
+        if text == "do":
+            nested, next_index = self._statement_flow(source, index + 1, end, depth)
+            condition = ""
+            if source.text(next_index) == "while" and source.text(next_index + 1) == "(":
+                close = source.pairs[next_index + 1]
+                if close != -1 and close < end:
+                    condition = source.render(next_index + 2, close)
+                    next_index = close + 1
+                    if source.text(next_index) == ";":
+                        next_index += 1
+            elements.append(LoopWhile(condition, nested))
+            return next_index
+
+        if text == "try":
+            return self._parse_try(source, index, end, elements, depth)
+
+        if text in ("switch", "with") and header_close != -1:
+            return header_close + 1
+
+        if text in ("case", "default"):
+            return self._skip_label(source, index, end)
+
+        if text == "return" and (index + 1 >= end or source.breaks[index + 1]
+                                 or texts[index + 1] in (";", "}")):
+            # "return" sozinho na linha: o ";" implícito vem logo depois
+            elements.append(Return("undefined"))
+            return index + 2 if source.text(index + 1) == ";" else index + 1
+
+        if text in ("return", "throw"):
+            next_index = self._skip_statement(source, index + 1, end)
+            value_end = next_index - 1 if texts[next_index - 1] == ";" else next_index
+            if text == "return":
+                elements.append(Return(source.render(index + 1, value_end)))
+            else:
+                elements.append(ExceptionThrow(self._thrown_exception(source, index + 1, value_end)))
+            return next_index
+
+        if text in ("else", "catch", "finally"):
+            # Sem a instrução correspondente (código incompleto)
+            return index + 1
+
+        return self._skip_statement(source, index, end)
+
+    def _parse_try(self, source: JSTokens, index: int, end: int,
+                   elements: List[FlowNode], depth: int) -> int:
+        """try, o catch (com ou sem binding) e o finally, cada um com o próprio fluxo"""
+        nested, next_index = self._statement_flow(source, index + 1, end, depth)
+        element = TryCatch(nested)
+        elements.append(element)
+        handlers: List[FlowNode] = []
+
+        while next_index < end and source.texts[next_index] == "catch":
+            body_index = next_index + 1
+            exception = "Error"
+            if source.text(body_index) == "(" and source.pairs[body_index] != -1:
+                close = source.pairs[body_index]
+                exception = self._extract_catch_type(source, body_index + 1, close)
+                body_index = close + 1
+            element.exceptions.append(intern_name(exception))
+            catch_flow, next_index = self._statement_flow(source, body_index, end, depth)
+            handlers.append(Catch(exception, catch_flow))
+
+        if next_index < end and source.texts[next_index] == "finally":
+            element.has_finally = True
+            finally_flow, next_index = self._statement_flow(source, next_index + 1, end, depth)
+            handlers.append(Finally(finally_flow))
+
+        elements.extend(handlers)
+        return next_index
+
+    def _extract_catch_type(self, source: JSTokens, start: int, close: int) -> str:
+        """Tipo anotado no catch (TypeScript); sem anotação útil, "Error" """
+        colon = source.find(":", start, close)
+        if colon == -1:
+            return "Error"
+        annotation = source.render(colon + 1, close)
+        return annotation if annotation not in ("", "any", "unknown") else "Error"
+
+    def _skip_statement(self, source: JSTokens, index: int, end: int) -> int:
+        """Fim de uma instrução simples: após o ";" do mesmo nível ou no fim de linha implícito
+
+        Parênteses, colchetes e chaves internos (callbacks, objetos literais,
+        funções declaradas) são pulados pelo índice de pares. Uma chave seguida
+        de algo que não é operador encerra a instrução (ex.: função declarada).
+        """
+        texts = source.texts
+        pairs = source.pairs
+        breaks = source.breaks
+        start = index
+        while index < end:
+            text = texts[index]
+            if text == ";":
+                return index + 1
+            if text == "}":
+                return index
+            if index > start and breaks[index] and source.statement_break(index):
+                return index
+            if text in ("(", "[", "{") and pairs[index] != -1:
+                closes_block = text == "{"
+                index = pairs[index] + 1
+                if closes_block and (source.kind(index) != "op" or source.text(index) in ("{", "}")):
+                    return min(index, end)
+                continue
+            index += 1
+        return end
+
+
+class JSAnalysisEngine:
+    """Motor de análise JavaScript/TypeScript em passagem única
+
+    Tokeniza o código uma vez (tokens compartilhados via cache), reconhece
+    todas as funções, arrow functions e métodos numa só varredura e
+    reaproveita a lista de imports do módulo.
+    """
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+        self.static_analyzer = JSStaticAnalyzer(cache)
+        self.flow_summarizer = JSFlowSummarizer(cache)
+
+    def analyze(self, code: str) -> Dict[str, Dict[str, Any]]:
+        """Retorna {"static": ..., "flow": ...} para a primeira função do código"""
+        try:
+            source = tokenize_js(code, self.cache)
+            with phase("walk"):
+                declarations = find_declarations(source)
+                declaration = find_declaration(source, declarations)
+
+            if declaration is None:
+                raise ValueError("Nenhuma função encontrada no código")
+        except Exception as e:
+            return {
+                "static": {"error": f"Erro na análise: {str(e)}"},
+                "flow": {"error": f"Erro na análise de fluxo: {str(e)}"}
+            }
+
+        with phase("walk"):
+            dependencies = self.static_analyzer._extract_dependencies(source, declaration, declarations)
+            return {
+                "static": self._build_static(source, declaration, dependencies),
+                "flow": self._build_flow(source, declaration)
+            }
+
+    def analyze_module(self, code: str) -> Dict[str, Any]:
+        """Analisa todas as funções nomeadas, arrow functions atribuídas e métodos do módulo
+
+        Callbacks anônimos (ex.: `itens.map(x => x.id)`) fazem parte do fluxo
+        de quem os contém e não entram na lista.
+        """
+        try:
+            source = tokenize_js(code, self.cache)
+            with phase("walk"):
+                imports = self.static_analyzer._extract_imports(source)
+                classes = find_classes(source)
+                declarations = find_declarations(source)
+        except Exception as e:
+            return {"error": f"Erro na análise do módulo: {str(e)}"}
+
+        with phase("walk"):
+            declared_parens = self.static_analyzer._declared_parens(declarations)
+            functions = [
+                self._analyze_member(source, declaration, qualified_name, imports, declared_parens)
+                for declaration, qualified_name in self._qualified_names(source, classes, declarations)
+                if declaration.name
+            ]
+
+        return {
+            "imports": imports,
+            "classes": [class_declaration.name for class_declaration in classes],
+            "function_count": len(functions),
+            "functions": functions
+        }
+
+    def _analyze_member(self, source: JSTokens, declaration: FunctionDeclaration, qualified_name: str,
+                        imports: List[str], declared_parens: set) -> Dict[str, Any]:
+        """Análises estática e de fluxo de uma função do módulo"""
+        body_start, body_end = declaration.body_range(source)
+        dependencies = {
+            "imports": imports,
+            "internal_calls": self.static_analyzer._extract_calls(source, body_start, body_end, declared_parens)
+        }
+        last_index = declaration.body_end if declaration.body_open != -1 else declaration.body_end - 1
+        return {
+            "name": declaration.name,
+            "qualified_name": qualified_name,
+            "kind": declaration.kind,
+            "is_async": declaration.is_async,
+            "lineno": source.line(declaration.start),
+            "end_lineno": source.line(max(declaration.start, min(last_index, len(source) - 1))),
+            "static_analysis": self._build_static(source, declaration, dependencies),
+            "flow_analysis": self._build_flow(source, declaration)
+        }
+
+    def _qualified_names(self, source: JSTokens, classes: list,
+                         declarations: List[FunctionDeclaration]) -> List[Tuple[FunctionDeclaration, str]]:
+        """Nome qualificado de cada declaração (Classe.metodo, externa.interna, objeto.metodo)
+
+        Sobe pelos blocos que contêm o início da declaração (índice de blocos
+        dos tokens) e usa os que pertencem a classes, funções ou objetos
+        literais atribuídos a um nome. Funções anônimas contam como
+        "<anonymous>".
+        """
+        owners: Dict[int, str] = {}  # chave de abertura -> nome
+        for class_declaration in classes:
+            owners[class_declaration.body_open] = class_declaration.name
+        for declaration in declarations:
+            if declaration.body_open != -1:
+                owners[declaration.body_open] = declaration.name or "<anonymous>"
+
+        names = []
+        for declaration in declarations:
+            parts = [declaration.name or "<anonymous>"]
+            block = source.enclosing(declaration.start)
+            while block != -1:
+                owner = owners.get(block)
+                if owner is None and source.texts[block] == "{":
+                    # Objeto literal com nome: const api = { ... } / chave: { ... }
+                    owner = owners[block] = binding_name(source, block)[0] or ""
+                if owner:
+                    parts.append(owner)
+                block = source.enclosing(block)
+            names.append((declaration, ".".join(reversed(parts))))
+
+        return names
+
+    def _build_static(self, source: JSTokens, declaration: FunctionDeclaration,
+                      dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Monta o resultado estático de uma função"""
+        try:
+            return self.static_analyzer._analyze_declaration(source, declaration, dependencies)
+        except Exception as e:
+            return {"error": f"Erro na análise: {str(e)}"}
+
+    def _build_flow(self, source: JSTokens, declaration: FunctionDeclaration) -> Dict[str, Any]:
+        """Monta o resultado de fluxo de uma função"""
+        try:
+            return self.flow_summarizer._summarize_function(source, declaration)
+        except Exception as e:
+            return {"error": f"Erro na análise de fluxo: {str(e)}"}
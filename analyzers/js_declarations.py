@@ -0,0 +1,696 @@
+from typing import Dict, List, Optional, Tuple
+
+from analyzers.js_lexer import JSTokens
+
+
+# Modificadores aceitos no prefixo de funções e métodos (JavaScript e TypeScript)
+MODIFIERS = frozenset({
+    "export", "default", "declare", "async", "static", "get", "set", "public",
+    "private", "protected", "readonly", "override", "abstract", "accessor"
+})
+
+# Modificadores que podem preceder a palavra "function"
+_FUNCTION_MODIFIERS = frozenset({"export", "default", "declare", "async"})
+
+# Tokens que podem preceder o início de um membro de classe ou de objeto
+_BOUNDARIES = frozenset({"{", "}", ";", ","})
+
+# Tokens depois dos quais um "{" ainda faz parte de um tipo (ex.: "): { a: number } {")
+_TYPE_OPERATORS = frozenset({":", "|", "&", ",", "<", "=>", "(", "[", "?", "keyof", "typeof"})
+
+# Tipos primitivos de TypeScript que não são expressões válidas sozinhos
+_TYPE_WORDS = frozenset({
+    "void", "never", "unknown", "any", "number", "string", "boolean", "object", "symbol", "bigint"
+})
+
+# Limite de tokens examinados por candidato (prefixo, tipos, nome do binding).
+# Cada candidato custa no máximo esta quantidade de passos, então o
+# reconhecimento é linear no tamanho do código mesmo para entradas patológicas.
+MAX_DECLARATION_TOKENS = 256
+
+
+class ClassDeclaration:
+    """Classe (declaração ou expressão), com o intervalo de tokens do corpo"""
+
+    __slots__ = ("name", "name_index", "body_open", "body_close")
+
+    def __init__(self, name: str, name_index: int, body_open: int, body_close: int):
+        self.name = name
+        self.name_index = name_index
+        self.body_open = body_open
+        self.body_close = body_close
+
+
+class Parameter:
+    """Partes de um parâmetro em índices de tokens; intervalos ausentes são (-1, -1)"""
+
+    __slots__ = ("name_start", "name_end", "is_rest", "is_optional",
+                 "type_start", "type_end", "default_start", "default_end")
+
+    def __init__(self, name_start: int, name_end: int):
+        self.name_start = name_start
+        self.name_end = name_end
+        self.is_rest = False
+        self.is_optional = False
+        self.type_start = self.type_end = -1
+        self.default_start = self.default_end = -1
+
+
+# Modificadores de parâmetros de construtor em TypeScript ("parameter properties")
+_PARAMETER_MODIFIERS = frozenset({"public", "private", "protected", "readonly", "override"})
+
+
+class FunctionDeclaration:
+    """Função, arrow function ou método, em índices de tokens"""
+
+    __slots__ = ("kind", "name", "name_index", "start", "modifiers", "is_generator",
+                 "decorator_spans", "uses_function_keyword", "header_start", "header_end",
+                 "params_start", "params_end", "return_start", "return_end",
+                 "body_open", "body_start", "body_end")
+
+    def __init__(self, kind: str):
+        # "function", "arrow", "method" ou "constructor"
+        self.kind = kind
+        # "" para funções anônimas
+        self.name = ""
+        self.name_index = -1
+        self.start = 0
+        self.modifiers: List[str] = []
+        self.is_generator = False
+        # Intervalos [início, fim) dos decoradores do prefixo, em ordem
+        self.decorator_spans: List[Tuple[int, int]] = []
+        self.uses_function_keyword = False
+        # Parâmetros de tipo, parâmetros e tipo de retorno: [header_start, header_end)
+        self.header_start = 0
+        self.header_end = 0
+        # Tokens dos parâmetros, sem os parênteses
+        self.params_start = 0
+        self.params_end = 0
+        # Anotação de tipo de retorno (TypeScript), ou -1
+        self.return_start = -1
+        self.return_end = -1
+        # Índice do "{" do corpo, ou -1 para arrow functions de expressão
+        self.body_open = -1
+        self.body_start = 0
+        self.body_end = 0
+
+    @property
+    def is_async(self) -> bool:
+        return "async" in self.modifiers
+
+    def body_range(self, source: JSTokens) -> Tuple[int, int]:
+        """Intervalo [início, fim) dos tokens do corpo (a expressão, em arrow functions sem bloco)"""
+        return self.body_start, self.body_end
+
+    def parameters(self, source: JSTokens) -> List[Parameter]:
+        """Parâmetros reconhecidos, em ordem"""
+        parameters = []
+        for start, end in split_parameters(source, self.params_start, self.params_end):
+            parameter = parse_parameter(source, start, end)
+            if parameter is not None:
+                parameters.append(parameter)
+        return parameters
+
+    def signature(self, source: JSTokens) -> str:
+        """Assinatura normalizada: modificadores, nome, parâmetros e tipo de retorno"""
+        parts = list(self.modifiers)
+        if self.uses_function_keyword:
+            parts.append("function*" if self.is_generator else "function")
+        name = self.name or "<anonymous>"
+        if self.is_generator and not self.uses_function_keyword:
+            name = "*" + name
+        header = source.render(self.header_start, self.header_end)
+        if self.params_start == self.header_start:
+            # Arrow function de parâmetro único, sem parênteses
+            header = f"({header})"
+        parts.append(name + header)
+        return " ".join(parts)
+
+
+def split_parameters(source: JSTokens, start: int, end: int) -> List[Tuple[int, int]]:
+    """Intervalos de tokens de cada parâmetro, separados por vírgulas fora de <...>"""
+    texts = source.texts
+    pairs = source.pairs
+    parameters = []
+    depth = 0
+    index = start
+    while index < end:
+        text = texts[index]
+        if text == "<":
+            depth += 1
+        elif text == ">":
+            depth -= 1
+        elif text in ("(", "[", "{") and pairs[index] != -1:
+            index = pairs[index]
+        elif text == "," and depth <= 0:
+            parameters.append((start, index))
+            start = index + 1
+            depth = 0
+        index += 1
+    if start < end:
+        parameters.append((start, end))
+    return parameters
+
+
+def parse_parameter(source: JSTokens, start: int, end: int) -> Optional[Parameter]:
+    """Nome (ou padrão de desestruturação), tipo e valor padrão de um parâmetro"""
+    texts = source.texts
+    while start < end and texts[start] == "@":
+        # Decoradores de parâmetro: @Inject() nome
+        start += 2
+        while start + 1 < end and texts[start] == "." and source.kinds[start + 1] == "ident":
+            start += 2
+        if start < end and texts[start] == "(" and source.pairs[start] != -1:
+            start = source.pairs[start] + 1
+    while start + 1 < end and texts[start] in _PARAMETER_MODIFIERS and texts[start + 1] not in (":", "=", "?"):
+        start += 1
+
+    is_rest = start < end and texts[start] == "..."
+    if is_rest:
+        start += 1
+    if start >= end:
+        return None
+
+    name_end = start + 1
+    if texts[start] in ("{", "[") and source.pairs[start] != -1:
+        name_end = source.pairs[start] + 1
+    parameter = Parameter(start, min(name_end, end))
+    parameter.is_rest = is_rest
+
+    index = parameter.name_end
+    if index < end and texts[index] == "?":
+        parameter.is_optional = True
+        index += 1
+    if index < end and texts[index] == ":":
+        parameter.type_start = index + 1
+        depth = 0
+        index += 1
+        while index < end and not (texts[index] == "=" and depth <= 0):
+            if texts[index] == "<":
+                depth += 1
+            elif texts[index] == ">":
+                depth -= 1
+            elif texts[index] in ("(", "[", "{") and source.pairs[index] != -1:
+                index = source.pairs[index]
+            index += 1
+        parameter.type_end = min(index, end)
+    if index < end and texts[index] == "=":
+        parameter.default_start = index + 1
+        parameter.default_end = end
+    return parameter
+
+
+def _angle_end(source: JSTokens, index: int) -> int:
+    """A partir de um "<", avança até o ">" correspondente; -1 se não houver"""
+    depth = 0
+    limit = min(len(source), index + MAX_DECLARATION_TOKENS)
+    while index < limit:
+        text = source.texts[index]
+        if text == "<":
+            depth += 1
+        elif text == ">":
+            depth -= 1
+            if depth == 0:
+                return index
+        elif text in (";", "{", "}", "=>"):
+            return -1
+        index += 1
+    return -1
+
+
+def _angle_start(source: JSTokens, index: int) -> int:
+    """A partir de um ">", volta até o "<" correspondente; -1 se não houver"""
+    depth = 0
+    limit = max(0, index - MAX_DECLARATION_TOKENS)
+    while index >= limit:
+        text = source.texts[index]
+        if text == ">":
+            depth += 1
+        elif text == "<":
+            depth -= 1
+            if depth == 0:
+                return index
+        elif text in (";", "{", "}", "=>", "="):
+            return -1
+        index -= 1
+    return -1
+
+
+def type_end(source: JSTokens, colon: int, stop: str) -> int:
+    """Fim (exclusivo) da anotação de tipo que começa depois do ":" em `colon`
+
+    Termina no primeiro `stop` ("{" do corpo ou "=>" da arrow function) fora
+    de "<...>"; "{" logo após um operador de tipo é um tipo objeto e é pulado.
+    Retorna -1 se encontrar algo que não pode fazer parte de um tipo.
+    """
+    texts = source.texts
+    pairs = source.pairs
+    depth = 0
+    index = colon + 1
+    limit = min(len(texts), colon + MAX_DECLARATION_TOKENS)
+    while index < limit:
+        text = texts[index]
+        if depth == 0 and text == stop and (stop != "{" or texts[index - 1] not in _TYPE_OPERATORS):
+            return index if index > colon + 1 else -1
+        if text == "<":
+            depth += 1
+        elif text == ">":
+            depth -= 1
+        elif text in (";", "=", ")", "]", "}") or (depth == 0 and text == ","):
+            return -1
+        elif text in ("(", "[", "{") and pairs[index] != -1:
+            index = pairs[index]
+        index += 1
+    return -1
+
+
+def _decorator_start(source: JSTokens, end: int) -> int:
+    """Índice do "@" de um decorador que termina no token `end`, ou -1"""
+    index = end
+    if source.text(index) == ")" and source.pairs[index] != -1:
+        index = source.pairs[index] - 1
+    if source.kind(index) != "ident":
+        return -1
+    while source.text(index - 1) == "." and source.kind(index - 2) == "ident":
+        index -= 2
+    if source.text(index - 1) == "@":
+        return index - 1
+    return -1
+
+
+def _strip_quotes(text: str) -> str:
+    if len(text) >= 2 and text[0] in "'\"`" and text[-1] == text[0]:
+        return text[1:-1]
+    return text
+
+
+def binding_name(source: JSTokens, start: int) -> Tuple[str, int]:
+    """Nome ao qual a expressão que começa em `start` é atribuída, e o índice do token
+
+    Reconhece `const nome = ...` (inclusive com anotação de tipo), `obj.nome = ...`,
+    `nome: ...` em objetos literais e `export default ...`; ("", -1) se anônima.
+    """
+    before = start - 1
+    text = source.text(before)
+    if text == "default" and source.text(before - 1) == "export":
+        return "default", before
+    if text == ":" and source.text(before - 2) in ("{", ","):
+        if source.kind(before - 1) in ("ident", "keyword", "string", "number"):
+            return _strip_quotes(source.texts[before - 1]), before - 1
+        return "", -1
+    if text != "=":
+        return "", -1
+
+    name_index = before - 1
+    if source.text(name_index) == ">":
+        # Parâmetros de tipo de um alias: type Nome<T> = ...
+        type_params = _angle_start(source, name_index)
+        name_index = type_params - 1 if type_params != -1 else name_index
+    # Anotação de tipo entre o nome e o "=": const nome: Tipo<X> = ...
+    probe = name_index
+    limit = max(0, before - MAX_DECLARATION_TOKENS)
+    while probe > limit:
+        probe_text = source.texts[probe]
+        if probe_text in (";", "{", "}", ",", "=", "=>") or source.kinds[probe] == "keyword":
+            break
+        if probe_text == ":":
+            name_index = probe - 1
+            break
+        if probe_text in (")", "]") and source.pairs[probe] != -1:
+            probe = source.pairs[probe]
+        probe -= 1
+
+    if source.kind(name_index) in ("ident", "keyword") and source.texts[name_index] not in ("this", "super"):
+        return source.texts[name_index], name_index
+    return "", -1
+
+
+def _parse_function(source: JSTokens, index: int) -> Optional[FunctionDeclaration]:
+    """Declaração ou expressão "function" cuja palavra-chave está em `index`"""
+    declaration = FunctionDeclaration("function")
+    declaration.uses_function_keyword = True
+    position = index + 1
+    if source.text(position) == "*":
+        declaration.is_generator = True
+        position += 1
+    if source.kind(position) == "ident":
+        declaration.name = source.texts[position]
+        declaration.name_index = position
+        position += 1
+
+    declaration.header_start = position
+    if source.text(position) == "<":
+        position = _angle_end(source, position) + 1
+        if position == 0:
+            return None
+    if not _parse_parameters(source, declaration, position):
+        return None
+    if not _parse_block_body(source, declaration):
+        return None
+
+    start = index
+    while start > 0 and source.texts[start - 1] in _FUNCTION_MODIFIERS:
+        start -= 1
+    declaration.modifiers = source.texts[start:index]
+    declaration.start = start
+    if not declaration.name:
+        declaration.name, declaration.name_index = binding_name(source, start)
+    return declaration
+
+
+def _parse_parameters(source: JSTokens, declaration: FunctionDeclaration, paren_index: int) -> bool:
+    """Parâmetros entre parênteses em `paren_index` e a anotação de retorno opcional"""
+    if source.text(paren_index) != "(" or source.pairs[paren_index] == -1:
+        return False
+    close = source.pairs[paren_index]
+    declaration.params_start = paren_index + 1
+    declaration.params_end = close
+    declaration.header_end = close + 1
+    return True
+
+
+def _parse_block_body(source: JSTokens, declaration: FunctionDeclaration) -> bool:
+    """Anotação de retorno (": Tipo") e corpo "{ ... }" logo após os parâmetros"""
+    position = declaration.header_end
+    if source.text(position) == ":":
+        end = type_end(source, position, "{")
+        if end == -1:
+            return False
+        declaration.return_start = position + 1
+        declaration.return_end = end
+        declaration.header_end = position = end
+
+    if source.text(position) != "{" or source.pairs[position] == -1:
+        return False
+    declaration.body_open = position
+    declaration.body_start = position + 1
+    declaration.body_end = source.pairs[position]
+    return True
+
+
+def _parse_method(source: JSTokens, paren_index: int) -> Optional[FunctionDeclaration]:
+    """Método de classe ou de objeto literal cujo parêntese de parâmetros está em `paren_index`"""
+    name_end = paren_index - 1
+    header_start = paren_index
+    if source.text(name_end) == ">":
+        # Parâmetros de tipo do método: nome<T>(...)
+        header_start = _angle_start(source, name_end)
+        if header_start == -1:
+            return None
+        name_end = header_start - 1
+
+    if source.text(name_end) == "]" and source.pairs[name_end] != -1:
+        name_index = source.pairs[name_end]
+        name = source.render(name_index, name_end + 1)
+    elif source.kind(name_end) in ("ident", "string", "number"):
+        name_index = name_end
+        name = _strip_quotes(source.texts[name_end])
+    else:
+        return None
+    if source.text(name_index - 1) in (".", "?.", "function", "new"):
+        return None
+
+    # Métodos só existem dentro de chaves (corpo de classe ou objeto literal)
+    block = source.enclosing(name_index)
+    if block == -1 or source.texts[block] != "{":
+        return None
+
+    declaration = FunctionDeclaration("constructor" if name == "constructor" else "method")
+    declaration.name = name
+    declaration.name_index = name_index
+    declaration.header_start = header_start
+    if not _parse_parameters(source, declaration, paren_index):
+        return None
+    if not _parse_block_body(source, declaration):
+        return None
+
+    index = name_index - 1
+    if source.text(index) == "*":
+        declaration.is_generator = True
+        index -= 1
+    limit = max(block, name_index - MAX_DECLARATION_TOKENS)
+    while index > limit and source.texts[index] in MODIFIERS and source.kinds[index] != "op":
+        declaration.modifiers.append(source.texts[index])
+        index -= 1
+    declaration.modifiers.reverse()
+    declaration.start = index + 1
+
+    while index > limit:
+        decorator = _decorator_start(source, index)
+        if decorator == -1:
+            break
+        declaration.decorator_spans.append((decorator, index + 1))
+        index = decorator - 1
+    declaration.decorator_spans.reverse()
+
+    # Antes do prefixo só pode haver o início do bloco ou o fim de outro membro
+    first = declaration.decorator_spans[0][0] if declaration.decorator_spans else declaration.start
+    if source.texts[index] not in _BOUNDARIES and not source.statement_break(first):
+        return None
+    return declaration
+
+
+def _parse_arrow(source: JSTokens, arrow_index: int,
+                 expression_ends: Dict[int, int]) -> Optional[FunctionDeclaration]:
+    """Arrow function cujo "=>" está em `arrow_index`"""
+    declaration = FunctionDeclaration("arrow")
+    previous = arrow_index - 1
+    declaration.header_end = arrow_index
+
+    colon = -1
+    if (source.text(previous) == ")" and source.pairs[previous] != -1
+            and not _is_return_type_group(source, source.pairs[previous])):
+        params_open = source.pairs[previous]
+    else:
+        # Tipo de retorno: (a: number): string => ...
+        colon = _arrow_return_colon(source, previous)
+        params_open = source.pairs[colon - 1] if colon != -1 else -1
+    if colon == -1 and params_open == -1:
+        if source.kind(previous) != "ident":
+            return None
+        # Parâmetro único sem parênteses: x => ...
+        declaration.header_start = declaration.params_start = previous
+        declaration.params_end = arrow_index
+    elif colon != -1:
+        if _is_named_parens(source, params_open):
+            # Anotação de retorno de uma função nomeada: function f(a): (b: T) => U { ... }
+            return None
+        declaration.return_start = colon + 1
+        declaration.return_end = arrow_index
+
+    if params_open != -1:
+        declaration.params_start = params_open + 1
+        declaration.params_end = source.pairs[params_open]
+        declaration.header_start = params_open
+        if source.text(params_open - 1) == ">":
+            type_params = _angle_start(source, params_open - 1)
+            if type_params != -1:
+                declaration.header_start = type_params
+
+    start = declaration.header_start
+    if source.text(start - 1) == "async" and not source.breaks[start]:
+        start -= 1
+        declaration.modifiers.append("async")
+    declaration.start = start
+    declaration.name, declaration.name_index = binding_name(source, start)
+    if declaration.name_index > 0 and source.texts[declaration.name_index - 1] == "type":
+        # Alias de tipo função: type Handler = (e: Event) => void
+        return None
+
+    body = arrow_index + 1
+    if source.text(body) == "{" and source.pairs[body] != -1:
+        declaration.body_open = body
+        declaration.body_start = body + 1
+        declaration.body_end = source.pairs[body]
+    else:
+        declaration.body_start = body
+        declaration.body_end = expression_end(source, body, expression_ends)
+    expression_ends[arrow_index] = declaration.body_end
+    if declaration.body_open == -1 and _is_type_expression(source, body, declaration.body_end):
+        # Tipo função em anotação ou interface: onClick: (e: Event) => void
+        return None
+    return declaration
+
+
+def _is_type_expression(source: JSTokens, start: int, end: int) -> bool:
+    """A "expressão" só pode ser um tipo: palavra de tipo isolada, `Tipo<...>` ou `Tipo[]`"""
+    if end - start == 1 and source.texts[start] in _TYPE_WORDS:
+        return True
+    return end - start > 1 and (source.texts[end - 1] == ">"
+                                or (source.texts[end - 1] == "]" and source.texts[end - 2] == "["))
+
+
+def _is_return_type_group(source: JSTokens, open_index: int) -> bool:
+    """O "(" em `open_index` abre um tipo de retorno entre parênteses: (a): (T) => ..."""
+    colon = open_index - 1
+    return (source.text(colon) == ":" and source.text(colon - 1) == ")"
+            and source.pairs[colon - 1] != -1
+            and not _is_named_parens(source, source.pairs[colon - 1]))
+
+
+def _is_named_parens(source: JSTokens, open_index: int) -> bool:
+    """O "(" em `open_index` segue um nome: chamada ou parâmetros de função, não de arrow"""
+    previous = open_index - 1
+    if source.text(previous) == ">":
+        type_params = _angle_start(source, previous)
+        if type_params == -1:
+            return False
+        previous = type_params - 1
+    if source.text(previous) == "*":
+        previous -= 1
+    kind = source.kind(previous)
+    return (kind == "ident" and source.text(previous) != "async") or source.text(previous) == "function"
+
+
+def _arrow_return_colon(source: JSTokens, index: int) -> int:
+    """Índice do ":" da anotação de retorno de uma arrow function que termina em `index`"""
+    texts = source.texts
+    pairs = source.pairs
+    depth = 0
+    limit = max(0, index - MAX_DECLARATION_TOKENS)
+    while index > limit:
+        text = texts[index]
+        if text == ":" and depth == 0:
+            return index if texts[index - 1] == ")" and pairs[index - 1] != -1 else -1
+        if text == ">":
+            depth += 1
+        elif text == "<":
+            depth -= 1
+        elif text in (")", "]", "}") and pairs[index] != -1:
+            index = pairs[index]
+        elif text in (";", "=", "=>", "(", "[", "{", ")", "]", "}") or (text == "," and depth == 0):
+            return -1
+        index -= 1
+    return -1
+
+
+def expression_end(source: JSTokens, start: int, expression_ends: Optional[Dict[int, int]] = None) -> int:
+    """Fim (exclusivo) da expressão que começa em `start`
+
+    Termina em ",", ";", num delimitador que fecha o bloco externo ou num fim
+    de instrução implícito. Arrow functions aninhadas já medidas (em
+    `expression_ends`) são puladas de uma vez, o que mantém linear uma
+    cadeia `a => b => c => ...`.
+    """
+    texts = source.texts
+    pairs = source.pairs
+    breaks = source.breaks
+    expression_ends = expression_ends or {}
+    index = start
+    end = len(texts)
+    while index < end:
+        text = texts[index]
+        if text in (",", ";", ")", "]", "}"):
+            return index
+        if index > start and breaks[index] and source.statement_break(index):
+            return index
+        if text in ("(", "[", "{") and pairs[index] != -1:
+            index = pairs[index] + 1
+            continue
+        if text == "=>" and index in expression_ends:
+            index = expression_ends[index]
+            continue
+        index += 1
+    return end
+
+
+def find_declarations(source: JSTokens) -> List[FunctionDeclaration]:
+    """Todas as funções, arrow functions e métodos do código, na ordem em que começam
+
+    Uma passada encontra os candidatos ("function", "=>" e "(" seguido de
+    corpo); as arrow functions são reconhecidas de trás para frente para que
+    expressões aninhadas sejam medidas uma única vez.
+    """
+    texts = source.texts
+    kinds = source.kinds
+    pairs = source.pairs
+    declarations = []
+    arrows = []
+
+    for index, text in enumerate(texts):
+        if text == "function" and kinds[index] == "keyword":
+            declaration = _parse_function(source, index)
+        elif text == "=>":
+            arrows.append(index)
+            continue
+        elif (text == "(" and kinds[index] == "op" and pairs[index] != -1
+              and source.text(pairs[index] + 1) in ("{", ":")):
+            declaration = _parse_method(source, index)
+        else:
+            continue
+        if declaration is not None:
+            declarations.append(declaration)
+
+    expression_ends: Dict[int, int] = {}
+    for index in reversed(arrows):
+        declaration = _parse_arrow(source, index, expression_ends)
+        if declaration is not None:
+            declarations.append(declaration)
+
+    declarations.sort(key=lambda declaration: declaration.start)
+    return _without_type_positions(source, declarations)
+
+
+def _without_type_positions(source: JSTokens, declarations: List[FunctionDeclaration]) -> List[FunctionDeclaration]:
+    """Remove "funções" que são tipos de função em anotações: (cb: (x: T) => void) => ...
+
+    As anotações de parâmetros e de retorno de todas as declarações formam
+    intervalos; uma declaração que começa dentro de um deles é descartada
+    (uma varredura pelos intervalos ordenados).
+    """
+    spans = []
+    for declaration in declarations:
+        if declaration.return_start != -1:
+            spans.append((declaration.return_start, declaration.return_end))
+        for parameter in declaration.parameters(source):
+            if parameter.type_start != -1:
+                spans.append((parameter.type_start, parameter.type_end))
+    if not spans:
+        return declarations
+    spans.sort()
+
+    kept = []
+    span_index = 0
+    covered_until = -1
+    for declaration in declarations:
+        while span_index < len(spans) and spans[span_index][0] <= declaration.start:
+            covered_until = max(covered_until, spans[span_index][1])
+            span_index += 1
+        if declaration.start >= covered_until:
+            kept.append(declaration)
+    return kept
+
+
+def find_declaration(source: JSTokens,
+                     declarations: Optional[List[FunctionDeclaration]] = None) -> Optional[FunctionDeclaration]:
+    """Primeira função com nome do código, ou a primeira anônima se não houver"""
+    if declarations is None:
+        declarations = find_declarations(source)
+    for declaration in declarations:
+        if declaration.name:
+            return declaration
+    return declarations[0] if declarations else None
+
+
+def find_classes(source: JSTokens) -> List[ClassDeclaration]:
+    """Classes declaradas (inclusive expressões "class" atribuídas a um nome), em ordem"""
+    texts = source.texts
+    kinds = source.kinds
+    classes = []
+    for index, text in enumerate(texts):
+        if text != "class" or kinds[index] != "keyword" or source.text(index - 1) == ".":
+            continue
+        if source.kind(index + 1) == "ident":
+            name, name_index = texts[index + 1], index + 1
+        else:
+            start = index - 1 if source.text(index - 1) == "abstract" else index
+            name, name_index = binding_name(source, start)
+
+        body_open = source.find("{", index + 1, min(len(texts), index + 1 + MAX_DECLARATION_TOKENS),
+                                stop=";")
+        if body_open == -1:
+            continue
+        body_close = source.pairs[body_open]
+        classes.append(ClassDeclaration(name or "<anonymous>", name_index if name else index,
+                                        body_open, body_close if body_close != -1 else len(texts)))
+    return classes
@@ -0,0 +1,218 @@
+import re
+from typing import List, Optional
+
+from analyzers.cache import AnalysisCache
+from analyzers.java_lexer import JavaTokens
+from analyzers.metrics import timed
+
+
+# Palavras reservadas de JavaScript/TypeScript (modo estrito) e literais.
+# Palavras contextuais (async, of, get, set, as, type...) ficam como "ident".
+JS_KEYWORDS = frozenset({
+    "await", "break", "case", "catch", "class", "const", "continue", "debugger",
+    "default", "delete", "do", "else", "enum", "export", "extends", "finally",
+    "for", "function", "if", "implements", "import", "in", "instanceof",
+    "interface", "let", "new", "package", "private", "protected", "public",
+    "return", "static", "super", "switch", "this", "throw", "try", "typeof",
+    "var", "void", "while", "with", "yield", "true", "false", "null"
+})
+
+# Uma alternativa por tipo de token, como em java_lexer. Template literals e
+# expressões regulares dependem do contexto e são completados no laço.
+_TOKEN_PATTERN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+  | (?P<template>`)
+  | (?P<ident>\#?(?:[^\W\d]|\$)[\w$]*)
+  | (?P<number>\.?\d(?:[\w.]|(?<=[eE])[+-])*)
+  | (?P<op>=>|\?\.(?!\d)|\?\?=?|\.\.\.|===?|!==?|\*\*=?|\+\+|--|&&=?|\|\|=?|[<>]=|[+\-*/%&|^]=|<<=?|[\s\S])
+''', re.VERBOSE)
+
+# Trecho de template literal até o fim ("`"), até uma interpolação ("${") ou até o fim do código
+_TEMPLATE_CHUNK = re.compile(r"(?:[^`\\$]|\\[\s\S]|\$(?!\{))*(?P<end>`|\$\{)?")
+
+# Expressão regular literal: termina na mesma linha; "/" dentro de [...] não fecha
+_REGEX_LITERAL = re.compile(r"/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[\w$]*")
+
+# Palavras após as quais "/" é divisão (encerram uma expressão)
+_VALUE_KEYWORDS = frozenset({"this", "super", "true", "false", "null"})
+
+_OPENERS = {"(": ")", "{": "}", "[": "]"}
+_CLOSERS = {")": "(", "}": "{", "]": "["}
+
+# Operadores que, no início de uma linha, iniciam uma nova instrução em vez de continuar a anterior
+_STATEMENT_START_OPS = frozenset({"{", "}", ";", "++", "--", "!", "~", "@"})
+
+# Palavras que continuam a expressão da linha anterior
+_CONTINUATION_WORDS = frozenset({"in", "instanceof", "as", "satisfies"})
+
+# Palavras cujo cabeçalho "( ... )" é seguido por uma instrução, não por um operador
+_HEADER_KEYWORDS = frozenset({"if", "while", "for", "with"})
+
+
+class JSTokens(JavaTokens):
+    """Fluxo de tokens de um código JavaScript/TypeScript, em uma única passada
+
+    Mesmas listas paralelas (e os mesmos índices de pares e blocos) de
+    JavaTokens, com:
+
+    - `kinds[i]`: "keyword", "ident", "number", "string", "template", "regex" ou "op"
+    - `breaks[i]`: havia quebra de linha antes do token (inserção automática de ";")
+
+    Um template literal vira um token por trecho: "`a ${", "} b ${", "} c`".
+    As expressões interpoladas são tokens comuns, e as chaves de "${ }" não
+    entram no índice de pares. "/" inicia uma expressão regular quando o
+    token anterior não encerra uma expressão, ou quando é o ")" que fecha o
+    cabeçalho de um if/while/for/with.
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.kinds: List[str] = []
+        self.texts: List[str] = []
+        self.starts: List[int] = []
+        self.spaced: List[bool] = []
+        self.breaks: List[bool] = []
+        self.pairs: List[int] = []
+        self._newlines: Optional[List[int]] = None
+        self._parents: Optional[List[int]] = None
+        self._depths: Optional[List[int]] = None
+        self._pair_offsets = None
+
+        kinds = self.kinds
+        texts = self.texts
+        pairs = self.pairs
+        append_kind = kinds.append
+        append_text = texts.append
+        append_start = self.starts.append
+        append_spaced = self.spaced.append
+        append_break = self.breaks.append
+        append_pair = pairs.append
+        match_token = _TOKEN_PATTERN.match
+        stack: List[int] = []
+        spaced = False
+        broken = False
+        position = 0
+        length = len(code)
+
+        if code.startswith("#!"):
+            # Linha de hashbang (scripts executáveis)
+            position = code.find("\n") if "\n" in code else length
+
+        while position < length:
+            match = match_token(code, position)
+            kind = match.lastgroup
+            end = match.end()
+
+            if kind == "space" or kind == "comment":
+                spaced = True
+                broken = broken or "\n" in match.group()
+                position = end
+                continue
+
+            interpolation = False
+            if kind == "template":
+                chunk = _TEMPLATE_CHUNK.match(code, end)
+                end = chunk.end()
+                interpolation = chunk.group("end") == "${"
+            elif kind == "ident":
+                if match.group() in JS_KEYWORDS:
+                    kind = "keyword"
+            elif kind == "op" and code[position] == "/" and self._regex_allowed():
+                regex = _REGEX_LITERAL.match(code, position)
+                if regex is not None:
+                    kind = "regex"
+                    end = regex.end()
+            text = code[position:end]
+
+            if kind == "op" and text == "}" and stack and kinds[stack[-1]] == "template":
+                # Fim de uma interpolação "${ ... }": continua o template literal
+                stack.pop()
+                kind = "template"
+                chunk = _TEMPLATE_CHUNK.match(code, end)
+                end = chunk.end()
+                interpolation = chunk.group("end") == "${"
+                text = code[position:end]
+
+            append_kind(kind)
+            append_text(text)
+            append_start(position)
+            append_spaced(spaced)
+            append_break(broken)
+            append_pair(-1)
+            spaced = broken = False
+            position = end
+
+            if kind == "template":
+                if interpolation:
+                    stack.append(len(texts) - 1)
+                continue
+            if kind != "op":
+                continue
+            if text in _OPENERS:
+                stack.append(len(texts) - 1)
+            elif text in _CLOSERS:
+                # Fecha o delimitador correspondente mais próximo, sem atravessar interpolações
+                opener = _CLOSERS[text]
+                while stack and texts[stack[-1]] != opener and kinds[stack[-1]] != "template":
+                    stack.pop()
+                if stack and texts[stack[-1]] == opener:
+                    open_index = stack.pop()
+                    index = len(texts) - 1
+                    pairs[open_index] = index
+                    pairs[index] = open_index
+
+    def _regex_allowed(self) -> bool:
+        """Um "/" neste ponto inicia expressão regular (o token anterior não encerra expressão)"""
+        if not self.texts:
+            return True
+        kind = self.kinds[-1]
+        if kind == "op":
+            if self.texts[-1] == ")":
+                # `if (s) /}/.test(s)`: depois do cabeçalho vem uma instrução
+                opener = self.pairs[-1]
+                return (opener > 0 and self.kinds[opener - 1] == "keyword"
+                        and self.texts[opener - 1] in _HEADER_KEYWORDS)
+            return self.texts[-1] not in ("]", "}")
+        if kind == "keyword":
+            return self.texts[-1] not in _VALUE_KEYWORDS
+        return False
+
+    def ends_expression(self, index: int) -> bool:
+        """O token pode encerrar uma expressão (identificador, literal, ")", "]", "}"...)"""
+        kind = self.kind(index)
+        if kind in ("ident", "number", "string", "regex"):
+            return True
+        if kind == "template":
+            return self.texts[index].endswith("`")
+        if kind == "keyword":
+            return self.texts[index] in _VALUE_KEYWORDS
+        return self.text(index) in (")", "]", "}", "++", "--")
+
+    def statement_break(self, index: int) -> bool:
+        """Há um fim de instrução implícito (sem ";") antes do token `index`
+
+        Vale quando o token começa uma nova linha, o anterior encerra uma
+        expressão e o próprio token não continua a expressão anterior.
+        """
+        if index >= len(self.texts) or not self.breaks[index] or not self.ends_expression(index - 1):
+            return False
+        kind = self.kinds[index]
+        text = self.texts[index]
+        if kind == "op":
+            return text in _STATEMENT_START_OPS
+        if kind == "template":
+            return False
+        return text not in _CONTINUATION_WORDS
+
+
+# Tokenização cronometrada na fase "tokenize"
+_tokenize = timed("tokenize", JSTokens)
+
+
+def tokenize_js(code: str, cache: Optional[AnalysisCache] = None) -> JSTokens:
+    """Tokeniza o código, reaproveitando os tokens do cache quando disponível"""
+    if cache is None:
+        return _tokenize(code)
+    return cache.get_tree(code, "javascript", _tokenize)
@@ -0,0 +1,36 @@
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class Lazy(Generic[T]):
+    """Valor criado por `factory` no primeiro uso, uma única vez por processo
+
+    Usado pelo servidor para adiar imports e inicializações caras (backends
+    de linguagem, banco persistente) até a primeira ferramenta que precisa
+    deles, deixando a partida só com o registro das ferramentas.
+    """
+
+    __slots__ = ("_factory", "_value", "_lock")
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Any = _MISSING
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        value = self._value
+        if value is _MISSING:
+            with self._lock:
+                value = self._value
+                if value is _MISSING:
+                    value = self._value = self._factory()
+        return value
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not _MISSING
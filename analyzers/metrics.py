@@ -0,0 +1,255 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+
+# MCP_QA_METRICS=0 desativa as métricas; a decisão é tomada na importação, então
+# com as métricas desligadas `timed` devolve a própria função, sem nenhum custo
+METRICS_ENABLED = os.environ.get("MCP_QA_METRICS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Limites superiores (ms) dos buckets de latência; o último bucket é aberto
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Limites superiores (caracteres) das faixas de tamanho de entrada
+SIZE_BUCKETS = (1024, 4 * 1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024)
+SIZE_LABELS = ("<1KB", "<4KB", "<16KB", "<64KB", "<256KB", "<1MB", ">=1MB")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Fases acumuladas da chamada de ferramenta em andamento na thread atual
+_local = threading.local()
+
+
+class Histogram:
+    """Histograma de latências em buckets fixos"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def quantile(self, fraction: float) -> float:
+        """Estimativa do quantil: limite superior do bucket que o contém"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                if index == len(LATENCY_BUCKETS_MS):
+                    return round(self.max, 3)
+                return min(float(LATENCY_BUCKETS_MS[index]), round(self.max, 3))
+        return round(self.max, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.quantile(0.50),
+            "p99_ms": self.quantile(0.99),
+            "buckets_ms": {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class ToolMetrics:
+    """Contadores e histogramas de uma ferramenta"""
+
+    __slots__ = ("calls", "errors", "latency", "by_size", "phases")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        # Faixa de tamanho -> [chamadas, erros, histograma]
+        self.by_size: Dict[str, List[Any]] = {}
+        self.phases: Dict[str, Histogram] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency": self.latency.to_dict(),
+            "by_input_size": {
+                label: {"calls": calls, "errors": errors, "latency": histogram.to_dict()}
+                for label, (calls, errors, histogram) in sorted(
+                    self.by_size.items(), key=lambda item: SIZE_LABELS.index(item[0]))
+            },
+            "phases": {name: histogram.to_dict() for name, histogram in sorted(self.phases.items())}
+        }
+
+
+def size_label(size: int) -> str:
+    """Faixa de tamanho de uma entrada com `size` caracteres"""
+    return SIZE_LABELS[bisect_left(SIZE_BUCKETS, size + 1)]
+
+
+def add_phase(name: str, seconds: float) -> None:
+    """Soma `seconds` à fase `name` da chamada em andamento, se houver"""
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+class _PhaseTimer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "_PhaseTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        add_phase(self.name, time.perf_counter() - self.start)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def phase(name: str) -> Any:
+    """Context manager que cronometra uma fase da chamada em andamento
+
+    As fases podem se aninhar (ex.: "unparse" acontece dentro de "walk"),
+    então os tempos são inclusivos.
+    """
+    if not METRICS_ENABLED:
+        return _NOOP_TIMER
+    return _PhaseTimer(name)
+
+
+def measure_phases(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, float]]:
+    """Executa fn(*args) e devolve (resultado, tempo de cada fase)
+
+    Para análises feitas em outro processo: os tempos voltam junto com o
+    resultado e são registrados pelo servidor com `ServerMetrics.record`.
+    """
+    phases: Dict[str, float] = {}
+    previous = getattr(_local, "phases", None)
+    _local.phases = phases
+    try:
+        return fn(*args), phases
+    finally:
+        _local.phases = previous
+
+
+def timed(name: str, fn: F) -> F:
+    """Versão de `fn` que acumula seu tempo na fase `name`; a própria `fn` se desligado"""
+    if not METRICS_ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        phases = getattr(_local, "phases", None)
+        if phases is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    return wrapper  # type: ignore[return-value]
+
+
+class ServerMetrics:
+    """Histogramas de latência por ferramenta, fase e faixa de tamanho de entrada
+
+    `call` executa a ferramenta na thread atual registrando o tempo total, se
+    o resultado foi um erro, e o tempo de cada fase cronometrada pelos
+    analisadores durante a chamada. Análises enviadas a outros processos
+    (modo "process" e lotes) entram só no tempo total; a varredura de
+    projetos traz as fases dos processos com `measure_phases`.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._tools: Dict[str, ToolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def call(self, tool: str, size: int, fn: Callable[..., Any], *args: Any) -> Any:
+        """Executa fn(*args) registrando as métricas da ferramenta `tool`"""
+        if not self.enabled:
+            return fn(*args)
+
+        phases: Dict[str, float] = {}
+        previous = getattr(_local, "phases", None)
+        _local.phases = phases
+        error = True
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+            error = isinstance(result, dict) and "error" in result
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            _local.phases = previous
+            self.record(tool, size, elapsed, error, phases)
+
+    def record(self, tool: str, size: int, seconds: float, error: bool = False,
+               phases: Optional[Dict[str, float]] = None) -> None:
+        """Registra uma chamada já medida"""
+        label = size_label(size)
+        with self._lock:
+            metrics = self._tools.get(tool)
+            if metrics is None:
+                metrics = self._tools[tool] = ToolMetrics()
+            metrics.calls += 1
+            metrics.errors += error
+            metrics.latency.observe(seconds * 1000)
+
+            bucket = metrics.by_size.get(label)
+            if bucket is None:
+                bucket = metrics.by_size[label] = [0, 0, Histogram()]
+            bucket[0] += 1
+            bucket[1] += error
+            bucket[2].observe(seconds * 1000)
+
+            for name, phase_seconds in (phases or {}).items():
+                histogram = metrics.phases.get(name)
+                if histogram is None:
+                    histogram = metrics.phases[name] = Histogram()
+                histogram.observe(phase_seconds * 1000)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self.started_at = time.time()
+
+    def stats(self, tools: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Histogramas por ferramenta (todas, ou só as de `tools`)"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "tools": {name: metrics.to_dict() for name, metrics in sorted(self._tools.items())
+                          if not tools or name in tools}
+            }
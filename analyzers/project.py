@@ -0,0 +1,332 @@
+import asyncio
+import fnmatch
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Dict, List, Any, Awaitable, Callable, Iterator, Optional
+
+from analyzers.batch import JS_LANGUAGES, BatchAnalyzer, get_backends
+from analyzers.cache import content_hash
+from analyzers.metrics import ServerMetrics, measure_phases
+from analyzers.store import AnalysisStore, StoredEntry
+
+
+# Extensões analisadas e a linguagem correspondente
+SOURCE_EXTENSIONS = {
+    ".py": "python",
+    ".java": "java",
+    ".js": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".mts": "typescript",
+    ".cts": "typescript"
+}
+
+# Diretórios ignorados por padrão durante a varredura
+DEFAULT_EXCLUDED_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", "target",
+    "build", "dist"
+}
+
+# (concluídos, total ou None enquanto a descoberta não terminou, resultado do arquivo)
+ProgressCallback = Callable[[int, Optional[int], Dict[str, Any]], Awaitable[None]]
+
+
+def _matches(relative_path: str, patterns: List[str]) -> bool:
+    """Verifica se o caminho relativo casa com algum padrão glob"""
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(name, pattern)
+               for pattern in patterns)
+
+
+def discover_files(root: str, include: Optional[List[str]] = None,
+                   exclude: Optional[List[str]] = None) -> Iterator[str]:
+    """Percorre a árvore e devolve caminhos relativos (com "/") dos arquivos de SOURCE_EXTENSIONS"""
+    include = include or []
+    exclude = exclude or []
+    stack = [""]
+
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, relative_dir)) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in DEFAULT_EXCLUDED_DIRS and not _matches(relative_path, exclude):
+                    subdirs.append(relative_path)
+            elif os.path.splitext(entry.name)[1] in SOURCE_EXTENSIONS:
+                if exclude and _matches(relative_path, exclude):
+                    continue
+                if include and not _matches(relative_path, include):
+                    continue
+                yield relative_path
+
+        # Pilha em ordem reversa para visitar os subdiretórios em ordem alfabética
+        stack.extend(reversed(subdirs))
+
+
+def analyze_file(root: str, relative_path: str,
+                 known_hash: Optional[str] = None) -> Dict[str, Any]:
+    """Analisa um arquivo do projeto e devolve um resumo compacto por função
+
+    Se o hash do conteúdo for igual a `known_hash`, a análise é pulada e o
+    resultado traz apenas {"path", "content_hash", "unchanged": True}.
+    """
+    language = SOURCE_EXTENSIONS[os.path.splitext(relative_path)[1]]
+    result: Dict[str, Any] = {"path": relative_path, "language": language}
+
+    try:
+        with open(os.path.join(root, relative_path), encoding="utf-8", errors="replace") as source:
+            code = source.read()
+
+        result["content_hash"] = content_hash(code)
+        if result["content_hash"] == known_hash:
+            return {"path": relative_path, "content_hash": known_hash, "unchanged": True}
+
+        backends = get_backends()
+        functions = []
+
+        if language == "python":
+            module = backends.python_engine.analyze_module(code)
+            if "error" in module:
+                result["error"] = module["error"]
+                return result
+
+            for function in module["functions"]:
+                functions.append({
+                    "qualified_name": function["qualified_name"],
+                    "lineno": function["lineno"],
+                    "signature": function["static_analysis"].get("signature"),
+                    "complexity_score": function["flow_analysis"]["complexity_score"]
+                })
+        elif language in JS_LANGUAGES:
+            module = backends.js_engine.analyze_module(code)
+            if "error" in module:
+                result["error"] = module["error"]
+                return result
+
+            for function in module["functions"]:
+                functions.append({
+                    "qualified_name": function["qualified_name"],
+                    "lineno": function["lineno"],
+                    "signature": function["static_analysis"].get("signature"),
+                    "complexity_score": function["flow_analysis"].get("complexity_score", 0)
+                })
+        else:
+            java_class = backends.java_engine.analyze_class(code)
+            if "error" in java_class:
+                result["error"] = java_class["error"]
+                return result
+
+            for method in java_class["methods"]:
+                functions.append({
+                    "qualified_name": method["qualified_name"],
+                    "lineno": method["lineno"],
+                    "signature": method["static_analysis"].get("signature"),
+                    "complexity_score": method["flow_analysis"].get("complexity_score", 0)
+                })
+
+        result["function_count"] = len(functions)
+        result["max_complexity"] = max((f["complexity_score"] for f in functions), default=0)
+        result["functions"] = functions
+        return result
+    except Exception as e:
+        result["error"] = f"Erro ao analisar arquivo: {str(e)}"
+        return result
+
+
+def _analyze_measured(root: str, relative_path: str,
+                      known_hash: Optional[str] = None) -> tuple:
+    """(resultado de analyze_file, tempo de cada fase, tamanho do arquivo), no processo do pool"""
+    result, phases = measure_phases(analyze_file, root, relative_path, known_hash)
+    try:
+        size = os.path.getsize(os.path.join(root, relative_path))
+    except OSError:
+        size = 0
+    return result, phases, size
+
+
+class ProjectScanner:
+    """Varre um diretório e analisa os arquivos em paralelo
+
+    No máximo `2 * max_workers` arquivos ficam em processamento ao mesmo
+    tempo, então a memória não cresce com o tamanho do projeto, e cada
+    arquivo concluído é reportado imediatamente pelo callback de progresso.
+    A descoberta dos arquivos é feita aos poucos, junto com a análise: o
+    total só é conhecido (e repassado ao callback) quando ela termina.
+
+    Com um AnalysisStore, arquivos com mesmo mtime/tamanho são respondidos
+    direto do disco, e arquivos apenas "tocados" (mesmo hash) não são
+    reanalisados. A travessia do diretório, os `stat` e o acesso ao banco
+    rodam em threads, sem bloquear o event loop.
+
+    Com `metrics`, cada varredura é registrada como a ferramenta
+    "scan_project", com as fases medidas nos processos do pool e o tamanho
+    somado dos arquivos analisados.
+    """
+
+    metrics_name = "scan_project"
+
+    def __init__(self, batch_analyzer: BatchAnalyzer, store: Optional[AnalysisStore] = None,
+                 metrics: Optional[ServerMetrics] = None):
+        self.batch_analyzer = batch_analyzer
+        self.store = store
+        self.metrics = metrics
+
+    async def scan(self, root: str, include: Optional[List[str]] = None,
+                   exclude: Optional[List[str]] = None,
+                   on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Analisa todos os arquivos encontrados e devolve o resumo do projeto"""
+        if self.metrics is None or not self.metrics.enabled:
+            return await self._scan(root, include, exclude, on_progress)
+
+        phases: Dict[str, float] = {}
+        sizes: List[int] = []
+        error = True
+        start = time.perf_counter()
+        try:
+            result = await self._scan(root, include, exclude, on_progress, phases, sizes)
+            error = "error" in result
+            return result
+        finally:
+            self.metrics.record(self.metrics_name, sum(sizes), time.perf_counter() - start,
+                                error, phases)
+
+    async def _scan(self, root: str, include: Optional[List[str]],
+                    exclude: Optional[List[str]], on_progress: Optional[ProgressCallback],
+                    phases: Optional[Dict[str, float]] = None,
+                    sizes: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Varredura em si; com `phases`, soma nele as fases e em `sizes` o tamanho dos arquivos"""
+        root = os.path.abspath(os.path.expanduser(root))
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, os.path.isdir, root):
+            return {"error": f"Diretório não encontrado: {root}"}
+
+        paths = discover_files(root, include, exclude)
+        executor = self.batch_analyzer.get_executor()
+        window = max(1, self.batch_analyzer.max_workers * 2)
+
+        files: List[Dict[str, Any]] = []
+        present: List[str] = []
+        pending: Dict[asyncio.Future, tuple] = {}
+        discovered = 0
+        total: Optional[int] = None
+        cached_count = 0
+
+        async def emit(file_result: Dict[str, Any]) -> None:
+            files.append(file_result)
+            if on_progress is not None:
+                await on_progress(len(files), total, file_result)
+
+        try:
+            while total is None or pending:
+                if total is None and len(pending) < window:
+                    wanted = window - len(pending)
+                    batch = await loop.run_in_executor(None, self._next_batch, root, paths, wanted)
+                    discovered += len(batch)
+                    if len(batch) < wanted:
+                        total = discovered
+
+                    for relative_path, stat, entry, cached in batch:
+                        present.append(os.path.join(root, relative_path))
+                        if cached is not None:
+                            cached_count += 1
+                            await emit(cached)
+                            continue
+                        known_hash = entry.content_hash if entry is not None else None
+                        worker = analyze_file if phases is None else _analyze_measured
+                        future = loop.run_in_executor(executor, worker, root,
+                                                      relative_path, known_hash)
+                        pending[future] = (relative_path, stat, entry)
+                    if batch and len(pending) < window:
+                        continue
+
+                if not pending:
+                    continue
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    relative_path, stat, entry = pending.pop(future)
+                    try:
+                        file_result = future.result()
+                        if phases is not None:
+                            file_result, file_phases, size = file_result
+                            sizes.append(size)
+                            for name, seconds in file_phases.items():
+                                phases[name] = phases.get(name, 0.0) + seconds
+                    except BrokenProcessPool as e:
+                        # Um processo morreu: descarta o pool e segue com um novo
+                        self.batch_analyzer.reset_executor()
+                        executor = self.batch_analyzer.get_executor()
+                        file_result = {"path": relative_path,
+                                       "error": f"Erro ao analisar arquivo: {str(e)}"}
+
+                    if file_result.get("unchanged"):
+                        # Conteúdo idêntico ao persistido: só atualiza mtime/tamanho
+                        cached_count += 1
+                        file_result = await loop.run_in_executor(
+                            None, self._refresh, root, relative_path, stat, entry
+                        )
+                    elif self.store is not None and stat is not None and "content_hash" in file_result:
+                        await loop.run_in_executor(None, self.store.put, os.path.join(root, relative_path),
+                                                   stat, file_result["content_hash"], file_result)
+
+                    await emit(file_result)
+
+            if self.store is not None:
+                # Varredura completa: descarta registros de arquivos que sumiram
+                await loop.run_in_executor(None, self.store.prune, root, present)
+        finally:
+            for future in pending:
+                future.cancel()
+            if self.store is not None:
+                await loop.run_in_executor(None, self.store.commit)
+
+        files.sort(key=lambda file_result: file_result["path"])
+        return {
+            "root": root,
+            "file_count": discovered,
+            "cached_count": cached_count,
+            "error_count": sum(1 for file_result in files if "error" in file_result),
+            "function_count": sum(file_result.get("function_count", 0) for file_result in files),
+            "files": files
+        }
+
+    def _next_batch(self, root: str, paths: Iterator[str], count: int) -> List[tuple]:
+        """Próximos `count` arquivos descobertos: (caminho, stat, registro, resultado em cache)
+
+        Executado em uma thread: avança a travessia do diretório, faz o `stat`
+        e consulta o banco; o resultado vem pronto para arquivos inalterados.
+        """
+        batch = []
+        for relative_path in islice(paths, count):
+            stat, entry = self._lookup(root, relative_path)
+            cached = entry.result() if entry is not None and entry.matches(stat) else None
+            batch.append((relative_path, stat, entry, cached))
+        return batch
+
+    def _refresh(self, root: str, relative_path: str, stat: os.stat_result,
+                 entry: StoredEntry) -> Dict[str, Any]:
+        """Atualiza mtime/tamanho de um arquivo apenas tocado e devolve o resultado persistido"""
+        self.store.touch(os.path.join(root, relative_path), stat)
+        return entry.result()
+
+    def _lookup(self, root: str, relative_path: str) -> tuple:
+        """Retorna (stat, registro persistido) do arquivo, quando há um store"""
+        if self.store is None:
+            return None, None
+        absolute_path = os.path.join(root, relative_path)
+        try:
+            stat = os.stat(absolute_path)
+        except OSError:
+            return None, None
+        return stat, self.store.get(absolute_path)
@@ -0,0 +1,178 @@
+import re
+import string
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Estimativa de tokens sem tokenizador: cada símbolo é um token e as palavras
+# rendem ~4 bytes por token (ao menos um por palavra); só usa bytes.translate
+_SYMBOLS = string.punctuation.encode()
+_WHITESPACE = string.whitespace.encode()
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_]\w*")
+
+# Passos de compactação, em ordem de prioridade (do que menos perde informação
+# para o que mais perde); cada um só é ativado se o anterior não bastou
+COMPACTION_STEPS = (
+    "dedupe_scenarios",
+    "drop_irrelevant_imports",
+    "abbreviate_conditions",
+    "short_skeleton",
+    "trim_scenarios"
+)
+
+# Condições maiores que isto são abreviadas no passo "abbreviate_conditions"
+MAX_CONDITION_CHARS = 48
+
+FLOW_SEPARATOR = " -> "
+
+
+def estimate_tokens(text: str) -> int:
+    """Quantidade estimada de tokens de `text`"""
+    data = text.encode()
+    words = data.translate(None, _SYMBOLS)
+    letters = len(words.translate(None, _WHITESPACE))
+    symbols = len(data) - len(words)
+    if not letters:
+        return symbols
+    return symbols + max(len(words) - letters + 1, (letters + 3) // 4)
+
+
+def abbreviate(text: str, limit: int = MAX_CONDITION_CHARS) -> str:
+    """`text` cortado em `limit` caracteres, terminando em reticências"""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
+
+
+def referenced_names(static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any]) -> set:
+    """Identificadores que a função realmente usa: assinatura, tipos, chamadas e fluxo"""
+    dependencies = static_analysis.get("dependencies", {})
+    texts = [
+        static_analysis.get("signature", ""),
+        static_analysis.get("return_type", ""),
+        flow_analysis.get("summary", "")
+    ]
+    texts += [str(param.get("type", "")) for param in static_analysis.get("parameters", [])]
+    texts += dependencies.get("internal_calls", []) + dependencies.get("method_calls", [])
+    texts += static_analysis.get("exceptions", [])
+    texts += [annotation["name"] for annotation in static_analysis.get("annotations", [])
+              if isinstance(annotation, dict) and "name" in annotation]
+    texts += [str(element.get("condition", "")) for element in flow_analysis.get("flow_map", [])]
+    return set(_IDENTIFIER_PATTERN.findall(" ".join(texts)))
+
+
+def is_relevant_import(name: str, names: set) -> bool:
+    """Import usado pela função: último ou primeiro segmento referenciado, ou curinga"""
+    segments = name.split(".")
+    return segments[-1] == "*" or segments[-1] in names or segments[0] in names
+
+
+class PromptCompactor:
+    """Compacta um prompt até caber em `max_tokens`
+
+    Os geradores montam as seções passando cada parte (cenários, imports,
+    condições, resumo do fluxo) pelo compactador. `fit` ativa os passos de
+    COMPACTION_STEPS um a um, na ordem, e remonta o prompt até a estimativa
+    caber no orçamento. Sem orçamento nenhum passo é ativado e o prompt sai
+    exatamente como antes.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        self.max_tokens = max_tokens if max_tokens and max_tokens > 0 else None
+        self.applied: List[str] = []
+        self.scenario_limit: Optional[int] = None
+        self._scenario_count = 0
+
+    def active(self, step: str) -> bool:
+        return step in self.applied
+
+    def scenarios(self, scenarios: List[str]) -> List[str]:
+        if self.active("dedupe_scenarios"):
+            scenarios = list(dict.fromkeys(scenarios))
+        self._scenario_count = len(scenarios)
+        if self.scenario_limit is not None and len(scenarios) > self.scenario_limit:
+            hidden = len(scenarios) - self.scenario_limit
+            scenarios = scenarios[:self.scenario_limit] + [f"+{hidden} cenários omitidos"]
+        return scenarios
+
+    def imports(self, imports: List[str], static_analysis: Dict[str, Any],
+                flow_analysis: Dict[str, Any]) -> List[str]:
+        if not self.active("drop_irrelevant_imports") or not imports:
+            return imports
+        names = referenced_names(static_analysis, flow_analysis)
+        return [name for name in imports if is_relevant_import(name, names)]
+
+    def condition(self, condition: str) -> str:
+        return abbreviate(condition) if self.active("abbreviate_conditions") else condition
+
+    def summary(self, summary: str) -> str:
+        """Resumo do fluxo com as mesmas abreviações e cortes dos cenários"""
+        if not self.active("abbreviate_conditions") and self.scenario_limit is None:
+            return summary
+        parts = summary.split(FLOW_SEPARATOR)
+        if self.active("abbreviate_conditions"):
+            parts = [part if len(part) <= MAX_CONDITION_CHARS
+                     else abbreviate(part, MAX_CONDITION_CHARS - 1) + ")" for part in parts]
+        if self.scenario_limit is not None and len(parts) > max(self.scenario_limit, 1):
+            parts = parts[:max(self.scenario_limit, 1)] + ["…"]
+        return FLOW_SEPARATOR.join(parts)
+
+    def fit(self, render: Callable[[], Tuple[str, Dict[str, str]]]) -> Tuple[str, Dict[str, str]]:
+        """Monta o prompt com `render`, ativando passos até caber no orçamento
+
+        `render` devolve o prompt e as seções variáveis usadas nele.
+        """
+        prompt, sections = render()
+        if self.max_tokens is None:
+            return prompt, sections
+
+        for step in COMPACTION_STEPS:
+            if estimate_tokens(prompt) <= self.max_tokens:
+                break
+            if step == "trim_scenarios":
+                prompt, sections = self._trim_scenarios(render, prompt, sections)
+                continue
+            self.applied.append(step)
+            compacted, compacted_sections = render()
+            if compacted == prompt:
+                self.applied.pop()  # Passo sem efeito neste prompt
+            else:
+                prompt, sections = compacted, compacted_sections
+        return prompt, sections
+
+    def _trim_scenarios(self, render: Callable[[], Tuple[str, Dict[str, str]]], prompt: str,
+                        sections: Dict[str, str]) -> Tuple[str, Dict[str, str]]:
+        """Maior quantidade de cenários que cabe no orçamento (busca binária)"""
+        count = self._scenario_count
+        if not count:
+            return prompt, sections
+        self.applied.append("trim_scenarios")
+        low, high = 0, count - 1
+        best = None
+        while low <= high:
+            self.scenario_limit = (low + high) // 2
+            candidate = render()
+            if estimate_tokens(candidate[0]) <= self.max_tokens:
+                best = (self.scenario_limit, candidate)
+                low = self.scenario_limit + 1
+            else:
+                high = self.scenario_limit - 1
+        if best is None:
+            # Nem sem cenários cabe: fica com o menor prompt possível
+            self.scenario_limit = 0
+            return render()
+        self.scenario_limit = best[0]
+        return best[1]
+
+    def report(self, prompt: str, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Tokens estimados por seção (e do texto fixo do modelo) e passos aplicados"""
+        total = estimate_tokens(prompt)
+        tokens = {name: estimate_tokens(text) for name, text in sections.items()}
+        tokens["template"] = max(0, total - sum(tokens.values()))
+        tokens["total"] = total
+
+        report: Dict[str, Any] = {"estimated_tokens": tokens}
+        if self.max_tokens is not None:
+            report["max_prompt_tokens"] = self.max_tokens
+            report["within_budget"] = total <= self.max_tokens
+            report["compaction"] = list(self.applied)
+        return report
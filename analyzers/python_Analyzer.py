@@ -0,0 +1,835 @@
+import ast
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple, Union
+from analyzers.cache import AnalysisCache
+from analyzers.flow import (
+    Conditional, Else, ExceptionRaise, FlowNode, LoopFor, LoopWhile, Return, TryExcept
+)
+from analyzers.metrics import phase, timed
+from analyzers.prompt_budget import PromptCompactor
+from analyzers.python_render import ExpressionRenderer
+from analyzers.python_symbols import SymbolIndex
+from analyzers.templates import TemplateRegistry, get_registry
+
+
+# Parse cronometrado na fase "parse" (sem custo com métricas desligadas); o texto
+# das expressões vem do ExpressionRenderer, cronometrado na fase "unparse"
+_parse = timed("parse", ast.parse)
+
+# Converte um nó de expressão em texto (ExpressionRenderer.render)
+Render = Callable[[ast.AST], str]
+
+# Esqueleto usado quando não há modelo para a linguagem/framework pedidos
+DEFAULT_SKELETON = ("python", "pytest")
+
+
+def parse_python(code: str, cache: Optional[AnalysisCache] = None) -> ast.AST:
+    """Faz o parse do código, reaproveitando a árvore do cache quando disponível"""
+    if cache is None:
+        return _parse(code)
+    return cache.get_tree(code, "python", _parse)
+
+
+def symbol_index(code: str, cache: Optional[AnalysisCache] = None) -> SymbolIndex:
+    """Índice de símbolos do módulo, montado uma vez por conteúdo (na camada de parse do cache)"""
+    if cache is None:
+        return SymbolIndex(code, _parse(code))
+    return cache.get_tree(code, "python:symbols",
+                          lambda code: SymbolIndex(code, parse_python(code, cache)))
+
+
+class StaticAnalyzer:
+    """Analisador estático de código Python"""
+    
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+    
+    def analyze_function(self, code: str) -> Dict[str, Any]:
+        """Extrai informações estruturais de uma função"""
+        try:
+            tree = parse_python(code, self.cache)
+            function_node = None
+            
+            # Encontrar a primeira função no código
+            for node in ast.walk(tree):
+                if isinstance(node, ast.FunctionDef):
+                    function_node = node
+                    break
+            
+            if not function_node:
+                raise ValueError("Nenhuma função encontrada no código")
+            
+            render = ExpressionRenderer(code).render
+            return {
+                "signature": self._extract_signature(function_node, render),
+                "parameters": self._extract_parameters(function_node, render),
+                "return_type": self._extract_return_type(function_node, render),
+                "dependencies": self._extract_dependencies(tree, render),
+                "decorators": self._extract_decorators(function_node, render)
+            }
+        except Exception as e:
+            return {"error": f"Erro na análise: {str(e)}"}
+    
+    def _extract_signature(self, node: ast.FunctionDef, render: Render) -> str:
+        """Extrai a assinatura completa da função"""
+        args = []
+        
+        # Argumentos posicionais
+        for arg in node.args.args:
+            arg_str = arg.arg
+            if arg.annotation:
+                arg_str += f": {render(arg.annotation)}"
+            args.append(arg_str)
+        
+        # Argumentos com valores padrão
+        defaults = node.args.defaults
+        default_offset = len(args) - len(defaults)
+        for i, default in enumerate(defaults):
+            args[default_offset + i] += f" = {render(default)}"
+        
+        # *args
+        if node.args.vararg:
+            vararg = f"*{node.args.vararg.arg}"
+            if node.args.vararg.annotation:
+                vararg += f": {render(node.args.vararg.annotation)}"
+            args.append(vararg)
+        
+        # **kwargs
+        if node.args.kwarg:
+            kwarg = f"**{node.args.kwarg.arg}"
+            if node.args.kwarg.annotation:
+                kwarg += f": {render(node.args.kwarg.annotation)}"
+            args.append(kwarg)
+        
+        signature = f"{node.name}({', '.join(args)})"
+        
+        # Tipo de retorno
+        if node.returns:
+            signature += f" -> {render(node.returns)}"
+        
+        return signature
+    
+    def _extract_parameters(self, node: ast.FunctionDef, render: Render) -> List[Dict[str, Any]]:
+        """Extrai informações detalhadas dos parâmetros"""
+        params = []
+        
+        for arg in node.args.args:
+            param_info = {
+                "name": arg.arg,
+                "type": render(arg.annotation) if arg.annotation else "Any",
+                "has_default": False,
+                "default_value": None
+            }
+            params.append(param_info)
+        
+        # Adicionar valores padrão
+        defaults = node.args.defaults
+        default_offset = len(params) - len(defaults)
+        for i, default in enumerate(defaults):
+            params[default_offset + i]["has_default"] = True
+            params[default_offset + i]["default_value"] = render(default)
+        
+        return params
+    
+    def _extract_return_type(self, node: ast.FunctionDef, render: Render) -> str:
+        """Extrai o tipo de retorno da função"""
+        if node.returns:
+            return render(node.returns)
+        return "Any"
+    
+    def _extract_dependencies(self, tree: ast.AST, render: Render) -> Dict[str, List[str]]:
+        """Extrai dependências internas e externas"""
+        imports = []
+        internal_calls = []
+        
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.append(alias.name)
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ""
+                for alias in node.names:
+                    imports.append(f"{module}.{alias.name}")
+            elif isinstance(node, ast.Call):
+                if isinstance(node.func, ast.Name):
+                    internal_calls.append(node.func.id)
+                elif isinstance(node.func, ast.Attribute):
+                    internal_calls.append(render(node.func))
+        
+        return {
+            "imports": list(dict.fromkeys(imports)),
+            "internal_calls": list(dict.fromkeys(internal_calls))
+        }
+    
+    def _extract_decorators(self, node: ast.FunctionDef, render: Render) -> List[str]:
+        """Extrai decoradores da função"""
+        return [render(decorator) for decorator in node.decorator_list]
+
+
+class FlowSummarizer:
+    """Resumidor de fluxo de execução"""
+    
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache
+    
+    def summarize_flow(self, code: str) -> Dict[str, Any]:
+        """Cria um mapa minimalista do fluxo da função"""
+        try:
+            tree = parse_python(code, self.cache)
+            function_node = None
+            
+            for node in ast.walk(tree):
+                if isinstance(node, ast.FunctionDef):
+                    function_node = node
+                    break
+            
+            if not function_node:
+                raise ValueError("Nenhuma função encontrada no código")
+            
+            flow_map = self._analyze_flow(function_node.body, ExpressionRenderer(code).render)
+            
+            return {
+                "flow_map": flow_map,
+                "complexity_score": self._calculate_complexity(flow_map),
+                "summary": self._generate_flow_summary(flow_map)
+            }
+        except Exception as e:
+            return {"error": f"Erro na análise de fluxo: {str(e)}"}
+    
+    def _analyze_flow(self, body: List[ast.stmt], render: Render) -> List[FlowNode]:
+        """Analisa o fluxo de controle do código"""
+        flow_elements: List[FlowNode] = []
+        
+        for node in body:
+            if isinstance(node, ast.If):
+                flow_elements.append(Conditional(
+                    render(node.test), len(node.orelse) > 0, self._analyze_flow(node.body, render)
+                ))
+                if node.orelse:
+                    flow_elements.append(Else(self._analyze_flow(node.orelse, render)))
+            
+            elif isinstance(node, ast.For):
+                flow_elements.append(LoopFor(
+                    render(node.target), render(node.iter), self._analyze_flow(node.body, render)
+                ))
+            
+            elif isinstance(node, ast.While):
+                flow_elements.append(LoopWhile(
+                    render(node.test), self._analyze_flow(node.body, render)
+                ))
+            
+            elif isinstance(node, ast.Try):
+                flow_elements.append(TryExcept(
+                    [render(handler.type) if handler.type else "Exception"
+                     for handler in node.handlers],
+                    len(node.finalbody) > 0,
+                    self._analyze_flow(node.body, render)
+                ))
+            
+            elif isinstance(node, ast.Raise):
+                flow_elements.append(ExceptionRaise(render(node.exc) if node.exc else "Re-raise"))
+            
+            elif isinstance(node, ast.Return):
+                flow_elements.append(Return(render(node.value) if node.value else "None"))
+        
+        return flow_elements
+    
+    def _calculate_complexity(self, flow_map: List[FlowNode]) -> int:
+        """Calcula complexidade ciclomática simplificada"""
+        complexity = 1  # Base complexity
+        
+        for element in flow_map:
+            if element["type"] in ["conditional", "loop_for", "loop_while"]:
+                complexity += 1
+            elif element["type"] == "try_except":
+                complexity += len(element["exceptions"])
+            
+            if "nested_flow" in element:
+                complexity += self._calculate_complexity(element["nested_flow"]) - 1
+        
+        return complexity
+    
+    def _generate_flow_summary(self, flow_map: List[FlowNode]) -> str:
+        """Gera resumo textual do fluxo"""
+        summary_parts = []
+        
+        for element in flow_map:
+            if element["type"] == "conditional":
+                summary_parts.append(f"IF({element['condition']})")
+            elif element["type"] == "loop_for":
+                summary_parts.append(f"FOR({element['target']} in {element['iter']})")
+            elif element["type"] == "loop_while":
+                summary_parts.append(f"WHILE({element['condition']})")
+            elif element["type"] == "try_except":
+                exceptions = ", ".join(element["exceptions"])
+                summary_parts.append(f"TRY-EXCEPT({exceptions})")
+            elif element["type"] == "exception_raise":
+                summary_parts.append(f"RAISE({element['exception']})")
+            elif element["type"] == "return":
+                summary_parts.append(f"RETURN({element['value']})")
+        
+        return " -> ".join(summary_parts)
+
+
+class FunctionFrame:
+    """Estado de fluxo acumulado para uma função durante a travessia"""
+    
+    __slots__ = ("node", "qualified_name", "kind", "flow_map", "complexity",
+                 "summary_parts", "calls")
+    
+    def __init__(self, node: Optional[ast.AST] = None, qualified_name: str = "",
+                 kind: str = "function"):
+        self.node = node
+        self.qualified_name = qualified_name
+        self.kind = kind
+        self.flow_map: List[FlowNode] = []
+        self.complexity = 1
+        self.summary_parts: List[str] = []
+        self.calls: List[str] = []
+    
+    def flow_result(self) -> Dict[str, Any]:
+        """Resultado no formato de FlowSummarizer.summarize_flow"""
+        return {
+            "flow_map": self.flow_map,
+            "complexity_score": self.complexity,
+            "summary": " -> ".join(self.summary_parts)
+        }
+
+
+class FusedFunctionVisitor(ast.NodeVisitor):
+    """Coleta em uma única travessia os dados das análises estática e de fluxo
+
+    Produz o mesmo resultado que StaticAnalyzer.analyze_function seguido de
+    FlowSummarizer.summarize_flow: a função escolhida é a primeira encontrada
+    por ast.walk (a de menor profundidade) e imports/chamadas são devolvidos
+    na mesma ordem em que ast.walk os visitaria.
+    """
+    
+    def __init__(self, render: Optional[Render] = None):
+        self.render = render or ExpressionRenderer().render
+        self.function_node: Optional[ast.FunctionDef] = None
+        self._frame = FunctionFrame()
+        self._best_depth: Optional[int] = None
+        self._depth = 0
+        self._flow: Optional[List[FlowNode]] = None
+        self._imports: List[tuple] = []
+        self._calls: List[tuple] = []
+    
+    # Nós sem filhos relevantes: não contêm chamadas, imports nem fluxo
+    _TERMINAL_NODES = (ast.Name, ast.Constant, ast.expr_context, ast.operator,
+                       ast.boolop, ast.unaryop, ast.cmpop)
+    
+    _dispatch: Dict[type, Any] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+    
+    def visit(self, node: ast.AST) -> None:
+        """Despacho com cache por classe de nó (evita getattr a cada visita)"""
+        method = self._dispatch.get(node.__class__)
+        if method is None:
+            method = self._resolve_visitor(node.__class__)
+        method(self, node)
+    
+    @classmethod
+    def _resolve_visitor(cls, node_class: type):
+        if issubclass(node_class, cls._TERMINAL_NODES):
+            method = cls._skip
+        else:
+            method = getattr(cls, "visit_" + node_class.__name__, cls.generic_visit)
+        cls._dispatch[node_class] = method
+        return method
+    
+    def _skip(self, node: ast.AST) -> None:
+        pass
+    
+    def generic_visit(self, node: ast.AST) -> None:
+        self._visit_children(node)
+    
+    def _visit_children(self, node: ast.AST,
+                        blocks: Optional[Dict[str, List[FlowNode]]] = None) -> None:
+        """Visita os filhos na ordem de ast.iter_child_nodes
+
+        `blocks` associa os campos de lista de statements que fazem parte do
+        fluxo da função à lista de fluxo que deve recebê-los.
+        """
+        outer_flow = self._flow
+        self._flow = None
+        self._depth += 1
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if blocks:
+                self._flow = blocks.get(field)
+            if value.__class__ is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+        self._depth -= 1
+        self._flow = outer_flow
+    
+    def _add_flow(self, flow: List[FlowNode], element: FlowNode,
+                  weight: int = 0, summary: Optional[str] = None) -> None:
+        """Registra um elemento de fluxo, acumulando complexidade e resumo"""
+        frame = self._frame
+        flow.append(element)
+        frame.complexity += weight
+        if summary is not None and flow is frame.flow_map:
+            frame.summary_parts.append(summary)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        if self._best_depth is not None and self._depth >= self._best_depth:
+            self.generic_visit(node)
+            return
+        
+        # Função mais rasa até agora: ast.walk a encontraria primeiro
+        self.function_node = node
+        self._best_depth = self._depth
+        self._frame = FunctionFrame(node)
+        self._visit_children(node, {"body": self._frame.flow_map})
+    
+    def visit_If(self, node: ast.If) -> None:
+        flow = self._flow
+        if flow is None:
+            self.generic_visit(node)
+            return
+        
+        condition = self.render(node.test)
+        nested: List[FlowNode] = []
+        self._add_flow(flow, Conditional(condition, len(node.orelse) > 0, nested),
+                       1, f"IF({condition})")
+        
+        blocks = {"body": nested}
+        if node.orelse:
+            else_nested: List[FlowNode] = []
+            self._add_flow(flow, Else(else_nested))
+            blocks["orelse"] = else_nested
+        
+        self._visit_children(node, blocks)
+    
+    def visit_For(self, node: ast.For) -> None:
+        flow = self._flow
+        if flow is None:
+            self.generic_visit(node)
+            return
+        
+        target = self.render(node.target)
+        iterable = self.render(node.iter)
+        nested: List[FlowNode] = []
+        self._add_flow(flow, LoopFor(target, iterable, nested), 1, f"FOR({target} in {iterable})")
+        self._visit_children(node, {"body": nested})
+    
+    def visit_While(self, node: ast.While) -> None:
+        flow = self._flow
+        if flow is None:
+            self.generic_visit(node)
+            return
+        
+        condition = self.render(node.test)
+        nested: List[FlowNode] = []
+        self._add_flow(flow, LoopWhile(condition, nested), 1, f"WHILE({condition})")
+        self._visit_children(node, {"body": nested})
+    
+    def visit_Try(self, node: ast.Try) -> None:
+        flow = self._flow
+        if flow is None:
+            self.generic_visit(node)
+            return
+        
+        exceptions = [self.render(handler.type) if handler.type else "Exception"
+                      for handler in node.handlers]
+        nested: List[FlowNode] = []
+        self._add_flow(flow, TryExcept(exceptions, len(node.finalbody) > 0, nested),
+                       len(exceptions), f"TRY-EXCEPT({', '.join(exceptions)})")
+        self._visit_children(node, {"body": nested})
+    
+    def visit_Raise(self, node: ast.Raise) -> None:
+        if self._flow is not None:
+            exception = self.render(node.exc) if node.exc else "Re-raise"
+            self._add_flow(self._flow, ExceptionRaise(exception), summary=f"RAISE({exception})")
+        self.generic_visit(node)
+    
+    def visit_Return(self, node: ast.Return) -> None:
+        if self._flow is not None:
+            value = self.render(node.value) if node.value else "None"
+            self._add_flow(self._flow, Return(value), summary=f"RETURN({value})")
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        self._imports.append((self._depth, [alias.name for alias in node.names]))
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        self._imports.append((self._depth, [f"{module}.{alias.name}" for alias in node.names]))
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            self._calls.append((self._depth, node.func.id))
+        elif isinstance(node.func, ast.Attribute):
+            self._calls.append((self._depth, self.render(node.func)))
+        self.generic_visit(node)
+    
+    def import_names(self) -> List[str]:
+        """Imports na ordem de ast.walk (profundidade, depois pré-ordem)"""
+        return [name
+                for _, names in sorted(self._imports, key=lambda item: item[0])
+                for name in names]
+    
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Imports e chamadas na ordem em que ast.walk os visitaria"""
+        internal_calls = [name for _, name in sorted(self._calls, key=lambda item: item[0])]
+        return {
+            "imports": list(dict.fromkeys(self.import_names())),
+            "internal_calls": list(dict.fromkeys(internal_calls))
+        }
+    
+    def flow_result(self) -> Dict[str, Any]:
+        """Resultado no formato de FlowSummarizer.summarize_flow"""
+        return self._frame.flow_result()
+
+
+class ModuleVisitor(FusedFunctionVisitor):
+    """Coleta fluxo e chamadas de todas as funções de um módulo em uma travessia
+
+    Cada função (inclusive métodos, funções aninhadas e `async def`) recebe
+    seu próprio FunctionFrame; as chamadas feitas no corpo são atribuídas à
+    função mais interna que as contém. Os imports de todo o módulo são
+    coletados uma única vez.
+    """
+    
+    def __init__(self, render: Optional[Render] = None):
+        super().__init__(render)
+        self.frames: List[FunctionFrame] = []
+        self._frame: Optional[FunctionFrame] = None
+        self._scope: List[str] = []
+        self._in_class: List[bool] = [False]
+    
+    def _visit_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        frame = FunctionFrame(
+            node,
+            ".".join(self._scope + [node.name]),
+            "method" if self._in_class[-1] else "function"
+        )
+        self.frames.append(frame)
+        
+        outer_frame = self._frame
+        outer_flow = self._flow
+        self._depth += 1
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if field == "body":
+                # Somente o corpo pertence ao escopo da função; decoradores,
+                # valores padrão e anotações são avaliados no escopo externo
+                self._frame = frame
+                self._flow = frame.flow_map
+                self._scope.extend([node.name, "<locals>"])
+                self._in_class.append(False)
+                for stmt in value:
+                    self.visit(stmt)
+                self._in_class.pop()
+                del self._scope[-2:]
+                self._frame = outer_frame
+            else:
+                self._flow = None
+                if value.__class__ is list:
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            self.visit(item)
+                elif isinstance(value, ast.AST):
+                    self.visit(value)
+        self._depth -= 1
+        self._flow = outer_flow
+    
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._scope.append(node.name)
+        self._in_class.append(True)
+        self.generic_visit(node)
+        self._in_class.pop()
+        self._scope.pop()
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        frame = self._frame
+        if frame is not None:
+            if isinstance(node.func, ast.Name):
+                frame.calls.append(node.func.id)
+            elif isinstance(node.func, ast.Attribute):
+                frame.calls.append(self.render(node.func))
+        self.generic_visit(node)
+    
+    def module_imports(self) -> List[str]:
+        """Tabela de imports do módulo, sem repetições, na ordem do código"""
+        return list(dict.fromkeys(name for _, names in self._imports for name in names))
+
+
+class PythonAnalysisEngine:
+    """Motor de análise Python em passagem única
+
+    Faz um único parse (compartilhado via cache) e uma única travessia da
+    árvore para produzir as análises estática e de fluxo de uma vez.
+    """
+    
+    def __init__(self, cache: Optional[AnalysisCache] = None, source_segments: bool = True):
+        self.cache = cache
+        self.static_analyzer = StaticAnalyzer(cache)
+        # False renderiza todas as expressões com ast.unparse (comparação nos benchmarks)
+        self.source_segments = source_segments
+    
+    def _renderer(self, code: str) -> ExpressionRenderer:
+        return ExpressionRenderer(code if self.source_segments else None)
+    
+    def analyze(self, code: str, qualified_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Retorna {"static": ..., "flow": ...} para a primeira função do código
+
+        Com `qualified_name` ("func", "Classe.metodo", "func.<locals>.interna"),
+        analisa essa função, inclusive `async def`, localizada pelo índice de
+        símbolos do módulo.
+        """
+        if qualified_name is not None:
+            return self._analyze_symbol(code, qualified_name)
+        try:
+            tree = parse_python(code, self.cache)
+            visitor = FusedFunctionVisitor(self._renderer(code).render)
+            with phase("walk"):
+                visitor.visit(tree)
+            
+            if not visitor.function_node:
+                raise ValueError("Nenhuma função encontrada no código")
+        except Exception as e:
+            return {
+                "static": {"error": f"Erro na análise: {str(e)}"},
+                "flow": {"error": f"Erro na análise de fluxo: {str(e)}"}
+            }
+        
+        return {
+            "static": self._build_static(visitor.function_node, visitor.dependencies(), visitor.render),
+            "flow": visitor.flow_result()
+        }
+    
+    def _analyze_symbol(self, code: str, qualified_name: str) -> Dict[str, Dict[str, Any]]:
+        """Análises de uma função do índice; só o corpo dela é percorrido"""
+        try:
+            index = symbol_index(code, self.cache)
+            node = index.lookup(qualified_name)
+            render = index.renderer.render if self.source_segments else ExpressionRenderer().render
+            visitor = ModuleVisitor(render)
+            with phase("walk"):
+                visitor.visit(node)
+        except Exception as e:
+            return {
+                "static": {"error": f"Erro na análise: {str(e)}"},
+                "flow": {"error": f"Erro na análise de fluxo: {str(e)}"}
+            }
+        
+        frame = visitor.frames[0]
+        dependencies = {
+            "imports": index.imports,
+            "internal_calls": list(dict.fromkeys(frame.calls))
+        }
+        return {
+            "static": self._build_static(node, dependencies, render),
+            "flow": frame.flow_result()
+        }
+    
+    def analyze_module(self, code: str) -> Dict[str, Any]:
+        """Analisa todas as funções, métodos e funções assíncronas do módulo"""
+        try:
+            tree = parse_python(code, self.cache)
+            visitor = ModuleVisitor(self._renderer(code).render)
+            with phase("walk"):
+                visitor.visit(tree)
+        except Exception as e:
+            return {"error": f"Erro na análise do módulo: {str(e)}"}
+        
+        imports = visitor.module_imports()
+        functions = []
+        for frame in visitor.frames:
+            node = frame.node
+            dependencies = {
+                "imports": imports,
+                "internal_calls": list(dict.fromkeys(frame.calls))
+            }
+            functions.append({
+                "name": node.name,
+                "qualified_name": frame.qualified_name,
+                "kind": frame.kind,
+                "is_async": isinstance(node, ast.AsyncFunctionDef),
+                "lineno": node.lineno,
+                "end_lineno": node.end_lineno,
+                "static_analysis": self._build_static(node, dependencies, visitor.render),
+                "flow_analysis": frame.flow_result()
+            })
+        
+        return {
+            "imports": imports,
+            "function_count": len(functions),
+            "functions": functions
+        }
+    
+    def _build_static(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+                      dependencies: Dict[str, List[str]], render: Render) -> Dict[str, Any]:
+        """Monta o resultado estático a partir dos dados coletados"""
+        analyzer = self.static_analyzer
+        try:
+            return {
+                "signature": analyzer._extract_signature(node, render),
+                "parameters": analyzer._extract_parameters(node, render),
+                "return_type": analyzer._extract_return_type(node, render),
+                "dependencies": dependencies,
+                "decorators": analyzer._extract_decorators(node, render)
+            }
+        except Exception as e:
+            return {"error": f"Erro na análise: {str(e)}"}
+
+
+class PromptGenerator:
+    """Gerador de prompts minimalistas para LLMs
+    
+    O texto fixo vem do TemplateRegistry (frame "function" e esqueletos por
+    linguagem/framework); cada chamada só preenche as seções variáveis.
+    """
+    
+    def __init__(self, registry: Optional[TemplateRegistry] = None):
+        self.registry = registry or get_registry()
+    
+    def generate_test_prompt(self, static_analysis: Dict[str, Any], 
+                           flow_analysis: Dict[str, Any], 
+                           language: str = "python", 
+                           test_framework: str = "pytest",
+                           max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Gera prompt otimizado para geração de testes unitários
+        
+        Com `max_prompt_tokens`, o prompt é compactado (PromptCompactor) até
+        caber no orçamento estimado.
+        """
+        
+        # Determinar framework baseado na linguagem se não especificado
+        if test_framework == "auto":
+            test_framework = "junit" if language.lower() == "java" else "pytest"
+        
+        compactor = PromptCompactor(max_prompt_tokens)
+        final_prompt, sections = compactor.fit(
+            lambda: self._render(static_analysis, flow_analysis, language, test_framework, compactor)
+        )
+        
+        return {
+            "prompt": final_prompt,
+            "metadata": {
+                "language": language,
+                "framework": test_framework,
+                "complexity_score": flow_analysis.get("complexity_score", 1),
+                "estimated_tests": self._estimate_test_count(flow_analysis),
+                **compactor.report(final_prompt, sections)
+            }
+        }
+    
+    def _render(self, static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any],
+                language: str, test_framework: str,
+                compactor: PromptCompactor) -> Tuple[str, Dict[str, str]]:
+        """Monta o prompt com os passos de compactação ativos; devolve (prompt, seções)"""
+        prompt_sections = self._build_prompt_sections(static_analysis, flow_analysis, compactor)
+        short = compactor.active("short_skeleton")
+        prompt = self.registry.render(
+            "function", language, test_framework, DEFAULT_SKELETON, prompt_sections, short
+        )
+        prompt_sections["output_structure"] = self.registry.skeleton(
+            "function", language, test_framework, DEFAULT_SKELETON, short
+        )
+        return prompt, prompt_sections
+    
+    def _build_prompt_sections(self, static_analysis: Dict[str, Any], 
+                              flow_analysis: Dict[str, Any],
+                              compactor: Optional[PromptCompactor] = None) -> Dict[str, str]:
+        """Constrói seções do prompt"""
+        compactor = compactor or PromptCompactor()
+        imports = compactor.imports(
+            static_analysis.get('dependencies', {}).get('imports', []), static_analysis, flow_analysis
+        )
+        
+        function_info = f"""
+FUNÇÃO: {static_analysis.get('signature', 'N/A')}
+PARÂMETROS: {self._format_parameters(static_analysis.get('parameters', []))}
+RETORNO: {static_analysis.get('return_type', 'Any')}
+DEPENDÊNCIAS: {', '.join(imports)}
+"""
+        
+        flow_info = f"""
+FLUXO: {compactor.summary(flow_analysis.get('summary', 'Linear'))}
+COMPLEXIDADE: {flow_analysis.get('complexity_score', 1)}
+CENÁRIOS: {self._extract_test_scenarios(flow_analysis.get('flow_map', []), compactor)}
+"""
+        
+        return {
+            "function_info": function_info.strip(),
+            "flow_info": flow_info.strip()
+        }
+    
+    def _format_parameters(self, parameters: List[Dict[str, Any]]) -> str:
+        """Formata parâmetros para o prompt"""
+        if not parameters:
+            return "Nenhum"
+        
+        param_strs = []
+        for param in parameters:
+            param_str = f"{param['name']}: {param['type']}"
+            if param['has_default']:
+                param_str += f" = {param['default_value']}"
+            param_strs.append(param_str)
+        
+        return ", ".join(param_strs)
+    
+    def iter_test_scenarios(self, flow_map: List[Dict[str, Any]],
+                            compactor: Optional[PromptCompactor] = None) -> Iterator[str]:
+        """Cenários de teste do mapa de fluxo, um por vez (sem montar a lista inteira)"""
+        compactor = compactor or PromptCompactor()
+        for element in flow_map:
+            if element["type"] == "conditional":
+                condition = compactor.condition(element['condition'])
+                yield f"Condição TRUE: {condition}"
+                yield f"Condição FALSE: {condition}"
+            elif element["type"] in ["loop_for", "loop_while"]:
+                yield "Loop vazio"
+                yield "Loop com múltiplas iterações"
+            elif element["type"] in ["try_except", "try_catch"]:
+                for exc in element["exceptions"]:
+                    yield f"Exceção: {exc}"
+                yield "Execução sem exceção"
+            elif element["type"] == "exception_throw":
+                yield f"Lança: {element['exception']}"
+    
+    def _extract_test_scenarios(self, flow_map: List[Dict[str, Any]],
+                                compactor: Optional[PromptCompactor] = None) -> str:
+        """Extrai cenários de teste do mapa de fluxo"""
+        compactor = compactor or PromptCompactor()
+        scenarios = compactor.scenarios(list(self.iter_test_scenarios(flow_map, compactor)))
+        return "; ".join(scenarios) if scenarios else "Fluxo linear"
+    
+    def _get_output_structure(self, language: str, framework: str) -> str:
+        """Retorna estrutura de saída baseada na linguagem e framework"""
+        return self.registry.skeleton("function", language, framework, DEFAULT_SKELETON)
+    
+    def _estimate_test_count(self, flow_analysis: Dict[str, Any]) -> int:
+        """Estima número de testes necessários"""
+        complexity = flow_analysis.get("complexity_score", 1)
+        flow_map = flow_analysis.get("flow_map", [])
+        
+        # Base: 1 teste para o caso feliz
+        test_count = 1
+        
+        # Adicionar testes baseados na complexidade
+        test_count += complexity
+        
+        # Contar cenários específicos
+        for element in flow_map:
+            if element["type"] == "conditional":
+                test_count += 1  # Teste para else/elif
+            elif element["type"] in ["loop_for", "loop_while"]:
+                test_count += 1  # Teste para loop vazio
+            elif element["type"] in ["try_except", "try_catch"]:
+                test_count += len(element["exceptions"])
+        
+        return min(test_count, 15)  # Limitar a 15 testes por função
@@ -0,0 +1,81 @@
+import ast
+import re
+from typing import Dict, List, Optional
+
+from analyzers.metrics import timed
+
+
+# Tamanho máximo (caracteres) do texto de uma expressão; o excedente vira "…"
+MAX_RENDERED_CHARS = 200
+
+# Quebras de linha reconhecidas pelo parser (as posições do AST contam linhas assim)
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def _truncate(text: str, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    return text[:max_length - 1] + "…"
+
+
+class ExpressionRenderer:
+    """Texto de anotações, valores padrão, condições e alvos de chamada
+
+    O texto é recortado do código fonte pelas posições do nó (lineno/col_offset,
+    em bytes UTF-8 por linha), sem percorrer a expressão como `ast.unparse`.
+    Trechos de várias linhas (que trariam quebras, indentação ou comentários)
+    e nós sem posição caem no `ast.unparse`. Cada nó é renderizado uma única
+    vez por renderizador e textos maiores que `max_length` são truncados.
+
+    Sem `code`, todo nó é renderizado por `ast.unparse` (como antes do recorte).
+    """
+
+    __slots__ = ("code", "max_length", "_ascii", "_line_starts", "_memo")
+
+    def __init__(self, code: Optional[str] = None, max_length: int = MAX_RENDERED_CHARS):
+        self.code = code
+        self.max_length = max(2, max_length)
+        self._ascii = code is not None and code.isascii()
+        self._line_starts: Optional[List[int]] = None
+        self._memo: Dict[ast.AST, str] = {}
+
+    def _render(self, node: ast.AST) -> str:
+        text = self._memo.get(node)
+        if text is not None:
+            return text
+
+        segment = self._segment(node)
+        if segment is None or "\n" in segment or "\r" in segment:
+            # Várias linhas trariam quebras, indentação e comentários do código
+            segment = ast.unparse(node)
+        text = _truncate(segment, self.max_length)
+        self._memo[node] = text
+        return text
+
+    # Renderização cronometrada na fase "unparse" (sem custo com métricas desligadas)
+    render = timed("unparse", _render)
+
+    def _segment(self, node: ast.AST) -> Optional[str]:
+        """Trecho do código entre o início e o fim do nó, ou None se não houver posição"""
+        if self.code is None:
+            return None
+        end_lineno = getattr(node, "end_lineno", None)
+        end_col_offset = getattr(node, "end_col_offset", None)
+        if end_lineno is None or end_col_offset is None:
+            return None
+        start = self._offset(node.lineno, node.col_offset)
+        end = self._offset(end_lineno, end_col_offset)
+        return self.code[start:end]
+
+    def _offset(self, lineno: int, col_offset: int) -> int:
+        """Posição no texto de uma coluna (em bytes UTF-8) da linha `lineno`"""
+        starts = self._line_starts
+        if starts is None:
+            starts = [0] + [match.end() for match in _LINE_BREAK.finditer(self.code)]
+            self._line_starts = starts
+        line_start = starts[lineno - 1]
+        if self._ascii:
+            return line_start + col_offset
+        line_end = starts[lineno] if lineno < len(starts) else len(self.code)
+        prefix = self.code[line_start:line_end].encode("utf-8")[:col_offset]
+        return line_start + len(prefix.decode("utf-8", "replace"))
@@ -0,0 +1,92 @@
+import ast
+from typing import Dict, List, Tuple, Union
+
+from analyzers.python_render import ExpressionRenderer
+
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+# Nós que podem conter instruções (def, class, import); expressões nunca contêm
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if hasattr(ast, "match_case") else ()
+)
+
+# Nomes listados na mensagem de erro de uma busca sem resultado
+_SUGGESTED_NAMES = 10
+
+# Separa o nome qualificado do número da definição repetida ("f#1", "f#2")
+DEFINITION_SEPARATOR = "#"
+
+
+class SymbolIndex:
+    """Tabela de símbolos de um módulo Python: nome qualificado -> nó da função
+
+    Os nomes seguem o `__qualname__` do Python, como em analyze_module:
+    "func", "Classe.metodo", "func.<locals>.interna". Funções `async def` e
+    métodos entram no índice. Se um nome se repete (funções redefinidas, o
+    getter e o setter de uma property), o nome puro aponta para a última
+    definição, como no Python em tempo de execução, e cada definição também
+    pode ser buscada pela ordem no código: "nome#1", "nome#2"...
+
+    A tabela é montada em uma travessia só pelas instruções (sem descer nas
+    expressões) e guarda também os imports do módulo e um ExpressionRenderer
+    compartilhado pelas buscas.
+    """
+
+    __slots__ = ("functions", "definitions", "imports", "renderer", "_numbered")
+
+    def __init__(self, code: str, tree: ast.AST):
+        self.functions: Dict[str, FunctionNode] = {}
+        # Todas as definições na ordem do código, com um nome único para cada
+        self.definitions: List[Tuple[str, FunctionNode]] = []
+        self._numbered: Dict[str, FunctionNode] = {}
+        self.renderer = ExpressionRenderer(code)
+        imports: List[str] = []
+        found: List[Tuple[str, FunctionNode]] = []
+
+        # Pré-ordem, na ordem do código: (nó, prefixo do nome qualificado)
+        stack = [(tree, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualified_name = prefix + node.name
+                found.append((qualified_name, node))
+                prefix = qualified_name + ".<locals>."
+            elif isinstance(node, ast.ClassDef):
+                prefix = prefix + node.name + "."
+            elif isinstance(node, ast.Import):
+                imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ""
+                imports.extend(f"{module}.{alias.name}" for alias in node.names)
+
+            children = [child for child in ast.iter_child_nodes(node)
+                        if isinstance(child, _STATEMENT_CONTAINERS)]
+            stack.extend((child, prefix) for child in reversed(children))
+
+        self.imports = list(dict.fromkeys(imports))
+
+        counts: Dict[str, int] = {}
+        for qualified_name, _ in found:
+            counts[qualified_name] = counts.get(qualified_name, 0) + 1
+        seen: Dict[str, int] = {}
+        for qualified_name, node in found:
+            self.functions[qualified_name] = node
+            if counts[qualified_name] == 1:
+                self.definitions.append((qualified_name, node))
+                continue
+            seen[qualified_name] = seen.get(qualified_name, 0) + 1
+            numbered = f"{qualified_name}{DEFINITION_SEPARATOR}{seen[qualified_name]}"
+            self._numbered[numbered] = node
+            self.definitions.append((numbered, node))
+
+    def lookup(self, qualified_name: str) -> FunctionNode:
+        """Nó da função (última definição, ou a de "nome#n"); ValueError se não existir"""
+        node = self.functions.get(qualified_name) or self._numbered.get(qualified_name)
+        if node is None:
+            names = list(self.functions)
+            available = ", ".join(names[:_SUGGESTED_NAMES]) or "nenhuma"
+            if len(names) > _SUGGESTED_NAMES:
+                available += f", ... (+{len(names) - _SUGGESTED_NAMES})"
+            raise ValueError(f"Função não encontrada: {qualified_name} (disponíveis: {available})")
+        return node
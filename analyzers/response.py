@@ -0,0 +1,204 @@
+from itertools import islice
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+from analyzers.cache import content_hash
+
+
+# Níveis de detalhe das respostas das ferramentas completas e do lote:
+# - "full": análises estática e de fluxo, prompt e resumo (padrão)
+# - "compact": apenas o prompt e os metadados, sem repetir dados
+DETAIL_LEVELS = ("full", "compact")
+
+# Campos mantidos em qualquer seleção: identificam o item e reportam falhas
+_ALWAYS_KEPT = ("index", "error")
+
+# Tamanho de página usado quando só o cursor é informado
+DEFAULT_PAGE_SIZE = 50
+
+# Caracteres do hash do código gravados no cursor para validar a continuação
+_CURSOR_HASH_CHARS = 12
+
+
+def detail_error(detail: str) -> Optional[Dict[str, Any]]:
+    """Resposta de erro para um nível de detalhe desconhecido, ou None"""
+    if detail in DETAIL_LEVELS:
+        return None
+    return {"error": f"Nível de detalhe inválido: {detail} (use {', '.join(DETAIL_LEVELS)})"}
+
+
+def compact_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Prompt e metadados de um relatório completo, sem as análises nem o resumo
+
+    Em caso de erro, só as mensagens de erro das análises são mantidas.
+    """
+    compact: Dict[str, Any] = {}
+    if "index" in result:
+        compact["index"] = result["index"]
+
+    if "error" in result:
+        compact["error"] = result["error"]
+        for key in ("static_analysis", "flow_analysis"):
+            analysis = result.get(key)
+            if isinstance(analysis, dict) and "error" in analysis:
+                compact[key] = {"error": analysis["error"]}
+        return compact
+
+    prompt_generation = result.get("prompt_generation", {})
+    compact["prompt"] = prompt_generation.get("prompt")
+    compact["metadata"] = {
+        "signature": result.get("static_analysis", {}).get("signature"),
+        **prompt_generation.get("metadata", {})
+    }
+    return compact
+
+
+def select_fields(result: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Mantém apenas os caminhos pedidos ("prompt_generation.prompt", "summary"...)
+
+    Caminhos inexistentes são ignorados; "index" e "error" são sempre mantidos.
+    """
+    selected: Dict[str, Any] = {key: result[key] for key in _ALWAYS_KEPT if key in result}
+    for field in fields:
+        parts = field.split(".")
+        value: Any = result
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = selected
+            for part in parts[:-1]:
+                child = target.get(part)
+                if not isinstance(child, dict):
+                    child = target[part] = {}
+                target = child
+            target[parts[-1]] = value
+    return selected
+
+
+def shape_response(result: Dict[str, Any], detail: str = "full",
+                   fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Aplica o nível de detalhe e a seleção de campos a um relatório completo"""
+    if detail == "compact":
+        result = compact_response(result)
+    if fields:
+        result = select_fields(result, fields)
+    return result
+
+
+def _cursor_digest(code: str, selector: str) -> str:
+    """Resumo do código e do seletor (ex.: qualified_name) gravado no cursor"""
+    return content_hash(f"{selector}\0{code}")[:_CURSOR_HASH_CHARS]
+
+
+def encode_cursor(offset: int, code: str, selector: str = "") -> str:
+    """Cursor opaco para continuar a leitura em `offset` do resultado de `code`/`selector`"""
+    return f"{offset}.{_cursor_digest(code, selector)}"
+
+
+def decode_cursor(cursor: Optional[str], code: str, selector: str = "") -> int:
+    """Posição gravada no cursor; ValueError se ele não for deste código e seletor"""
+    if not cursor:
+        return 0
+    offset, _, digest = cursor.partition(".")
+    if not offset.isdigit() or digest != _cursor_digest(code, selector):
+        raise ValueError(f"Cursor inválido para este código: {cursor}")
+    return int(offset)
+
+
+def _check_page_size(page_size: int) -> None:
+    """ValueError para tamanhos de página menores que 1"""
+    if page_size < 1:
+        raise ValueError(f"page_size inválido: {page_size} (use um valor >= 1)")
+
+
+def count_flow_nodes(element: Dict[str, Any]) -> int:
+    """Nós de um elemento do mapa de fluxo, incluindo os aninhados"""
+    count = 0
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.get("nested_flow", ()))
+    return count
+
+
+def _page_bounds(items: List[Any], start: int, page_size: int,
+                 weight: Optional[Callable[[Any], int]]) -> Tuple[int, int]:
+    """(fim exclusivo, peso total) da página que começa em `start`
+
+    Com `weight`, a página acumula itens até somar `page_size`, mas sempre
+    leva ao menos um item inteiro: um item mais pesado que `page_size` (um
+    `try` ou `if` de topo com o corpo inteiro da função) forma sozinho uma
+    página maior que o pedido.
+    """
+    if weight is None:
+        end = min(len(items), start + page_size)
+        return end, end - start
+    end = start
+    total = 0
+    while end < len(items):
+        item_weight = weight(items[end])
+        if end > start and total + item_weight > page_size:
+            break
+        total += item_weight
+        end += 1
+    return end, total
+
+
+def paginate(result: Dict[str, Any], key: str, code: str, page_size: Optional[int],
+             cursor: Optional[str] = None,
+             weight: Optional[Callable[[Any], int]] = None,
+             selector: str = "") -> Dict[str, Any]:
+    """Troca a lista `result[key]` por uma página e acrescenta o campo "page"
+
+    Sem `page_size` nem `cursor`, o resultado volta inteiro. O cursor de
+    continuação vem em page["next_cursor"] (None na última página). Só a
+    lista de topo é paginada: page["oversized"] indica a página formada por
+    um único item mais pesado que `page_size`. O resultado completo continua
+    sendo calculado (e guardado no cache) para cada página. `selector`
+    distingue listas diferentes do mesmo código (ex.: o qualified_name).
+    """
+    if (page_size is None and not cursor) or "error" in result or key not in result:
+        return result
+    if page_size is None:
+        page_size = DEFAULT_PAGE_SIZE
+    try:
+        _check_page_size(page_size)
+        start = decode_cursor(cursor, code, selector)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    items = result[key]
+    start = min(start, len(items))
+    end, total_weight = _page_bounds(items, start, page_size, weight)
+    page = dict(result)
+    page[key] = items[start:end]
+    page["page"] = {
+        "offset": start,
+        "count": end - start,
+        "total": len(items),
+        "next_cursor": encode_cursor(end, code, selector) if end < len(items) else None,
+        "oversized": total_weight > page_size
+    }
+    return page
+
+
+def paginate_iterable(items: Iterable[Any], code: str, page_size: int,
+                      cursor: Optional[str] = None,
+                      selector: str = "") -> Tuple[List[Any], Dict[str, Any]]:
+    """Página de um iterável consumido sob demanda: (itens, campo "page")
+
+    Só os itens até o fim da página são gerados, então o total não é conhecido.
+    ValueError para cursor inválido ou `page_size` menor que 1.
+    """
+    _check_page_size(page_size)
+    start = decode_cursor(cursor, code, selector)
+    window = list(islice(items, start, start + page_size + 1))
+    has_more = len(window) > page_size
+    window = window[:page_size]
+    return window, {
+        "offset": start,
+        "count": len(window),
+        "next_cursor": encode_cursor(start + page_size, code, selector) if has_more else None
+    }
@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Any, Iterable, Optional
+
+
+# Incrementar sempre que o formato ou o conteúdo das análises mudar:
+# entradas gravadas com outra versão são ignoradas e recalculadas
+ANALYZER_VERSION = "8"
+
+# Caminho padrão do banco (MCP_QA_CACHE_DB="" desativa a persistência)
+DEFAULT_DB_PATH = os.path.join("~", ".cache", "mcp-server-qa", "analysis.db")
+
+# Quantidade de gravações acumuladas antes de um commit
+COMMIT_INTERVAL = 200
+
+
+def default_store_path() -> Optional[str]:
+    """Resolve o caminho do banco a partir de MCP_QA_CACHE_DB"""
+    path = os.environ.get("MCP_QA_CACHE_DB", DEFAULT_DB_PATH)
+    return os.path.expanduser(path) if path else None
+
+
+class StoredEntry:
+    """Registro persistido de um arquivo analisado"""
+
+    __slots__ = ("mtime_ns", "size", "content_hash", "_payload")
+
+    def __init__(self, mtime_ns: int, size: int, content_hash: str, payload: bytes):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.content_hash = content_hash
+        self._payload = payload
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Arquivo inalterado segundo mtime e tamanho"""
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+    def result(self) -> Dict[str, Any]:
+        """Descomprime o resultado somente quando ele for usado"""
+        return json.loads(zlib.decompress(self._payload))
+
+
+class AnalysisStore:
+    """Cache persistente (SQLite) de análises por arquivo
+
+    Cada linha guarda o resultado comprimido de um arquivo, junto com mtime,
+    tamanho, hash do conteúdo e a versão dos analisadores que o produziram.
+    """
+
+    def __init__(self, path: str, version: str = ANALYZER_VERSION):
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS file_analysis (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                analyzer_version TEXT NOT NULL,
+                result BLOB NOT NULL
+            )"""
+        )
+        self._connection.commit()
+
+    def get(self, path: str) -> Optional[StoredEntry]:
+        """Retorna o registro do arquivo se ele foi gerado pela versão atual"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime_ns, size, content_hash, result FROM file_analysis "
+                "WHERE path = ? AND analyzer_version = ?",
+                (path, self.version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return StoredEntry(*row)
+
+    def put(self, path: str, stat: os.stat_result, content_hash: str,
+            result: Dict[str, Any]) -> None:
+        """Grava (ou substitui) o resultado de um arquivo"""
+        payload = zlib.compress(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        self._write(
+            "INSERT OR REPLACE INTO file_analysis VALUES (?, ?, ?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, content_hash, self.version, payload)
+        )
+
+    def touch(self, path: str, stat: os.stat_result) -> None:
+        """Atualiza mtime/tamanho de um arquivo cujo conteúdo não mudou"""
+        self._write(
+            "UPDATE file_analysis SET mtime_ns = ?, size = ? WHERE path = ?",
+            (stat.st_mtime_ns, stat.st_size, path)
+        )
+
+    def prune(self, root: str, present: Iterable[str]) -> int:
+        """Remove registros de arquivos apagados ou renomeados sob `root` e de outras versões
+
+        Caminhos fora de `present` só são removidos se o arquivo não existir
+        mais: arquivos apenas deixados de fora por include/exclude continuam
+        aproveitáveis. Retorna a quantidade de registros removidos.
+        """
+        prefix = os.path.join(root, "")
+        present = set(present)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT path FROM file_analysis WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+        missing = [(path,) for (path,) in rows if path not in present and not os.path.isfile(path)]
+
+        with self._lock:
+            self._connection.executemany("DELETE FROM file_analysis WHERE path = ?", missing)
+            removed = self._connection.execute(
+                "DELETE FROM file_analysis WHERE analyzer_version != ?", (self.version,)
+            ).rowcount
+            self._connection.commit()
+            self._pending_writes = 0
+        return len(missing) + removed
+
+    def _write(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._connection.execute(sql, params)
+            self._pending_writes += 1
+            if self._pending_writes >= COMMIT_INTERVAL:
+                self._connection.commit()
+                self._pending_writes = 0
+
+    def commit(self) -> None:
+        """Persiste as gravações pendentes"""
+        with self._lock:
+            self._connection.commit()
+            self._pending_writes = 0
+
+    def close(self) -> None:
+        self.commit()
+        with self._lock:
+            self._connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso e quantidade de arquivos persistidos"""
+        with self._lock:
+            (entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM file_analysis WHERE analyzer_version = ?",
+                (self.version,)
+            ).fetchone()
+        return {
+            "path": self.path,
+            "analyzer_version": self.version,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def open_default_store() -> Optional[AnalysisStore]:
+    """Abre o cache persistente padrão; sem ele o servidor segue apenas em memória"""
+    path = default_store_path()
+    if not path:
+        return None
+    try:
+        return AnalysisStore(path)
+    except (OSError, sqlite3.Error):
+        return None
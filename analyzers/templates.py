@@ -0,0 +1,213 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+# Diretório dos modelos embutidos (mesmo formato aceito em MCP_QA_TEMPLATES_DIR)
+BUILTIN_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_templates")
+
+# Variáveis aceitas nos modelos, escritas como {{nome}}
+PLACEHOLDERS = frozenset({
+    "language", "framework", "function_info", "method_info", "flow_info", "output_structure"
+})
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Combinações montadas mantidas em memória (a linguagem vem do cliente, então é limitado)
+MAX_ASSEMBLED_TEMPLATES = 256
+
+
+class CompiledTemplate:
+    """Modelo pré-compilado: trechos estáticos intercalados com variáveis
+
+    `parts` alterna texto literal (posições pares) e nome de variável
+    (posições ímpares), então preencher o modelo é um único join.
+    """
+
+    __slots__ = ("parts", "placeholders")
+
+    def __init__(self, parts: List[str]):
+        self.parts = parts
+        self.placeholders = frozenset(parts[1::2])
+
+    @classmethod
+    def compile(cls, text: str, source: str = "<modelo>") -> "CompiledTemplate":
+        parts = _PLACEHOLDER_PATTERN.split(text)
+        unknown = set(parts[1::2]) - PLACEHOLDERS
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas em {source}: {', '.join(sorted(unknown))}")
+        return cls(parts)
+
+    def partial(self, values: Dict[str, str]) -> "CompiledTemplate":
+        """Novo modelo com as variáveis de `values` já preenchidas nos trechos estáticos"""
+        parts = [self.parts[0]]
+        for index in range(1, len(self.parts), 2):
+            name = self.parts[index]
+            if name in values:
+                parts[-1] += values[name] + self.parts[index + 1]
+            else:
+                parts += [name, self.parts[index + 1]]
+        return CompiledTemplate(parts)
+
+    def render(self, values: Dict[str, str]) -> str:
+        parts = list(self.parts)
+        for index in range(1, len(parts), 2):
+            parts[index] = values.get(parts[index], "")
+        return "".join(parts)
+
+
+def shorten_skeleton(text: str) -> str:
+    """Esqueleto sem linhas em branco e sem linhas só de comentário"""
+    return "\n".join(
+        line for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith(("#", "//"))
+    )
+
+
+def _read_template(path: str) -> str:
+    """Conteúdo do arquivo sem a quebra de linha final"""
+    with open(path, encoding="utf-8") as template_file:
+        text = template_file.read()
+    return text[:-1] if text.endswith("\n") else text
+
+
+class TemplateRegistry:
+    """Registro dos modelos de prompt, carregados e compilados uma vez
+
+    Cada diretório de modelos pode ter:
+    - `frames/<nome>.txt`: o prompt completo de um gerador ("function" para
+      PromptGenerator, "method" para JavaPromptGenerator)
+    - `skeletons/<frame>/<linguagem>.<framework>.txt`: a estrutura de saída
+      esperada por um gerador; cada frame tem os seus esqueletos, então
+      `java.junit` de PromptGenerator não atende JavaPromptGenerator
+    - `skeletons/<linguagem>.<framework>.txt`: esqueleto usado por qualquer
+      frame que não tenha um próprio para a combinação
+
+    Diretórios carregados depois substituem modelos com o mesmo nome, então
+    um time adiciona ou ajusta frameworks sem mudar o código. A combinação
+    (frame, linguagem, framework) é montada uma vez, com o esqueleto e os
+    valores fixos já embutidos; cada prompt só preenche as seções variáveis.
+    """
+
+    def __init__(self, directories: Optional[List[str]] = None):
+        self.directories: List[str] = []
+        self._frames: Dict[str, str] = {}
+        # (frame ou None para os compartilhados, linguagem, framework) -> esqueleto
+        self._skeletons: Dict[Tuple[Optional[str], str, str], str] = {}
+        self._assembled: Dict[Tuple[str, str, str, bool], CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        for directory in [BUILTIN_TEMPLATES_DIR] + list(directories or []):
+            self.load_directory(directory)
+
+    def load_directory(self, directory: str) -> None:
+        """Carrega (e valida) os modelos de um diretório"""
+        frames_dir = os.path.join(directory, "frames")
+        skeletons_dir = os.path.join(directory, "skeletons")
+        if not os.path.isdir(frames_dir) and not os.path.isdir(skeletons_dir):
+            raise ValueError(f"Diretório de modelos sem frames/ ou skeletons/: {directory}")
+
+        frames: Dict[str, str] = {}
+        skeletons: Dict[Tuple[Optional[str], str, str], str] = {}
+        for name in sorted(os.listdir(frames_dir)) if os.path.isdir(frames_dir) else []:
+            if name.endswith(".txt"):
+                path = os.path.join(frames_dir, name)
+                frames[name[:-4]] = _read_template(path)
+                CompiledTemplate.compile(frames[name[:-4]], path)
+        for frame, name in _skeleton_files(skeletons_dir):
+            path = os.path.join(skeletons_dir, frame or "", name)
+            text = _read_template(path)
+            CompiledTemplate.compile(text, path)
+            language, framework = name[:-4].split(".", 1)
+            skeletons[(frame, language.lower(), framework.lower())] = text
+
+        with self._lock:
+            self._frames.update(frames)
+            self._skeletons.update(skeletons)
+            self._assembled.clear()
+            self.directories.append(directory)
+
+    def frameworks(self, frame: str) -> Dict[str, List[str]]:
+        """Frameworks disponíveis por linguagem para o frame (próprios e compartilhados)"""
+        available: Dict[str, List[str]] = {}
+        for language, framework in sorted({(language, framework)
+                                           for owner, language, framework in self._skeletons
+                                           if owner in (frame, None)}):
+            available.setdefault(language, []).append(framework)
+        return available
+
+    def skeleton(self, frame: str, language: str, framework: str, fallback: Tuple[str, str],
+                 short: bool = False) -> str:
+        """Estrutura de saída de (linguagem, framework) para o frame, ou a de `fallback`
+
+        `short` remove linhas em branco e comentários (compactação de prompt).
+        """
+        skeleton = (self._lookup(frame, language.lower(), framework.lower())
+                    or self._lookup(frame, *fallback))
+        return shorten_skeleton(skeleton) if short else skeleton
+
+    def _lookup(self, frame: str, language: str, framework: str) -> Optional[str]:
+        """Esqueleto do próprio frame ou, na falta dele, o compartilhado"""
+        return (self._skeletons.get((frame, language, framework))
+                or self._skeletons.get((None, language, framework)))
+
+    def template(self, frame: str, language: str, framework: str,
+                 fallback: Tuple[str, str], short: bool = False) -> CompiledTemplate:
+        """Modelo do prompt com esqueleto, linguagem e framework já embutidos"""
+        key = (frame, language, framework, short)
+        template = self._assembled.get(key)
+        if template is None:
+            # O esqueleto entra como texto antes da compilação, então também pode usar variáveis
+            skeleton = self.skeleton(frame, language, framework, fallback, short)
+            text = _PLACEHOLDER_PATTERN.sub(
+                lambda match: skeleton if match.group(1) == "output_structure" else match.group(0),
+                self._frames[frame]
+            )
+            template = CompiledTemplate.compile(text, f"{frame}/{language}.{framework}").partial({
+                "language": language,
+                "framework": framework,
+                "output_structure": ""
+            })
+            with self._lock:
+                if len(self._assembled) >= MAX_ASSEMBLED_TEMPLATES:
+                    self._assembled.clear()
+                self._assembled[key] = template
+        return template
+
+    def render(self, frame: str, language: str, framework: str, fallback: Tuple[str, str],
+               values: Dict[str, str], short: bool = False) -> str:
+        """Prompt final: só as seções variáveis são preenchidas a cada chamada"""
+        return self.template(frame, language, framework, fallback, short).render(values)
+
+
+def _skeleton_files(skeletons_dir: str) -> List[Tuple[Optional[str], str]]:
+    """(frame ou None, arquivo) dos esqueletos `<linguagem>.<framework>.txt` do diretório"""
+    if not os.path.isdir(skeletons_dir):
+        return []
+    files: List[Tuple[Optional[str], str]] = []
+    for entry in sorted(os.listdir(skeletons_dir)):
+        if os.path.isdir(os.path.join(skeletons_dir, entry)):
+            files += [(entry, name) for name in sorted(os.listdir(os.path.join(skeletons_dir, entry)))
+                      if _is_skeleton_name(name)]
+        elif _is_skeleton_name(entry):
+            files.append((None, entry))
+    return files
+
+
+def _is_skeleton_name(name: str) -> bool:
+    return name.endswith(".txt") and "." in name[:-4]
+
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> TemplateRegistry:
+    """Registro do processo atual: embutidos + MCP_QA_TEMPLATES_DIR (separados por os.pathsep)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            directories = [path for path in os.environ.get("MCP_QA_TEMPLATES_DIR", "").split(os.pathsep)
+                           if path]
+            _registry = TemplateRegistry([os.path.expanduser(path) for path in directories])
+        return _registry
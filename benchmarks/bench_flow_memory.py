@@ -0,0 +1,99 @@
+"""Benchmark: memória do mapa de fluxo em nós com slots vs. dicts
+
+Gera uma função Python e um método Java com milhares de blocos de
+ramificação (benchmarks/corpus.py), monta o mapa de fluxo e mede a memória
+retida pela árvore de nós (analyzers/flow.py) e pela mesma árvore convertida
+em dicts, como era guardada antes e como sai nas respostas. Também mede o
+tempo da análise e da conversão feita na saída das ferramentas.
+
+Uso:
+    python -m benchmarks.bench_flow_memory [--branches 10000] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from analyzers.flow import FlowNode, to_response
+from analyzers.java_Analyzer import JavaFlowSummarizer
+from analyzers.python_Analyzer import PythonAnalysisEngine
+from analyzers.response import count_flow_nodes
+from benchmarks.corpus import CorpusSpec, generate_java_method, generate_python_function
+
+
+def deep_size(root: Any) -> int:
+    """Bytes ocupados por `root` e por tudo que ele referencia (cada objeto uma vez)"""
+    seen = set()
+    total = 0
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, FlowNode):
+            stack.extend(getattr(value, name) for name in value.__slots__)
+        elif value.__class__ is dict:
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif value.__class__ is list:
+            stack.extend(value)
+    return total
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Menor tempo de execução em segundos entre `repeat` execuções"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(branches: int, repeat: int) -> Dict[str, Any]:
+    """Memória e tempos por linguagem para uma função com `branches` blocos"""
+    spec = CorpusSpec("branches", statements=branches, depth=2, branches=2, params=2)
+    python_code = generate_python_function(spec)
+    java_code = generate_java_method(spec)
+    flows: Dict[str, Callable[[], List[FlowNode]]] = {
+        "python": lambda: PythonAnalysisEngine().analyze(python_code)["flow"]["flow_map"],
+        "java": lambda: JavaFlowSummarizer().summarize_flow(java_code)["flow_map"],
+    }
+
+    results: Dict[str, Any] = {}
+    print(f"{'linguagem':>10} {'nós':>8} {'dicts (MB)':>11} {'slots (MB)':>11} {'redução':>8} "
+          f"{'análise (ms)':>13} {'conversão (ms)':>15}")
+    for language, build in flows.items():
+        flow_map = build()
+        nodes = sum(count_flow_nodes(element) for element in flow_map)
+        as_dicts = to_response(flow_map)
+        slotted_bytes = deep_size(flow_map)
+        dict_bytes = deep_size(as_dicts)
+        analysis = best_of(build, repeat)
+        conversion = best_of(lambda: to_response(flow_map), repeat)
+        results[language] = {
+            "nodes": nodes,
+            "dict_bytes": dict_bytes,
+            "slotted_bytes": slotted_bytes,
+            "analysis_ms": round(analysis * 1000, 1),
+            "conversion_ms": round(conversion * 1000, 1)
+        }
+        print(f"{language:>10} {nodes:>8} {dict_bytes / 1048576:>11.2f} "
+              f"{slotted_bytes / 1048576:>11.2f} {dict_bytes / slotted_bytes:>7.1f}x "
+              f"{analysis * 1000:>13.1f} {conversion * 1000:>15.1f}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--branches", type=int, default=10000,
+                        help="blocos de ramificação (if/for/try/while) na função gerada")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(max(1, args.branches), max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
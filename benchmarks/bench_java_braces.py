@@ -0,0 +1,125 @@
+"""Benchmark: índice de pares de delimitadores vs. contagem de chaves caractere a caractere
+
+Gera um arquivo Java grande (50 mil linhas por padrão) e compara, para todas
+as chaves do arquivo, o casamento por varredura de caracteres (como o antigo
+_extract_method_body, reiniciado a cada consulta) com as consultas O(1) ao
+índice construído uma vez na tokenização.
+
+Uso:
+    python -m benchmarks.bench_java_braces [--lines 50000] [--repeat 3]
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from analyzers.java_Analyzer import JavaAnalysisEngine
+from analyzers.java_lexer import JavaTokens
+
+
+def generate_java_file(lines: int) -> str:
+    """Gera uma classe com métodos aninhados até atingir `lines` linhas"""
+    output = [
+        "package com.example.bench;",
+        "",
+        "import java.util.List;",
+        "import java.util.Map;",
+        "",
+        "public class Generated {",
+    ]
+    index = 0
+    while len(output) < lines - 1:
+        output += [
+            f"    public int method{index}(List<Integer> items, Map<String, Integer> map) {{",
+            "        int total = 0;",
+            "        for (Integer item : items) {",
+            f"            if (item > {index}) {{",
+            f"                total += map.getOrDefault(\"}}{{key{index}\", item);",
+            "            } else {",
+            "                while (total < 10) { total++; }",
+            "            }",
+            "        }",
+            "        return total;",
+            "    }",
+            "",
+        ]
+        index += 1
+    output.append("}")
+    return "\n".join(output) + "\n"
+
+
+def legacy_match(code: str, brace_start: int) -> int:
+    """Casamento de chaves como no código antigo: conta caractere a caractere"""
+    brace_count = 1
+    pos = brace_start + 1
+    while pos < len(code) and brace_count > 0:
+        if code[pos] == '{':
+            brace_count += 1
+        elif code[pos] == '}':
+            brace_count -= 1
+        pos += 1
+    return pos - 1 if brace_count == 0 else -1
+
+
+def legacy_depth(code: str, position: int) -> int:
+    """Profundidade de chaves de uma posição, recontando desde o início do arquivo"""
+    return code.count("{", 0, position) - code.count("}", 0, position)
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Menor tempo de execução em segundos entre `repeat` execuções"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(lines: int, repeat: int) -> None:
+    code = generate_java_file(lines)
+    source = JavaTokens(code)
+    braces: List[int] = [index for index, text in enumerate(source.texts) if text == "{"]
+    offsets = [source.starts[index] for index in braces]
+
+    build_time = best_of(lambda: JavaTokens(code), repeat)
+    blocks_time = best_of(source._build_blocks, repeat)
+
+    legacy_results = [legacy_match(code, offset) for offset in offsets]
+    indexed_results = [source.match_offset(offset) for offset in offsets]
+    mismatches = sum(1 for legacy, indexed in zip(legacy_results, indexed_results) if legacy != indexed)
+
+    legacy_time = best_of(lambda: [legacy_match(code, offset) for offset in offsets], repeat)
+    indexed_time = best_of(lambda: [source.pairs[index] for index in braces], repeat)
+
+    # Profundidade: amostra de 500 chaves, pois a versão antiga é O(n) por consulta
+    sample = braces[::max(1, len(braces) // 500)]
+    legacy_depth_time = best_of(lambda: [legacy_depth(code, source.starts[i]) for i in sample], repeat)
+    indexed_depth_time = best_of(lambda: [source.depth(i) for i in sample], repeat)
+
+    engine = JavaAnalysisEngine()
+    class_time = best_of(lambda: engine.analyze_class(code), repeat)
+    method_count = engine.analyze_class(code)["method_count"]
+
+    print(f"arquivo: {code.count(chr(10))} linhas, {len(code) / 1048576:.2f} MB, "
+          f"{len(source)} tokens, {len(braces)} chaves")
+    print(f"tokenização + pares:           {build_time * 1000:10.1f} ms")
+    print(f"índice de blocos (pai/prof.):  {blocks_time * 1000:10.1f} ms")
+    print(f"casar todas as chaves, antigo: {legacy_time * 1000:10.1f} ms")
+    print(f"casar todas as chaves, índice: {indexed_time * 1000:10.1f} ms "
+          f"({legacy_time / max(indexed_time, 1e-9):.0f}x)")
+    print(f"profundidade ({len(sample)} consultas), antigo: {legacy_depth_time * 1000:8.1f} ms")
+    print(f"profundidade ({len(sample)} consultas), índice: {indexed_depth_time * 1000:8.3f} ms")
+    print(f"consultas antigas erradas (chave dentro de string): {mismatches}")
+    print(f"analyze_class ({method_count} métodos):  {class_time * 1000:10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.lines, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: latência de pior caso dos analisadores Java em entradas patológicas
+
+Cada entrada do corpus ataca um ponto onde as antigas expressões regulares
+faziam backtracking (espaços longos, sequências de modificadores, parênteses
+sem par, generics profundos...). O tempo de análise deve crescer linearmente
+e ficar abaixo de um limite fixo; o processo termina com código 1 se não ficar.
+
+Uso:
+    python -m benchmarks.bench_java_pathological [--sizes 0.5 1 4] [--bound 30]
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List
+
+from analyzers.cache import AnalysisCache
+from analyzers.java_Analyzer import JavaStaticAnalyzer, JavaFlowSummarizer
+
+
+def _repeat(unit: str, size: int) -> str:
+    """Repete `unit` até ocupar aproximadamente `size` caracteres"""
+    return unit * max(1, size // len(unit))
+
+
+# Cada gerador recebe o tamanho aproximado em caracteres
+PATHOLOGICAL_CORPUS: Dict[str, Callable[[int], str]] = {
+    "whitespace_run": lambda size: "public" + " " * size + "x",
+    "modifier_run": lambda size: _repeat("public static final ", size) + "x",
+    "modifiers_unclosed_paren": lambda size: _repeat("public ", size) + "int f(",
+    "open_parens": lambda size: _repeat("(", size),
+    "annotation_chain": lambda size: _repeat("@A(", size),
+    "generic_nesting": lambda size: _repeat("List<", size) + " f() { }",
+    "unterminated_comment": lambda size: "void f() { /*" + _repeat("x ", size),
+    "unterminated_text_block": lambda size: 'void f() { String s = """' + _repeat("a\\", size),
+    "returns_without_semicolon": lambda size: "void f() { " + _repeat("return x ", size),
+    "imports_without_semicolon": lambda size: _repeat("import a.b ", size) + "void f() { }",
+    "deep_braces": lambda size: "void f() " + "{" * (size // 2) + "}" * (size // 2),
+    "many_methods": lambda size: "class A { " + _repeat(
+        "public int m(int a) { if (a > 0) { return a; } else { throw new X(); } } ", size) + "}",
+}
+
+
+def worst_case(code: str, repeat: int) -> float:
+    """Maior tempo (s) de analyze_method + summarize_flow entre `repeat` execuções
+
+    Como no servidor, as duas análises compartilham os tokens por um
+    AnalysisCache; o cache é novo a cada execução.
+    """
+    timings = []
+    for _ in range(repeat):
+        cache = AnalysisCache()
+        static_analyzer = JavaStaticAnalyzer(cache)
+        flow_summarizer = JavaFlowSummarizer(cache)
+        start = time.perf_counter()
+        static_analyzer.analyze_method(code)
+        flow_summarizer.summarize_flow(code)
+        timings.append(time.perf_counter() - start)
+    return max(timings)
+
+
+def run(sizes_mb: List[float], repeat: int, bound: float) -> bool:
+    """Executa o corpus e informa se todos os tempos ficaram abaixo do limite"""
+    within_bound = True
+    print(f"{'entrada':>28} {'MB':>6} {'pior caso (ms)':>15} {'µs/KB':>8}")
+    for name, generate in PATHOLOGICAL_CORPUS.items():
+        for size_mb in sizes_mb:
+            code = generate(int(size_mb * 1024 * 1024))
+            elapsed = worst_case(code, repeat)
+            within_bound = within_bound and elapsed <= bound
+            marker = "" if elapsed <= bound else "  << acima do limite"
+            print(f"{name:>28} {len(code) / 1048576:>6.2f} {elapsed * 1000:>15.1f} "
+                  f"{elapsed * 1e6 / (len(code) / 1024):>8.1f}{marker}")
+    return within_bound
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.5, 1, 4],
+                        help="tamanhos das entradas em MB")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--bound", type=float, default=30.0,
+                        help="limite de latência por entrada, em segundos")
+    args = parser.parse_args()
+    if not run(args.sizes, args.repeat, args.bound):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
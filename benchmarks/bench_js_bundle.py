@@ -0,0 +1,97 @@
+"""Benchmark: análise JavaScript/TypeScript de arquivos empacotados (bundles) grandes
+
+Gera bundles sintéticos de vários tamanhos (benchmarks/corpus.py) ou lê
+arquivos reais com --file e mede a tokenização e a análise de módulo
+completa. O tempo por KB deve ficar estável com o tamanho (crescimento
+linear) e abaixo de um limite fixo; o processo termina com código 1 se não
+ficar.
+
+Uso:
+    python -m benchmarks.bench_js_bundle [--sizes 0.5 1 4] [--bound 30]
+    python -m benchmarks.bench_js_bundle --file dist/app.js [--file dist/vendor.js]
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from analyzers.cache import AnalysisCache
+from analyzers.js_Analyzer import JSAnalysisEngine
+from analyzers.js_lexer import JSTokens
+from benchmarks.corpus import generate_js_bundle
+
+# Crescimento do µs/KB tolerado entre a menor e a maior entrada
+MAX_GROWTH = 3.0
+
+
+def measure(code: str, repeat: int) -> Tuple[float, float, int]:
+    """(melhor tempo de tokenização, melhor tempo de análise do módulo, funções) em segundos
+
+    A análise do módulo inclui a tokenização, como em uma chamada do servidor
+    com o cache vazio.
+    """
+    tokenize_times = []
+    module_times = []
+    function_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        JSTokens(code)
+        tokenize_times.append(time.perf_counter() - start)
+
+        engine = JSAnalysisEngine(AnalysisCache())
+        start = time.perf_counter()
+        module = engine.analyze_module(code)
+        module_times.append(time.perf_counter() - start)
+        if "error" in module:
+            raise RuntimeError(module["error"])
+        function_count = module["function_count"]
+    return min(tokenize_times), min(module_times), function_count
+
+
+def run(inputs: Dict[str, str], repeat: int, bound: float, check_growth: bool = True) -> bool:
+    """Mede as entradas e informa se ficaram abaixo do limite (e com crescimento linear)"""
+    within_bound = True
+    per_kb: List[float] = []
+    print(f"{'entrada':>28} {'MB':>6} {'funções':>8} {'tokens (ms)':>12} "
+          f"{'módulo (ms)':>12} {'µs/KB':>8}")
+    for name, code in inputs.items():
+        tokenize, module, functions = measure(code, repeat)
+        kb = len(code) / 1024
+        per_kb.append(module * 1e6 / kb)
+        within_bound = within_bound and module <= bound
+        marker = "" if module <= bound else "  << acima do limite"
+        print(f"{name:>28} {len(code) / 1048576:>6.2f} {functions:>8} {tokenize * 1000:>12.1f} "
+              f"{module * 1000:>12.1f} {per_kb[-1]:>8.1f}{marker}")
+
+    if check_growth and len(per_kb) > 1 and max(per_kb) > MAX_GROWTH * min(per_kb):
+        print(f"\nCrescimento não linear: µs/KB variou de {min(per_kb):.1f} a {max(per_kb):.1f}")
+        return False
+    return within_bound
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.5, 1, 4],
+                        help="tamanhos dos bundles sintéticos em MB")
+    parser.add_argument("--file", action="append", default=[],
+                        help="arquivo JavaScript/TypeScript real (substitui os bundles sintéticos)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--bound", type=float, default=30.0,
+                        help="limite de latência por entrada, em segundos")
+    args = parser.parse_args()
+
+    inputs: Dict[str, str] = {}
+    for path in args.file:
+        with open(path, encoding="utf-8", errors="replace") as source:
+            inputs[path[-28:]] = source.read()
+    if not inputs:
+        for size_mb in args.sizes:
+            inputs[f"bundle_{size_mb:g}mb"] = generate_js_bundle(int(size_mb * 1024 * 1024))
+
+    # Arquivos reais têm conteúdos diferentes: só os bundles sintéticos comparam o µs/KB
+    if not run(inputs, max(1, args.repeat), args.bound, check_growth=not args.file):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: tamanho e tempo de serialização das respostas por nível de detalhe
+
+Gera funções Python e métodos Java dos corpora sintéticos, monta o relatório
+de analyze_and_generate_complete / analyze_and_generate_java_complete e mede,
+para cada nível de detalhe, os bytes em JSON e o tempo de codificação (a
+conversão dos nós de fluxo em dicts seguida de json.dumps, como a saída das
+ferramentas e o transporte stdio fazem a cada chamada).
+
+Uso:
+    python -m benchmarks.bench_response [--corpus small medium large] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+from analyzers.flow import to_response
+from analyzers.response import DETAIL_LEVELS, shape_response
+from benchmarks.corpus import PRESETS, generate_java_method, generate_python_function
+
+# O benchmark não deve ler nem gravar o cache persistente do usuário
+os.environ["MCP_QA_CACHE_DB"] = ""
+import mcp_server  # noqa: E402
+
+
+def encode_time(response: Dict[str, Any], repeat: int) -> float:
+    """Melhor tempo (s) de conversão e json.dumps da resposta entre `repeat` execuções"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.dumps(to_response(response), ensure_ascii=False)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(corpora: List[str], repeat: int) -> Dict[str, Any]:
+    """Bytes e tempo de codificação por linguagem, corpus e nível de detalhe"""
+    reports: Dict[str, Callable[[str], Dict[str, Any]]] = {
+        "python": lambda name: mcp_server._analyze_and_generate_complete(
+            generate_python_function(PRESETS[name])),
+        "java": lambda name: mcp_server._analyze_and_generate_java_complete(
+            generate_java_method(PRESETS[name])),
+    }
+    results: Dict[str, Any] = {}
+    print(f"{'linguagem':>10} {'corpus':>7} {'detalhe':>8} {'KB':>9} {'codificação (ms)':>17} {'redução':>8}")
+    for language, report in reports.items():
+        for name in corpora:
+            full = report(name)
+            baseline = None
+            for detail in DETAIL_LEVELS:
+                response = shape_response(full, detail)
+                size = len(json.dumps(to_response(response), ensure_ascii=False).encode("utf-8"))
+                elapsed = encode_time(response, repeat)
+                baseline = baseline or size
+                results[f"{language}/{name}/{detail}"] = {
+                    "bytes": size, "encode_ms": round(elapsed * 1000, 3)
+                }
+                print(f"{language:>10} {name:>7} {detail:>8} {size / 1024:>9.1f} "
+                      f"{elapsed * 1000:>17.3f} {baseline / size:>7.1f}x")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", nargs="+", choices=sorted(PRESETS), default=["small", "medium", "large"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    try:
+        results = run(args.corpus, max(1, args.repeat))
+    finally:
+        mcp_server.batch_analyzer.shutdown()
+        mcp_server.tool_executor.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump({"results": results}, output, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
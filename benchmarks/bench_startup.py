@@ -0,0 +1,206 @@
+"""Benchmark: partida do servidor MCP, do processo novo até a primeira resposta
+
+Inicia `python mcp_server.py` como o cliente stdio de uma IDE faria, envia
+`initialize` e mede o tempo até a resposta; em seguida mede a primeira
+chamada de ferramenta (que inclui carregar o backend da linguagem). Cada
+rodada usa um processo novo, com o cache persistente desativado.
+
+Com --import-profile, uma rodada extra com `python -X importtime` (encerrada
+logo após o initialize) lista o tempo de import por pacote, os módulos mais
+caros e os módulos de `analyzers` carregados na partida.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs 10] [--output partida.json]
+    python -m benchmarks.bench_startup --import-profile [--top 15]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.regression import percentile
+
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_server.py")
+
+PROTOCOL_VERSION = "2025-06-18"
+
+FIRST_CALLS = {
+    "python": ("analyze_function_static", {"code": "def soma(a, b):\n    return a + b\n"}),
+    "java": ("analyze_java_method_static", {"code": "public int soma(int a, int b) { return a + b; }"}),
+    "javascript": ("analyze_js_module", {"code": "export const soma = (a, b) => a + b\n"}),
+}
+
+
+class ServerProcess:
+    """Servidor MCP em um processo novo, falando JSON-RPC por stdio"""
+
+    def __init__(self, python_options: Optional[List[str]] = None, stderr=subprocess.DEVNULL):
+        env = dict(os.environ, MCP_QA_CACHE_DB="")
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(
+            [sys.executable] + list(python_options or []) + [SERVER_SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr,
+            env=env, text=True, encoding="utf-8"
+        )
+        self._next_id = 0
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None, notify: bool = False) -> Optional[int]:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        request_id = None
+        if not notify:
+            self._next_id += 1
+            request_id = message["id"] = self._next_id
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+        return request_id
+
+    def receive(self, request_id: int) -> Dict[str, Any]:
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"Servidor encerrou antes de responder (código {self.process.poll()})")
+            message = json.loads(line)
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise RuntimeError(f"Erro do servidor: {message['error']}")
+                return message
+
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.receive(self.send(method, params))
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def measure_startup(language: Optional[str], python_options: Optional[List[str]] = None,
+                    stderr=subprocess.DEVNULL) -> Tuple[float, float]:
+    """(tempo até a resposta do initialize, tempo da primeira chamada de ferramenta) em segundos
+
+    Sem `language`, o processo é encerrado logo após o initialize.
+    """
+    server = ServerProcess(python_options, stderr)
+    try:
+        server.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "bench_startup", "version": "1"}
+        })
+        initialized = time.perf_counter() - server.started
+        if language is None:
+            return initialized, 0.0
+        server.send("notifications/initialized", notify=True)
+
+        tool, arguments = FIRST_CALLS[language]
+        start = time.perf_counter()
+        server.request("tools/call", {"name": tool, "arguments": arguments})
+        first_call = time.perf_counter() - start
+        return initialized, first_call
+    finally:
+        server.close()
+
+
+def parse_importtime(lines: List[str]) -> List[Tuple[str, int, int]]:
+    """Linhas de `-X importtime` como (módulo, próprio µs, acumulado µs)"""
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            modules.append((name, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def import_profile(top: int) -> Dict[str, Any]:
+    """Tempo de import por pacote e módulos mais caros até a resposta do initialize"""
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as stderr:
+        measure_startup(None, ["-X", "importtime"], stderr)
+        stderr.seek(0)
+        modules = parse_importtime(stderr.read().splitlines())
+
+    by_package: Dict[str, int] = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    return {
+        "total_ms": round(sum(self_us for _, self_us, _ in modules) / 1000, 2),
+        "by_package_ms": {package: round(us / 1000, 2) for package, us in
+                          sorted(by_package.items(), key=lambda item: -item[1])[:top]},
+        "slowest_modules_ms": {name: round(self_us / 1000, 2) for name, self_us, _ in
+                               sorted(modules, key=lambda item: -item[1])[:top]},
+        "analyzers_loaded": [name for name, _, _ in modules if name.startswith("analyzers")],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="processos novos por linguagem")
+    parser.add_argument("--language", nargs="+", choices=sorted(FIRST_CALLS), default=["python", "java"],
+                        help="linguagem da primeira chamada de ferramenta")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="lista o tempo de import por pacote e os módulos mais caros")
+    parser.add_argument("--top", type=int, default=15, help="itens listados no perfil de imports")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    print(f"{'linguagem':>10} {'init p50 (ms)':>14} {'init p90 (ms)':>14} "
+          f"{'1ª chamada p50 (ms)':>20} {'total p50 (ms)':>15}")
+    for language in args.language:
+        samples = [measure_startup(language) for _ in range(max(1, args.runs))]
+        initialize = [sample[0] for sample in samples]
+        first_call = [sample[1] for sample in samples]
+        totals = [sum(sample) for sample in samples]
+        results[language] = {
+            "runs": len(samples),
+            "initialize_p50_ms": round(percentile(initialize, 0.50) * 1000, 2),
+            "initialize_p90_ms": round(percentile(initialize, 0.90) * 1000, 2),
+            "first_call_p50_ms": round(percentile(first_call, 0.50) * 1000, 2),
+            "time_to_first_result_p50_ms": round(percentile(totals, 0.50) * 1000, 2),
+        }
+        row = results[language]
+        print(f"{language:>10} {row['initialize_p50_ms']:>14.1f} {row['initialize_p90_ms']:>14.1f} "
+              f"{row['first_call_p50_ms']:>20.1f} {row['time_to_first_result_p50_ms']:>15.1f}")
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    if args.import_profile:
+        profile = import_profile(args.top)
+        report["import_profile"] = profile
+        print(f"\nImports até o initialize: {profile['total_ms']:.1f} ms")
+        print("Por pacote:")
+        for package, elapsed in profile["by_package_ms"].items():
+            print(f"  {package:<40} {elapsed:>8.1f} ms")
+        print("Módulos mais caros:")
+        for name, elapsed in profile["slowest_modules_ms"].items():
+            print(f"  {name:<40} {elapsed:>8.1f} ms")
+        print(f"Módulos de analyzers carregados: {', '.join(profile['analyzers_loaded']) or 'nenhum'}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
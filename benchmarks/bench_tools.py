@@ -0,0 +1,292 @@
+"""Benchmark: throughput, latência p50/p99 e pico de memória de cada ferramenta MCP
+
+Gera corpora sintéticos (benchmarks/corpus.py) e chama as ferramentas do
+servidor como um cliente chamaria, com o cache em memória esvaziado antes de
+cada chamada. O resultado pode ser gravado em JSON e comparado com uma
+baseline; o processo termina com código 1 se alguma ferramenta regredir
+mais que o limite percentual. As ferramentas são medidas em rodadas
+intercaladas, e a comparação exige pelo menos MIN_SAMPLES amostras por
+ferramenta e ignora diferenças dentro do ruído medido (mad_ms).
+
+O pico de memória (tracemalloc) cobre apenas o processo do servidor: em
+analyze_batch e scan_project o trabalho dos processos de análise não entra.
+O projeto gerado é um repositório git com um commit e a árvore de trabalho
+alterada, usado por scan_project, call_graph_order e analyze_git_diff (que só
+é medido se o executável git estiver disponível).
+
+Uso:
+    python -m benchmarks.bench_tools [--corpus small medium large] [--output atual.json]
+    python -m benchmarks.bench_tools --compare baseline.json [--threshold 20] [--metrics p50_ms p99_ms]
+    python -m benchmarks.bench_tools --depth 6 --branches 10 --params 20 --statements 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import (
+    PRESETS, CorpusSpec, generate_java_class, generate_java_method, generate_js_function,
+    generate_js_module, generate_python_function, generate_python_module
+)
+from benchmarks.regression import (
+    DEFAULT_METRICS, MIN_REGRESSION, MIN_SAMPLES, compare, median_deviation, percentile, unreliable
+)
+
+# O benchmark não deve ler nem gravar o cache persistente do usuário
+os.environ["MCP_QA_CACHE_DB"] = ""
+import mcp_server  # noqa: E402
+
+
+
+def build_calls(spec: CorpusSpec, project_dir: str,
+                project_chars: int) -> Dict[str, Tuple[int, Callable[[], Awaitable[Any]]]]:
+    """(tamanho da entrada, chamada) por ferramenta pública, com entradas geradas de `spec`"""
+    python_code = generate_python_function(spec)
+    python_module = generate_python_module(spec)
+    java_code = generate_java_method(spec)
+    java_class = generate_java_class(spec)
+    js_code = generate_js_function(spec)
+    js_module = generate_js_module(spec)
+    batch = [{"code": python_code}, {"code": java_code, "language": "java"},
+             {"code": js_code, "language": "javascript"}] * 3
+    batch_chars = sum(len(item["code"]) for item in batch)
+    server = mcp_server
+
+    calls = {
+        "analyze_function_static": (
+            len(python_code), lambda: server.analyze_function_static(python_code)),
+        "summarize_function_flow": (
+            len(python_code), lambda: server.summarize_function_flow(python_code)),
+        "generate_test_prompt": (
+            len(python_code), lambda: server.generate_test_prompt(python_code)),
+        "analyze_module": (
+            len(python_module), lambda: server.analyze_module(python_module)),
+        "analyze_module[paged]": (
+            len(python_module), lambda: server.analyze_module(python_module, page_size=2)),
+        "list_test_scenarios": (
+            len(python_code), lambda: server.list_test_scenarios(python_code)),
+        "analyze_and_generate_complete[python]": (
+            len(python_code), lambda: server.analyze_and_generate_complete(python_code)),
+        "analyze_java_method_static": (
+            len(java_code), lambda: server.analyze_java_method_static(java_code)),
+        "summarize_java_method_flow": (
+            len(java_code), lambda: server.summarize_java_method_flow(java_code)),
+        "generate_java_test_prompt": (
+            len(java_code), lambda: server.generate_java_test_prompt(java_code)),
+        "analyze_and_generate_java_complete": (
+            len(java_code), lambda: server.analyze_and_generate_java_complete(java_code)),
+        "analyze_java_class": (
+            len(java_class), lambda: server.analyze_java_class(java_class)),
+        "analyze_and_generate_complete[java]": (
+            len(java_code), lambda: server.analyze_and_generate_complete(java_code, "java", "junit5")),
+        "generate_test_prompt[javascript]": (
+            len(js_code), lambda: server.generate_test_prompt(js_code, "javascript", "jest")),
+        "analyze_js_module": (
+            len(js_module), lambda: server.analyze_js_module(js_module)),
+        "analyze_and_generate_complete[javascript]": (
+            len(js_code), lambda: server.analyze_and_generate_complete(js_code, "javascript", "jest")),
+        "analyze_batch": (batch_chars, lambda: server.analyze_batch(batch)),
+        "scan_project": (project_chars, lambda: server.scan_project(project_dir)),
+        "call_graph_order": (
+            len(python_module), lambda: server.call_graph_order(python_module)),
+        # O grafo do projeto é mantido entre chamadas: mede a atualização incremental
+        "call_graph_order[project]": (
+            project_chars, lambda: server.call_graph_order(path=project_dir)),
+        "server_stats": (0, lambda: server.server_stats()),
+    }
+    if os.path.isdir(os.path.join(project_dir, ".git")):
+        calls["analyze_git_diff"] = (
+            project_chars, lambda: server.analyze_git_diff(project_dir, "HEAD", detail="compact"))
+    return calls
+
+
+def write_project(spec: CorpusSpec, root: str, files: int = 4) -> int:
+    """Grava um projeto com arquivos .py, .java e .js para scan_project; devolve o total de caracteres"""
+    total = 0
+    for index in range(files):
+        for name, code in ((f"module_{index}.py", generate_python_module(spec, 2)),
+                           (f"Generated{index}.java", generate_java_class(spec, 2)),
+                           (f"module_{index}.js", generate_js_module(spec, 2))):
+            with open(os.path.join(root, name), "w", encoding="utf-8") as output:
+                output.write(code)
+            total += len(code)
+    return total
+
+
+def commit_project(spec: CorpusSpec, root: str) -> None:
+    """Versiona o projeto em git e regrava os arquivos com mais blocos, para analyze_git_diff"""
+    if shutil.which("git") is None:
+        return
+    for args in (["init", "-q"], ["add", "."], ["commit", "-q", "-m", "bench"]):
+        subprocess.run(["git", "-C", root, "-c", "user.name=bench", "-c", "user.email=bench@localhost",
+                        *args], check=True, capture_output=True)
+    changed = CorpusSpec(spec.name, spec.statements + 1, spec.depth, spec.branches, spec.params)
+    write_project(changed, root)
+
+
+def summarize(samples: List[float], peak: int, result: Any) -> Dict[str, Any]:
+    """Métricas de uma ferramenta a partir das amostras de tempo (s) e do pico de memória (bytes)"""
+    return {
+        "iterations": len(samples),
+        "throughput_per_s": round(len(samples) / sum(samples), 2),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "mad_ms": round(median_deviation(samples) * 1000, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "error": isinstance(result, dict) and "error" in result,
+    }
+
+
+async def sample(call: Callable[[], Awaitable[Any]]) -> Tuple[float, Any]:
+    """Uma chamada com o cache em memória vazio: (duração em s, resultado)"""
+    mcp_server.analysis_cache.clear()
+    start = time.perf_counter()
+    result = await call()
+    return time.perf_counter() - start, result
+
+
+async def peak_memory(call: Callable[[], Awaitable[Any]]) -> int:
+    """Pico de memória de uma chamada, em execução separada: o tracemalloc distorceria os tempos"""
+    mcp_server.analysis_cache.clear()
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+async def measure(calls: Dict[str, Callable[[], Awaitable[Any]]], iterations: int, warmup: int,
+                  max_seconds: float, min_samples: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Executa as chamadas em rodadas intercaladas, sempre com o cache em memória vazio
+
+    Cada rodada faz uma chamada de cada ferramenta ainda ativa: uma fase lenta da
+    máquina atinge amostras de todas, em vez de todas as amostras de uma só.
+    """
+    for call in calls.values():
+        for _ in range(warmup):
+            await sample(call)
+
+    samples: Dict[str, List[float]] = {tool: [] for tool in calls}
+    spent = dict.fromkeys(calls, 0.0)
+    results: Dict[str, Any] = {}
+    active = list(calls)
+    while active:
+        for tool in active:
+            duration, results[tool] = await sample(calls[tool])
+            samples[tool].append(duration)
+            spent[tool] += duration
+        # Entradas grandes: pelo menos min_samples amostras, depois respeita o orçamento de tempo
+        active = [tool for tool in active if len(samples[tool]) < iterations
+                  and not (len(samples[tool]) >= min_samples and spent[tool] > max_seconds)]
+
+    return {tool: summarize(samples[tool], await peak_memory(call), results[tool])
+            for tool, call in calls.items()}
+
+
+async def run(specs: List[CorpusSpec], iterations: int, warmup: int, max_seconds: float,
+              tools: Optional[List[str]] = None, min_samples: int = 3) -> Dict[str, Any]:
+    """Mede todas as ferramentas em todos os corpora"""
+    results: Dict[str, Any] = {}
+    print(f"{'ferramenta':>40} {'corpus':>7} {'KB':>8} {'ops/s':>9} {'p50 (ms)':>10} "
+          f"{'p99 (ms)':>10} {'pico (KB)':>10}")
+    for spec in specs:
+        with tempfile.TemporaryDirectory() as project_dir:
+            project_chars = write_project(spec, project_dir)
+            commit_project(spec, project_dir)
+            calls = {tool: entry for tool, entry in build_calls(spec, project_dir, project_chars).items()
+                     if not tools or tool.split("[")[0] in tools}
+            measured = await measure({tool: call for tool, (_, call) in calls.items()},
+                                     iterations, warmup, max_seconds, min_samples)
+            for tool, metrics in measured.items():
+                metrics["corpus"] = spec.name
+                metrics["spec"] = spec.to_dict()
+                metrics["input_chars"] = calls[tool][0]
+                results[f"{tool}/{spec.name}"] = metrics
+                print(f"{tool:>40} {spec.name:>7} {metrics['input_chars'] / 1024:>8.1f} "
+                      f"{metrics['throughput_per_s']:>9.1f} {metrics['p50_ms']:>10.2f} "
+                      f"{metrics['p99_ms']:>10.2f} {metrics['peak_memory_kb']:>10.1f}"
+                      f"{'  (erro)' if metrics['error'] else ''}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", nargs="+", choices=sorted(PRESETS), default=["small", "medium"])
+    parser.add_argument("--statements", type=int, help="blocos de instruções (substitui o perfil)")
+    parser.add_argument("--depth", type=int, help="profundidade de aninhamento")
+    parser.add_argument("--branches", type=int, help="ramos por condicional")
+    parser.add_argument("--params", type=int, help="quantidade de parâmetros")
+    parser.add_argument("--tools", nargs="+", help="mede apenas estas ferramentas")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--max-seconds", type=float, default=5.0,
+                        help="orçamento de tempo por ferramenta e corpus")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", help="baseline JSON para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="regressão máxima aceita, em porcentagem")
+    parser.add_argument("--metrics", nargs="+", choices=sorted(MIN_REGRESSION),
+                        default=list(DEFAULT_METRICS), help="métricas comparadas com a baseline")
+    args = parser.parse_args()
+    if args.compare and args.iterations < MIN_SAMPLES:
+        parser.error(f"--compare exige --iterations >= {MIN_SAMPLES}: com menos amostras a "
+                     f"diferença entre execuções idênticas passa do limite")
+
+    specs = []
+    for name in args.corpus:
+        preset = PRESETS[name]
+        specs.append(CorpusSpec(
+            name,
+            args.statements if args.statements is not None else preset.statements,
+            args.depth if args.depth is not None else preset.depth,
+            args.branches if args.branches is not None else preset.branches,
+            args.params if args.params is not None else preset.params,
+        ))
+
+    try:
+        # Ao comparar, o orçamento de tempo não corta a medição abaixo de MIN_SAMPLES
+        min_samples = MIN_SAMPLES if args.compare else 3
+        results = asyncio.run(run(specs, args.iterations, args.warmup, args.max_seconds, args.tools,
+                                  min_samples))
+    finally:
+        mcp_server.batch_analyzer.shutdown()
+        mcp_server.tool_executor.shutdown()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "executor": mcp_server.tool_executor.mode,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        for warning in unreliable(results, baseline.get("results", {}), args.metrics):
+            print(f"Aviso: {warning}")
+        regressions = compare(results, baseline.get("results", {}), args.threshold, args.metrics)
+        if regressions:
+            print(f"\nRegressões acima de {args.threshold:.0f}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nSem regressões acima de {args.threshold:.0f}% em relação a {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark: parcela do unparse na latência da análise Python
+
+Compara a renderização de expressões só com ast.unparse (como antes) com o
+recorte do código fonte (ExpressionRenderer) nos corpora sintéticos: mede a
+latência total de PythonAnalysisEngine.analyze e analyze_module e o tempo da
+fase "unparse" registrado pelas métricas, em cada modo.
+
+Uso:
+    python -m benchmarks.bench_unparse [--corpus small medium large] [--repeat 5]
+"""
+import argparse
+from typing import Any, Dict, List
+
+from analyzers.metrics import ServerMetrics
+from analyzers.python_Analyzer import PythonAnalysisEngine
+from benchmarks.corpus import PRESETS, generate_python_function, generate_python_module
+
+# Modos comparados: nome -> usa o recorte do código fonte
+MODES = {"unparse": False, "segments": True}
+
+
+def profile(engine: PythonAnalysisEngine, operation: str, code: str, repeat: int) -> Dict[str, float]:
+    """Latência média e tempo médio da fase "unparse" (ms) de `repeat` análises"""
+    metrics = ServerMetrics(enabled=True)
+    analyze = getattr(engine, operation)
+    for _ in range(repeat):
+        metrics.call(operation, len(code), analyze, code)
+    stats = metrics.stats()["tools"][operation]
+    unparse = stats["phases"].get("unparse", {"mean_ms": 0.0})
+    return {"total_ms": stats["latency"]["mean_ms"], "unparse_ms": unparse["mean_ms"]}
+
+
+def run(corpora: List[str], repeat: int) -> Dict[str, Any]:
+    """Latência e parcela do unparse por corpus, operação e modo"""
+    results: Dict[str, Any] = {}
+    print(f"{'corpus':>7} {'operação':>15} {'modo':>9} {'total (ms)':>11} "
+          f"{'unparse (ms)':>13} {'parcela':>8}")
+    for name in corpora:
+        inputs = {
+            "analyze": generate_python_function(PRESETS[name]),
+            "analyze_module": generate_python_module(PRESETS[name]),
+        }
+        for operation, code in inputs.items():
+            for mode, source_segments in MODES.items():
+                measured = profile(PythonAnalysisEngine(source_segments=source_segments),
+                                   operation, code, repeat)
+                share = measured["unparse_ms"] / measured["total_ms"] if measured["total_ms"] else 0.0
+                results[f"{name}/{operation}/{mode}"] = {**measured, "share": round(share, 3)}
+                print(f"{name:>7} {operation:>15} {mode:>9} {measured['total_ms']:>11.2f} "
+                      f"{measured['unparse_ms']:>13.2f} {share:>7.0%}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", nargs="+", choices=sorted(PRESETS), default=["small", "medium", "large"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.corpus, max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Corpora sintéticos de Python, Java e JavaScript para os benchmarks das ferramentas
+
+Cada gerador é determinístico e controlado por um CorpusSpec: quantidade de
+blocos de instruções, profundidade de aninhamento, ramos por condicional e
+quantidade de parâmetros.
+"""
+from typing import Dict, List
+
+
+class CorpusSpec:
+    """Parâmetros de geração de um corpus"""
+
+    __slots__ = ("name", "statements", "depth", "branches", "params")
+
+    def __init__(self, name: str, statements: int, depth: int, branches: int, params: int):
+        self.name = name
+        self.statements = max(1, statements)
+        self.depth = max(1, depth)
+        self.branches = max(1, branches)
+        self.params = max(0, params)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"statements": self.statements, "depth": self.depth,
+                "branches": self.branches, "params": self.params}
+
+
+# Perfis padrão, do trecho típico enviado por um cliente até uma função enorme
+PRESETS: Dict[str, CorpusSpec] = {
+    "small": CorpusSpec("small", statements=4, depth=2, branches=2, params=2),
+    "medium": CorpusSpec("medium", statements=40, depth=3, branches=4, params=5),
+    "large": CorpusSpec("large", statements=400, depth=4, branches=6, params=10),
+}
+
+
+def _python_block(index: int, depth: int, branches: int, indent: str) -> List[str]:
+    """Bloco com `depth` níveis aninhados; o mais interno tem `branches` ramos"""
+    if depth == 0:
+        return [f"{indent}total += helper_{index % 7}(p0, {index})"]
+
+    inner = indent + "    "
+    kind = (index + depth) % 4
+    if kind == 0:
+        lines = [f"{indent}if p0 > {index} and flag_{depth}:"]
+        lines += _python_block(index, depth - 1, branches, inner)
+        for branch in range(1, branches):
+            lines.append(f"{indent}elif p0 == {index + branch}:")
+            lines.append(f"{inner}total -= {branch}")
+        lines += [f"{indent}else:", f"{inner}total = os.path.join(str(total), 'x')"]
+    elif kind == 1:
+        lines = [f"{indent}for item_{depth} in items:"]
+        lines += _python_block(index, depth - 1, branches, inner)
+    elif kind == 2:
+        lines = [f"{indent}try:"]
+        lines += _python_block(index, depth - 1, branches, inner)
+        lines += [f"{indent}except (KeyError, ValueError) as error:",
+                  f"{inner}raise RuntimeError('bloco {index}') from error"]
+    else:
+        lines = [f"{indent}while total < {index}:"]
+        lines += _python_block(index, depth - 1, branches, inner)
+        lines.append(f"{inner}total += 1")
+    return lines
+
+
+def generate_python_function(spec: CorpusSpec, name: str = "generated") -> str:
+    """Função Python com os blocos descritos em `spec`"""
+    params = ", ".join(["p0: int"] + [f"p{i}: str = 'v{i}'" for i in range(1, spec.params)])
+    lines = [f"def {name}({params}, items: list = None, **options) -> int:",
+             "    total = 0",
+             "    items = items or []"]
+    lines += [f"    flag_{level} = options.get('flag_{level}', True)"
+              for level in range(1, spec.depth + 1)]
+    for index in range(spec.statements):
+        lines += _python_block(index, spec.depth, spec.branches, "    ")
+    lines.append("    return total")
+    return "\n".join(lines) + "\n"
+
+
+def generate_python_module(spec: CorpusSpec, functions: int = 8) -> str:
+    """Módulo com imports e `functions` funções (metade como métodos de uma classe)"""
+    parts = ["import os", "from collections import OrderedDict", ""]
+    for index in range(functions):
+        code = generate_python_function(spec, f"generated_{index}")
+        if index % 2:
+            parts.append(f"class Generated{index}:")
+            code = code.replace("(", "(self, ", 1)
+            parts.append("\n".join("    " + line for line in code.splitlines()))
+        else:
+            parts.append(code)
+        parts.append("")
+    return "\n".join(parts) + "\n"
+
+
+def _java_block(index: int, depth: int, branches: int, indent: str) -> List[str]:
+    """Equivalente Java de _python_block"""
+    if depth == 0:
+        return [f"{indent}total += helper{index % 7}(p0, {index});"]
+
+    inner = indent + "    "
+    kind = (index + depth) % 4
+    if kind == 0:
+        lines = [f"{indent}if (p0 > {index} && flag{depth}) {{"]
+        lines += _java_block(index, depth - 1, branches, inner)
+        for branch in range(1, branches):
+            lines += [f"{indent}}} else if (p0 == {index + branch}) {{",
+                      f"{inner}total -= {branch};"]
+        lines += [f"{indent}}} else {{", f"{inner}total = Math.abs(total);", f"{indent}}}"]
+    elif kind == 1:
+        lines = [f"{indent}for (String item{depth} : items) {{"]
+        lines += _java_block(index, depth - 1, branches, inner)
+        lines.append(f"{indent}}}")
+    elif kind == 2:
+        lines = [f"{indent}try {{"]
+        lines += _java_block(index, depth - 1, branches, inner)
+        lines += [f"{indent}}} catch (IllegalArgumentException | IllegalStateException e) {{",
+                  f"{inner}throw new RuntimeException(\"bloco {index}\", e);",
+                  f"{indent}}} finally {{",
+                  f"{inner}total++;",
+                  f"{indent}}}"]
+    else:
+        lines = [f"{indent}while (total < {index}) {{"]
+        lines += _java_block(index, depth - 1, branches, inner)
+        lines += [f"{inner}total++;", f"{indent}}}"]
+    return lines
+
+
+def generate_java_method(spec: CorpusSpec, name: str = "generated") -> str:
+    """Método Java com os blocos descritos em `spec`"""
+    params = ", ".join(["int p0"] + [f"String p{i}" for i in range(1, spec.params)]
+                       + ["List<String> items", "Map<String, Boolean> options"])
+    lines = [f"public int {name}({params}) throws IOException {{",
+             "    int total = 0;"]
+    lines += [f"    boolean flag{level} = options.getOrDefault(\"flag{level}\", true);"
+              for level in range(1, spec.depth + 1)]
+    for index in range(spec.statements):
+        lines += _java_block(index, spec.depth, spec.branches, "    ")
+    lines += ["    return total;", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_java_class(spec: CorpusSpec, methods: int = 8) -> str:
+    """Unidade de compilação com imports e `methods` métodos"""
+    parts = ["package com.example.bench;", "",
+             "import java.io.IOException;", "import java.util.List;", "import java.util.Map;", "",
+             "public class Generated {"]
+    for index in range(methods):
+        method = generate_java_method(spec, f"generated{index}")
+        parts.append("\n".join("    " + line for line in method.splitlines()))
+        parts.append("")
+    parts.append("}")
+    return "\n".join(parts) + "\n"
+
+
+def _js_block(index: int, depth: int, branches: int, indent: str) -> List[str]:
+    """Equivalente JavaScript de _java_block (sem ";", como em código real com ASI)"""
+    if depth == 0:
+        return [f"{indent}total += helper{index % 7}(p0, `item ${{{index}}}`)"]
+
+    inner = indent + "    "
+    kind = (index + depth) % 4
+    if kind == 0:
+        lines = [f"{indent}if (p0 > {index} && flag{depth}) {{"]
+        lines += _js_block(index, depth - 1, branches, inner)
+        for branch in range(1, branches):
+            lines += [f"{indent}}} else if (p0 === {index + branch}) {{",
+                      f"{inner}total -= {branch}"]
+        lines += [f"{indent}}} else {{", f"{inner}total = Math.abs(total / 2)", f"{indent}}}"]
+    elif kind == 1:
+        lines = [f"{indent}for (const item{depth} of items) {{"]
+        lines += _js_block(index, depth - 1, branches, inner)
+        lines.append(f"{indent}}}")
+    elif kind == 2:
+        lines = [f"{indent}try {{"]
+        lines += _js_block(index, depth - 1, branches, inner)
+        lines += [f"{indent}}} catch (error) {{",
+                  f"{inner}throw new RangeError(`bloco {index}: ${{error.message}}`)",
+                  f"{indent}}} finally {{",
+                  f"{inner}total++",
+                  f"{indent}}}"]
+    else:
+        lines = [f"{indent}while (total < {index} && !/^x+$/.test(p1)) {{"]
+        lines += _js_block(index, depth - 1, branches, inner)
+        lines += [f"{inner}total++", f"{indent}}}"]
+    return lines
+
+
+def generate_js_function(spec: CorpusSpec, name: str = "generated") -> str:
+    """Função JavaScript com os blocos descritos em `spec`"""
+    params = ", ".join(["p0"] + [f"p{i} = 'v{i}'" for i in range(1, spec.params)]
+                       + ["items = []", "...options"])
+    lines = [f"function {name}({params}) {{",
+             "    let total = 0"]
+    lines += [f"    const flag{level} = options[{level - 1}] ?? true"
+              for level in range(1, spec.depth + 1)]
+    for index in range(spec.statements):
+        lines += _js_block(index, spec.depth, spec.branches, "    ")
+    lines += ["    return total", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_js_module(spec: CorpusSpec, functions: int = 8) -> str:
+    """Módulo ES com imports e `functions` funções (declarações, arrow functions e métodos)"""
+    parts = ["import path from 'path'", "import { readFile } from 'fs/promises'",
+             "const { format } = require('util')", ""]
+    for index in range(functions):
+        code = generate_js_function(spec, f"generated{index}")
+        if index % 3 == 1:
+            code = code.replace(f"function generated{index}(", f"export const generated{index} = (", 1)
+            code = code.replace(") {", ") => {", 1)
+        elif index % 3 == 2:
+            parts.append(f"export class Generated{index} {{")
+            code = code.replace("function ", "async ", 1)
+            code = "\n".join("    " + line for line in code.splitlines()) + "\n}"
+        parts.append(code)
+    return "\n".join(parts) + "\n"
+
+
+def generate_js_bundle(size: int) -> str:
+    """Bundle no estilo de um empacotador (webpack/rollup) com aproximadamente `size` caracteres
+
+    Cada módulo do corpus "medium" vira uma função de fábrica dentro de um
+    único objeto, como nos arquivos gerados para produção.
+    """
+    module = generate_js_module(PRESETS["medium"], functions=4)
+    module = module.replace("export const", "const").replace("export class", "class")
+    module = "\n".join(line for line in module.splitlines() if not line.startswith("import "))
+    parts = ["(function (modules) {", "  const cache = {}",
+             "  function __require(id) { return cache[id] || (cache[id] = modules[id](__require)) }",
+             "  return __require(0)", "})({"]
+    total = sum(len(part) for part in parts)
+    index = 0
+    while total < size:
+        part = f"{index}: function (require) {{\n{module}\n}},"
+        parts.append(part)
+        total += len(part)
+        index += 1
+    parts.append("})")
+    return "\n".join(parts) + "\n"
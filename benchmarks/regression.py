@@ -0,0 +1,89 @@
+"""Estatísticas e comparação com baseline usadas pelos benchmarks"""
+import math
+from typing import Any, Dict, List, Sequence
+
+
+# Métricas comparadas por padrão com a baseline (maior é pior)
+DEFAULT_METRICS = ("p50_ms", "peak_memory_kb")
+
+# Diferenças absolutas abaixo disto são ruído de medição, não regressão
+MIN_REGRESSION = {
+    "p50_ms": 1.0,
+    "p99_ms": 1.0,
+    "peak_memory_kb": 64.0,
+}
+
+# Amostras mínimas para comparar tempos: com menos, a mediana é dominada por ruído
+MIN_SAMPLES = 10
+
+# Um tempo só regride se piorar mais que NOISE_FACTOR vezes o desvio absoluto
+# mediano (mad_ms) das amostras da baseline ou da execução atual
+NOISE_FACTOR = 3.0
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Percentil pelo método nearest-rank"""
+    ordered = sorted(samples)
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
+
+
+def median_deviation(samples: Sequence[float]) -> float:
+    """Desvio absoluto mediano: dispersão das amostras robusta a valores extremos"""
+    center = percentile(samples, 0.50)
+    return percentile([abs(sample - center) for sample in samples], 0.50)
+
+
+def _is_timing(metric: str) -> bool:
+    return metric.endswith("_ms")
+
+
+def _too_few_samples(values: Dict[str, Any]) -> bool:
+    iterations = values.get("iterations")
+    return iterations is not None and iterations < MIN_SAMPLES
+
+
+def unreliable(current: Dict[str, Any], baseline: Dict[str, Any],
+               metrics: Sequence[str] = DEFAULT_METRICS) -> List[str]:
+    """Entradas cujos tempos não são comparados por terem menos de MIN_SAMPLES amostras"""
+    if not any(_is_timing(metric) for metric in metrics):
+        return []
+    warnings = []
+    for key, values in current.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if _too_few_samples(values) or _too_few_samples(reference):
+            warnings.append(f"{key}: {reference.get('iterations')} -> {values.get('iterations')} amostras "
+                            f"(mínimo {MIN_SAMPLES}), tempos não comparados")
+    return warnings
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            metrics: Sequence[str] = DEFAULT_METRICS) -> List[str]:
+    """Lista as regressões de `current` em relação à baseline, acima de `threshold` %
+
+    Entradas que só existem em um dos lados são ignoradas, assim como os tempos
+    de entradas com poucas amostras (ver `unreliable`). Um tempo também precisa
+    piorar acima do ruído medido (NOISE_FACTOR * mad_ms) para contar.
+    """
+    regressions = []
+    for key, values in current.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        few_samples = _too_few_samples(values) or _too_few_samples(reference)
+        noise = NOISE_FACTOR * max(values.get("mad_ms", 0.0), reference.get("mad_ms", 0.0))
+        for metric in metrics:
+            old, new = reference.get(metric), values.get(metric)
+            if not old or new is None:
+                continue
+            floor = MIN_REGRESSION.get(metric, 0.0)
+            if _is_timing(metric):
+                if few_samples:
+                    continue
+                floor = max(floor, noise)
+            change = (new - old) / old * 100
+            if change > threshold and new - old > floor:
+                regressions.append(f"{key}: {metric} {old} -> {new} (+{change:.1f}%)")
+    return regressions
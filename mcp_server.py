@@ -1,481 +1,248 @@
-import ast
-import re
-import json
-from typing import Dict, List, Any, Optional, Union
-from analyzers.java_Analyzer import JavaStaticAnalyzer, JavaFlowSummarizer, JavaPromptGenerator
-from mcp.server.fastmcp import FastMCP
+import os
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, List, Any, Callable, Optional
+from analyzers.cache import AnalysisCache
+from analyzers.batch import JS_LANGUAGES, BatchAnalyzer, resolve_framework
+from analyzers.executor import LIGHT_INPUT_CHARS, executor_from_env
+from analyzers.lazy import Lazy
+from analyzers.metrics import ServerMetrics, timed
+from analyzers.response import (
+    DEFAULT_PAGE_SIZE, count_flow_nodes, detail_error, paginate, paginate_iterable, shape_response
+)
+from mcp.server.fastmcp import FastMCP, Context
 
 # Inicializar o servidor MCP
 mcp = FastMCP("Code Analysis MCP Server")
 
-class StaticAnalyzer:
-    """Analisador estático de código Python"""
-    
-    def analyze_function(self, code: str) -> Dict[str, Any]:
-        """Extrai informações estruturais de uma função"""
-        try:
-            tree = ast.parse(code)
-            function_node = None
-            
-            # Encontrar a primeira função no código
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    function_node = node
-                    break
-            
-            if not function_node:
-                raise ValueError("Nenhuma função encontrada no código")
-            
-            return {
-                "signature": self._extract_signature(function_node),
-                "parameters": self._extract_parameters(function_node),
-                "return_type": self._extract_return_type(function_node),
-                "dependencies": self._extract_dependencies(tree),
-                "decorators": self._extract_decorators(function_node)
-            }
-        except Exception as e:
-            return {"error": f"Erro na análise: {str(e)}"}
-    
-    def _extract_signature(self, node: ast.FunctionDef) -> str:
-        """Extrai a assinatura completa da função"""
-        args = []
-        
-        # Argumentos posicionais
-        for arg in node.args.args:
-            arg_str = arg.arg
-            if arg.annotation:
-                arg_str += f": {ast.unparse(arg.annotation)}"
-            args.append(arg_str)
-        
-        # Argumentos com valores padrão
-        defaults = node.args.defaults
-        default_offset = len(args) - len(defaults)
-        for i, default in enumerate(defaults):
-            args[default_offset + i] += f" = {ast.unparse(default)}"
-        
-        # *args
-        if node.args.vararg:
-            vararg = f"*{node.args.vararg.arg}"
-            if node.args.vararg.annotation:
-                vararg += f": {ast.unparse(node.args.vararg.annotation)}"
-            args.append(vararg)
-        
-        # **kwargs
-        if node.args.kwarg:
-            kwarg = f"**{node.args.kwarg.arg}"
-            if node.args.kwarg.annotation:
-                kwarg += f": {ast.unparse(node.args.kwarg.annotation)}"
-            args.append(kwarg)
-        
-        signature = f"{node.name}({', '.join(args)})"
-        
-        # Tipo de retorno
-        if node.returns:
-            signature += f" -> {ast.unparse(node.returns)}"
-        
-        return signature
-    
-    def _extract_parameters(self, node: ast.FunctionDef) -> List[Dict[str, Any]]:
-        """Extrai informações detalhadas dos parâmetros"""
-        params = []
-        
-        for arg in node.args.args:
-            param_info = {
-                "name": arg.arg,
-                "type": ast.unparse(arg.annotation) if arg.annotation else "Any",
-                "has_default": False,
-                "default_value": None
-            }
-            params.append(param_info)
-        
-        # Adicionar valores padrão
-        defaults = node.args.defaults
-        default_offset = len(params) - len(defaults)
-        for i, default in enumerate(defaults):
-            params[default_offset + i]["has_default"] = True
-            params[default_offset + i]["default_value"] = ast.unparse(default)
-        
-        return params
-    
-    def _extract_return_type(self, node: ast.FunctionDef) -> str:
-        """Extrai o tipo de retorno da função"""
-        if node.returns:
-            return ast.unparse(node.returns)
-        return "Any"
-    
-    def _extract_dependencies(self, tree: ast.AST) -> Dict[str, List[str]]:
-        """Extrai dependências internas e externas"""
-        imports = []
-        internal_calls = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for alias in node.names:
-                    imports.append(f"{module}.{alias.name}")
-            elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    internal_calls.append(node.func.id)
-                elif isinstance(node.func, ast.Attribute):
-                    internal_calls.append(ast.unparse(node.func))
-        
-        return {
-            "imports": list(set(imports)),
-            "internal_calls": list(set(internal_calls))
-        }
-    
-    def _extract_decorators(self, node: ast.FunctionDef) -> List[str]:
-        """Extrai decoradores da função"""
-        return [ast.unparse(decorator) for decorator in node.decorator_list]
-
-
-class FlowSummarizer:
-    """Resumidor de fluxo de execução"""
-    
-    def summarize_flow(self, code: str) -> Dict[str, Any]:
-        """Cria um mapa minimalista do fluxo da função"""
-        try:
-            tree = ast.parse(code)
-            function_node = None
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    function_node = node
-                    break
-            
-            if not function_node:
-                raise ValueError("Nenhuma função encontrada no código")
-            
-            flow_map = self._analyze_flow(function_node.body)
-            
-            return {
-                "flow_map": flow_map,
-                "complexity_score": self._calculate_complexity(flow_map),
-                "summary": self._generate_flow_summary(flow_map)
-            }
-        except Exception as e:
-            return {"error": f"Erro na análise de fluxo: {str(e)}"}
-    
-    def _analyze_flow(self, body: List[ast.stmt]) -> List[Dict[str, Any]]:
-        """Analisa o fluxo de controle do código"""
-        flow_elements = []
-        
-        for node in body:
-            if isinstance(node, ast.If):
-                flow_elements.append({
-                    "type": "conditional",
-                    "condition": ast.unparse(node.test),
-                    "has_else": len(node.orelse) > 0,
-                    "nested_flow": self._analyze_flow(node.body)
-                })
-                if node.orelse:
-                    flow_elements.append({
-                        "type": "else",
-                        "nested_flow": self._analyze_flow(node.orelse)
-                    })
-            
-            elif isinstance(node, ast.For):
-                flow_elements.append({
-                    "type": "loop_for",
-                    "target": ast.unparse(node.target),
-                    "iter": ast.unparse(node.iter),
-                    "nested_flow": self._analyze_flow(node.body)
-                })
-            
-            elif isinstance(node, ast.While):
-                flow_elements.append({
-                    "type": "loop_while",
-                    "condition": ast.unparse(node.test),
-                    "nested_flow": self._analyze_flow(node.body)
-                })
-            
-            elif isinstance(node, ast.Try):
-                flow_elements.append({
-                    "type": "try_except",
-                    "exceptions": [ast.unparse(handler.type) if handler.type else "Exception" 
-                                 for handler in node.handlers],
-                    "has_finally": len(node.finalbody) > 0,
-                    "nested_flow": self._analyze_flow(node.body)
-                })
-            
-            elif isinstance(node, ast.Raise):
-                flow_elements.append({
-                    "type": "exception_raise",
-                    "exception": ast.unparse(node.exc) if node.exc else "Re-raise"
-                })
-            
-            elif isinstance(node, ast.Return):
-                flow_elements.append({
-                    "type": "return",
-                    "value": ast.unparse(node.value) if node.value else "None"
-                })
-        
-        return flow_elements
-    
-    def _calculate_complexity(self, flow_map: List[Dict[str, Any]]) -> int:
-        """Calcula complexidade ciclomática simplificada"""
-        complexity = 1  # Base complexity
-        
-        for element in flow_map:
-            if element["type"] in ["conditional", "loop_for", "loop_while"]:
-                complexity += 1
-            elif element["type"] == "try_except":
-                complexity += len(element["exceptions"])
-            
-            if "nested_flow" in element:
-                complexity += self._calculate_complexity(element["nested_flow"]) - 1
-        
-        return complexity
-    
-    def _generate_flow_summary(self, flow_map: List[Dict[str, Any]]) -> str:
-        """Gera resumo textual do fluxo"""
-        summary_parts = []
-        
-        for element in flow_map:
-            if element["type"] == "conditional":
-                summary_parts.append(f"IF({element['condition']})")
-            elif element["type"] == "loop_for":
-                summary_parts.append(f"FOR({element['target']} in {element['iter']})")
-            elif element["type"] == "loop_while":
-                summary_parts.append(f"WHILE({element['condition']})")
-            elif element["type"] == "try_except":
-                exceptions = ", ".join(element["exceptions"])
-                summary_parts.append(f"TRY-EXCEPT({exceptions})")
-            elif element["type"] == "exception_raise":
-                summary_parts.append(f"RAISE({element['exception']})")
-            elif element["type"] == "return":
-                summary_parts.append(f"RETURN({element['value']})")
-        
-        return " -> ".join(summary_parts)
 
+# Cache compartilhado entre todas as ferramentas
+analysis_cache = AnalysisCache()
 
-class PromptGenerator:
-    """Gerador de prompts minimalistas para LLMs"""
-    
-    def generate_test_prompt(self, static_analysis: Dict[str, Any], 
-                           flow_analysis: Dict[str, Any], 
-                           language: str = "python", 
-                           test_framework: str = "pytest") -> Dict[str, Any]:
-        """Gera prompt otimizado para geração de testes unitários"""
-        
-        # Determinar framework baseado na linguagem se não especificado
-        if test_framework == "auto":
-            test_framework = "junit" if language.lower() == "java" else "pytest"
-        
-        prompt_sections = self._build_prompt_sections(static_analysis, flow_analysis)
-        
-        output_structure = self._get_output_structure(language, test_framework)
-        
-        final_prompt = self._assemble_final_prompt(prompt_sections, output_structure, language)
-        
-        return {
-            "prompt": final_prompt,
-            "metadata": {
-                "language": language,
-                "framework": test_framework,
-                "complexity_score": flow_analysis.get("complexity_score", 1),
-                "estimated_tests": self._estimate_test_count(flow_analysis)
-            }
-        }
-    
-    def _build_prompt_sections(self, static_analysis: Dict[str, Any], 
-                              flow_analysis: Dict[str, Any]) -> Dict[str, str]:
-        """Constrói seções do prompt"""
-        
-        function_info = f"""
-FUNÇÃO: {static_analysis.get('signature', 'N/A')}
-PARÂMETROS: {self._format_parameters(static_analysis.get('parameters', []))}
-RETORNO: {static_analysis.get('return_type', 'Any')}
-DEPENDÊNCIAS: {', '.join(static_analysis.get('dependencies', {}).get('imports', []))}
-"""
-        
-        flow_info = f"""
-FLUXO: {flow_analysis.get('summary', 'Linear')}
-COMPLEXIDADE: {flow_analysis.get('complexity_score', 1)}
-CENÁRIOS: {self._extract_test_scenarios(flow_analysis.get('flow_map', []))}
-"""
-        
-        return {
-            "function_info": function_info.strip(),
-            "flow_info": flow_info.strip()
-        }
-    
-    def _format_parameters(self, parameters: List[Dict[str, Any]]) -> str:
-        """Formata parâmetros para o prompt"""
-        if not parameters:
-            return "Nenhum"
-        
-        param_strs = []
-        for param in parameters:
-            param_str = f"{param['name']}: {param['type']}"
-            if param['has_default']:
-                param_str += f" = {param['default_value']}"
-            param_strs.append(param_str)
-        
-        return ", ".join(param_strs)
-    
-    def _extract_test_scenarios(self, flow_map: List[Dict[str, Any]]) -> str:
-        """Extrai cenários de teste do mapa de fluxo"""
-        scenarios = []
-        
-        for element in flow_map:
-            if element["type"] == "conditional":
-                scenarios.extend([f"Condição TRUE: {element['condition']}", 
-                                f"Condição FALSE: {element['condition']}"])
-            elif element["type"] in ["loop_for", "loop_while"]:
-                scenarios.extend(["Loop vazio", "Loop com múltiplas iterações"])
-            elif element["type"] == "try_except":
-                scenarios.extend([f"Exceção: {exc}" for exc in element["exceptions"]])
-                scenarios.append("Execução sem exceção")
-        
-        return "; ".join(scenarios) if scenarios else "Fluxo linear"
-    
-    def _get_output_structure(self, language: str, framework: str) -> str:
-        """Retorna estrutura de saída baseada na linguagem e framework"""
-        
-        structures = {
-            ("python", "pytest"): """
-```python
-import pytest
-from unittest.mock import Mock, patch
-
-class TestFunctionName:
-    def test_case_name(self):
-        # Arrange
-        
-        # Act
-        
-        # Assert
-        
-    def test_edge_case(self):
-        # Test edge cases
-        
-    def test_exception_handling(self):
-        # Test exception scenarios
-```""",
-            
-            ("java", "junit"): """
-```java
-import org.junit.jupiter.api.Test;
-import org.junit.jupiter.api.BeforeEach;
-import static org.junit.jupiter.api.Assertions.*;
-
-class FunctionNameTest {
-    
-    @BeforeEach
-    void setUp() {
-        // Setup
-    }
-    
-    @Test
-    void testCaseName() {
-        // Arrange
-        
-        // Act
-        
-        // Assert
-    }
-    
-    @Test
-    void testEdgeCase() {
-        // Test edge cases
-    }
-    
-    @Test
-    void testExceptionHandling() {
-        // Test exception scenarios
-    }
-}
-```""",
-            
-            ("javascript", "jest"): """
-```javascript
-const { functionName } = require('./module');
-
-describe('functionName', () => {
-    test('should handle normal case', () => {
-        // Arrange
-        
-        // Act
-        
-        // Assert
-    });
-    
-    test('should handle edge cases', () => {
-        // Test edge cases
-    });
-    
-    test('should handle errors', () => {
-        // Test error scenarios
-    });
-});
-```"""
-        }
-        
-        key = (language.lower(), framework.lower())
-        return structures.get(key, structures[("python", "pytest")])
-    
-    def _assemble_final_prompt(self, sections: Dict[str, str], 
-                              output_structure: str, language: str) -> str:
-        """Monta o prompt final"""
-        
-        return f"""Gere testes unitários completos para a seguinte função em {language}:
 
-{sections['function_info']}
+# Backends de linguagem, importados e criados na primeira ferramenta que precisa
+# deles: a partida do servidor fica só com o registro das ferramentas, e uma
+# sessão só de Python nunca carrega o analisador Java
+class PythonBackend:
+    """Analisadores Python do servidor"""
 
-{sections['flow_info']}
+    def __init__(self):
+        from analyzers.python_Analyzer import PromptGenerator, PythonAnalysisEngine
 
-INSTRUÇÕES:
-1. Cubra todos os cenários identificados no fluxo
-2. Inclua testes para casos extremos e validação de parâmetros
-3. Teste tratamento de exceções quando aplicável
-4. Use mocks para dependências externas
-5. Mantenha testes independentes e determinísticos
+        self.engine = PythonAnalysisEngine(analysis_cache)
+        self.prompt_generator = PromptGenerator()
+        # Montagem dos prompts cronometrada na fase "prompt"
+        self.build_prompt = timed("prompt", self.prompt_generator.generate_test_prompt)
 
-ESTRUTURA DE SAÍDA OBRIGATÓRIA:
-{output_structure}
 
-Gere APENAS o código dos testes, sem explicações adicionais."""
-    
-    def _estimate_test_count(self, flow_analysis: Dict[str, Any]) -> int:
-        """Estima número de testes necessários"""
-        complexity = flow_analysis.get("complexity_score", 1)
-        flow_map = flow_analysis.get("flow_map", [])
-        
-        # Base: 1 teste para o caso feliz
-        test_count = 1
-        
-        # Adicionar testes baseados na complexidade
-        test_count += complexity
-        
-        # Contar cenários específicos
-        for element in flow_map:
-            if element["type"] == "conditional":
-                test_count += 1  # Teste para else/elif
-            elif element["type"] in ["loop_for", "loop_while"]:
-                test_count += 1  # Teste para loop vazio
-            elif element["type"] == "try_except":
-                test_count += len(element["exceptions"])
-        
-        return min(test_count, 15)  # Limitar a 15 testes por função
+class JavaBackend:
+    """Analisadores Java do servidor"""
+
+    def __init__(self):
+        from analyzers.java_Analyzer import (
+            JavaAnalysisEngine, JavaFlowSummarizer, JavaPromptGenerator, JavaStaticAnalyzer
+        )
+
+        self.static_analyzer = JavaStaticAnalyzer(analysis_cache)
+        self.flow_summarizer = JavaFlowSummarizer(analysis_cache)
+        self.engine = JavaAnalysisEngine(analysis_cache)
+        self.prompt_generator = JavaPromptGenerator()
+        self.build_prompt = timed("prompt", self.prompt_generator.generate_test_prompt)
+
+
+class JSBackend:
+    """Analisadores JavaScript/TypeScript do servidor"""
+
+    def __init__(self):
+        from analyzers.js_Analyzer import JSAnalysisEngine
+        from analyzers.python_Analyzer import PromptGenerator
+
+        self.engine = JSAnalysisEngine(analysis_cache)
+        self.prompt_generator = PromptGenerator()
+        self.build_prompt = timed("prompt", self.prompt_generator.generate_test_prompt)
+
 
+def _open_store():
+    """Cache persistente entre reinícios do servidor (MCP_QA_CACHE_DB)"""
+    from analyzers.store import open_default_store
 
-# Instanciar as classes
-static_analyzer = StaticAnalyzer()
-flow_summarizer = FlowSummarizer()
-prompt_generator = PromptGenerator()
+    return open_default_store()
 
-# Instanciar as classes Java
-java_static_analyzer = JavaStaticAnalyzer()
-java_flow_summarizer = JavaFlowSummarizer()
-java_prompt_generator = JavaPromptGenerator()
+
+def _create_project_scanner():
+    from analyzers.project import ProjectScanner
+
+    return ProjectScanner(batch_analyzer, analysis_store(), server_metrics)
+
+
+def _create_diff_analyzer():
+    from analyzers.git_diff import DiffAnalyzer
+
+    return DiffAnalyzer(analysis_cache)
+
+
+python_backend = Lazy(PythonBackend)
+java_backend = Lazy(JavaBackend)
+js_backend = Lazy(JSBackend)
+
+# Pool de processos para análises em lote e varredura de projetos (criado no primeiro uso)
+batch_analyzer = BatchAnalyzer()
+
+# Banco persistente e varredura de projetos: abertos na primeira chamada de scan_project
+analysis_store = Lazy(_open_store)
+project_scanner = Lazy(_create_project_scanner)
+
+# Análise das funções alteradas entre revisões git (criada na primeira chamada)
+diff_analyzer = Lazy(_create_diff_analyzer)
+
+# Grafos de chamadas por diretório raiz, mantidos entre chamadas para a atualização incremental
+project_call_graphs: Dict[str, Any] = {}
+
+# Latência por ferramenta, fase e tamanho de entrada (MCP_QA_METRICS=0 desativa)
+server_metrics = ServerMetrics()
+
+# Executa as ferramentas fora do event loop (MCP_QA_EXECUTOR, MCP_QA_MAX_CONCURRENCY)
+tool_executor = executor_from_env(batch_analyzer, server_metrics)
+
+
+def _cached_analysis(kind: str, language: str, code: str,
+                     local: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    """Análise com cache, calculada na thread da chamada ou em um processo"""
+    return analysis_cache.get_analysis(
+        kind, code, language,
+        lambda code: tool_executor.analyze(kind, language, code, local)
+    )
+
+
+def _python_analysis(code: str, qualified_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Análises estática e de fluxo Python em passagem única, com cache
+
+    Com `qualified_name`, a função é buscada no índice de símbolos do módulo,
+    que fica no cache deste processo: a busca roda na própria thread.
+    """
+    if qualified_name is None:
+        return _cached_analysis("fused", "python", code, python_backend().engine.analyze)
+    return analysis_cache.get_analysis(
+        f"fused:{qualified_name}", code, "python",
+        lambda code: python_backend().engine.analyze(code, qualified_name)
+    )
+
+
+def _python_static(code: str, qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """Análise estática Python com cache"""
+    return _python_analysis(code, qualified_name)["static"]
+
+
+def _python_flow(code: str, qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """Análise de fluxo Python com cache"""
+    return _python_analysis(code, qualified_name)["flow"]
+
+
+def _java_static(code: str) -> Dict[str, Any]:
+    """Análise estática Java com cache"""
+    return _cached_analysis("static", "java", code, java_backend().static_analyzer.analyze_method)
+
+
+def _java_flow(code: str) -> Dict[str, Any]:
+    """Análise de fluxo Java com cache"""
+    return _cached_analysis("flow", "java", code, java_backend().flow_summarizer.summarize_flow)
+
+
+def _python_module(code: str) -> Dict[str, Any]:
+    """Análise de módulo Python completo com cache"""
+    return _cached_analysis("module", "python", code, python_backend().engine.analyze_module)
+
+
+def _java_class(code: str) -> Dict[str, Any]:
+    """Análise de classe Java completa com cache"""
+    return _cached_analysis("class", "java", code, java_backend().engine.analyze_class)
+
+
+def _js_analysis(code: str) -> Dict[str, Dict[str, Any]]:
+    """Análises estática e de fluxo JavaScript/TypeScript em passagem única, com cache"""
+    return _cached_analysis("fused", "javascript", code, js_backend().engine.analyze)
+
+
+def _python_call_graph(code: str) -> Dict[str, Any]:
+    """Grafo de chamadas de um módulo Python com cache (compartilha o parse das demais análises)"""
+    from analyzers.call_graph import analyze_call_graph
+
+    return analysis_cache.get_analysis(
+        "call_graph", code, "python", lambda code: analyze_call_graph(code, analysis_cache)
+    )
+
+
+def _js_module(code: str) -> Dict[str, Any]:
+    """Análise de módulo JavaScript/TypeScript completo com cache"""
+    return _cached_analysis("module", "javascript", code, js_backend().engine.analyze_module)
+
+
+def _python_prompt(code: str, static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any],
+                   language: str, test_framework: str,
+                   max_prompt_tokens: Optional[int] = None,
+                   qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """Prompt Python com cache (um por função pedida do mesmo código)"""
+    generator = "python" if qualified_name is None else f"python:{qualified_name}"
+    return analysis_cache.get_prompt(
+        generator, code, language, test_framework,
+        lambda: python_backend().build_prompt(
+            static_analysis, flow_analysis, language, test_framework, max_prompt_tokens
+        ),
+        max_prompt_tokens
+    )
+
+
+def _java_prompt(code: str, static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any],
+                 test_framework: str, max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """Prompt Java com cache"""
+    return analysis_cache.get_prompt(
+        "java", code, "java", test_framework,
+        lambda: java_backend().build_prompt(
+            static_analysis, flow_analysis, test_framework, max_prompt_tokens
+        ),
+        max_prompt_tokens
+    )
+
+
+def _js_prompt(code: str, static_analysis: Dict[str, Any], flow_analysis: Dict[str, Any],
+               language: str, test_framework: str,
+               max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """Prompt JavaScript/TypeScript com cache"""
+    return analysis_cache.get_prompt(
+        "javascript", code, language, test_framework,
+        lambda: js_backend().build_prompt(
+            static_analysis, flow_analysis, language, test_framework, max_prompt_tokens
+        ),
+        max_prompt_tokens
+    )
+
+
+def _shaped(report: Callable[..., Dict[str, Any]], detail: str, fields: Optional[List[str]],
+            *args: Any) -> Dict[str, Any]:
+    """Relatório `report(*args)` com o nível de detalhe e a seleção de campos pedidos"""
+    error = detail_error(detail)
+    if error is not None:
+        return error
+    return shape_response(report(*args), detail, fields)
+
+
+def _paged(analysis: Callable[[str], Dict[str, Any]], key: str, code: str,
+           page_size: Optional[int], cursor: Optional[str],
+           weight: Optional[Callable[[Any], int]] = None,
+           selector: Optional[str] = None) -> Dict[str, Any]:
+    """Análise com a lista `key` paginada (a análise inteira fica só no cache)"""
+    return paginate(analysis(code), key, code, page_size, cursor, weight, selector or "")
+
+
+def _symbol_error(language: str, qualified_name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Erro para `qualified_name` pedido em uma linguagem sem índice de símbolos, ou None"""
+    if qualified_name is None or language.lower() not in (JS_LANGUAGES | {"java"}):
+        return None
+    return {"error": f"qualified_name só é suportado para Python (linguagem: {language})"}
 
 
 @mcp.tool()
-def analyze_function_static(code: str) -> Dict[str, Any]:
+async def analyze_function_static(code: str, qualified_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Ferramenta 1: Analisador Estático
     
@@ -488,15 +255,20 @@ def analyze_function_static(code: str) -> Dict[str, Any]:
     
     Args:
         code: Código fonte da função a ser analisada
+        qualified_name: Função a analisar no código ("func", "Classe.metodo",
+                        "func.<locals>.interna"); padrão: a primeira encontrada
         
     Returns:
         Dicionário com informações estruturais da função
     """
-    return static_analyzer.analyze_function(code)
+    return await tool_executor.run(_python_static, code, qualified_name, size=len(code),
+                                   tool="analyze_function_static")
 
 
 @mcp.tool()
-def summarize_function_flow(code: str) -> Dict[str, Any]:
+async def summarize_function_flow(code: str, page_size: Optional[int] = None,
+                                  cursor: Optional[str] = None,
+                                  qualified_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Ferramenta 2: Resumidor de Fluxo
     
@@ -508,16 +280,54 @@ def summarize_function_flow(code: str) -> Dict[str, Any]:
     
     Args:
         code: Código fonte da função a ser analisada
+        page_size: Máximo de nós do mapa de fluxo por página (padrão: sem paginação)
+        cursor: Valor de page.next_cursor da página anterior
+        qualified_name: Função a analisar no código (padrão: a primeira encontrada)
         
     Returns:
         Dicionário com mapa de fluxo e métricas de complexidade
     """
-    return flow_summarizer.summarize_flow(code)
+    return await tool_executor.run(_paged, partial(_python_flow, qualified_name=qualified_name),
+                                   "flow_map", code, page_size, cursor, count_flow_nodes,
+                                   qualified_name, size=len(code), tool="summarize_function_flow")
+
+
+def _generate_test_prompt(code: str, language: str = "python", test_framework: str = "pytest",
+                          max_prompt_tokens: Optional[int] = None,
+                          qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """Gera o prompt de testes Python ou JavaScript/TypeScript (executado fora do event loop)"""
+    error = _symbol_error(language, qualified_name)
+    if error is not None:
+        return error
+    
+    # Executar análises
+    if language.lower() in JS_LANGUAGES:
+        analysis = _js_analysis(code)
+    else:
+        analysis = _python_analysis(code, qualified_name)
+    static_analysis = analysis["static"]
+    flow_analysis = analysis["flow"]
+    
+    # Verificar se houve erros nas análises
+    if "error" in static_analysis:
+        return {"error": f"Erro na análise estática: {static_analysis['error']}"}
+    
+    if "error" in flow_analysis:
+        return {"error": f"Erro na análise de fluxo: {flow_analysis['error']}"}
+    
+    # Gerar prompt
+    if language.lower() in JS_LANGUAGES:
+        return _js_prompt(code, static_analysis, flow_analysis, language.lower(), test_framework,
+                          max_prompt_tokens)
+    return _python_prompt(code, static_analysis, flow_analysis, language, test_framework,
+                          max_prompt_tokens, qualified_name)
 
 
 @mcp.tool()
-def generate_test_prompt(code: str, language: str = "python", 
-                        test_framework: str = "pytest") -> Dict[str, Any]:
+async def generate_test_prompt(code: str, language: str = "python", 
+                               test_framework: str = "pytest",
+                               max_prompt_tokens: Optional[int] = None,
+                               qualified_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Ferramenta 3: Gerador de Prompt Minimalista
     
@@ -526,32 +336,46 @@ def generate_test_prompt(code: str, language: str = "python",
     
     Args:
         code: Código fonte da função
-        language: Linguagem de programação (python, java, javascript)
-        test_framework: Framework de teste (pytest, junit, jest, auto)
+        language: Linguagem de programação (python, javascript, typescript)
+        test_framework: Framework de teste (pytest, jest, auto)
+        max_prompt_tokens: Orçamento de tokens do prompt; acima dele o prompt é compactado
+        qualified_name: Função Python a usar (padrão: a primeira encontrada)
         
     Returns:
-        Dicionário com prompt otimizado e metadados
+        Dicionário com prompt otimizado e metadados (tokens estimados por seção)
     """
-    # Executar análises
-    static_analysis = static_analyzer.analyze_function(code)
-    flow_analysis = flow_summarizer.summarize_flow(code)
-    
-    # Verificar se houve erros nas análises
-    if "error" in static_analysis:
-        return {"error": f"Erro na análise estática: {static_analysis['error']}"}
+    return await tool_executor.run(_generate_test_prompt, code, language, test_framework,
+                                   max_prompt_tokens, qualified_name, size=len(code),
+                                   tool="generate_test_prompt")
+
+
+@mcp.tool()
+async def analyze_module(code: str, page_size: Optional[int] = None,
+                         cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Análise de Módulo Python Completo
     
-    if "error" in flow_analysis:
-        return {"error": f"Erro na análise de fluxo: {flow_analysis['error']}"}
+    Faz o parse do arquivo uma única vez e retorna as análises estática e
+    de fluxo de todas as funções, métodos e funções assíncronas:
+    - Tabela de imports do módulo (construída uma vez)
+    - Nome qualificado, tipo (function/method) e intervalo de linhas
+    - Chamadas internas restritas ao corpo de cada função
+    - Mapa de fluxo, complexidade e resumo por função
     
-    # Gerar prompt
-    return prompt_generator.generate_test_prompt(
-        static_analysis, flow_analysis, language, test_framework
-    )
+    Args:
+        code: Código fonte completo do módulo Python
+        page_size: Máximo de funções por página (padrão: sem paginação)
+        cursor: Valor de page.next_cursor da página anterior
+        
+    Returns:
+        Dicionário com imports do módulo e a lista de funções analisadas
+    """
+    return await tool_executor.run(_paged, _python_module, "functions", code, page_size, cursor,
+                                   size=len(code), tool="analyze_module")
 
-    # TOOLS PARA ANÁLISE JAVA - Adicione estes métodos ao seu mcp_server.py
 
 @mcp.tool()
-def analyze_java_method_static(code: str) -> Dict[str, Any]:
+async def analyze_java_method_static(code: str) -> Dict[str, Any]:
     """
     Ferramenta 1: Analisador Estático para Java
     
@@ -569,11 +393,12 @@ def analyze_java_method_static(code: str) -> Dict[str, Any]:
     Returns:
         Dicionário com informações estruturais do método Java
     """
-    return java_static_analyzer.analyze_method(code)
+    return await tool_executor.run(_java_static, code, size=len(code), tool="analyze_java_method_static")
 
 
 @mcp.tool()
-def summarize_java_method_flow(code: str) -> Dict[str, Any]:
+async def summarize_java_method_flow(code: str, page_size: Optional[int] = None,
+                                     cursor: Optional[str] = None) -> Dict[str, Any]:
     """
     Ferramenta 2: Resumidor de Fluxo para Java
     
@@ -586,31 +411,22 @@ def summarize_java_method_flow(code: str) -> Dict[str, Any]:
     
     Args:
         code: Código fonte do método Java a ser analisado
+        page_size: Máximo de nós do mapa de fluxo por página (padrão: sem paginação)
+        cursor: Valor de page.next_cursor da página anterior
         
     Returns:
         Dicionário com mapa de fluxo e métricas de complexidade
     """
-    return java_flow_summarizer.summarize_flow(code)
+    return await tool_executor.run(_paged, _java_flow, "flow_map", code, page_size, cursor,
+                                   count_flow_nodes, size=len(code), tool="summarize_java_method_flow")
 
 
-@mcp.tool()
-def generate_java_test_prompt(code: str, test_framework: str = "junit5") -> Dict[str, Any]:
-    """
-    Ferramenta 3: Gerador de Prompt para Testes Java
-    
-    Combina análise estática e de fluxo para gerar um prompt otimizado
-    para LLMs criarem testes unitários Java com estrutura de saída fixa.
-    
-    Args:
-        code: Código fonte do método Java
-        test_framework: Framework de teste (junit5, junit4)
-        
-    Returns:
-        Dicionário com prompt otimizado e metadados
-    """
+def _generate_java_test_prompt(code: str, test_framework: str = "junit5",
+                               max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """Gera o prompt de testes Java (executado fora do event loop)"""
     # Executar análises
-    static_analysis = java_static_analyzer.analyze_method(code)
-    flow_analysis = java_flow_summarizer.summarize_flow(code)
+    static_analysis = _java_static(code)
+    flow_analysis = _java_flow(code)
     
     # Verificar se houve erros nas análises
     if "error" in static_analysis:
@@ -620,28 +436,35 @@ def generate_java_test_prompt(code: str, test_framework: str = "junit5") -> Dict
         return {"error": f"Erro na análise de fluxo Java: {flow_analysis['error']}"}
     
     # Gerar prompt
-    return java_prompt_generator.generate_test_prompt(
-        static_analysis, flow_analysis, test_framework
-    )
+    return _java_prompt(code, static_analysis, flow_analysis, test_framework, max_prompt_tokens)
 
 
 @mcp.tool()
-def analyze_and_generate_java_complete(code: str, test_framework: str = "junit5") -> Dict[str, Any]:
+async def generate_java_test_prompt(code: str, test_framework: str = "junit5",
+                                    max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
     """
-    Ferramenta Combinada: Análise Completa Java e Geração de Prompt
+    Ferramenta 3: Gerador de Prompt para Testes Java
     
-    Executa todas as três ferramentas Java em sequência e retorna
-    um relatório completo com análise detalhada e prompt otimizado.
+    Combina análise estática e de fluxo para gerar um prompt otimizado
+    para LLMs criarem testes unitários Java com estrutura de saída fixa.
     
     Args:
         code: Código fonte do método Java
         test_framework: Framework de teste (junit5, junit4)
+        max_prompt_tokens: Orçamento de tokens do prompt; acima dele o prompt é compactado
         
     Returns:
-        Relatório completo com todas as análises Java e prompt final
+        Dicionário com prompt otimizado e metadados (tokens estimados por seção)
     """
-    static_analysis = java_static_analyzer.analyze_method(code)
-    flow_analysis = java_flow_summarizer.summarize_flow(code)
+    return await tool_executor.run(_generate_java_test_prompt, code, test_framework, max_prompt_tokens,
+                                   size=len(code), tool="generate_java_test_prompt")
+
+
+def _analyze_and_generate_java_complete(code: str, test_framework: str = "junit5",
+                                        max_prompt_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """Relatório completo Java (executado fora do event loop)"""
+    static_analysis = _java_static(code)
+    flow_analysis = _java_flow(code)
     
     if "error" in static_analysis or "error" in flow_analysis:
         return {
@@ -650,9 +473,8 @@ def analyze_and_generate_java_complete(code: str, test_framework: str = "junit5"
             "error": "Erro em uma ou mais análises Java"
         }
     
-    prompt_result = java_prompt_generator.generate_test_prompt(
-        static_analysis, flow_analysis, test_framework
-    )
+    prompt_result = _java_prompt(code, static_analysis, flow_analysis, test_framework,
+                                 max_prompt_tokens)
     
     return {
         "static_analysis": static_analysis,
@@ -669,45 +491,163 @@ def analyze_and_generate_java_complete(code: str, test_framework: str = "junit5"
     }
 
 
-
 @mcp.tool()
-def analyze_and_generate_complete(code: str, language: str = "python", 
-                                 test_framework: str = "pytest") -> Dict[str, Any]:
+async def analyze_and_generate_java_complete(code: str, test_framework: str = "junit5",
+                                             max_prompt_tokens: Optional[int] = None,
+                                             detail: str = "full",
+                                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
-    Ferramenta Combinada: Análise Completa e Geração de Prompt
+    Ferramenta Combinada: Análise Completa Java e Geração de Prompt
     
-    Executa todas as três ferramentas em sequência e retorna
+    Executa todas as três ferramentas Java em sequência e retorna
     um relatório completo com análise detalhada e prompt otimizado.
     
     Args:
-        code: Código fonte da função
-        language: Linguagem de programação (python, java, javascript)
-        test_framework: Framework de teste (pytest, junit5, jest)
+        code: Código fonte do método Java
+        test_framework: Framework de teste (junit5, junit4)
+        max_prompt_tokens: Orçamento de tokens do prompt; acima dele o prompt é compactado
+        detail: "full" (padrão) ou "compact" (apenas prompt e metadados)
+        fields: Caminhos a manter na resposta (ex.: ["prompt_generation.prompt", "summary"])
         
     Returns:
-        Relatório completo com todas as análises e prompt final
+        Relatório completo com todas as análises Java e prompt final
     """
-    # Normalizar entradas
+    return await tool_executor.run(_shaped, _analyze_and_generate_java_complete, detail, fields,
+                                   code, test_framework, max_prompt_tokens, size=len(code),
+                                   tool="analyze_and_generate_java_complete")
+
+
+@mcp.tool()
+async def analyze_java_class(code: str, page_size: Optional[int] = None,
+                             cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Análise de Classe Java Completa
+    
+    Tokeniza a unidade de compilação uma única vez e retorna as análises
+    estática e de fluxo de todos os métodos e construtores:
+    - Lista de imports do arquivo (construída uma vez)
+    - Tipos declarados, inclusive classes internas
+    - Nome qualificado, tipo (method/constructor) e intervalo de linhas
+    - Chamadas restritas ao corpo de cada método
+    - Mapa de fluxo, complexidade e resumo por método
+    
+    Args:
+        code: Código fonte completo do arquivo Java
+        page_size: Máximo de métodos por página (padrão: sem paginação)
+        cursor: Valor de page.next_cursor da página anterior
+        
+    Returns:
+        Dicionário com imports, tipos e a lista de métodos analisados
+    """
+    return await tool_executor.run(_paged, _java_class, "methods", code, page_size, cursor,
+                                   size=len(code), tool="analyze_java_class")
+
+
+@mcp.tool()
+async def analyze_js_module(code: str, page_size: Optional[int] = None,
+                            cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Análise de Módulo JavaScript/TypeScript Completo
+    
+    Tokeniza o arquivo uma única vez (tempo linear, inclusive em bundles
+    grandes) e retorna as análises estática e de fluxo de todas as funções
+    nomeadas: declarações, arrow functions, métodos e construtores:
+    - Imports do módulo (import, export ... from, require e import())
+    - Classes declaradas
+    - Nome qualificado, tipo (function/arrow/method/constructor) e intervalo de linhas
+    - Chamadas restritas ao corpo de cada função
+    - Mapa de fluxo, complexidade e resumo por função
+    
+    Args:
+        code: Código fonte completo do arquivo JavaScript ou TypeScript
+        page_size: Máximo de funções por página (padrão: sem paginação)
+        cursor: Valor de page.next_cursor da página anterior
+        
+    Returns:
+        Dicionário com imports, classes e a lista de funções analisadas
+    """
+    return await tool_executor.run(_paged, _js_module, "functions", code, page_size, cursor,
+                                   size=len(code), tool="analyze_js_module")
+
+
+def _list_test_scenarios(code: str, language: str = "python", page_size: int = DEFAULT_PAGE_SIZE,
+                         cursor: Optional[str] = None,
+                         qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """Página de cenários de teste (executado fora do event loop)"""
+    error = _symbol_error(language, qualified_name)
+    if error is not None:
+        return error
     language = language.lower()
+    if language == "java":
+        flow_analysis = _java_flow(code)
+        generator = java_backend().prompt_generator
+    elif language in JS_LANGUAGES:
+        flow_analysis = _js_analysis(code)["flow"]
+        generator = js_backend().prompt_generator
+    else:
+        flow_analysis = _python_flow(code, qualified_name)
+        generator = python_backend().prompt_generator
+
+    if "error" in flow_analysis:
+        return {"error": f"Erro na análise de fluxo: {flow_analysis['error']}"}
+
+    try:
+        scenarios, page = paginate_iterable(
+            generator.iter_test_scenarios(flow_analysis["flow_map"]), code, page_size, cursor,
+            qualified_name or ""
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    return {
+        "scenarios": scenarios,
+        "complexity_score": flow_analysis.get("complexity_score"),
+        "page": page
+    }
+
+
+@mcp.tool()
+async def list_test_scenarios(code: str, language: str = "python", page_size: int = DEFAULT_PAGE_SIZE,
+                              cursor: Optional[str] = None,
+                              qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Cenários de Teste Paginados
     
-    # Mapear frameworks padrão por linguagem
-    if test_framework == "auto":
-        framework_map = {
-            "python": "pytest",
-            "java": "junit5", 
-            "javascript": "jest",
-            "typescript": "jest"
-        }
-        test_framework = framework_map.get(language, "pytest")
+    Lista os cenários de teste derivados do mapa de fluxo (os mesmos da
+    seção CENÁRIOS do prompt, sem compactação) em páginas. Os cenários são
+    gerados sob demanda só até o fim da página pedida, então funções com
+    centenas de ramos não produzem uma resposta única enorme.
+    
+    Args:
+        code: Código fonte da função ou método
+        language: Linguagem de programação (python, java, javascript, typescript)
+        page_size: Cenários por página
+        cursor: Valor de page.next_cursor da página anterior
+        qualified_name: Função Python a usar (padrão: a primeira encontrada)
+        
+    Returns:
+        Dicionário com os cenários da página e o cursor da próxima
+    """
+    return await tool_executor.run(_list_test_scenarios, code, language, page_size, cursor,
+                                   qualified_name, size=len(code), tool="list_test_scenarios")
+
+
+
+def _analyze_and_generate_complete(code: str, language: str = "python", test_framework: str = "pytest",
+                                   max_prompt_tokens: Optional[int] = None,
+                                   qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """Relatório completo por linguagem (executado fora do event loop)"""
+    error = _symbol_error(language, qualified_name)
+    if error is not None:
+        return error
     
-    # Mapear junit para junit5 se necessário
-    if language == "java" and test_framework == "junit":
-        test_framework = "junit5"
+    # Normalizar entradas
+    language = language.lower()
+    test_framework = resolve_framework(language, test_framework)
     
     # Executar análise baseada na linguagem
     if language == "java":
-        static_analysis = java_static_analyzer.analyze_method(code)
-        flow_analysis = java_flow_summarizer.summarize_flow(code)
+        static_analysis = _java_static(code)
+        flow_analysis = _java_flow(code)
         
         if "error" in static_analysis or "error" in flow_analysis:
             return {
@@ -716,9 +656,8 @@ def analyze_and_generate_complete(code: str, language: str = "python",
                 "error": "Erro em uma ou mais análises Java"
             }
         
-        prompt_result = java_prompt_generator.generate_test_prompt(
-            static_analysis, flow_analysis, test_framework
-        )
+        prompt_result = _java_prompt(code, static_analysis, flow_analysis, test_framework,
+                                     max_prompt_tokens)
         
         return {
             "static_analysis": static_analysis,
@@ -734,10 +673,39 @@ def analyze_and_generate_complete(code: str, language: str = "python",
                 "ready_for_llm": True
             }
         }
+    elif language in JS_LANGUAGES:
+        analysis = _js_analysis(code)
+        static_analysis = analysis["static"]
+        flow_analysis = analysis["flow"]
+        
+        if "error" in static_analysis or "error" in flow_analysis:
+            return {
+                "static_analysis": static_analysis,
+                "flow_analysis": flow_analysis,
+                "error": "Erro em uma ou mais análises JavaScript/TypeScript"
+            }
+        
+        prompt_result = _js_prompt(
+            code, static_analysis, flow_analysis, language, test_framework, max_prompt_tokens
+        )
+        
+        return {
+            "static_analysis": static_analysis,
+            "flow_analysis": flow_analysis,
+            "prompt_generation": prompt_result,
+            "summary": {
+                "function_signature": static_analysis.get("signature"),
+                "complexity_score": flow_analysis.get("complexity_score"),
+                "estimated_tests": prompt_result.get("metadata", {}).get("estimated_tests"),
+                "language": language,
+                "framework": test_framework,
+                "ready_for_llm": True
+            }
+        }
     else:
-        # Python, JavaScript e outras linguagens
-        static_analysis = static_analyzer.analyze_function(code)
-        flow_analysis = flow_summarizer.summarize_flow(code)
+        # Python e outras linguagens
+        static_analysis = _python_static(code, qualified_name)
+        flow_analysis = _python_flow(code, qualified_name)
         
         if "error" in static_analysis or "error" in flow_analysis:
             return {
@@ -746,8 +714,9 @@ def analyze_and_generate_complete(code: str, language: str = "python",
                 "error": "Erro em uma ou mais análises"
             }
         
-        prompt_result = prompt_generator.generate_test_prompt(
-            static_analysis, flow_analysis, language, test_framework
+        prompt_result = _python_prompt(
+            code, static_analysis, flow_analysis, language, test_framework, max_prompt_tokens,
+            qualified_name
         )
         
         return {
@@ -765,5 +734,253 @@ def analyze_and_generate_complete(code: str, language: str = "python",
         }
 
 
+@mcp.tool()
+async def analyze_and_generate_complete(code: str, language: str = "python", 
+                                        test_framework: str = "pytest",
+                                        max_prompt_tokens: Optional[int] = None,
+                                        detail: str = "full",
+                                        fields: Optional[List[str]] = None,
+                                        qualified_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ferramenta Combinada: Análise Completa e Geração de Prompt
+    
+    Executa todas as três ferramentas em sequência e retorna
+    um relatório completo com análise detalhada e prompt otimizado.
+    
+    Args:
+        code: Código fonte da função
+        language: Linguagem de programação (python, java, javascript, typescript)
+        test_framework: Framework de teste (pytest, junit5, jest)
+        max_prompt_tokens: Orçamento de tokens do prompt; acima dele o prompt é compactado
+        detail: "full" (padrão) ou "compact" (apenas prompt e metadados)
+        fields: Caminhos a manter na resposta (ex.: ["prompt_generation.prompt", "summary"])
+        qualified_name: Função Python a usar (padrão: a primeira encontrada)
+        
+    Returns:
+        Relatório completo com todas as análises e prompt final
+    """
+    return await tool_executor.run(_shaped, _analyze_and_generate_complete, detail, fields,
+                                   code, language, test_framework, max_prompt_tokens, qualified_name,
+                                   size=len(code), tool="analyze_and_generate_complete")
+
+
+def _analyze_batch(items: List[Dict[str, str]], detail: str = "full",
+                   fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Análise em lote (aguarda o pool de processos fora do event loop)"""
+    error = detail_error(detail)
+    if error is not None:
+        return error
+    results = batch_analyzer.analyze(items, detail, fields)
+    return {
+        "count": len(results),
+        "error_count": sum(1 for result in results if "error" in result),
+        "results": results
+    }
+
+
+@mcp.tool()
+async def analyze_batch(items: List[Dict[str, str]], detail: str = "full",
+                        fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Análise em Lote
+    
+    Analisa vários trechos de código (Python, Java, JavaScript ou TypeScript)
+    em uma única chamada, distribuindo o trabalho entre processos. Cada item
+    executa as análises estática e de fluxo e gera o prompt, como analyze_and_generate_complete.
+    
+    Args:
+        items: Lista de objetos {"code": str, "language": str, "test_framework": str,
+               "max_prompt_tokens": int}; todos opcionais exceto code (language padrão
+               "python", test_framework padrão "auto", sem orçamento de tokens)
+        detail: "full" (padrão) ou "compact" (apenas prompt e metadados de cada item)
+        fields: Caminhos a manter em cada resultado (ex.: ["prompt_generation.prompt"])
+        
+    Returns:
+        Resultados na mesma ordem da entrada; itens com falha trazem o campo "error"
+    """
+    size = sum(len(item["code"]) for item in items
+               if isinstance(item, dict) and isinstance(item.get("code"), str))
+    return await tool_executor.run(_analyze_batch, items, detail, fields, size=size, tool="analyze_batch")
+
+
+@mcp.tool()
+async def scan_project(path: str, include: Optional[List[str]] = None,
+                       exclude: Optional[List[str]] = None,
+                       ctx: Optional[Context] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Varredura de Projeto
+    
+    Percorre um diretório, encontra arquivos .py, .java, .js e .ts e os
+    analisa em paralelo. Cada arquivo concluído gera uma notificação de
+    progresso MCP, então o cliente acompanha o resultado sem esperar o fim
+    da varredura.
+    
+    Args:
+        path: Diretório raiz do projeto
+        include: Padrões glob de arquivos a incluir (ex.: ["src/*"])
+        exclude: Padrões glob de arquivos ou diretórios a ignorar
+        
+    Returns:
+        Resumo do projeto com funções e complexidade por arquivo
+    """
+    async def report_progress(done: int, total: Optional[int], file_result: Dict[str, Any]) -> None:
+        if ctx is None:
+            return
+        if "error" in file_result:
+            message = f"{file_result['path']}: {file_result['error']}"
+        else:
+            message = (f"{file_result['path']}: {file_result['function_count']} funções, "
+                       f"complexidade máx. {file_result['max_complexity']}")
+        await ctx.report_progress(done, total, message)
+    
+    return await project_scanner().scan(path, include, exclude, report_progress)
+
+
+
+def _project_call_graph(path: str, include: Optional[List[str]], exclude: Optional[List[str]],
+                        page_size: Optional[int], cursor: Optional[str]) -> Dict[str, Any]:
+    """Atualiza o grafo do projeto (só os arquivos alterados) e devolve a ordem paginada"""
+    from analyzers.call_graph import ProjectCallGraph
+
+    root = os.path.abspath(os.path.expanduser(path))
+    if not os.path.isdir(root):
+        return {"error": f"Diretório não encontrado: {root}"}
+    project = project_call_graphs.setdefault(root, ProjectCallGraph(root))
+    try:
+        update = project.update(include, exclude, batch_analyzer.get_executor())
+    except BrokenProcessPool:
+        # Um processo morreu: descarta o pool e extrai no próprio processo
+        batch_analyzer.reset_executor()
+        update = project.update(include, exclude)
+
+    errors = project.errors()
+    result = {"root": root, **update, "error_count": len(errors), "errors": errors,
+              **project.graph().leaf_first()}
+    return paginate(result, "order", project.revision(), page_size, cursor)
+
+
+def _call_graph_order(code: Optional[str] = None, path: Optional[str] = None,
+                      include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                      page_size: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Ordem das folhas para os chamadores de um módulo (`code`) ou de um projeto (`path`)"""
+    if (code is None) == (path is None):
+        return {"error": "Informe apenas um entre code e path"}
+    if code is not None:
+        return _paged(_python_call_graph, "order", code, page_size, cursor)
+    return _project_call_graph(path, include, exclude, page_size, cursor)
+
+
+@mcp.tool()
+async def call_graph_order(code: Optional[str] = None, path: Optional[str] = None,
+                           include: Optional[List[str]] = None,
+                           exclude: Optional[List[str]] = None,
+                           page_size: Optional[int] = None,
+                           cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Grafo de Chamadas e Ordem de Geração
+    
+    Monta o grafo de chamadas entre as funções de um módulo Python (code) ou
+    de um projeto inteiro (path) e devolve as funções em ordem topológica,
+    das folhas para os chamadores: ao gerar prompts nessa ordem, o resumo de
+    cada função chamada já existe e pode servir de contexto para os mocks de
+    quem a chama.
+    - Nível 0: funções que não chamam nenhuma outra do grafo
+    - Funções do mesmo nível são independentes (podem ser geradas em paralelo)
+    - Recursões diretas ou mútuas ficam no mesmo nível e aparecem em "cycles"
+    
+    No modo projeto o grafo fica guardado por diretório: chamadas seguintes
+    só fazem o parse dos arquivos alterados desde a última chamada.
+    
+    Args:
+        code: Código fonte de um módulo Python (nós: nomes qualificados)
+        path: Diretório raiz de um projeto Python (nós: "arquivo::nome qualificado")
+        include: Padrões glob de arquivos a incluir (apenas com path)
+        exclude: Padrões glob de arquivos ou diretórios a ignorar (apenas com path)
+        page_size: Máximo de funções por página (padrão: sem paginação)
+        cursor: Valor de page.next_cursor da página anterior
+        
+    Returns:
+        Dicionário com a ordem ({"name", "level", "calls"} por função), ciclos e contagens
+    """
+    size = len(code) if code is not None else LIGHT_INPUT_CHARS
+    return await tool_executor.run(_call_graph_order, code, path, include, exclude, page_size,
+                                   cursor, size=size, tool="call_graph_order")
+
+
+def _analyze_git_diff(repo: str, base: str, head: Optional[str] = None,
+                      test_framework: str = "auto", max_prompt_tokens: Optional[int] = None,
+                      detail: str = "full", fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Relatórios das funções alteradas (executado fora do event loop)"""
+    return diff_analyzer().analyze(repo, base, head, test_framework, max_prompt_tokens, detail, fields)
+
+
+@mcp.tool()
+async def analyze_git_diff(repo: str, base: str, head: Optional[str] = None,
+                           test_framework: str = "auto",
+                           max_prompt_tokens: Optional[int] = None,
+                           detail: str = "full",
+                           fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Ferramenta: Análise das Funções Alteradas (git diff)
+    
+    Compara duas revisões de um repositório git local, mapeia cada trecho
+    alterado para a função Python ou o método Java que o contém (pelos
+    intervalos de linhas) e executa as análises e a geração de prompt só
+    nessas funções, sem varrer o restante do repositório.
+    
+    Args:
+        repo: Diretório do repositório git
+        base: Revisão de referência (ex.: "origin/main", "HEAD~1")
+        head: Revisão alterada (padrão: árvore de trabalho)
+        test_framework: Framework de teste ("auto": pytest para Python, junit5 para Java)
+        max_prompt_tokens: Orçamento opcional de tokens de cada prompt
+        detail: "full" (padrão) ou "compact" (apenas prompt e metadados de cada função)
+        fields: Caminhos a manter em cada função (ex.: ["prompt_generation.prompt"])
+        
+    Returns:
+        Funções alteradas com arquivo, nome qualificado, linhas, análises e prompt
+    """
+    return await tool_executor.run(_analyze_git_diff, repo, base, head, test_framework,
+                                   max_prompt_tokens, detail, fields, size=LIGHT_INPUT_CHARS,
+                                   tool="analyze_git_diff")
+
+
+@mcp.tool()
+async def server_stats(tools: Optional[List[str]] = None, reset: bool = False) -> Dict[str, Any]:
+    """
+    Ferramenta: Estatísticas do Servidor
+    
+    Retorna as métricas coletadas desde o início (ou o último reset):
+    - Chamadas, erros e histograma de latência (p50/p99) por ferramenta
+    - Latência por faixa de tamanho de entrada, para correlacionar chamadas
+      lentas com o tamanho do código
+    - Tempo por fase: parse, tokenize, walk, unparse, prompt e serialize
+    - Uso dos caches e do executor
+    - Banco persistente, se já foi aberto por scan_project ({"loaded": false}
+      antes disso; null quando desativado): consultar não abre o banco
+    
+    Args:
+        tools: Restringe as métricas a estas ferramentas (padrão: todas)
+        reset: Zera as métricas depois de lê-las
+        
+    Returns:
+        Dicionário com métricas por ferramenta, cache e executor
+    """
+    store_stats: Optional[Dict[str, Any]] = {"loaded": False}
+    if analysis_store.loaded:
+        store = analysis_store()
+        # A contagem de registros é uma consulta SQLite: roda fora do event loop
+        store_stats = await tool_executor.run(store.stats) if store is not None else None
+    stats = {
+        "metrics": server_metrics.stats(tools),
+        "cache": analysis_cache.stats(),
+        "executor": tool_executor.stats(),
+        "store": store_stats
+    }
+    if reset:
+        server_metrics.reset()
+    return stats
+
+
 if __name__ == "__main__":
     mcp.run()
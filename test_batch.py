@@ -0,0 +1,44 @@
+from analyzers.batch import BatchAnalyzer, resolve_framework
+
+
+PYTHON_CODE = "def soma(a, b):\n    if a > b:\n        return a\n    return b\n"
+JAVA_CODE = "public int soma(int a, int b) {\n    if (a > b) { return a; }\n    return b;\n}\n"
+JS_CODE = "function soma(a, b) {\n    if (a > b) { return a }\n    return b\n}\n"
+
+ITEMS = [
+    {"code": PYTHON_CODE},
+    {"code": JAVA_CODE, "language": "java", "test_framework": "junit"},
+    {"code": "x = 1"},
+    {"language": "python"},
+    {"code": JS_CODE, "language": "javascript", "test_framework": "auto"},
+]
+
+
+class TestBatchAnalyzer:
+    def check_results(self, results):
+        assert [result["index"] for result in results] == list(range(len(ITEMS)))
+        assert results[0]["prompt_generation"]["metadata"]["framework"] == "pytest"
+        assert results[1]["framework"] == "junit5"
+        assert results[1]["static_analysis"]["return_type"] == "int"
+        assert "error" in results[2]
+        assert "error" in results[3]
+        assert results[4]["framework"] == "jest"
+        assert results[4]["static_analysis"]["signature"] == "function soma(a, b)"
+        assert "javascript" in results[4]["prompt_generation"]["prompt"]
+
+    def test_inline_execution(self):
+        self.check_results(BatchAnalyzer(max_workers=1).analyze(ITEMS))
+
+    def test_process_pool_preserves_order(self):
+        analyzer = BatchAnalyzer(max_workers=2)
+        try:
+            self.check_results(analyzer.analyze(ITEMS * 3)[:len(ITEMS)])
+        finally:
+            analyzer.shutdown()
+
+
+def test_resolve_framework():
+    assert resolve_framework("java", "auto") == "junit5"
+    assert resolve_framework("java", "junit") == "junit5"
+    assert resolve_framework("typescript", "auto") == "jest"
+    assert resolve_framework("python", "unittest") == "unittest"
@@ -0,0 +1,85 @@
+import ast
+
+from analyzers.java_Analyzer import JavaAnalysisEngine, JavaFlowSummarizer
+from analyzers.js_Analyzer import JSAnalysisEngine
+from analyzers.python_Analyzer import PythonAnalysisEngine
+from benchmarks.corpus import (
+    PRESETS, CorpusSpec, generate_java_class, generate_java_method, generate_js_bundle,
+    generate_js_function, generate_js_module, generate_python_function, generate_python_module
+)
+from benchmarks.regression import MIN_SAMPLES, compare, median_deviation, percentile, unreliable
+
+
+class TestCorpus:
+    def test_python_corpus_is_valid(self):
+        spec = CorpusSpec("t", statements=8, depth=3, branches=3, params=4)
+        code = generate_python_function(spec)
+        ast.parse(generate_python_module(spec))
+        analysis = PythonAnalysisEngine().analyze(code)
+        assert [p["name"] for p in analysis["static"]["parameters"]] == ["p0", "p1", "p2", "p3", "items"]
+        assert analysis["flow"]["complexity_score"] > spec.statements
+
+    def test_java_corpus_is_valid(self):
+        spec = CorpusSpec("t", statements=8, depth=3, branches=3, params=4)
+        flow = JavaFlowSummarizer().summarize_flow(generate_java_method(spec))
+        assert flow["complexity_score"] > spec.statements
+        java_class = JavaAnalysisEngine().analyze_class(generate_java_class(spec, methods=3))
+        assert java_class["method_count"] == 3
+
+    def test_js_corpus_is_valid(self):
+        spec = CorpusSpec("t", statements=8, depth=3, branches=3, params=4)
+        analysis = JSAnalysisEngine().analyze(generate_js_function(spec))
+        assert [p["name"] for p in analysis["static"]["parameters"]] == ["p0", "p1", "p2", "p3", "items", "options"]
+        assert analysis["flow"]["complexity_score"] > spec.statements
+        module = JSAnalysisEngine().analyze_module(generate_js_module(spec, functions=3))
+        assert [f["qualified_name"] for f in module["functions"]] == [
+            "generated0", "generated1", "Generated2.generated2"
+        ]
+
+    def test_js_bundle_reaches_requested_size(self):
+        bundle = generate_js_bundle(200_000)
+        assert len(bundle) >= 200_000
+        assert JSAnalysisEngine().analyze_module(bundle)["function_count"] > 10
+
+    def test_presets_grow(self):
+        sizes = [len(generate_python_function(PRESETS[name])) for name in ("small", "medium", "large")]
+        assert sizes == sorted(sizes)
+
+
+class TestRegression:
+    def test_percentile_nearest_rank(self):
+        samples = list(range(1, 101))
+        assert percentile(samples, 0.5) == 50
+        assert percentile(samples, 0.99) == 99
+        assert percentile([3.0], 0.99) == 3.0
+
+    def test_compare_flags_only_relevant_regressions(self):
+        baseline = {
+            "a/small": {"p50_ms": 10.0, "peak_memory_kb": 1000.0},
+            "b/small": {"p50_ms": 0.5, "peak_memory_kb": 100.0},
+            "c/small": {"p50_ms": 10.0},
+        }
+        current = {
+            "a/small": {"p50_ms": 13.0, "peak_memory_kb": 1100.0},
+            "b/small": {"p50_ms": 0.9, "peak_memory_kb": 150.0},
+            "d/small": {"p50_ms": 99.0},
+        }
+        assert compare(current, baseline, 20.0) == ["a/small: p50_ms 10.0 -> 13.0 (+30.0%)"]
+        assert compare(current, baseline, 50.0) == []
+
+    def test_timings_need_enough_samples(self):
+        baseline = {"a/small": {"iterations": 3, "p50_ms": 10.0, "peak_memory_kb": 1000.0}}
+        current = {"a/small": {"iterations": MIN_SAMPLES, "p50_ms": 16.0, "peak_memory_kb": 2000.0}}
+        assert compare(current, baseline, 20.0) == ["a/small: peak_memory_kb 1000.0 -> 2000.0 (+100.0%)"]
+        assert unreliable(current, baseline) == [
+            f"a/small: 3 -> {MIN_SAMPLES} amostras (mínimo {MIN_SAMPLES}), tempos não comparados"
+        ]
+        assert unreliable(current, baseline, ["peak_memory_kb"]) == []
+
+    def test_differences_within_the_noise_are_ignored(self):
+        assert median_deviation([10.0, 11.0, 9.0, 30.0, 10.0]) == 1.0
+        baseline = {"a/small": {"p50_ms": 10.0, "mad_ms": 2.0}}
+        assert compare({"a/small": {"p50_ms": 15.0, "mad_ms": 1.0}}, baseline, 20.0) == []
+        assert compare({"a/small": {"p50_ms": 17.0, "mad_ms": 1.0}}, baseline, 20.0) == [
+            "a/small: p50_ms 10.0 -> 17.0 (+70.0%)"
+        ]
@@ -0,0 +1,77 @@
+import ast
+import json
+
+from analyzers.cache import AnalysisCache, LRUCache, content_hash, estimate_size
+from analyzers.flow import Conditional, json_default
+
+
+class TestLRUCache:
+    def test_hit_and_miss_counters(self):
+        cache = LRUCache(max_bytes=100)
+        cache.put("a", 1, 10)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = LRUCache(max_bytes=30)
+        cache.put("a", 1, 10)
+        cache.put("b", 2, 10)
+        cache.put("c", 3, 10)
+        cache.get("a")
+        cache.put("d", 4, 10)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.current_bytes == 30
+        assert cache.evictions == 1
+
+    def test_value_larger_than_limit_is_not_stored(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", "x" * 100, 100)
+        assert len(cache) == 0
+
+
+class TestAnalysisCache:
+    def test_tree_is_parsed_once(self):
+        cache = AnalysisCache()
+        calls = []
+
+        def parser(code):
+            calls.append(code)
+            return ast.parse(code)
+
+        code = "def f(x):\n    return x\n"
+        first = cache.get_tree(code, "python", parser)
+        second = cache.get_tree("def f(x):\n    return x\n", "python", parser)
+        assert first is second
+        assert len(calls) == 1
+
+    def test_analysis_layer_is_keyed_by_kind_and_language(self):
+        cache = AnalysisCache()
+        cache.get_analysis("static", "code", "python", lambda c: {"kind": "static"})
+        cache.get_analysis("flow", "code", "python", lambda c: {"kind": "flow"})
+        result = cache.get_analysis("static", "code", "java", lambda c: {"kind": "java"})
+        assert result == {"kind": "java"}
+        assert cache.analysis.stats()["entries"] == 3
+
+    def test_prompt_layer_is_keyed_by_language_and_framework(self):
+        cache = AnalysisCache()
+        cache.get_prompt("python", "code", "python", "pytest", lambda: {"prompt": "a"})
+        hit = cache.get_prompt("python", "code", "python", "pytest", lambda: {"prompt": "b"})
+        other = cache.get_prompt("python", "code", "javascript", "jest", lambda: {"prompt": "c"})
+        assert hit == {"prompt": "a"}
+        assert other == {"prompt": "c"}
+        assert cache.stats()["prompt"]["hits"] == 1
+
+    def test_content_hash_is_stable(self):
+        assert content_hash("abc") == content_hash("abc")
+        assert content_hash("abc") != content_hash("abd")
+
+    def test_size_estimate_follows_the_json_length(self):
+        small = {"name": "f", "lines": [1, 2], "ok": True, "doc": None}
+        assert abs(estimate_size(small) - len(json.dumps(small))) <= 8
+
+        flow = [Conditional(f"x > {i}", i % 2 == 0, [Conditional("y", False, [])]) for i in range(1000)]
+        serialized = len(json.dumps({"flow": flow}, default=json_default))
+        assert abs(estimate_size({"flow": flow}) - serialized) < serialized * 0.15
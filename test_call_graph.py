@@ -0,0 +1,163 @@
+import os
+
+import mcp_server
+from analyzers.call_graph import (
+    CallGraph, ProjectCallGraph, analyze_call_graph, module_calls, module_graph, module_name
+)
+
+
+MODULE = '''def leaf(x):
+    return len(x)
+
+def mid(x):
+    return leaf(x) + helper()
+
+def helper():
+    return 1
+
+class Conta:
+    def __init__(self):
+        self.sincroniza()
+
+    def sincroniza(self):
+        def filtra():
+            return mid(1)
+        return filtra()
+
+    def par(self, n):
+        return self.impar(n - 1)
+
+    def impar(self, n):
+        return self.par(n - 1)
+
+def main():
+    conta = Conta()
+    return Conta.sincroniza(conta)
+'''
+
+
+def order_of(result):
+    return [(entry["name"], entry["level"]) for entry in result["order"]]
+
+
+class TestModuleGraph:
+    def test_calls_are_resolved_by_scope(self):
+        graph = module_graph(module_calls(MODULE))
+        assert graph.edges["mid"] == ["leaf", "helper"]
+        assert graph.edges["Conta.sincroniza"] == ["Conta.sincroniza.<locals>.filtra"]
+        assert graph.edges["Conta.par"] == ["Conta.impar"]
+        assert graph.edges["main"] == ["Conta.__init__", "Conta.sincroniza"]
+        assert graph.edges["leaf"] == []
+
+    def test_leaf_first_order_and_cycles(self):
+        result = analyze_call_graph(MODULE)
+        assert order_of(result) == [
+            ("leaf", 0), ("helper", 0), ("Conta.par", 0), ("Conta.impar", 0), ("mid", 1),
+            ("Conta.sincroniza.<locals>.filtra", 2), ("Conta.sincroniza", 3),
+            ("Conta.__init__", 4), ("main", 5)
+        ]
+        assert result["cycles"] == [["Conta.par", "Conta.impar"]]
+        assert result["level_count"] == 6
+
+    def test_redefined_functions_bind_the_last_definition(self):
+        code = ("def helper():\n    return old()\n\ndef old():\n    return 1\n\n"
+                "def helper():\n    return new()\n\ndef new():\n    return 2\n\n"
+                "def main():\n    return helper()\n")
+        graph = module_graph(module_calls(code))
+        assert graph.edges == {"helper#1": ["old"], "old": [], "helper": ["new"], "new": [],
+                               "main": ["helper"]}
+
+    def test_self_recursion_is_a_cycle(self):
+        graph = CallGraph()
+        graph.add("f", ["f", "g"])
+        graph.add("g", [])
+        result = graph.leaf_first()
+        assert order_of(result) == [("g", 0), ("f", 1)]
+        assert result["cycles"] == [["f"]]
+
+    def test_deep_chain_does_not_recurse(self):
+        code = "".join(f"def f{i}():\n    return f{i + 1}()\n\n" for i in range(3000))
+        result = analyze_call_graph(code + "def f3000():\n    return 0\n")
+        assert result["order"][0]["name"] == "f3000"
+        assert result["level_count"] == 3001
+
+    def test_syntax_error(self):
+        assert "Erro na análise do módulo" in analyze_call_graph("def f(:\n")["error"]
+
+
+def write(root, relative_path, code):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code)
+
+
+def make_project(root):
+    write(root, "app/__init__.py", "")
+    write(root, "app/util.py", "def limpa(x):\n    return x.strip()\n\nclass Repo:\n    def salva(self):\n        return 1\n")
+    write(root, "app/service.py",
+          "from app.util import limpa, Repo\nfrom . import util\n\n"
+          "def processa(x):\n    Repo.salva(Repo())\n    return util.limpa(limpa(x))\n")
+    write(root, "main.py", "import app.service\n\ndef run():\n    return app.service.processa(' a ')\n")
+
+
+class TestProjectCallGraph:
+    def test_module_names(self):
+        assert module_name("pkg/mod.py") == "pkg.mod"
+        assert module_name("pkg/__init__.py") == "pkg"
+        assert module_name("__init__.py") == ""
+
+    def test_calls_cross_modules(self, tmp_path):
+        make_project(tmp_path)
+        project = ProjectCallGraph(str(tmp_path))
+        assert project.update() == {"file_count": 4, "parsed_count": 4}
+        edges = project.graph().edges
+        assert edges["app/service.py::processa"] == ["app/util.py::Repo.salva", "app/util.py::limpa"]
+        assert edges["main.py::run"] == ["app/service.py::processa"]
+        assert order_of(project.graph().leaf_first())[-1] == ("main.py::run", 2)
+
+    def test_only_changed_files_are_parsed_again(self, tmp_path):
+        make_project(tmp_path)
+        project = ProjectCallGraph(str(tmp_path))
+        project.update()
+        assert project.update()["parsed_count"] == 0
+
+        write(tmp_path, "app/util.py", "def limpa(x):\n    return x\n")
+        assert project.update() == {"file_count": 4, "parsed_count": 1}
+        assert project.graph().edges["app/service.py::processa"] == ["app/util.py::limpa"]
+
+        # Apenas tocado: mesmo conteúdo, reconhecido pelo hash
+        stat = os.stat(tmp_path / "main.py")
+        os.utime(tmp_path / "main.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert project.update()["parsed_count"] == 0
+
+        (tmp_path / "main.py").unlink()
+        assert project.update()["file_count"] == 3
+
+    def test_broken_files_are_reported(self, tmp_path):
+        make_project(tmp_path)
+        write(tmp_path, "broken.py", "def broken(:\n")
+        project = ProjectCallGraph(str(tmp_path))
+        project.update()
+        assert [error["path"] for error in project.errors()] == ["broken.py"]
+        assert "main.py::run" in project.graph().edges
+
+
+class TestServerCallGraph:
+    def test_module_order_is_paginated(self):
+        page = mcp_server._call_graph_order(MODULE, page_size=4)
+        assert [entry["name"] for entry in page["order"]] == ["leaf", "helper", "Conta.par", "Conta.impar"]
+        rest = mcp_server._call_graph_order(MODULE, cursor=page["page"]["next_cursor"], page_size=10)
+        assert rest["order"][-1]["name"] == "main"
+
+    def test_project_graph_is_kept_between_calls(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(mcp_server, "project_call_graphs", {})
+        make_project(tmp_path)
+        first = mcp_server._call_graph_order(path=str(tmp_path))
+        second = mcp_server._call_graph_order(path=str(tmp_path))
+        assert first["parsed_count"] == 4 and second["parsed_count"] == 0
+        assert second["order"] == first["order"]
+
+    def test_requires_exactly_one_source(self, tmp_path):
+        assert "error" in mcp_server._call_graph_order()
+        assert "error" in mcp_server._call_graph_order("def f():\n    pass\n", str(tmp_path))
+        assert "Diretório não encontrado" in mcp_server._call_graph_order(path=str(tmp_path / "x"))["error"]
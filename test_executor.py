@@ -0,0 +1,170 @@
+import asyncio
+import threading
+
+import pytest
+
+from analyzers.batch import BatchAnalyzer
+from analyzers.executor import (
+    LIGHT_INPUT_CHARS, ToolCancelled, ToolExecutor, check_cancelled, executor_from_env
+)
+
+
+HEAVY = LIGHT_INPUT_CHARS
+PYTHON_CODE = "def soma(a, b):\n    if a > b:\n        return a\n    return b\n"
+
+
+async def wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+class TestToolExecutor:
+    def test_heavy_calls_respect_concurrency_cap(self):
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1), max_concurrency=1)
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.create_task(executor.run(release.wait, size=HEAVY))
+            second = asyncio.create_task(executor.run(release.wait, size=HEAVY))
+            await wait_until(lambda: executor.running == 1 and executor.waiting == 1)
+            release.set()
+            return await asyncio.gather(first, second)
+
+        try:
+            assert asyncio.run(scenario()) == [True, True]
+            assert executor.stats()["waiting"] == 0
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_light_calls_do_not_wait_for_heavy_ones(self):
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1), max_concurrency=1)
+        release = threading.Event()
+
+        async def scenario():
+            heavy = asyncio.create_task(executor.run(release.wait, size=HEAVY))
+            await wait_until(lambda: executor.running == 1)
+            light = await asyncio.wait_for(executor.run(len, "abc", size=3), timeout=5)
+            done_before_release = heavy.done()
+            release.set()
+            await heavy
+            return light, done_before_release
+
+        try:
+            assert asyncio.run(scenario()) == (3, False)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_cancelled_call_never_runs_when_queued(self):
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1), max_concurrency=1)
+        release = threading.Event()
+        calls = []
+
+        async def scenario():
+            heavy = asyncio.create_task(executor.run(release.wait, size=HEAVY))
+            queued = asyncio.create_task(executor.run(calls.append, "x", size=HEAVY))
+            await wait_until(lambda: executor.waiting == 1)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            release.set()
+            await heavy
+
+        try:
+            asyncio.run(scenario())
+            assert calls == []
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_running_call_stops_at_next_analysis(self):
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1))
+        started = threading.Event()
+        release = threading.Event()
+        outcome = []
+
+        def tool():
+            started.set()
+            release.wait()
+            try:
+                executor.analyze("fused", "python", "x", lambda code: outcome.append("analisado"))
+            except ToolCancelled:
+                outcome.append("cancelado")
+
+        async def scenario():
+            task = asyncio.create_task(executor.run(tool))
+            await wait_until(started.is_set)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        try:
+            asyncio.run(scenario())
+            assert executor.cancelled == 1
+            release.set()
+            executor.shutdown()
+            assert outcome == ["cancelado"]
+        finally:
+            release.set()
+
+    def test_cancelled_heavy_calls_keep_their_permit_until_they_stop(self):
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1), max_concurrency=2)
+        release = threading.Event()
+        started = []
+
+        def heavy():
+            started.append(1)
+            release.wait()
+
+        async def scenario():
+            running = [asyncio.create_task(executor.run(heavy, size=HEAVY)) for _ in range(2)]
+            await wait_until(lambda: len(started) == 2)
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+            # As threads continuam ocupadas: novas pesadas esperam, leves seguem rápidas
+            queued = [asyncio.create_task(executor.run(heavy, size=HEAVY)) for _ in range(3)]
+            await asyncio.sleep(0.1)
+            light = await asyncio.wait_for(executor.run(len, "abc", size=3), timeout=2)
+            waiting = executor.waiting
+            release.set()
+            await asyncio.gather(*queued)
+            return light, waiting
+
+        try:
+            assert asyncio.run(scenario()) == (3, 3)
+            assert len(started) == 5
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_process_mode_runs_analysis_in_worker(self):
+        batch_analyzer = BatchAnalyzer(max_workers=1)
+        executor = ToolExecutor(batch_analyzer, "process")
+
+        def local(code):
+            raise AssertionError("análise deveria rodar no processo de trabalho")
+
+        code = PYTHON_CODE + "\n" * LIGHT_INPUT_CHARS
+        try:
+            result = executor.analyze("fused", "python", code, local)
+            assert result["static"]["signature"] == "soma(a, b)"
+            assert result["flow"]["complexity_score"] == 2
+        finally:
+            batch_analyzer.shutdown()
+
+    def test_check_cancelled_outside_a_call_is_noop(self):
+        check_cancelled()
+
+
+def test_executor_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_QA_EXECUTOR", "process")
+    monkeypatch.setenv("MCP_QA_MAX_CONCURRENCY", "3")
+    executor = executor_from_env(BatchAnalyzer(max_workers=1))
+    assert (executor.mode, executor.max_concurrency) == ("process", 3)
+
+    monkeypatch.setenv("MCP_QA_EXECUTOR", "fibers")
+    with pytest.raises(ValueError):
+        executor_from_env(BatchAnalyzer(max_workers=1))
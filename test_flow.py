@@ -0,0 +1,77 @@
+import asyncio
+import json
+import pickle
+
+from analyzers.batch import BatchAnalyzer
+from analyzers.executor import ToolExecutor
+from analyzers.flow import Catch, Conditional, FlowNode, Return, TryExcept, to_response
+from analyzers.java_Analyzer import JavaFlowSummarizer
+from analyzers.python_Analyzer import FlowSummarizer, PythonAnalysisEngine
+from benchmarks.bench_flow_memory import deep_size
+
+
+PYTHON_CODE = (
+    "def f(x):\n"
+    "    try:\n"
+    "        if x:\n"
+    "            raise ValueError(x)\n"
+    "    except KeyError:\n"
+    "        return 1\n"
+    "    for i in x:\n"
+    "        pass\n"
+    "    return 2\n"
+)
+
+
+class TestFlowNode:
+    def test_reads_like_the_dict_it_replaces(self):
+        node = Conditional("x > 0", False, [Return("x")])
+        assert node["type"] == "conditional"
+        assert node.get("nested_flow") == [{"type": "return", "value": "x"}]
+        assert "has_else" in node and "target" not in node
+        assert list(node) == ["type", "condition", "has_else", "nested_flow"]
+        assert node == {"type": "conditional", "condition": "x > 0", "has_else": False,
+                        "nested_flow": [{"type": "return", "value": "x"}]}
+
+    def test_exception_names_are_interned(self):
+        first = TryExcept(["".join(["Key", "Error"])], False, [])
+        second = Catch("".join(["Key", "Error"]), [])
+        assert first.exceptions[0] is second.exception
+
+    def test_nodes_have_no_instance_dict(self):
+        assert not hasattr(Return("x"), "__dict__")
+
+    def test_fused_and_summarizer_flows_match(self):
+        fused = PythonAnalysisEngine().analyze(PYTHON_CODE)["flow"]
+        assert fused == FlowSummarizer().summarize_flow(PYTHON_CODE)
+        assert all(isinstance(node, FlowNode) for node in fused["flow_map"])
+
+    def test_pickle_round_trip(self):
+        flow_map = JavaFlowSummarizer().summarize_flow(
+            "int f() { try { g(); } catch (IOException e) { return 1; } finally { h(); } return 0; }"
+        )["flow_map"]
+        assert pickle.loads(pickle.dumps(flow_map)) == flow_map
+
+    def test_slotted_flow_uses_less_memory(self):
+        code = "def f(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(200))
+        flow_map = FlowSummarizer().summarize_flow(code)["flow_map"]
+        assert deep_size(flow_map) < deep_size(to_response(flow_map))
+
+
+class TestResponseBoundary:
+    def test_to_response_converts_nested_nodes(self):
+        flow = FlowSummarizer().summarize_flow(PYTHON_CODE)
+        response = to_response({"results": [{"flow_analysis": flow}]})
+        flow_map = response["results"][0]["flow_analysis"]["flow_map"]
+        assert type(flow_map[0]) is dict
+        assert type(flow_map[0]["nested_flow"][0]) is dict
+        assert json.loads(json.dumps(response))["results"][0]["flow_analysis"] == flow
+
+    def test_executor_returns_plain_dicts(self):
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1), max_concurrency=1)
+        try:
+            result = asyncio.run(executor.run(FlowSummarizer().summarize_flow, PYTHON_CODE))
+        finally:
+            executor.shutdown()
+        assert type(result["flow_map"][1]) is dict
+        assert result["flow_map"][1] == {"type": "loop_for", "target": "i", "iter": "x", "nested_flow": []}
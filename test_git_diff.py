@@ -0,0 +1,185 @@
+import json
+import subprocess
+
+import pytest
+
+import mcp_server
+from analyzers.git_diff import DiffAnalyzer, diff_path, main, parse_diff, touched_functions
+
+
+PYTHON_V1 = '''import os
+
+
+def soma(a, b):
+    return a + b
+
+
+class Conta:
+    @property
+    def saldo(self):
+        return 0
+
+    def deposita(self, valor):
+        def valida(v):
+            return v > 0
+        return valida(valor)
+
+
+def intocada():
+    return 1
+'''
+
+JAVA_V1 = '''public class Store {
+    public int total(int a) {
+        return a;
+    }
+
+    public int total(int a, int b) {
+        return a + b;
+    }
+
+    public void clear() {
+    }
+}
+'''
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "conta.py").write_text(PYTHON_V1)
+    (tmp_path / "Store.java").write_text(JAVA_V1)
+    (tmp_path / "notas.txt").write_text("a\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "v1")
+
+    (tmp_path / "pkg" / "conta.py").write_text(
+        PYTHON_V1.replace("return v > 0", "return v >= 0").replace("    return a + b", "    return b + a")
+    )
+    (tmp_path / "Store.java").write_text(JAVA_V1.replace("return a + b;", "if (b < 0) { return a; }\n        return a + b;"))
+    (tmp_path / "notas.txt").write_text("b\n")
+    git(tmp_path, "commit", "-q", "-am", "v2")
+    return tmp_path
+
+
+class TestDiffParsing:
+    def test_hunks_become_line_ranges(self):
+        output = (
+            "diff --git a/m.py b/m.py\n--- a/m.py\n+++ b/m.py\n"
+            "@@ -3 +3 @@ def f():\n-x\n+y\n@@ -10,2 +10,0 @@\n-a\n-b\n@@ -20,0 +19,3 @@\n+c\n+d\n+e\n"
+            "diff --git a/old.py b/old.py\n--- a/old.py\n+++ /dev/null\n@@ -1,2 +0,0 @@\n"
+        )
+        assert parse_diff(output) == {"m.py": [(3, 3), (10, 10), (19, 21)]}
+
+    def test_header_paths_are_unquoted(self):
+        assert diff_path("b/pasta/a b.py\t") == "pasta/a b.py"
+        assert diff_path('"b/q\\"\\303\\251\\tx.py"') == 'q"é\tx.py'
+        assert diff_path('"b/ação.py"') == "ação.py"
+        assert diff_path("/dev/null") is None
+
+    def test_innermost_function_owns_the_line(self):
+        spans = [("outer", 1, 10), ("outer.inner", 3, 5), ("other", 12, 14)]
+        assert touched_functions(spans, [(4, 4)], 14) == ["outer.inner"]
+        assert touched_functions(spans, [(6, 13)], 14) == ["outer", "other"]
+        assert touched_functions(spans, [(11, 11)], 14) == []
+
+
+class TestDiffAnalyzer:
+    def test_only_changed_functions_are_analyzed(self, repo):
+        result = DiffAnalyzer().analyze(str(repo), "HEAD~1", "HEAD")
+        changed = [(f["path"], f["qualified_name"]) for f in result["functions"]]
+        assert changed == [
+            ("Store.java", "Store.total"),
+            ("pkg/conta.py", "soma"),
+            ("pkg/conta.py", "Conta.deposita.<locals>.valida"),
+        ]
+        assert result["file_count"] == 2 and result["error_count"] == 0
+
+        java = result["functions"][0]
+        assert java["static_analysis"]["signature"] == "public int total(int a, int b)"
+        assert java["framework"] == "junit5" and java["lineno"] == 6
+        valida = result["functions"][2]
+        assert valida["flow_analysis"]["summary"] == "RETURN(v >= 0)"
+        assert "prompt" in valida["prompt_generation"]
+
+    def test_working_tree_and_decorators(self, repo):
+        conta = repo / "pkg" / "conta.py"
+        conta.write_text(conta.read_text().replace("@property", "@property  # cache"))
+        result = DiffAnalyzer().analyze(str(repo), "HEAD", detail="compact")
+        assert [f["qualified_name"] for f in result["functions"]] == ["Conta.saldo"]
+        assert set(result["functions"][0]) == {"path", "qualified_name", "lineno", "end_lineno",
+                                               "prompt", "metadata"}
+
+    def test_subdirectory_as_repo(self, repo):
+        result = DiffAnalyzer().analyze(str(repo / "pkg"), "HEAD~1", "HEAD")
+        assert result["root"] == str(repo)
+        assert [(f["path"], f["qualified_name"]) for f in result["functions"]] == [
+            ("pkg/conta.py", "soma"), ("pkg/conta.py", "Conta.deposita.<locals>.valida")
+        ]
+        conta = repo / "pkg" / "conta.py"
+        conta.write_text(conta.read_text().replace("return 0", "return -1"))
+        assert [f["qualified_name"] for f in DiffAnalyzer().analyze(str(repo / "pkg"), "HEAD")["functions"]] == [
+            "Conta.saldo"
+        ]
+
+    def test_property_setter_and_redefinitions(self, repo):
+        conta = repo / "pkg" / "conta.py"
+        conta.write_text(conta.read_text().replace(
+            "    def deposita", "    @saldo.setter\n    def saldo(self, valor):\n        self._saldo = valor\n\n    def deposita"
+        ) + "\n\ndef intocada():\n    return 2\n")
+        git(repo, "commit", "-q", "-am", "v3")
+        conta.write_text(conta.read_text().replace("self._saldo = valor", "self._saldo = valor * 2")
+                         .replace("return 2", "return 3"))
+        result = DiffAnalyzer().analyze(str(repo), "HEAD")
+        functions = result["functions"]
+        assert [f["qualified_name"] for f in functions] == ["Conta.saldo#2", "intocada#2"]
+        assert functions[0]["static_analysis"]["signature"] == "saldo(self, valor)"
+        assert functions[1]["flow_analysis"]["summary"] == "RETURN(3)"
+
+    def test_user_diff_config_does_not_change_paths(self, repo):
+        git(repo, "config", "diff.noprefix", "true")
+        git(repo, "config", "diff.relative", "true")
+        assert main(["HEAD~1", "HEAD", "--repo", str(repo / "pkg"), "--fields", "summary"]) == 0
+        result = DiffAnalyzer().analyze(str(repo), "HEAD~1", "HEAD")
+        assert result["error_count"] == 0 and result["function_count"] == 3
+
+    def test_special_file_names(self, repo):
+        for name in ("a b.py", 'q"é.py'):
+            (repo / name).write_text("def f():\n    return 1\n")
+        git(repo, "add", ".")
+        git(repo, "commit", "-q", "-m", "v3")
+        for name in ("a b.py", 'q"é.py'):
+            (repo / name).write_text("def f():\n    return 2\n")
+        result = DiffAnalyzer().analyze(str(repo), "HEAD")
+        assert [(f["path"], f["qualified_name"]) for f in result["functions"]] == [
+            ("a b.py", "f"), ('q"é.py', "f")
+        ]
+
+    def test_syntax_errors_are_reported_per_file(self, repo):
+        (repo / "pkg" / "conta.py").write_text("def quebrada(:\n")
+        result = DiffAnalyzer().analyze(str(repo), "HEAD")
+        assert result["errors"][0]["path"] == "pkg/conta.py"
+        assert result["function_count"] == 0
+
+    def test_invalid_revisions(self, repo):
+        assert "Erro no git" in DiffAnalyzer().analyze(str(repo), "nao-existe")["error"]
+        assert "Revisão inválida" in DiffAnalyzer().analyze(str(repo), "--output=/tmp/x")["error"]
+
+
+class TestDiffEntryPoints:
+    def test_cli_prints_json(self, repo, capsys):
+        assert main(["HEAD~1", "HEAD", "--repo", str(repo), "--fields", "summary"]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result["function_count"] == 3
+
+    def test_server_tool_shares_the_cache(self, repo):
+        result = mcp_server._analyze_git_diff(str(repo), "HEAD~1", "HEAD",
+                                              fields=["prompt_generation.metadata"])
+        assert all(set(f) >= {"path", "qualified_name", "prompt_generation"} for f in result["functions"])
+        assert mcp_server.diff_analyzer().cache is mcp_server.analysis_cache
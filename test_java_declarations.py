@@ -0,0 +1,116 @@
+import time
+
+from analyzers.java_Analyzer import JavaAnalysisEngine, JavaFlowSummarizer, JavaStaticAnalyzer
+from analyzers.java_declarations import find_declaration, iter_declarations
+from analyzers.java_lexer import JavaTokens
+from benchmarks.bench_java_pathological import PATHOLOGICAL_CORPUS
+
+
+class TestDeclarations:
+    def test_generic_method_with_annotations(self):
+        code = ('@Override\n@SuppressWarnings("unchecked")\n'
+                'public static <T> Map<String, List<T>> group(@NotNull List<T> items, String... keys)'
+                ' throws IOException, java.sql.SQLException { return null; }')
+        result = JavaStaticAnalyzer().analyze_method(code)
+        assert result["signature"] == (
+            "public static <T> Map<String, List<T>> group(@NotNull List<T> items, String... keys)"
+            " throws IOException, java.sql.SQLException")
+        assert result["modifiers"] == ["public", "static"]
+        assert result["return_type"] == "Map<String, List<T>>"
+        assert result["exceptions"] == ["IOException", "java.sql.SQLException"]
+        assert result["parameters"][0]["annotations"] == ["@NotNull"]
+        assert result["parameters"][1]["is_varargs"] is True
+        assert result["annotations"] == [
+            {"name": "Override"},
+            {"name": "SuppressWarnings", "parameters": '"unchecked"'}
+        ]
+
+    def test_calls_and_statements_are_not_declarations(self):
+        source = JavaTokens("class A { void run() { foo(1); if (x) bar(2); int y = baz(3);"
+                            " new Thread(r); } A(int x) { super(x); } }")
+        names = [source.texts[d.name_index] for d in iter_declarations(source)]
+        assert names == ["run", "A"]
+
+    def test_constructor_requires_body(self):
+        declaration = find_declaration(JavaTokens("public Foo(int x) { this.x = x; }"))
+        assert declaration.is_constructor
+        assert find_declaration(JavaTokens("foo(x);")) is None
+
+    def test_constructor_returns_its_class(self):
+        result = JavaStaticAnalyzer().analyze_method("public Foo(int x) { this.x = x; }")
+        assert result["return_type"] == "Foo"
+
+    def test_header_without_body(self):
+        result = JavaStaticAnalyzer().analyze_method("int add(int a, int b)")
+        assert result["signature"] == "int add(int a, int b)"
+
+
+class TestPathologicalInputs:
+    def test_worst_case_latency_is_bounded(self):
+        # As expressões regulares antigas levavam dezenas de segundos em 60KB
+        analyzer = JavaStaticAnalyzer()
+        for name, generate in PATHOLOGICAL_CORPUS.items():
+            code = generate(64 * 1024)
+            start = time.perf_counter()
+            analyzer.analyze_method(code)
+            assert time.perf_counter() - start < 5, name
+
+
+STORE_CLASS = '''package com.zez.store;
+
+import java.util.Map;
+
+public class Store {
+    private final Map<String, Integer> stock;
+
+    public Store(Map<String, Integer> stock) {
+        this.stock = stock;
+    }
+
+    public int quantity(String item) {
+        if (stock.containsKey(item)) {
+            return stock.get(item);
+        }
+        return 0;
+    }
+
+    public Runnable task() {
+        return new Runnable() {
+            public void run() { log(); }
+        };
+    }
+
+    interface Repo {
+        int count();
+    }
+}
+'''
+
+
+class TestAnalyzeClass:
+    def test_every_method_and_constructor(self):
+        result = JavaAnalysisEngine().analyze_class(STORE_CLASS)
+        assert result["imports"] == ["java.util.Map"]
+        assert result["types"] == ["Store", "Repo"]
+        assert [(m["qualified_name"], m["kind"]) for m in result["methods"]] == [
+            ("Store.Store", "constructor"),
+            ("Store.quantity", "method"),
+            ("Store.task", "method"),
+            ("Store.task.<anonymous>.run", "method"),
+            ("Store.Repo.count", "method"),
+        ]
+
+    def test_each_method_has_its_own_body(self):
+        methods = {m["qualified_name"]: m for m in JavaAnalysisEngine().analyze_class(STORE_CLASS)["methods"]}
+        quantity = methods["Store.quantity"]
+        assert (quantity["lineno"], quantity["end_lineno"]) == (12, 17)
+        assert quantity["flow_analysis"]["complexity_score"] == 2
+        assert quantity["static_analysis"]["dependencies"] == {
+            "imports": ["java.util.Map"],
+            "method_calls": ["stock.containsKey", "stock.get"]
+        }
+        assert methods["Store.Repo.count"]["flow_analysis"]["summary"] == "Linear"
+
+    def test_flow_of_whole_file_uses_first_method_body(self):
+        flow = JavaFlowSummarizer().summarize_flow(STORE_CLASS)
+        assert flow["flow_map"] == []
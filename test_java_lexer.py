@@ -0,0 +1,154 @@
+from analyzers.java_Analyzer import JavaStaticAnalyzer, JavaFlowSummarizer
+from analyzers.java_lexer import JavaTokens
+
+
+JAVA_METHOD = '''
+import java.util.List;
+public class Orders {
+    public int total(List<Order> orders) {
+        // if (comentario) { return -1; }
+        String marker = "} { if (x) ";
+        int sum = 0;
+        if (orders != null && (orders.size() > 0)) {
+            for (Order order : orders) { sum += order.value(); }
+        } else {
+            throw new java.lang.IllegalStateException("vazio");
+        }
+        try (Reader reader = open()) {
+            while (reader.ready()) reader.read();
+        } catch (final IOException | RuntimeException e) {
+            log(e);
+        } finally {
+            close();
+        }
+        return sum;
+    }
+}
+'''
+
+
+class TestJavaTokens:
+    def test_strings_and_comments_are_single_tokens(self):
+        source = JavaTokens('a = "{ // }"; /* { */ b = \'}\';')
+        assert source.texts == ["a", "=", '"{ // }"', ";", "b", "=", "'}'", ";"]
+
+    def test_text_block_does_not_affect_brace_pairs(self):
+        source = JavaTokens('void f() { String s = """\n  }\n  """; }')
+        open_index = source.find("{")
+        assert source.pairs[open_index] == len(source) - 1
+
+    def test_find_skips_nested_blocks(self):
+        source = JavaTokens("f(a; b); c;")
+        assert source.find(";") == 6
+
+    def test_render_normalizes_spacing(self):
+        source = JavaTokens("x  =\n  y /* c */ + z")
+        assert source.render(0, len(source)) == "x = y + z"
+
+
+class TestBlockIndex:
+    CODE = 'void f() { if (a) { s = "}"; } }'
+
+    def test_depth_and_enclosing_block(self):
+        source = JavaTokens(self.CODE)
+        string_index = source.texts.index('"}"')
+        if_block = source.find("{", source.texts.index("if"))
+        assert source.depth(string_index) == 2
+        assert source.enclosing(string_index) == if_block
+        assert source.in_block(string_index, if_block)
+        assert not source.in_block(source.texts.index("if"), if_block)
+
+    def test_block_text_and_offset_lookup_ignore_strings(self):
+        source = JavaTokens(self.CODE)
+        body = source.find("{")
+        assert source.block_text(body) == '{ if (a) { s = "}"; } }'
+        assert source.match_offset(self.CODE.index("{")) == len(self.CODE) - 1
+        assert source.match_offset(self.CODE.index("s")) == -1
+
+
+class TestJavaFlowSummarizer:
+    def test_flow_ignores_strings_and_comments(self):
+        flow = JavaFlowSummarizer().summarize_flow(JAVA_METHOD)
+        conditionals = [item for item in flow["flow_map"] if item["type"] == "conditional"]
+        assert len(conditionals) == 1
+        assert conditionals[0]["condition"] == "orders != null && (orders.size() > 0)"
+        assert conditionals[0]["has_else"] is True
+
+    def test_flow_is_a_tree_in_source_order(self):
+        flow = JavaFlowSummarizer().summarize_flow(JAVA_METHOD)
+        types = [item["type"] for item in flow["flow_map"]]
+        assert types == ["conditional", "else", "try_catch", "catch", "finally", "return"]
+        assert flow["flow_map"][0]["nested_flow"][0]["type"] == "loop_for"
+        assert flow["flow_map"][1]["nested_flow"] == [
+            {"type": "exception_throw", "exception": "java.lang.IllegalStateException"}
+        ]
+        assert flow["flow_map"][2]["exceptions"] == ["IOException | RuntimeException"]
+        assert flow["flow_map"][2]["has_finally"] is True
+        assert flow["flow_map"][2]["nested_flow"][0]["type"] == "loop_while"
+        assert flow["flow_map"][5]["value"] == "sum"
+        assert flow["complexity_score"] == 5
+
+    def test_missing_body_is_an_error(self):
+        assert "error" in JavaFlowSummarizer().summarize_flow("{}")
+
+
+class TestJavaFlowTree:
+    def summarize(self, body):
+        return JavaFlowSummarizer().summarize_flow("void f() {" + body + "}")["flow_map"]
+
+    def test_each_try_gets_only_its_own_handlers(self):
+        flow = self.summarize(
+            "try { a(); } catch (IOException e) { log(e); }"
+            "try { b(); } finally { close(); }"
+        )
+        tries = [item for item in flow if item["type"] == "try_catch"]
+        assert [(t["exceptions"], t["has_finally"]) for t in tries] == [
+            (["IOException"], False), ([], True)
+        ]
+
+    def test_else_binds_to_innermost_if(self):
+        flow = self.summarize("if (a) if (b) x(); else y(); if (c) z();")
+        outer, second = flow
+        assert outer["has_else"] is False
+        assert [item["type"] for item in outer["nested_flow"]] == ["conditional", "else"]
+        assert outer["nested_flow"][0]["has_else"] is True
+        assert second["has_else"] is False
+
+    def test_else_if_chain_is_nested(self):
+        flow = self.summarize("if (a) { return 1; } else if (b) { return 2; } else { return 3; }")
+        assert [item["type"] for item in flow] == ["conditional", "else"]
+        chained = flow[1]["nested_flow"]
+        assert [item["type"] for item in chained] == ["conditional", "else"]
+        assert chained[1]["nested_flow"] == [{"type": "return", "value": "3"}]
+
+    def test_do_while_switch_and_labels(self):
+        flow = self.summarize(
+            "outer: do { x++; } while (x < 10);"
+            "switch (x) { case 1: return 1; default -> throw new IllegalStateException(); }"
+        )
+        assert flow[0] == {"type": "loop_while", "condition": "x < 10", "nested_flow": []}
+        assert flow[1:] == [
+            {"type": "return", "value": "1"},
+            {"type": "exception_throw", "exception": "IllegalStateException"}
+        ]
+
+    def test_lambdas_and_local_classes_are_skipped(self):
+        flow = self.summarize(
+            "items.forEach(i -> { if (i > 0) { return; } });"
+            "class Local { void g() { while (true) {} } }"
+            "return 0;"
+        )
+        assert flow == [{"type": "return", "value": "0"}]
+
+    def test_deep_nesting_is_bounded(self):
+        flow = JavaFlowSummarizer().summarize_flow("void f() {" + "if (a) {" * 5000 + "}" * 5001)
+        assert "error" not in flow
+
+
+class TestJavaDependencies:
+    def test_keywords_are_not_method_calls(self):
+        static = JavaStaticAnalyzer().analyze_method(JAVA_METHOD)
+        calls = static["dependencies"]["method_calls"]
+        assert "if" not in calls and "for" not in calls and "while" not in calls
+        assert "orders.size" in calls and "order.value" in calls
+        assert static["dependencies"]["imports"] == ["java.util.List"]
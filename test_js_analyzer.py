@@ -0,0 +1,161 @@
+from analyzers.js_Analyzer import JSAnalysisEngine, JSFlowSummarizer, JSStaticAnalyzer
+from analyzers.js_declarations import find_declarations
+from analyzers.js_lexer import JSTokens
+
+
+JS_MODULE = '''#!/usr/bin/env node
+import React, { useState, type FC } from 'react'
+const path = require('path')
+const { readFile } = require('fs')
+
+export async function load(url, { retries = 3 } = {}) {
+  // if (comentario) { return -1 }
+  const marker = `} { ${url} if (x) `
+  if (!url || /}{/.test(url)) {
+    throw new TypeError('url')
+  } else if (retries > 0) {
+    for await (const chunk of stream(url)) consume(chunk)
+  }
+  try {
+    return await fetch(url)
+  } catch {
+    return null
+  } finally {
+    close()
+  }
+}
+
+export class Store extends Base {
+  constructor(items = []) { super(); this.items = items }
+  @action.bound
+  add(item) { this.items.push(item) }
+  get size() { return this.items.length }
+  handle = async (event) => { await this.add(event.detail) }
+}
+
+export const add = (a, b) => a + b
+exports.sub = function (a, b) { return a - b }
+'''
+
+
+class TestJSTokens:
+    def test_regex_and_division(self):
+        source = JSTokens("a = b / c / d; r = /[/]}/g.test(s)")
+        assert source.kinds.count("regex") == 1
+        assert "/[/]}/g" in source.texts
+
+    def test_regex_after_keyword_header(self):
+        source = JSTokens("if (s) /}/.test(s); while (x) /a/g.exec(x); f(a) / 2; (a) / b")
+        assert [text for kind, text in zip(source.kinds, source.texts) if kind == "regex"] == ["/}/", "/a/g"]
+        assert source.texts.count("/") == 2
+
+    def test_template_interpolation_keeps_brace_pairs(self):
+        source = JSTokens("f(`a ${ {x: 1}.x } b`) { }")
+        assert source.texts[2:4] == ["`a ${", "{"]
+        assert source.pairs[source.texts.index("(")] == source.texts.index(")")
+        assert source.texts[-4] == "} b`"
+
+    def test_automatic_semicolon_insertion(self):
+        source = JSTokens("a = b\nc()\nd = e\n(f)")
+        assert source.statement_break(source.texts.index("c"))
+        assert not source.statement_break(source.texts.index("(", 5))
+
+
+class TestJSDeclarations:
+    def test_functions_arrows_and_methods(self):
+        source = JSTokens(JS_MODULE)
+        names = [(d.name, d.kind) for d in find_declarations(source)]
+        assert names == [
+            ("load", "function"), ("constructor", "constructor"), ("add", "method"),
+            ("size", "method"), ("handle", "arrow"), ("add", "arrow"), ("sub", "function")
+        ]
+
+    def test_typescript_type_positions_are_not_arrows(self):
+        source = JSTokens(
+            "type Fn = (a: number) => void\n"
+            "function apply(fn: (x: T) => U, items: T[]): (y: U) => void { return (y) => fn(y) }"
+        )
+        assert [(d.name, d.kind) for d in find_declarations(source)] == [
+            ("apply", "function"), ("", "arrow")
+        ]
+
+
+class TestJSStaticAnalyzer:
+    def test_typescript_signature_and_parameters(self):
+        static = JSStaticAnalyzer().analyze_function(
+            "export async function find<T>(id: string, opts?: Options, ...rest: T[]): Promise<T> { }"
+        )
+        assert static["signature"] == (
+            "export async function find<T>(id: string, opts?: Options, ...rest: T[]): Promise<T>"
+        )
+        assert [(p["name"], p["type"], p["is_rest"]) for p in static["parameters"]] == [
+            ("id", "string", False), ("opts", "Options", False), ("rest", "T[]", True)
+        ]
+        assert static["parameters"][1]["default_value"] == "undefined"
+        assert static["return_type"] == "Promise<T>"
+
+    def test_untyped_defaults(self):
+        static = JSStaticAnalyzer().analyze_function("const f = async (a, b = 2) => a + b")
+        assert static["return_type"] == "Promise<any>"
+        assert [(p["name"], p["type"], p["default_value"]) for p in static["parameters"]] == [
+            ("a", "any", None), ("b", "any", "2")
+        ]
+
+    def test_not_a_function_is_an_error(self):
+        assert "error" in JSStaticAnalyzer().analyze_function("x = 1")
+
+
+class TestJSFlowSummarizer:
+    def test_flow_tree_uses_the_java_schema(self):
+        flow = JSFlowSummarizer().summarize_flow(JS_MODULE)
+        types = [item["type"] for item in flow["flow_map"]]
+        assert types == ["conditional", "else", "try_catch", "catch", "finally"]
+        assert flow["flow_map"][0]["condition"] == "!url || /}{/.test(url)"
+        assert flow["flow_map"][0]["nested_flow"] == [{"type": "exception_throw", "exception": "TypeError"}]
+        assert flow["flow_map"][1]["nested_flow"][0]["nested_flow"][0]["type"] == "loop_for"
+        assert flow["flow_map"][2]["exceptions"] == ["Error"]
+        assert flow["flow_map"][3]["nested_flow"] == [{"type": "return", "value": "null"}]
+
+    def test_statements_without_semicolons(self):
+        flow = JSFlowSummarizer().summarize_flow("function f(a) {\n  if (a) return\n  return a\n}")
+        assert flow["flow_map"] == [
+            {"type": "conditional", "condition": "a", "has_else": False,
+             "nested_flow": [{"type": "return", "value": "undefined"}]},
+            {"type": "return", "value": "a"}
+        ]
+
+    def test_regex_statement_after_if_header(self):
+        flow = JSFlowSummarizer().summarize_flow("function f(s, x) {\n  if (s) /}/.test(s); return x\n}")
+        assert flow["flow_map"] == [
+            {"type": "conditional", "condition": "s", "has_else": False, "nested_flow": []},
+            {"type": "return", "value": "x"}
+        ]
+
+    def test_expression_arrow_returns_its_body(self):
+        flow = JSFlowSummarizer().summarize_flow("const add = (a, b) => a + b")
+        assert flow["flow_map"] == [{"type": "return", "value": "a + b"}]
+
+
+class TestJSAnalysisEngine:
+    def test_module_qualified_names_and_imports(self):
+        module = JSAnalysisEngine().analyze_module(JS_MODULE)
+        assert module["imports"] == ["react", "react.useState", "react.FC", "path", "fs.readFile"]
+        assert module["classes"] == ["Store"]
+        assert [(f["qualified_name"], f["kind"]) for f in module["functions"]] == [
+            ("load", "function"), ("Store.constructor", "constructor"), ("Store.add", "method"),
+            ("Store.size", "method"), ("Store.handle", "arrow"), ("add", "arrow"),
+            ("sub", "function")
+        ]
+        add = module["functions"][2]
+        assert add["static_analysis"]["decorators"] == ["action.bound"]
+        assert add["static_analysis"]["dependencies"]["internal_calls"] == ["this.items.push"]
+
+    def test_server_routes_javascript_and_typescript(self):
+        import mcp_server
+
+        result = mcp_server._analyze_and_generate_complete(
+            "function soma(a: number, b: number): number { return a + b }", "typescript", "auto"
+        )
+        assert result["summary"]["framework"] == "jest"
+        assert result["summary"]["function_signature"] == "function soma(a: number, b: number): number"
+        assert "```typescript" in result["prompt_generation"]["prompt"]
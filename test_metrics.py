@@ -0,0 +1,82 @@
+import asyncio
+import ast
+
+import pytest
+
+from analyzers import metrics
+from analyzers.batch import BatchAnalyzer
+from analyzers.executor import ToolExecutor
+from analyzers.java_Analyzer import JavaAnalysisEngine
+from analyzers.metrics import Histogram, ServerMetrics, phase, size_label, timed
+from analyzers.python_Analyzer import PythonAnalysisEngine
+
+
+PYTHON_CODE = "def soma(a: int, b: int) -> int:\n    if a > b:\n        return a\n    return b\n"
+JAVA_CODE = "class A { public int soma(int a, int b) { if (a > b) { return a; } return b; } }"
+
+
+class TestHistogram:
+    def test_quantiles_use_bucket_bounds(self):
+        histogram = Histogram()
+        for value in [0.2] * 90 + [30.0] * 9 + [7000.0]:
+            histogram.observe(value)
+        assert histogram.quantile(0.5) == 0.5
+        assert histogram.quantile(0.99) == 50
+        assert histogram.quantile(1.0) == 7000.0
+        assert histogram.to_dict()["buckets_ms"] == {"<=0.5": 90, "<=50": 9, "<=10000": 1}
+
+    def test_size_labels(self):
+        assert size_label(0) == "<1KB"
+        assert size_label(1023) == "<1KB"
+        assert size_label(1024) == "<4KB"
+        assert size_label(5 * 1024 * 1024) == ">=1MB"
+
+
+class TestServerMetrics:
+    def test_call_records_phases_errors_and_sizes(self):
+        server_metrics = ServerMetrics(enabled=True)
+        engine = PythonAnalysisEngine()
+
+        server_metrics.call("analyze", len(PYTHON_CODE), engine.analyze, PYTHON_CODE)
+        server_metrics.call("analyze_class", 5000, JavaAnalysisEngine().analyze_class, JAVA_CODE)
+        server_metrics.call("static", 3, lambda code: {"error": "x"}, "x =")
+
+        tools = server_metrics.stats()["tools"]
+        assert set(tools["analyze"]["phases"]) == {"parse", "walk", "unparse"}
+        assert set(tools["analyze_class"]["phases"]) == {"tokenize", "walk"}
+        assert list(tools["analyze_class"]["by_input_size"]) == ["<16KB"]
+        assert (tools["static"]["calls"], tools["static"]["errors"]) == (1, 1)
+
+    def test_exceptions_count_as_errors(self):
+        server_metrics = ServerMetrics(enabled=True)
+        with pytest.raises(ValueError):
+            server_metrics.call("falha", 0, int, "x")
+        assert server_metrics.stats()["tools"]["falha"]["errors"] == 1
+
+    def test_phases_outside_a_call_are_ignored(self):
+        with phase("walk"):
+            ast.parse("x = 1")
+        server_metrics = ServerMetrics(enabled=True)
+        server_metrics.call("vazio", 0, len, "")
+        assert server_metrics.stats()["tools"]["vazio"]["phases"] == {}
+
+    def test_disabled_metrics_record_nothing(self, monkeypatch):
+        server_metrics = ServerMetrics(enabled=False)
+        assert server_metrics.call("x", 0, len, "abc") == 3
+        assert server_metrics.stats()["tools"] == {}
+
+        monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+        assert timed("parse", ast.parse) is ast.parse
+
+    def test_executor_records_named_tools(self):
+        server_metrics = ServerMetrics(enabled=True)
+        executor = ToolExecutor(BatchAnalyzer(max_workers=1), metrics=server_metrics)
+        try:
+            result = asyncio.run(executor.run(len, "abc", size=3, tool="contar"))
+            asyncio.run(executor.run(len, "abc", size=3))
+        finally:
+            executor.shutdown()
+        assert result == 3
+        assert list(server_metrics.stats()["tools"]) == ["contar"]
+        server_metrics.reset()
+        assert server_metrics.stats()["tools"] == {}
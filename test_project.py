@@ -0,0 +1,116 @@
+import asyncio
+
+from analyzers.batch import BatchAnalyzer
+from analyzers.metrics import ServerMetrics
+from analyzers.project import ProjectScanner, analyze_file, discover_files
+
+
+def make_project(root):
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text(
+        "def run(x):\n    if x:\n        return 1\n    return 0\n\nclass A:\n    def m(self):\n        pass\n"
+    )
+    (root / "src" / "Store.java").write_text(
+        "public int total(int a) {\n    if (a > 0) { return a; }\n    return 0;\n}\n"
+    )
+    (root / "src" / "broken.py").write_text("def broken(:\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "ignored.py").write_text("def ignored():\n    pass\n")
+    (root / "README.md").write_text("docs")
+
+
+class TestDiscoverFiles:
+    def test_finds_sources_and_skips_default_dirs(self, tmp_path):
+        make_project(tmp_path)
+        assert list(discover_files(str(tmp_path))) == [
+            "src/Store.java", "src/app.py", "src/broken.py"
+        ]
+
+    def test_include_and_exclude_patterns(self, tmp_path):
+        make_project(tmp_path)
+        assert list(discover_files(str(tmp_path), include=["*.py"], exclude=["broken*"])) == [
+            "src/app.py"
+        ]
+
+
+class TestProjectScanner:
+    def test_analyze_file_summarizes_functions(self, tmp_path):
+        make_project(tmp_path)
+        result = analyze_file(str(tmp_path), "src/app.py")
+        assert result["function_count"] == 2
+        assert result["max_complexity"] == 2
+        assert [f["qualified_name"] for f in result["functions"]] == ["run", "A.m"]
+
+    def test_analyze_typescript_file(self, tmp_path):
+        (tmp_path / "store.ts").write_text(
+            "export class Store {\n  add(item: Item): void { if (item) { this.items.push(item) } }\n}\n"
+            "export const size = (s: Store): number => s.items.length\n"
+        )
+        assert list(discover_files(str(tmp_path))) == ["store.ts"]
+        result = analyze_file(str(tmp_path), "store.ts")
+        assert result["language"] == "typescript"
+        assert [f["qualified_name"] for f in result["functions"]] == ["Store.add", "size"]
+        assert result["max_complexity"] == 2
+
+    def test_scan_reports_progress_per_file(self, tmp_path):
+        make_project(tmp_path)
+        progress = []
+
+        async def on_progress(done, total, file_result):
+            progress.append((done, total, file_result["path"]))
+
+        analyzer = BatchAnalyzer(max_workers=1)
+        try:
+            result = asyncio.run(ProjectScanner(analyzer).scan(str(tmp_path), on_progress=on_progress))
+        finally:
+            analyzer.shutdown()
+
+        assert [done for done, _, _ in progress] == [1, 2, 3]
+        assert all(total in (None, 3) for _, total, _ in progress) and progress[-1][1] == 3
+        assert [f["path"] for f in result["files"]] == ["src/Store.java", "src/app.py", "src/broken.py"]
+        assert result["error_count"] == 1
+        assert result["function_count"] == 3
+
+    def test_discovery_is_lazy(self, tmp_path, monkeypatch):
+        for i in range(6):
+            (tmp_path / f"m{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+        discovered = []
+
+        def counting_discover(*args):
+            for relative_path in discover_files(*args):
+                discovered.append(relative_path)
+                yield relative_path
+
+        seen = []
+
+        async def on_progress(done, total, file_result):
+            seen.append((len(discovered), total))
+
+        monkeypatch.setattr("analyzers.project.discover_files", counting_discover)
+        analyzer = BatchAnalyzer(max_workers=1)
+        try:
+            result = asyncio.run(ProjectScanner(analyzer).scan(str(tmp_path), on_progress=on_progress))
+        finally:
+            analyzer.shutdown()
+
+        assert result["file_count"] == 6
+        assert seen[0] == (2, None)
+        assert seen[-1] == (6, 6)
+
+    def test_missing_directory(self, tmp_path):
+        result = asyncio.run(ProjectScanner(BatchAnalyzer(max_workers=1)).scan(str(tmp_path / "nope")))
+        assert "error" in result
+
+    def test_scan_is_recorded_with_phases(self, tmp_path):
+        make_project(tmp_path)
+        metrics = ServerMetrics(enabled=True)
+        analyzer = BatchAnalyzer(max_workers=1)
+        try:
+            asyncio.run(ProjectScanner(analyzer, metrics=metrics).scan(str(tmp_path)))
+        finally:
+            analyzer.shutdown()
+
+        scan = metrics.stats()["tools"]["scan_project"]
+        assert (scan["calls"], scan["errors"]) == (1, 0)
+        assert list(scan["by_input_size"]) == ["<1KB"]
+        assert {"parse", "walk", "tokenize"} <= set(scan["phases"])
@@ -0,0 +1,118 @@
+from analyzers.java_Analyzer import JavaFlowSummarizer, JavaPromptGenerator, JavaStaticAnalyzer
+from analyzers.prompt_budget import PromptCompactor, estimate_tokens, is_relevant_import
+from analyzers.python_Analyzer import PromptGenerator, PythonAnalysisEngine
+from analyzers.templates import shorten_skeleton
+
+
+LONG_CONDITION = "configuracao.obter('limite_maximo_de_tentativas') > tentativas_realizadas"
+PYTHON_CODE = f"""import os
+import re
+import sys
+from collections import OrderedDict
+
+def processar(caminho, tentativas_realizadas, configuracao):
+    if {LONG_CONDITION}:
+        return os.path.join(caminho, 'x')
+    if {LONG_CONDITION}:
+        return None
+    for linha in caminho:
+        pass
+    return OrderedDict()
+"""
+
+
+def python_prompt(max_prompt_tokens=None):
+    analysis = PythonAnalysisEngine().analyze(PYTHON_CODE)
+    return PromptGenerator().generate_test_prompt(
+        analysis["static"], analysis["flow"], max_prompt_tokens=max_prompt_tokens
+    )
+
+
+class TestEstimateTokens:
+    def test_words_and_symbols(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("a b c") == 3
+        assert estimate_tokens("f(x)") == 3
+        assert estimate_tokens("x" * 40) == 10
+
+    def test_relevant_imports(self):
+        names = {"os", "OrderedDict", "List"}
+        assert is_relevant_import("os", names)
+        assert is_relevant_import("collections.OrderedDict", names)
+        assert is_relevant_import("java.util.List", names)
+        assert is_relevant_import("java.io.*", names)
+        assert not is_relevant_import("re", names)
+
+
+class TestPromptCompactor:
+    def test_without_budget_prompt_is_unchanged(self):
+        result = python_prompt()
+        metadata = result["metadata"]
+        assert "compaction" not in metadata
+        tokens = metadata["estimated_tokens"]
+        assert set(tokens) == {"function_info", "flow_info", "output_structure", "template", "total"}
+        assert tokens["total"] == estimate_tokens(result["prompt"])
+        assert f"Condição TRUE: {LONG_CONDITION}; Condição FALSE: {LONG_CONDITION}; " \
+               f"Condição TRUE: {LONG_CONDITION}" in result["prompt"]
+
+    def test_large_budget_applies_no_step(self):
+        metadata = python_prompt(10000)["metadata"]
+        assert metadata["within_budget"] is True
+        assert metadata["compaction"] == []
+
+    def test_steps_follow_priority_order(self):
+        total = python_prompt()["metadata"]["estimated_tokens"]["total"]
+        result = python_prompt(total - 1)
+        assert result["metadata"]["compaction"] == ["dedupe_scenarios"]
+        assert result["prompt"].count(f"Condição TRUE: {LONG_CONDITION}") == 1
+
+        deduped = result["metadata"]["estimated_tokens"]["total"]
+        result = python_prompt(deduped - 1)
+        assert result["metadata"]["compaction"] == ["dedupe_scenarios", "drop_irrelevant_imports"]
+        dependencies = result["prompt"].split("DEPENDÊNCIAS: ")[1].split("\n")[0]
+        assert sorted(dependencies.split(", ")) == ["collections.OrderedDict", "os"]
+
+    def test_tight_budget_trims_scenarios_and_skeleton(self):
+        result = python_prompt(260)
+        metadata = result["metadata"]
+        assert metadata["compaction"] == [
+            "dedupe_scenarios", "drop_irrelevant_imports", "abbreviate_conditions",
+            "short_skeleton", "trim_scenarios"
+        ]
+        assert metadata["within_budget"] is True
+        assert metadata["estimated_tokens"]["total"] <= 260
+        assert "cenários omitidos" in result["prompt"]
+        assert "# Arrange" not in result["prompt"]
+
+    def test_unreachable_budget_is_reported(self):
+        metadata = python_prompt(10)["metadata"]
+        assert metadata["within_budget"] is False
+        assert metadata["max_prompt_tokens"] == 10
+
+    def test_java_prompt_budget(self):
+        code = ("import java.util.List;\nimport java.util.Map;\n"
+                "public int contar(List<String> itens) {\n"
+                "    if (itens.isEmpty()) { return 0; }\n"
+                "    if (itens.isEmpty()) { return 1; }\n"
+                "    return itens.size();\n}")
+        static = JavaStaticAnalyzer().analyze_method(code)
+        flow = JavaFlowSummarizer().summarize_flow(code)
+        generator = JavaPromptGenerator()
+        full = generator.generate_test_prompt(static, flow)
+        total = full["metadata"]["estimated_tokens"]["total"]
+
+        result = generator.generate_test_prompt(static, flow, max_prompt_tokens=total - 20)
+        assert result["metadata"]["compaction"][:2] == ["dedupe_scenarios", "drop_irrelevant_imports"]
+        assert "DEPENDÊNCIAS: java.util.List\n" in result["prompt"]
+        assert result["metadata"]["estimated_tokens"]["method_info"] < \
+            full["metadata"]["estimated_tokens"]["method_info"]
+
+    def test_short_skeleton_drops_comments_and_blank_lines(self):
+        skeleton = "```python\nclass TestX:\n\n    def test_a(self):\n        # Arrange\n```"
+        assert shorten_skeleton(skeleton) == "```python\nclass TestX:\n    def test_a(self):\n```"
+
+    def test_compactor_without_steps_is_identity(self):
+        compactor = PromptCompactor()
+        assert compactor.scenarios(["a", "a"]) == ["a", "a"]
+        assert compactor.condition(LONG_CONDITION) == LONG_CONDITION
+        assert compactor.summary("IF(x) -> RETURN(1)") == "IF(x) -> RETURN(1)"
@@ -0,0 +1,113 @@
+import pytest
+
+from analyzers.python_Analyzer import StaticAnalyzer, FlowSummarizer, PythonAnalysisEngine
+
+
+NESTED_CODE = '''
+import os
+from collections import OrderedDict as OD
+
+class Service:
+    def method(self, value):
+        return value
+
+def first(data: dict, limit: int = 3, *args, **kwargs) -> dict:
+    for item in data:
+        while limit:
+            try:
+                if item:
+                    raise ValueError(item)
+                elif limit > 2:
+                    return os.path.join(item)
+                else:
+                    limit -= 1
+            except (KeyError, ValueError):
+                raise
+            finally:
+                pass
+    return OD(data)
+'''
+
+
+def legacy_pipeline(code):
+    return StaticAnalyzer().analyze_function(code), FlowSummarizer().summarize_flow(code)
+
+
+class TestPythonAnalysisEngine:
+    @pytest.mark.parametrize("code", [
+        open("teste.py", encoding="utf-8").read(),
+        NESTED_CODE,
+        "x = 1",
+        "def broken(:",
+    ])
+    def test_matches_multi_walk_pipeline(self, code):
+        static_analysis, flow_analysis = legacy_pipeline(code)
+        result = PythonAnalysisEngine().analyze(code)
+        assert repr(result["static"]) == repr(static_analysis)
+        assert repr(result["flow"]) == repr(flow_analysis)
+
+    def test_picks_shallowest_function_like_ast_walk(self):
+        result = PythonAnalysisEngine().analyze(NESTED_CODE)
+        assert result["static"]["signature"].startswith("first(")
+
+    def test_dependencies_keep_first_seen_order(self):
+        code = "import sys\nimport os\nimport sys\ndef f(x):\n    b(a(x))\n    a(1)\n    return os.path.join(b(2))\n"
+        expected = {"imports": ["sys", "os"], "internal_calls": ["b", "a", "os.path.join"]}
+        assert PythonAnalysisEngine().analyze(code)["static"]["dependencies"] == expected
+        assert StaticAnalyzer().analyze_function(code)["dependencies"] == expected
+
+
+MODULE_CODE = '''
+import os
+from typing import List
+
+@register(build())
+def outer(items: List[str] = default()) -> int:
+    total = count(items)
+    def inner(value):
+        return os.path.basename(value)
+    return total
+
+class Repository:
+    def save(self, entity):
+        if entity is None:
+            raise ValueError("entity")
+        self.session.add(entity)
+
+    async def load(self, key):
+        for row in await self.fetch(key):
+            return row
+'''
+
+
+class TestAnalyzeModule:
+    def setup_method(self):
+        self.result = PythonAnalysisEngine().analyze_module(MODULE_CODE)
+        self.functions = {f["qualified_name"]: f for f in self.result["functions"]}
+
+    def test_finds_functions_methods_and_async(self):
+        assert list(self.functions) == [
+            "outer", "outer.<locals>.inner", "Repository.save", "Repository.load"
+        ]
+        assert self.functions["Repository.save"]["kind"] == "method"
+        assert self.functions["Repository.load"]["is_async"] is True
+
+    def test_imports_are_collected_once_for_the_module(self):
+        assert self.result["imports"] == ["os", "typing.List"]
+        for function in self.result["functions"]:
+            assert function["static_analysis"]["dependencies"]["imports"] is self.result["imports"]
+
+    def test_calls_are_scoped_to_function_body(self):
+        calls = {name: f["static_analysis"]["dependencies"]["internal_calls"]
+                 for name, f in self.functions.items()}
+        assert calls["outer"] == ["count"]
+        assert calls["outer.<locals>.inner"] == ["os.path.basename"]
+        assert calls["Repository.save"] == ["ValueError", "self.session.add"]
+
+    def test_flow_per_function(self):
+        flow = self.functions["Repository.save"]["flow_analysis"]
+        assert flow["summary"] == "IF(entity is None)"
+        assert flow["complexity_score"] == 2
+
+    def test_syntax_error(self):
+        assert "error" in PythonAnalysisEngine().analyze_module("def broken(:")
@@ -0,0 +1,70 @@
+import ast
+
+from analyzers.python_Analyzer import PythonAnalysisEngine, StaticAnalyzer
+from analyzers.python_render import ExpressionRenderer
+
+
+def first(tree, node_type):
+    return next(node for node in ast.walk(tree) if isinstance(node, node_type))
+
+
+class TestExpressionRenderer:
+    def test_single_line_expressions_come_from_the_source(self):
+        code = 'def f(a: "Tipo" = {"k":  1}):\n    return obj.metodo(a)\n'
+        tree = ast.parse(code)
+        render = ExpressionRenderer(code).render
+        function = first(tree, ast.FunctionDef)
+        assert render(function.args.args[0].annotation) == '"Tipo"'
+        assert render(function.args.defaults[0]) == '{"k":  1}'
+        assert render(first(tree, ast.Call).func) == "obj.metodo"
+
+    def test_non_ascii_lines_use_byte_offsets(self):
+        code = "def f(nome='ação', x=1):\n    if nome == 'não' and x:\n        pass\n"
+        tree = ast.parse(code)
+        render = ExpressionRenderer(code).render
+        assert render(first(tree, ast.If).test) == "nome == 'não' and x"
+        assert render(first(tree, ast.FunctionDef).args.defaults[1]) == "1"
+
+    def test_multiline_falls_back_to_unparse(self):
+        code = "def f(x):\n    if (x > 1 and  # comentário\n            x < 9):\n        pass\n"
+        test = first(ast.parse(code), ast.If).test
+        assert ExpressionRenderer(code).render(test) == "x > 1 and x < 9"
+
+    def test_huge_expressions_are_truncated(self):
+        code = "def f(x=[" + ", ".join(str(i) for i in range(1000)) + "]):\n    pass\n"
+        default = first(ast.parse(code), ast.FunctionDef).args.defaults[0]
+        text = ExpressionRenderer(code, max_length=20).render(default)
+        assert text == "[0, 1, 2, 3, 4, 5, …"
+        assert len(ExpressionRenderer(None, max_length=20).render(default)) == 20
+
+    def test_long_multiline_expressions_drop_comments(self):
+        items = "".join(f'        "chave_{i}":  "a  b",  # item {i}\n' for i in range(30))
+        code = f"def f():\n    return {{  # grande\n{items}    }}\n"
+        value = first(ast.parse(code), ast.Return).value
+        text = ExpressionRenderer(code, max_length=40).render(value)
+        assert text == "{'chave_0': 'a  b', 'chave_1': 'a  b', …"
+        assert "#" not in text and len(text) == 40
+
+    def test_each_node_is_rendered_once(self, monkeypatch):
+        code = "def f(x):\n    if (x >\n        1):\n        pass\n"
+        test = first(ast.parse(code), ast.If).test
+        renderer = ExpressionRenderer(code)
+        calls = []
+        original = ast.unparse
+        monkeypatch.setattr(ast, "unparse", lambda node: calls.append(node) or original(node))
+        assert renderer.render(test) == renderer.render(test) == "x > 1"
+        assert calls == [test]
+
+
+class TestAnalyzersUseSegments:
+    def test_signature_and_parameters_share_rendering(self):
+        code = 'def f(a: int = len("x"), *rest: str) -> "Resultado":\n    return a\n'
+        static = StaticAnalyzer().analyze_function(code)
+        assert static["signature"] == 'f(a: int = len("x"), *rest: str) -> "Resultado"'
+        assert static["parameters"][0]["default_value"] == 'len("x")'
+        assert PythonAnalysisEngine().analyze(code)["static"] == static
+
+    def test_unparse_mode_matches_previous_output(self):
+        code = 'def f(a="x"):\n    if a == "y":\n        return a\n'
+        flow = PythonAnalysisEngine(source_segments=False).analyze(code)["flow"]
+        assert flow["flow_map"][0]["condition"] == "a == 'y'"
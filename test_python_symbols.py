@@ -0,0 +1,119 @@
+import ast
+
+import pytest
+
+import mcp_server
+from analyzers.cache import AnalysisCache
+from analyzers.python_Analyzer import PythonAnalysisEngine, symbol_index
+from analyzers.python_symbols import SymbolIndex
+
+
+MODULE = '''import os
+from typing import List
+
+def primeira(x):
+    return x
+
+class Conta:
+    def deposita(self, valor: float = 0.0) -> None:
+        if valor <= 0:
+            raise ValueError("valor")
+        self.saldo = os.path.join(valor)
+
+    async def sincroniza(self, ids: List[int]):
+        def filtra(item):
+            return item > 0
+        for item in ids:
+            await self.envia(filtra(item))
+
+    class Interna:
+        def metodo(self):
+            return 1
+
+if os.name == "nt":
+    async def plataforma():
+        return "windows"
+'''
+
+
+class TestSymbolIndex:
+    def test_qualified_names_include_async_and_methods(self):
+        index = SymbolIndex(MODULE, ast.parse(MODULE))
+        assert list(index.functions) == [
+            "primeira", "Conta.deposita", "Conta.sincroniza", "Conta.sincroniza.<locals>.filtra",
+            "Conta.Interna.metodo", "plataforma"
+        ]
+        assert isinstance(index.lookup("plataforma"), ast.AsyncFunctionDef)
+        assert index.imports == ["os", "typing.List"]
+
+    def test_last_definition_wins_and_each_is_numbered(self):
+        code = "def f():\n    return 1\n\ndef f():\n    return 2\n"
+        index = SymbolIndex(code, ast.parse(code))
+        assert index.lookup("f").lineno == 4
+        assert index.lookup("f#1").lineno == 1 and index.lookup("f#2").lineno == 4
+        assert [name for name, _ in index.definitions] == ["f#1", "f#2"]
+        assert list(index.functions) == ["f"]
+
+    def test_property_setter_is_reachable(self):
+        code = ("class C:\n    @property\n    def x(self):\n        return self._x\n\n"
+                "    @x.setter\n    def x(self, valor):\n        self._x = valor\n")
+        index = SymbolIndex(code, ast.parse(code))
+        assert [arg.arg for arg in index.lookup("C.x").args.args] == ["self", "valor"]
+        assert len(index.lookup("C.x#1").args.args) == 1
+        analysis = PythonAnalysisEngine().analyze(code, "C.x")
+        assert analysis["static"]["signature"] == "x(self, valor)"
+
+    def test_missing_name_lists_available(self):
+        with pytest.raises(ValueError, match="disponíveis: primeira, Conta.deposita"):
+            SymbolIndex(MODULE, ast.parse(MODULE)).lookup("Conta.saca")
+
+    def test_index_is_cached_by_content(self):
+        cache = AnalysisCache()
+        assert symbol_index(MODULE, cache) is symbol_index(MODULE, cache)
+        assert symbol_index(MODULE + "\n", cache) is not symbol_index(MODULE, cache)
+
+
+class TestQualifiedAnalysis:
+    def test_method_analysis(self):
+        analysis = PythonAnalysisEngine().analyze(MODULE, "Conta.deposita")
+        assert analysis["static"]["signature"] == "deposita(self, valor: float = 0.0) -> None"
+        assert analysis["static"]["dependencies"] == {
+            "imports": ["os", "typing.List"], "internal_calls": ["ValueError", "os.path.join"]
+        }
+        assert analysis["flow"]["summary"] == "IF(valor <= 0)"
+
+    def test_async_method_keeps_nested_function_separate(self):
+        analysis = PythonAnalysisEngine().analyze(MODULE, "Conta.sincroniza")
+        assert [node["type"] for node in analysis["flow"]["flow_map"]] == ["loop_for"]
+        assert analysis["static"]["dependencies"]["internal_calls"] == ["self.envia", "filtra"]
+
+    def test_default_is_still_the_first_function(self):
+        engine = PythonAnalysisEngine()
+        first, named = engine.analyze(MODULE), engine.analyze(MODULE, "primeira")
+        assert first["flow"] == named["flow"]
+        assert first["static"]["signature"] == named["static"]["signature"] == "primeira(x)"
+
+    def test_missing_name_is_an_error(self):
+        analysis = PythonAnalysisEngine().analyze(MODULE, "nada")
+        assert "Função não encontrada: nada" in analysis["static"]["error"]
+        assert "error" in analysis["flow"]
+
+
+class TestServerQualifiedName:
+    def test_complete_report_per_function(self):
+        deposit = mcp_server._analyze_and_generate_complete(MODULE, qualified_name="Conta.deposita")
+        nested = mcp_server._analyze_and_generate_complete(
+            MODULE, qualified_name="Conta.sincroniza.<locals>.filtra"
+        )
+        assert deposit["summary"]["function_signature"].startswith("deposita(")
+        assert nested["summary"]["function_signature"] == "filtra(item)"
+        assert deposit["prompt_generation"]["prompt"] != nested["prompt_generation"]["prompt"]
+
+    def test_scenarios_and_flow_follow_the_name(self):
+        scenarios = mcp_server._list_test_scenarios(MODULE, "python", 10, None, "Conta.deposita")
+        assert scenarios["scenarios"][0] == "Condição TRUE: valor <= 0"
+        assert mcp_server._python_flow(MODULE, "plataforma")["summary"] == 'RETURN("windows")'
+
+    def test_other_languages_reject_qualified_name(self):
+        result = mcp_server._generate_test_prompt("void f() {}", "java", "junit5", None, "f")
+        assert "só é suportado para Python" in result["error"]
@@ -0,0 +1,130 @@
+import json
+from functools import partial
+
+import mcp_server
+from analyzers.batch import BatchAnalyzer
+from analyzers.flow import to_response
+from analyzers.response import (
+    compact_response, count_flow_nodes, paginate, select_fields, shape_response
+)
+
+
+PYTHON_CODE = "def soma(a, b):\n    if a > b:\n        return a\n    return b\n"
+JAVA_CODE = "public int soma(int a, int b) {\n    if (a > b) { return a; }\n    return b;\n}\n"
+
+
+class TestShapeResponse:
+    def test_compact_keeps_prompt_and_metadata_only(self):
+        full = mcp_server._analyze_and_generate_complete(PYTHON_CODE)
+        compact = compact_response(full)
+        assert set(compact) == {"prompt", "metadata"}
+        assert compact["prompt"] == full["prompt_generation"]["prompt"]
+        assert compact["metadata"]["signature"] == "soma(a, b)"
+        assert compact["metadata"]["complexity_score"] == 2
+        assert len(json.dumps(compact)) < len(json.dumps(to_response(full)))
+
+    def test_compact_error_keeps_only_messages(self):
+        full = mcp_server._analyze_and_generate_complete("x = 1")
+        compact = compact_response(full)
+        assert compact["error"] == full["error"]
+        assert set(compact["static_analysis"]) == {"error"}
+
+    def test_select_dotted_fields(self):
+        result = {"index": 3, "summary": {"a": 1, "b": 2}, "static_analysis": {"signature": "f()"}}
+        assert select_fields(result, ["summary.a", "summary.missing", "nope.x"]) == {
+            "index": 3, "summary": {"a": 1}
+        }
+        assert shape_response(result, "full", ["static_analysis"]) == {
+            "index": 3, "static_analysis": {"signature": "f()"}
+        }
+
+
+class TestServerDetail:
+    def test_java_complete_compact(self):
+        response = mcp_server._shaped(mcp_server._analyze_and_generate_java_complete, "compact", None,
+                                      JAVA_CODE, "junit5")
+        assert set(response) == {"prompt", "metadata"}
+        assert response["metadata"]["signature"] == "public int soma(int a, int b)"
+
+    def test_invalid_detail(self):
+        assert "error" in mcp_server._shaped(mcp_server._analyze_and_generate_complete, "tudo", None, PYTHON_CODE)
+
+    def test_batch_compact_preserves_index(self):
+        results = BatchAnalyzer(max_workers=1).analyze([{"code": PYTHON_CODE}, {"code": "x = 1"}], "compact")
+        assert [result["index"] for result in results] == [0, 1]
+        assert set(results[0]) == {"index", "prompt", "metadata"}
+        assert "error" in results[1]
+
+
+class TestPagination:
+    def read_all(self, read):
+        items, cursor, pages = [], None, 0
+        while True:
+            page = read(cursor)
+            items.extend(page["flow_map"])
+            pages += 1
+            cursor = page["page"]["next_cursor"]
+            if cursor is None:
+                return items, pages
+
+    def test_flow_pages_cover_the_whole_map(self):
+        code = "def f(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(30)) + "    return -1\n"
+        full = mcp_server._python_flow(code)
+        items, pages = self.read_all(
+            lambda cursor: mcp_server._paged(mcp_server._python_flow, "flow_map", code, 10, cursor,
+                                             count_flow_nodes)
+        )
+        assert items == full["flow_map"]
+        assert pages == 7
+
+    def test_single_heavy_item_is_an_oversized_page(self):
+        body = "".join(f"        if x == {i}:\n            return {i}\n" for i in range(12))
+        code = f"def f(x):\n    try:\n{body}    except ValueError:\n        pass\n    return -1\n"
+        first = mcp_server._paged(mcp_server._python_flow, "flow_map", code, 5, None, count_flow_nodes)
+        assert [node["type"] for node in first["flow_map"]] == ["try_except"]
+        assert first["page"]["count"] == 1 and first["page"]["oversized"] is True
+        second = mcp_server._paged(mcp_server._python_flow, "flow_map", code, 5,
+                                   first["page"]["next_cursor"], count_flow_nodes)
+        assert second["flow_map"][0]["type"] == "return"
+        assert second["page"]["oversized"] is False
+
+    def test_without_page_size_result_is_unchanged(self):
+        result = {"functions": [1, 2, 3]}
+        assert paginate(result, "functions", "code", None) is result
+
+    def test_cursor_is_bound_to_the_code(self):
+        result = {"functions": [1, 2, 3]}
+        page = paginate(result, "functions", "a", 2)
+        cursor = page["page"]["next_cursor"]
+        assert page["functions"] == [1, 2]
+        assert (page["page"]["offset"], page["page"]["count"], page["page"]["total"]) == (0, 2, 3)
+        assert paginate(result, "functions", "a", 2, cursor)["functions"] == [3]
+        assert "error" in paginate(result, "functions", "b", 2, cursor)
+
+    def test_cursor_is_bound_to_the_selector(self):
+        code = "def f(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(3)) + \
+               "\ndef g(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(3))
+        def read(name, cursor):
+            analysis = partial(mcp_server._python_flow, qualified_name=name)
+            return mcp_server._paged(analysis, "flow_map", code, 1, cursor, None, name)
+
+        cursor = read("f", None)["page"]["next_cursor"]
+        assert "error" not in read("f", cursor)
+        assert "error" in read("g", cursor)
+        scenarios = mcp_server._list_test_scenarios(code, "python", 1, None, "f")
+        other = mcp_server._list_test_scenarios(code, "python", 1, scenarios["page"]["next_cursor"], "g")
+        assert "error" in other
+
+    def test_page_size_below_one_is_rejected(self):
+        result = {"functions": [1, 2, 3]}
+        assert "page_size inválido" in paginate(result, "functions", "code", 0)["error"]
+        assert "page_size inválido" in paginate(result, "functions", "code", -1)["error"]
+        assert "page_size inválido" in mcp_server._list_test_scenarios(JAVA_CODE, "java", 0)["error"]
+
+    def test_scenarios_are_generated_per_page(self):
+        code = "public int f(int x) {\n    if (x > 0) { return 1; }\n    for (int i : xs) { x++; }\n    return 0;\n}\n"
+        first = mcp_server._list_test_scenarios(code, "java", 3)
+        assert first["scenarios"] == ["Condição TRUE: x > 0", "Condição FALSE: x > 0", "Loop vazio"]
+        second = mcp_server._list_test_scenarios(code, "java", 3, first["page"]["next_cursor"])
+        assert second["scenarios"] == ["Loop com múltiplas iterações"]
+        assert second["page"]["next_cursor"] is None
@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from analyzers.lazy import Lazy
+from benchmarks.bench_startup import parse_importtime
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestLazy:
+    def test_factory_runs_once(self):
+        calls = []
+        value = Lazy(lambda: calls.append(1) or len(calls))
+        assert not value.loaded
+        threads = [threading.Thread(target=value) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert value() == 1
+        assert value.loaded
+        assert calls == [1]
+
+    def test_none_is_a_value(self):
+        calls = []
+        value = Lazy(lambda: calls.append(1))
+        assert value() is None and value() is None
+        assert calls == [1]
+
+
+class TestServerStartup:
+    def test_backends_load_on_first_use(self):
+        script = (
+            "import json, sys\n"
+            "import mcp_server\n"
+            "loaded = lambda: sorted(m for m in sys.modules if m.startswith('analyzers.'))\n"
+            "startup = loaded()\n"
+            "mcp_server._python_static('def soma(a, b):\\n    return a + b\\n')\n"
+            "print(json.dumps({'startup': startup, 'python': loaded(),"
+            " 'sqlite3': 'sqlite3' in sys.modules}))\n"
+        )
+        env = dict(os.environ, MCP_QA_CACHE_DB="")
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        modules = json.loads(output.splitlines()[-1])
+
+        assert "analyzers.python_Analyzer" not in modules["startup"]
+        assert "analyzers.java_Analyzer" not in modules["startup"]
+        assert "analyzers.js_Analyzer" not in modules["startup"]
+        assert "analyzers.store" not in modules["startup"]
+        assert "analyzers.python_Analyzer" in modules["python"]
+        assert "analyzers.java_Analyzer" not in modules["python"]
+        assert modules["sqlite3"] is False
+
+    def test_server_stats_does_not_open_the_store(self, tmp_path):
+        db_path = tmp_path / "analysis.db"
+        script = (
+            "import asyncio, json, sys\n"
+            "import mcp_server\n"
+            "stats = asyncio.run(mcp_server.server_stats())\n"
+            "print(json.dumps({'store': stats['store'], 'sqlite3': 'sqlite3' in sys.modules}))\n"
+        )
+        env = dict(os.environ, MCP_QA_CACHE_DB=str(db_path))
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        assert json.loads(output.splitlines()[-1]) == {"store": {"loaded": False}, "sqlite3": False}
+        assert not db_path.exists()
+
+    def test_parse_importtime(self):
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   analyzers.lazy",
+            "import time:      2000 |       5000 | mcp_server",
+            "Traceback (most recent call last):",
+        ]
+        assert parse_importtime(lines) == [("analyzers.lazy", 120, 120), ("mcp_server", 2000, 5000)]
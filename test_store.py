@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+from analyzers.batch import BatchAnalyzer
+from analyzers.project import ProjectScanner
+from analyzers.store import AnalysisStore
+
+
+class TestAnalysisStore:
+    def test_roundtrip_and_version_stamp(self, tmp_path):
+        source = tmp_path / "a.py"
+        source.write_text("def f():\n    pass\n")
+        stat = os.stat(source)
+        db_path = str(tmp_path / "cache.db")
+
+        store = AnalysisStore(db_path)
+        store.put(str(source), stat, "hash", {"path": "a.py", "function_count": 1})
+        store.close()
+
+        entry = AnalysisStore(db_path).get(str(source))
+        assert entry.matches(stat)
+        assert entry.content_hash == "hash"
+        assert entry.result() == {"path": "a.py", "function_count": 1}
+
+        assert AnalysisStore(db_path, version="outra").get(str(source)) is None
+
+
+class TestIncrementalScan:
+    def scan(self, root, db_path):
+        analyzer = BatchAnalyzer(max_workers=1)
+        store = AnalysisStore(db_path)
+        try:
+            return asyncio.run(ProjectScanner(analyzer, store).scan(str(root)))
+        finally:
+            store.close()
+            analyzer.shutdown()
+
+    def test_unchanged_files_are_not_reanalyzed(self, tmp_path):
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "a.py").write_text("def a(x):\n    return x\n")
+        (root / "b.py").write_text("def b(y):\n    if y:\n        return 1\n    return 0\n")
+        db_path = str(tmp_path / "cache.db")
+
+        first = self.scan(root, db_path)
+        assert first["cached_count"] == 0
+
+        second = self.scan(root, db_path)
+        assert second["cached_count"] == 2
+        assert second["files"] == first["files"]
+
+        (root / "a.py").write_text("def a(x):\n    if x:\n        return x\n    return None\n")
+        os.utime(root / "b.py")
+        third = self.scan(root, db_path)
+        assert third["cached_count"] == 1
+        assert third["files"][0]["max_complexity"] == 2
+
+    def test_deleted_and_renamed_files_are_pruned(self, tmp_path):
+        root = tmp_path / "project"
+        root.mkdir()
+        for name in ("a.py", "b.py", "c.py"):
+            (root / name).write_text(f"def {name[0]}():\n    return 1\n")
+        sibling = tmp_path / "project2" / "d.py"
+        sibling.parent.mkdir()
+        db_path = str(tmp_path / "cache.db")
+        self.scan(root, db_path)
+
+        stat = os.stat(root / "a.py")
+        for store, path in ((AnalysisStore(db_path), sibling), (AnalysisStore(db_path, "antiga"), root / "velho.py")):
+            store.put(str(path), stat, "hash", {})
+            store.close()
+
+        (root / "a.py").rename(root / "renomeado.py")
+        (root / "b.py").unlink()
+        self.scan(root, db_path)
+
+        store = AnalysisStore(db_path)
+        rows = store._connection.execute("SELECT path FROM file_analysis ORDER BY path").fetchall()
+        store.close()
+        assert [os.path.relpath(path, tmp_path) for (path,) in rows] == [
+            os.path.join("project", "c.py"), os.path.join("project", "renomeado.py"),
+            os.path.join("project2", "d.py")
+        ]
+
+    def test_files_left_out_by_filters_are_kept(self, tmp_path):
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "a.py").write_text("def a():\n    return 1\n")
+        (root / "b.py").write_text("def b():\n    return 2\n")
+        store = AnalysisStore(str(tmp_path / "cache.db"))
+        analyzer = BatchAnalyzer(max_workers=1)
+        try:
+            asyncio.run(ProjectScanner(analyzer, store).scan(str(root)))
+            asyncio.run(ProjectScanner(analyzer, store).scan(str(root), exclude=["b.py"]))
+            assert store.stats()["entries"] == 2
+        finally:
+            store.close()
+            analyzer.shutdown()
@@ -0,0 +1,173 @@
+import pytest
+
+from analyzers.java_Analyzer import JavaPromptGenerator
+from analyzers.python_Analyzer import PromptGenerator
+from analyzers.templates import CompiledTemplate, TemplateRegistry
+
+
+STATIC = {"signature": "soma(a, b)", "parameters": [], "return_type": "int",
+          "dependencies": {"imports": []}}
+FLOW = {"flow_map": [], "complexity_score": 1, "summary": "Linear"}
+JAVA_STATIC = {"signature": "public int soma(int a, int b)", "modifiers": ["public"],
+               "parameters": [], "return_type": "int", "exceptions": [], "annotations": [],
+               "dependencies": {"imports": []}}
+
+# Prompt da versão anterior aos modelos, para JAVA_STATIC/FLOW com "junit" ou "junit5"
+BASELINE_JAVA_PROMPT = """Gere testes unitários completos para o seguinte método Java:
+
+MÉTODO: public int soma(int a, int b)
+MODIFICADORES: public
+PARÂMETROS: Nenhum
+RETORNO: int
+EXCEÇÕES: 
+ANOTAÇÕES: Nenhuma
+DEPENDÊNCIAS:
+
+FLUXO: Linear
+COMPLEXIDADE: 1
+CENÁRIOS: Fluxo linear
+
+INSTRUÇÕES:
+1. Cubra todos os cenários identificados no fluxo
+2. Inclua testes para casos extremos e validação de parâmetros
+3. Teste tratamento de exceções quando aplicável
+4. Use Mockito para mockar dependências
+5. Mantenha testes independentes e determinísticos
+6. Use anotações @DisplayName para descrever os testes
+7. Implemente testes parametrizados quando apropriado
+
+ESTRUTURA DE SAÍDA OBRIGATÓRIA:
+
+```java
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.BeforeEach;
+import org.junit.jupiter.api.DisplayName;
+import org.junit.jupiter.params.ParameterizedTest;
+import org.junit.jupiter.params.provider.ValueSource;
+import static org.junit.jupiter.api.Assertions.*;
+import static org.mockito.Mockito.*;
+
+class MethodNameTest {
+    
+    private ClassName classUnderTest;
+    
+    @BeforeEach
+    void setUp() {
+        classUnderTest = new ClassName();
+    }
+    
+    @Test
+    @DisplayName("Should handle normal case")
+    void shouldHandleNormalCase() {
+        // Arrange
+        
+        // Act
+        
+        // Assert
+    }
+    
+    @Test
+    @DisplayName("Should handle edge cases")
+    void shouldHandleEdgeCases() {
+        // Test edge cases
+    }
+    
+    @Test
+    @DisplayName("Should throw exception when invalid")
+    void shouldThrowExceptionWhenInvalid() {
+        // Test exception scenarios
+        assertThrows(ExceptionType.class, () -> {
+            // Code that should throw
+        });
+    }
+    
+    @ParameterizedTest
+    @ValueSource(ints = {1, 2, 3})
+    void shouldHandleMultipleValues(int value) {
+        // Parameterized tests
+    }
+}
+```
+
+Gere APENAS o código dos testes, sem explicações adicionais."""
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestCompiledTemplate:
+    def test_partial_folds_static_values(self):
+        template = CompiledTemplate.compile("{{language}}: {{flow_info}} ({{ framework }})")
+        partial = template.partial({"language": "python", "framework": "pytest"})
+        assert partial.parts == ["python: ", "flow_info", " (pytest)"]
+        assert partial.render({"flow_info": "IF(x)"}) == "python: IF(x) (pytest)"
+
+    def test_unknown_placeholder_is_rejected(self):
+        with pytest.raises(ValueError, match="nome_errado"):
+            CompiledTemplate.compile("{{nome_errado}}")
+
+
+class TestTemplateRegistry:
+    def test_builtin_frameworks(self):
+        registry = TemplateRegistry()
+        assert registry.frameworks("method") == {"java": ["junit4", "junit5"]}
+        assert registry.frameworks("function")["java"] == ["junit"]
+        assert registry.frameworks("function")["python"] == ["pytest"]
+
+    def test_each_generator_has_its_own_skeletons(self):
+        registry = TemplateRegistry()
+        java = JavaPromptGenerator(registry)
+        assert java.generate_test_prompt(JAVA_STATIC, FLOW, "junit")["prompt"] == BASELINE_JAVA_PROMPT
+        assert java.generate_test_prompt(JAVA_STATIC, FLOW, "junit5")["prompt"] == BASELINE_JAVA_PROMPT
+
+        python = PromptGenerator(registry)
+        assert "class FunctionNameTest" in python._get_output_structure("java", "junit")
+        assert python._get_output_structure("java", "junit5") == python._get_output_structure("python", "pytest")
+
+    def test_builtin_prompt_contains_skeleton(self):
+        prompt = PromptGenerator(TemplateRegistry()).generate_test_prompt(STATIC, FLOW)["prompt"]
+        assert prompt.startswith("Gere testes unitários completos para a seguinte função em python:")
+        assert "FUNÇÃO: soma(a, b)" in prompt
+        assert "ESTRUTURA DE SAÍDA OBRIGATÓRIA:\n\n```python\nimport pytest" in prompt
+        assert prompt.endswith("Gere APENAS o código dos testes, sem explicações adicionais.")
+
+    def test_user_directory_adds_frameworks(self, tmp_path):
+        write(tmp_path / "skeletons" / "python.unittest.txt",
+              "```python\nimport unittest  # {{language}}/{{framework}}\n```\n")
+        write(tmp_path / "skeletons" / "java.testng.txt", "```java\nimport org.testng.annotations.Test;\n```\n")
+        registry = TemplateRegistry([str(tmp_path)])
+
+        prompt = PromptGenerator(registry).generate_test_prompt(STATIC, FLOW, "python", "unittest")["prompt"]
+        assert "import unittest  # python/unittest" in prompt
+        java_prompt = JavaPromptGenerator(registry).generate_test_prompt(JAVA_STATIC, FLOW, "testng")["prompt"]
+        assert "org.testng" in java_prompt
+        assert "MÉTODO: public int soma(int a, int b)" in java_prompt
+
+    def test_user_skeleton_for_one_frame(self, tmp_path):
+        write(tmp_path / "skeletons" / "method" / "java.junit.txt", "```java\n// junit do método\n```\n")
+        registry = TemplateRegistry([str(tmp_path)])
+        assert JavaPromptGenerator(registry)._get_output_structure("junit") == "```java\n// junit do método\n```"
+        assert "FunctionNameTest" in PromptGenerator(registry)._get_output_structure("java", "junit")
+
+    def test_user_frame_overrides_builtin(self, tmp_path):
+        write(tmp_path / "frames" / "function.txt", "Testes {{framework}}:\n{{function_info}}\n{{output_structure}}\n")
+        registry = TemplateRegistry([str(tmp_path)])
+        prompt = PromptGenerator(registry).generate_test_prompt(STATIC, FLOW)["prompt"]
+        assert prompt.startswith("Testes pytest:\nFUNÇÃO: soma(a, b)")
+        assert prompt.endswith("```")
+
+    def test_unknown_framework_falls_back(self):
+        registry = TemplateRegistry()
+        generator = JavaPromptGenerator(registry)
+        assert generator._get_output_structure("spock") == generator._get_output_structure("junit5")
+        assert registry.template("method", "java", "spock", ("java", "junit5")) is \
+            registry.template("method", "java", "spock", ("java", "junit5"))
+
+    def test_invalid_directory_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            TemplateRegistry([str(tmp_path)])
+        write(tmp_path / "skeletons" / "python.bad.txt", "{{codigo}}")
+        with pytest.raises(ValueError, match="codigo"):
+            TemplateRegistry([str(tmp_path)])